@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark the Cast control path against a local simulated receiver.
+
+Runs the real pychromecast / CastSessionManager code against FakeCastDevice
+(see src/cast/simulator.py), which fetches the stream from a local
+StreamingServer, and reports per stage:
+
+    connect_ms       - get_cast_device() (CAST_DEVICE_IP) until receiver status
+    wake_ms          - CastSessionManager entry (wake, if the TV is in standby)
+    load_ms          - start_cast() until the receiver reports the media loaded
+    first_segment_ms - receiver LOAD until its first segment was downloaded
+    stop_ms          - CastSessionManager exit (stop media, disconnect)
+
+Needs no TV, display or network, so it runs on CI boxes:
+
+    python scripts/bench_cast_control.py [--runs 10] [--standby] [--wake-delay 0.5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.cast.discovery import get_cast_device  # noqa: E402
+from src.cast.session import CastSessionManager  # noqa: E402
+from src.cast.simulator import FakeCastDevice  # noqa: E402
+from src.video.server import StreamingServer  # noqa: E402
+
+STAGES = ['connect_ms', 'wake_ms', 'load_ms', 'first_segment_ms', 'stop_ms']
+
+
+def write_live_stream(stream_dir: str, segments: int, segment_kb: int) -> str:
+    """Write a live HLS playlist with dummy segments; returns the playlist name."""
+    lines = ['#EXTM3U', '#EXT-X-VERSION:3', '#EXT-X-TARGETDURATION:2', '#EXT-X-MEDIA-SEQUENCE:0']
+    for i in range(segments):
+        name = f'bench{i}.ts'
+        with open(os.path.join(stream_dir, name), 'wb') as f:
+            f.write(os.urandom(segment_kb * 1024))
+        lines.extend(['#EXTINF:2.0,', name])
+    with open(os.path.join(stream_dir, 'bench.m3u8'), 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    return 'bench.m3u8'
+
+
+async def measure(stream_url: str, standby: bool, wake_delay: float) -> dict:
+    """One cast from connect to stop against a fresh simulated TV."""
+    async with FakeCastDevice(standby=standby, wake_delay=wake_delay) as tv:
+        os.environ['CAST_DEVICE_IP'] = tv.address
+        started = time.monotonic()
+        device = await get_cast_device()
+        connected = time.monotonic()
+
+        session = CastSessionManager(device)
+        await session.__aenter__()
+        awake = time.monotonic()
+        try:
+            if not await session.start_cast(stream_url):
+                raise RuntimeError("Receiver did not report the media loaded")
+            loaded = time.monotonic()
+        finally:
+            await session.__aexit__(None, None, None)
+        stopped = time.monotonic()
+
+        return {
+            'connect_ms': (connected - started) * 1000,
+            'wake_ms': (awake - connected) * 1000,
+            'load_ms': (loaded - awake) * 1000,
+            'first_segment_ms': tv.stats()['load_to_first_segment_ms'][0],
+            'stop_ms': (stopped - loaded) * 1000,
+        }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--standby', action='store_true', help="Start each TV in standby")
+    parser.add_argument('--wake-delay', type=float, default=0.5)
+    parser.add_argument('--segment-kb', type=int, default=512)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as stream_dir, socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+        probe.close()
+        playlist = write_live_stream(stream_dir, segments=3, segment_kb=args.segment_kb)
+        server = StreamingServer(port=port, stream_dir=stream_dir)
+        await server.start()
+        try:
+            samples = []
+            for _ in range(args.runs):
+                sample = await measure(
+                    f'http://127.0.0.1:{port}/{playlist}', args.standby, args.wake_delay
+                )
+                print(' '.join(f"{k}={v:.1f}" for k, v in sample.items()), file=sys.stderr)
+                samples.append(sample)
+        finally:
+            await server.stop()
+
+    results = {
+        stage: {
+            'median': round(statistics.median(s[stage] for s in samples), 1),
+            'min': round(min(s[stage] for s in samples), 1),
+            'max': round(max(s[stage] for s in samples), 1),
+        }
+        for stage in STAGES
+    }
+    print(json.dumps({
+        'runs': args.runs, 'standby': args.standby, 'wake_delay': args.wake_delay,
+        'results': results,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
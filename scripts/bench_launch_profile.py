@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark Chromium launch profiles: cold-launch time and steady-state RSS.
+
+For each launch profile (see src/browser/launch.py), repeatedly launches
+Chromium into a fresh Xvfb display and reports:
+
+    launch_ms - chromium.launch() until the first page has loaded
+    rss_mb    - resident memory of all Chromium processes after the page has
+                been open for --settle seconds
+
+Requires Xvfb and Chromium (run inside the service container):
+
+    python scripts/bench_launch_profile.py [--url URL] [--runs 5] [--settle 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from playwright.async_api import async_playwright  # noqa: E402
+
+from src.browser.launch import LAUNCH_PROFILES  # noqa: E402
+from src.browser.procstat import chromium_pids, rss_bytes  # noqa: E402
+from src.video.capture import XvfbManager, find_free_display  # noqa: E402
+
+DEFAULT_PAGE = "data:text/html,<!doctype html><h1 style='font:48px sans-serif'>Dashboard</h1>"
+
+
+async def measure(playwright, profile, url: str, settle: float) -> dict:
+    """Cold-launch Chromium with a profile and measure launch time and RSS."""
+    async with XvfbManager(display=find_free_display(), resolution=(1920, 1080)) as display:
+        started = time.monotonic()
+        browser = await playwright.chromium.launch(
+            headless=False,
+            env={**os.environ, 'DISPLAY': display},
+            **profile.launch_options()
+        )
+        try:
+            context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
+            page = await context.new_page()
+            await page.goto(url, wait_until='load')
+            launch_ms = (time.monotonic() - started) * 1000
+
+            await asyncio.sleep(settle)
+            rss = rss_bytes(chromium_pids(display) or [])
+        finally:
+            await browser.close()
+
+    return {'launch_ms': launch_ms, 'rss_mb': rss / (1024 * 1024)}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--url', default=DEFAULT_PAGE)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--settle', type=float, default=10)
+    parser.add_argument('--profiles', nargs='+', default=list(LAUNCH_PROFILES))
+    args = parser.parse_args()
+
+    results = {}
+    async with async_playwright() as playwright:
+        for name in args.profiles:
+            samples = [
+                await measure(playwright, LAUNCH_PROFILES[name], args.url, args.settle)
+                for _ in range(args.runs)
+            ]
+            results[name] = {
+                'launch_ms_median': round(statistics.median(s['launch_ms'] for s in samples), 1),
+                'launch_ms_min': round(min(s['launch_ms'] for s in samples), 1),
+                'rss_mb_median': round(statistics.median(s['rss_mb'] for s in samples), 1),
+            }
+            print(f"{name:10s} {results[name]}", file=sys.stderr)
+
+    print(json.dumps({'runs': args.runs, 'settle': args.settle, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
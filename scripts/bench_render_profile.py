@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark Chromium + FFmpeg CPU with and without the render profile.
+
+Renders a page into Xvfb, captures it with FFmpeg at the quality preset's
+frame rate, and reports CPU time of all Chromium processes and FFmpeg over a
+fixed window for each render profile variant:
+
+    baseline  - no render profile (native frame rate, no motion preference)
+    profile   - RenderProfile for the capture frame rate (env defaults)
+    paused    - profile + CSS animations paused
+
+Requires Xvfb, FFmpeg and Chromium (run inside the service container):
+
+    python scripts/bench_render_profile.py [--url URL] [--quality 1080p] [--seconds 20]
+
+Without --url an offline page with CSS animations and a requestAnimationFrame
+canvas is used.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.browser.manager import BrowserManager  # noqa: E402
+from src.browser.procstat import chromium_pids, cpu_seconds  # noqa: E402
+from src.browser.render import RenderProfile  # noqa: E402
+from src.video.capture import XvfbManager, find_free_display  # noqa: E402
+from src.video.encoder import FFmpegEncoder  # noqa: E402
+from src.video.quality import get_quality_config  # noqa: E402
+
+ANIMATED_PAGE = """data:text/html,<!doctype html><html><body style="margin:0;background:%23111">
+<style>.spin{width:200px;height:200px;margin:40px;display:inline-block;background:%234af;
+animation:spin 1s linear infinite}@keyframes spin{to{transform:rotate(360deg)}}</style>
+<div class="spin"></div><div class="spin"></div><div class="spin"></div>
+<canvas id="c" width="1200" height="500"></canvas>
+<script>const c=document.getElementById('c').getContext('2d');let t=0;
+(function draw(){t++;c.fillStyle='%23111';c.fillRect(0,0,1200,500);c.strokeStyle='%23fa4';
+c.beginPath();for(let x=0;x<1200;x++){c.lineTo(x,250+200*Math.sin((x+t*4)/60))}c.stroke();
+requestAnimationFrame(draw)})();</script></body></html>"""
+
+
+async def measure(url: str, quality_name: str, seconds: float, profile) -> dict:
+    """Run one capture pipeline and measure CPU over the window."""
+    quality = get_quality_config(quality_name)
+    async with XvfbManager(display=find_free_display(), resolution=quality.resolution) as display:
+        async with BrowserManager(display=display, render_profile=profile) as browser:
+            await browser.get_page(url)
+            encoder = FFmpegEncoder(quality, display=display, output_dir='/tmp/bench-render')
+            async with encoder:
+                await asyncio.sleep(2)  # Let encoder and page settle
+
+                ffmpeg_pids = [encoder.process.pid]
+                chrome_before = cpu_seconds(chromium_pids(display))
+                ffmpeg_before = cpu_seconds(ffmpeg_pids)
+                started = time.monotonic()
+                await asyncio.sleep(seconds)
+                elapsed = time.monotonic() - started
+                chrome = cpu_seconds(chromium_pids(display)) - chrome_before
+                ffmpeg = cpu_seconds(ffmpeg_pids) - ffmpeg_before
+
+    return {
+        'chromium_cpu_pct': round(chrome / elapsed * 100, 1),
+        'ffmpeg_cpu_pct': round(ffmpeg / elapsed * 100, 1),
+        'total_cpu_pct': round((chrome + ffmpeg) / elapsed * 100, 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--url', default=ANIMATED_PAGE)
+    parser.add_argument('--quality', default='1080p')
+    parser.add_argument('--seconds', type=float, default=20)
+    args = parser.parse_args()
+
+    framerate = get_quality_config(args.quality).framerate
+    profile = RenderProfile.for_framerate(framerate)
+    variants = {
+        'baseline': None,
+        'profile': profile,
+        'paused': RenderProfile(profile.max_fps, profile.reduced_motion, pause_animations=True),
+    }
+
+    results = {}
+    for name, variant in variants.items():
+        results[name] = await measure(args.url, args.quality, args.seconds, variant)
+        print(f"{name:10s} {results[name]}", file=sys.stderr)
+
+    print(json.dumps({'quality': args.quality, 'seconds': args.seconds, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
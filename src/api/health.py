@@ -0,0 +1,235 @@
+"""Background health checks for /health.
+
+Checking the Cast device (possibly a discovery scan) and probing the encoder
+hardware take seconds, and the hardware probe blocks in subprocess.run. A
+liveness probe polling /health every few seconds would keep the service busy
+checking itself, so HealthMonitor runs the checks on a background task and
+/health serves the latest snapshot with its age:
+
+- cast_device: the Cast device answers (mDNS device table, connection pool,
+  or a connection made and dropped again)
+- hardware_acceleration: FFmpeg is installed and QuickSync is usable
+  (detected once, in a worker thread)
+- stream: the active stream's encoder keeps reporting progress and, for
+  HLS, the receiver keeps fetching segments (an fMP4 stream is fetched
+  once, as one long response, so only encoder progress counts)
+- disk: free space where the stream segments are written
+
+Environment variables:
+    HEALTH_INTERVAL: Seconds between background checks (default: 30)
+    HEALTH_CHECK_TIMEOUT: Seconds allowed for the Cast device check
+                          (default: 10)
+    HEALTH_STREAM_STALE_TIMEOUT: Seconds without encoder progress (or, for
+                                 HLS, receiver fetches) after which a stream
+                                 is stalled
+                                 (default: 30)
+    HEALTH_MIN_FREE_MB: Free disk space below which the service is degraded
+                        (default: 512)
+"""
+
+import asyncio
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import structlog
+
+from src.api.state import StreamTracker
+from src.cast.device_cache import DeviceCache
+from src.cast.discovery import get_cast_device
+from src.cast.registry import CastDeviceRegistry
+from src.video.hardware import HardwareAcceleration
+
+logger = structlog.get_logger()
+
+
+class HealthMonitor:
+    """Refreshes a health snapshot in the background.
+
+    Usage:
+        monitor = HealthMonitor(tracker, stream_dir="/tmp/streams")
+        await monitor.start()
+        snapshot = await monitor.get()               # Never runs the checks if cached
+        snapshot = await monitor.get(refresh=True)   # Runs them now
+        await monitor.stop()
+    """
+
+    def __init__(
+        self,
+        tracker: StreamTracker,
+        stream_dir: str = "/tmp/streams",
+        device_cache: Optional[DeviceCache] = None,
+        cast_registry: Optional[CastDeviceRegistry] = None,
+        interval: Optional[float] = None
+    ):
+        """Initialize monitor.
+
+        Args:
+            tracker: Stream tracker whose active stream is checked
+            stream_dir: Directory the encoder writes segments to (disk check)
+            device_cache: mDNS device table to answer the device check from
+            cast_registry: Connection pool to check the device through
+            interval: Seconds between checks (default: HEALTH_INTERVAL env var)
+        """
+        self.tracker = tracker
+        self.stream_dir = str(stream_dir)
+        self.device_cache = device_cache
+        self.cast_registry = cast_registry
+        self.interval = interval if interval is not None else float(os.getenv("HEALTH_INTERVAL", "30"))
+        self.check_timeout = float(os.getenv("HEALTH_CHECK_TIMEOUT", "10"))
+        self.stale_timeout = float(os.getenv("HEALTH_STREAM_STALE_TIMEOUT", "30"))
+        self.min_free_mb = float(os.getenv("HEALTH_MIN_FREE_MB", "512"))
+        self.hw_accel = HardwareAcceleration()
+        self.snapshot: Optional[dict] = None
+        self.updated_at: Optional[float] = None  # time.monotonic() of the snapshot
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start refreshing every interval (the first check runs right away)."""
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Cancel the background refresher and any check in progress."""
+        for task in (self._loop_task, self._refresh_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._loop_task = self._refresh_task = None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the snapshot was taken (None before the first check)."""
+        return time.monotonic() - self.updated_at if self.updated_at is not None else None
+
+    async def get(self, refresh: bool = False) -> dict:
+        """Latest snapshot, checking first if asked to or if there is none yet."""
+        if refresh or self.snapshot is None:
+            await self.refresh()
+        return self.snapshot
+
+    async def refresh(self) -> dict:
+        """Run the checks now; concurrent callers share one run."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._check())
+        return await asyncio.shield(self._refresh_task)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("health_check_failed", error=str(e))
+            await asyncio.sleep(self.interval)
+
+    async def _check(self) -> dict:
+        started = time.monotonic()
+        device_available, hardware, disk = await asyncio.gather(
+            self._check_device(), self._check_hardware(), asyncio.to_thread(self._check_disk)
+        )
+        stream = self._check_stream()
+        healthy = (
+            device_available
+            and hardware["ffmpeg_available"]
+            and stream["state"] != "stalled"
+            and not disk.get("low", False)
+        )
+        self.snapshot = {
+            "status": "healthy" if healthy else "degraded",
+            "cast_device": "available" if device_available else "unavailable",
+            "hardware_acceleration": hardware,
+            "stream": stream,
+            "disk": disk,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "check_ms": round((time.monotonic() - started) * 1000, 1),
+        }
+        self.updated_at = time.monotonic()
+        logger.debug("health_checked", status=self.snapshot["status"], check_ms=self.snapshot["check_ms"])
+        return self.snapshot
+
+    async def _check_device(self) -> bool:
+        """Whether the Cast device answers, within HEALTH_CHECK_TIMEOUT."""
+        try:
+            return await asyncio.wait_for(self._find_device(), timeout=self.check_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("health_device_check_timeout", timeout=self.check_timeout)
+        except Exception as e:
+            logger.warning("health_device_check_failed", error=str(e))
+        return False
+
+    async def _find_device(self) -> bool:
+        # The mDNS device table answers without discovery; otherwise go
+        # through the connection pool when there is one
+        if self.device_cache is not None and not os.getenv("CAST_DEVICE_IP"):
+            return self.device_cache.lookup(os.getenv("CAST_DEVICE_NAME")) is not None
+        if self.cast_registry is not None:
+            return await self.cast_registry.get_device() is not None
+        device = await get_cast_device()
+        if device is None:
+            return False
+        # Not pooled: don't keep a connection open per check
+        await asyncio.to_thread(device.disconnect, timeout=2)
+        return True
+
+    async def _check_hardware(self) -> dict:
+        """FFmpeg presence and QuickSync support (probed once, off the event loop)."""
+        quicksync = await asyncio.to_thread(self.hw_accel.is_qsv_available)
+        return {
+            "ffmpeg_available": shutil.which("ffmpeg") is not None,
+            "quicksync_available": quicksync,
+            "encoder": self.hw_accel.get_encoder_config()["encoder"],  # Cached by now
+        }
+
+    def _check_stream(self) -> dict:
+        """Whether the active stream is still producing and being fetched."""
+        session = self.tracker.current_session()
+        if session is None:
+            return {"state": "idle"}
+        stats = session.to_dict()
+        record = {
+            "state": "starting",
+            "session_id": session.session_id,
+            "stage": stats["stage"],
+            "mode": stats["mode"],
+            "encoder_reported_s_ago": (stats["encoder"] or {}).get("reported_s_ago"),
+            "receiver_fetched_s_ago": None,
+        }
+        last_fetch = (stats["receiver"] or {}).get("last_fetch_at")
+        if last_fetch:
+            fetched_at = datetime.fromisoformat(last_fetch)
+            record["receiver_fetched_s_ago"] = round(
+                (datetime.now(timezone.utc) - fetched_at).total_seconds(), 1
+            )
+        if stats["stage"] == "streaming":
+            # Stalled: the encoder stopped reporting, or an HLS receiver
+            # stopped fetching segments (or never started) although the stream
+            # is playing. fMP4 is fetched once, so its fetch age only grows.
+            encoder_age = record["encoder_reported_s_ago"]
+            fetch_age = record["receiver_fetched_s_ago"]
+            stalled = encoder_age is not None and encoder_age > self.stale_timeout
+            if stats["mode"] == "hls":
+                stalled = stalled or (
+                    fetch_age if fetch_age is not None else stats["uptime_s"]
+                ) > self.stale_timeout
+            record["state"] = "stalled" if stalled else "live"
+        return record
+
+    def _check_disk(self) -> dict:
+        """Free space where segments are written."""
+        try:
+            usage = shutil.disk_usage(self.stream_dir)
+        except OSError as e:
+            return {"path": self.stream_dir, "error": str(e), "low": True}
+        free_mb = usage.free / (1024 * 1024)
+        return {
+            "path": self.stream_dir,
+            "free_mb": round(free_mb, 1),
+            "used_ratio": round(usage.used / usage.total, 3) if usage.total else None,
+            "low": free_mb < self.min_free_mb,
+        }
@@ -3,14 +3,24 @@ FastAPI application with lifespan management for Dashboard Cast Service.
 
 Uses lifespan context manager for startup/shutdown logic and resource cleanup.
 """
+import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import structlog
 
+from src.api.health import HealthMonitor
 from src.api.logging_config import configure_logging
+from src.api.scheduler import CastScheduler
 from src.api.state import StreamTracker
 from src.api.routes import register_routes
+from src.browser.service import BrowserService
+from src.cast.breaker import stop_breakers
+from src.cast.device_cache import start_device_cache, stop_device_cache
+from src.cast.registry import CastDeviceRegistry
+from src.video.quality import RenderGeometry, get_quality_config
 from src.video.server import StreamingServer
+from src.video.slate import SlateCache
+from src.video.timeline import StartupTraceLog
 
 logger = structlog.get_logger()
 
@@ -27,19 +37,73 @@ async def lifespan(app: FastAPI):
     configure_logging()
     logger.info("app_startup", phase="webhook-api")
 
-    # Initialize StreamTracker
-    app.state.stream_tracker = StreamTracker()
-
     # Start streaming server
     app.state.streaming_server = StreamingServer(port=8080)
     await app.state.streaming_server.start()
     logger.info("streaming_server_started", port=8080)
 
+    # Keep Chromium warm across sessions (BROWSER_PERSISTENT=false launches per stream)
+    app.state.browser_service = None
+    if os.getenv("BROWSER_PERSISTENT", "true").lower() == "true":
+        app.state.browser_service = BrowserService()
+        await app.state.browser_service.start(prelaunch=RenderGeometry.for_quality(
+            get_quality_config("1080p")
+        ).display)
+        logger.info("browser_service_started")
+
+    # Cast each dashboard's last frame while its pipeline warms up (SLATE=false disables)
+    app.state.slate_cache = None
+    if os.getenv("SLATE", "true").lower() == "true":
+        app.state.slate_cache = SlateCache(stream_dir=str(app.state.streaming_server.stream_dir))
+        await app.state.slate_cache.prepare_default()
+        logger.info("slate_cache_ready")
+
+    # Browse mDNS in the background so lookups never wait on discovery (MDNS_CACHE=false browses per lookup)
+    app.state.device_cache = None
+    if os.getenv("MDNS_CACHE", "true").lower() == "true":
+        app.state.device_cache = await start_device_cache()
+        logger.info("device_cache_started")
+
+    # Keep Cast connections open between sessions (CAST_POOL=false connects per stream)
+    app.state.cast_registry = None
+    if os.getenv("CAST_POOL", "true").lower() == "true":
+        app.state.cast_registry = CastDeviceRegistry()
+        await app.state.cast_registry.start(prewarm=os.getenv("CAST_DEVICE_NAME", ""))
+        logger.info("cast_registry_started")
+
+    # Initialize StreamTracker (observes the streaming server for receiver fetches)
+    app.state.stream_tracker = StreamTracker(
+        streaming_server=app.state.streaming_server,
+        trace_log=StartupTraceLog(),
+        browser_service=app.state.browser_service,
+        slate=app.state.slate_cache,
+        cast_registry=app.state.cast_registry
+    )
+    app.state.scheduler = CastScheduler(app.state.stream_tracker)
+
+    # Check health in the background; /health serves the latest snapshot
+    app.state.health_monitor = HealthMonitor(
+        app.state.stream_tracker,
+        stream_dir=str(app.state.streaming_server.stream_dir),
+        device_cache=app.state.device_cache,
+        cast_registry=app.state.cast_registry
+    )
+    await app.state.health_monitor.start()
+
     yield
 
-    # Shutdown: Cleanup active streams
+    # Shutdown: Release pre-warmed schedules, then cleanup active streams
     logger.info("app_shutdown", active_streams=len(app.state.stream_tracker.active_tasks))
+    await app.state.health_monitor.stop()
+    await app.state.scheduler.shutdown()
     await app.state.stream_tracker.cleanup_all()
+    if app.state.browser_service:
+        await app.state.browser_service.stop()
+    if app.state.cast_registry:
+        await app.state.cast_registry.stop()
+    if app.state.device_cache:
+        await stop_device_cache()
+    await stop_breakers()
     await app.state.streaming_server.stop()
     logger.info("streaming_server_stopped")
 
@@ -3,16 +3,92 @@ Pydantic request/response models for webhook API endpoints.
 
 All models use Pydantic v2 for validation and serialization.
 """
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, HttpUrl, Field, model_validator
 from typing import Literal, Optional
 
 
+class ReadinessConfig(BaseModel):
+    """Per-request page readiness strategy (see src.browser.readiness)."""
+    strategy: Literal['fcp', 'selector', 'js', 'settle', 'networkidle'] = 'fcp'
+    selector: Optional[str] = None  # Required for 'selector'
+    expression: Optional[str] = None  # Required for 'js'
+    settle_ms: int = Field(default=0, ge=0)
+    timeout_ms: int = Field(default=10000, gt=0)
+
+    @model_validator(mode='after')
+    def check_strategy_args(self):
+        if self.strategy == 'selector' and not self.selector:
+            raise ValueError("strategy 'selector' requires 'selector'")
+        if self.strategy == 'js' and not self.expression:
+            raise ValueError("strategy 'js' requires 'expression'")
+        return self
+
+
 class StartRequest(BaseModel):
     """Request model for starting a cast stream."""
     url: HttpUrl
     quality: str = "1080p"  # Default from Docker config
     duration: Optional[int] = None  # Seconds, None = indefinite
     mode: Literal['hls', 'fmp4'] = 'hls'  # Streaming mode: HLS (buffered) or fMP4 (low-latency)
+    readiness: Optional[ReadinessConfig] = None  # None = per-URL rule or PAGE_READINESS default
+
+
+class CarouselItemRequest(BaseModel):
+    """One dashboard in a carousel rotation."""
+    url: HttpUrl
+    dwell: float = Field(default=30.0, gt=0)  # Seconds on screen per rotation
+    readiness: Optional[ReadinessConfig] = None
+
+
+class CarouselRequest(BaseModel):
+    """Request model for starting a carousel (rotating dashboards) stream."""
+    items: list[CarouselItemRequest] = Field(min_length=1)
+    quality: str = "1080p"
+    duration: Optional[int] = None  # Seconds, None = indefinite
+    mode: Literal['hls', 'fmp4'] = 'hls'
+    refresh_ahead: float = Field(default=5.0, ge=0)  # Reload an item this long before its turn
+
+
+class WallRequest(BaseModel):
+    """Request model for casting to a synchronized multi-screen video wall."""
+    url: HttpUrl
+    devices: list[str] = Field(min_length=2)  # Cast device friendly names, row-major
+    tiled: bool = False  # Give each screen its own tile of one large render
+    columns: int = Field(default=0, ge=0)  # Screens per row, 0 = one row
+    quality: str = "1080p"  # Per screen
+    duration: Optional[int] = None  # Seconds, None = indefinite
+    mode: Literal['hls', 'fmp4'] = 'hls'
+    readiness: Optional[ReadinessConfig] = None
+
+    @model_validator(mode='after')
+    def check_grid(self):
+        if self.tiled and self.columns and len(self.devices) % self.columns:
+            raise ValueError("a tiled wall needs a full grid: len(devices) must be a multiple of columns")
+        return self
+
+
+class ScheduleRequest(BaseModel):
+    """Request model for creating a scheduled (recurring) cast."""
+    cron: str  # 5-field cron expression or @hourly/@daily/@weekly/@monthly, local time
+    url: HttpUrl
+    quality: str = "1080p"
+    duration: Optional[int] = None  # Seconds per slot, None = until next /start or /stop
+    mode: Literal['hls', 'fmp4'] = 'hls'
+    lead_time: float = Field(default=30.0, ge=0)  # Seconds before each slot to pre-warm
+    readiness: Optional[ReadinessConfig] = None
+
+
+class ScheduleResponse(BaseModel):
+    """Response model for a scheduled cast."""
+    id: str
+    cron: str
+    url: str
+    quality: str
+    duration: Optional[int] = None
+    mode: str
+    lead_time: float
+    next_run: Optional[str] = None  # ISO timestamp (local time)
+    prewarmed: bool = False  # Pipeline already pre-warmed for next_run
 
 
 class StartResponse(BaseModel):
@@ -25,12 +101,13 @@ class StopResponse(BaseModel):
     """Response model for stop endpoint."""
     status: str
     message: str
+    time_to_idle_ms: Optional[float] = None  # Stop request -> all components torn down
 
 
 class StatusResponse(BaseModel):
     """Response model for status endpoint."""
     status: str  # "casting" or "idle"
-    stream: Optional[dict] = None  # {session_id, started_at, url, quality} if active
+    stream: Optional[dict] = None  # StreamSession.to_dict() if active
 
 
 class HealthResponse(BaseModel):
@@ -38,4 +115,13 @@ class HealthResponse(BaseModel):
     status: str  # "healthy" or "degraded"
     active_streams: int
     cast_device: str  # "available" or "unavailable"
-    hardware_acceleration: dict  # QuickSync status
+    hardware_acceleration: dict  # FFmpeg and QuickSync status
+    stream: Optional[dict] = None  # Active stream liveness (idle, starting, live or stalled)
+    disk: Optional[dict] = None  # Free space where segments are written
+    checked_at: Optional[str] = None  # When the background checks ran (UTC)
+    check_ms: Optional[float] = None  # How long they took
+    age_s: Optional[float] = None  # Seconds since checked_at
+    request_interception: Optional[dict] = None  # Block/asset cache counters and hit rate
+    cast_connections: Optional[list] = None  # Pooled Cast connections (name, host, connected, reconnects)
+    cast_devices: Optional[list] = None  # Devices in the mDNS device cache (name, model, host, last_seen)
+    cast_device_health: Optional[list] = None  # Per-device circuit state and health score (0-100)
@@ -1,14 +1,28 @@
 """
 Webhook endpoint handlers for Dashboard Cast Service.
 
-Implements /start and /stop endpoints following non-blocking pattern.
+Implements /start, /carousel, /wall, /stop and /schedules endpoints following non-blocking pattern.
 """
 import uuid
 import structlog
+from fastapi import HTTPException
 
-from src.api.models import StartRequest, StartResponse, StopResponse, StatusResponse, HealthResponse
-from src.cast.discovery import get_cast_device
-from src.video.hardware import HardwareAcceleration
+from src.api.models import (
+    StartRequest,
+    StartResponse,
+    StopResponse,
+    StatusResponse,
+    HealthResponse,
+    CarouselRequest,
+    WallRequest,
+    ScheduleRequest,
+    ScheduleResponse,
+)
+from src.browser.carousel import CarouselItem
+from src.browser.intercept import get_interceptor
+from src.browser.readiness import ReadinessStrategy
+from src.cast.breaker import get_breakers
+from src.cast.group import VideoWall
 
 logger = structlog.get_logger()
 
@@ -24,7 +38,7 @@ def register_routes(app):
         If a stream is already active, it will be stopped before starting new one.
 
         Args:
-            request: StartRequest with url, quality, duration
+            request: StartRequest with url, quality, duration, mode, readiness
 
         Returns:
             StartResponse with status and session_id
@@ -42,7 +56,99 @@ def register_routes(app):
             str(request.url),
             request.quality,
             request.duration,
-            request.mode
+            request.mode,
+            ReadinessStrategy(**request.readiness.model_dump()) if request.readiness else None
+        )
+
+        return StartResponse(status="success", session_id=session_id)
+
+    @app.post("/carousel", response_model=StartResponse)
+    async def start_carousel(request: CarouselRequest):
+        """Start a carousel that rotates through several dashboards.
+
+        All dashboards are pre-rendered in one browser and rotated in place,
+        so a single encoder and Cast session serve the whole rotation.
+        Auto-stops any previous stream like /start.
+
+        Args:
+            request: CarouselRequest with items (url, dwell, readiness),
+                quality, duration, mode and refresh_ahead
+
+        Returns:
+            StartResponse with status and session_id
+        """
+        logger.info(
+            "webhook_carousel",
+            urls=[str(item.url) for item in request.items],
+            quality=request.quality,
+            duration=request.duration,
+            mode=request.mode
+        )
+
+        if app.state.stream_tracker.has_active_stream():
+            await app.state.stream_tracker.stop_current_stream()
+
+        items = [
+            CarouselItem(
+                url=str(item.url),
+                dwell=item.dwell,
+                readiness=ReadinessStrategy(**item.readiness.model_dump()) if item.readiness else None
+            )
+            for item in request.items
+        ]
+
+        session_id = str(uuid.uuid4())
+        await app.state.stream_tracker.start_stream(
+            session_id,
+            items[0].url,
+            request.quality,
+            request.duration,
+            request.mode,
+            carousel=items,
+            carousel_refresh_ahead=request.refresh_ahead
+        )
+
+        return StartResponse(status="success", session_id=session_id)
+
+    @app.post("/wall", response_model=StartResponse)
+    async def start_wall(request: WallRequest):
+        """Start casting to a synchronized multi-screen video wall.
+
+        One pipeline serves every screen: devices are connected in parallel,
+        playback starts on all of them together and drifting screens are
+        re-synchronized. A tiled wall renders the dashboard across the whole
+        grid and gives each screen its own tile. Auto-stops any previous
+        stream like /start.
+
+        Args:
+            request: WallRequest with url, devices, tiled, columns, quality,
+                duration, mode and readiness
+
+        Returns:
+            StartResponse with status and session_id
+        """
+        logger.info(
+            "webhook_wall",
+            url=str(request.url),
+            devices=request.devices,
+            tiled=request.tiled,
+            quality=request.quality,
+            duration=request.duration,
+            mode=request.mode
+        )
+
+        if app.state.stream_tracker.has_active_stream():
+            await app.state.stream_tracker.stop_current_stream()
+
+        session_id = str(uuid.uuid4())
+        await app.state.stream_tracker.start_stream(
+            session_id,
+            str(request.url),
+            request.quality,
+            request.duration,
+            request.mode,
+            ReadinessStrategy(**request.readiness.model_dump()) if request.readiness else None,
+            wall=VideoWall(request.devices, tiled=request.tiled, columns=request.columns)
         )
 
         return StartResponse(status="success", session_id=session_id)
@@ -52,63 +158,117 @@ def register_routes(app):
         """Stop active casting session.
 
         Returns:
-            StopResponse with status and message
+            StopResponse with status, message and time-to-idle
         """
         logger.info("webhook_stop")
 
         if not app.state.stream_tracker.has_active_stream():
             return StopResponse(status="success", message="No active stream")
 
-        await app.state.stream_tracker.stop_current_stream()
-        return StopResponse(status="success", message="Stream stopped")
+        time_to_idle_ms = await app.state.stream_tracker.stop_current_stream()
+        return StopResponse(
+            status="success",
+            message="Stream stopped",
+            time_to_idle_ms=time_to_idle_ms
+        )
 
     @app.get("/status", response_model=StatusResponse)
     async def get_status():
         """Get current stream status.
 
-        Returns idle or casting with stream info. Note that stream metadata
-        (started_at, url, quality) is not tracked in StreamTracker v1.
+        Returns idle, or casting with the session record: request parameters,
+        device, pipeline stage, startup timeline, encoder progress, receiver
+        fetches and playback counters. Everything is read from memory.
         """
-        if not app.state.stream_tracker.has_active_stream():
+        session = app.state.stream_tracker.current_session()
+        if session is None:
             return StatusResponse(status="idle", stream=None)
 
-        # Return active stream info
-        session_id, task = next(iter(app.state.stream_tracker.active_tasks.items()))
-
-        # TODO: Track stream metadata (started_at, url, quality) in StreamTracker
-        # For now, return basic info
-        return StatusResponse(
-            status="casting",
-            stream={
-                "session_id": session_id,
-                "started_at": "TODO",  # Add timestamp tracking
-                "url": "TODO",  # Add metadata tracking
-                "quality": "TODO"
-            }
-        )
+        return StatusResponse(status="casting", stream=session.to_dict())
+
+    @app.post("/schedules", response_model=ScheduleResponse)
+    async def create_schedule(request: ScheduleRequest):
+        """Create a recurring cast.
+
+        The pipeline (discovery, Xvfb, browser, page) is pre-warmed
+        lead_time seconds before each slot so the cast starts on time.
+
+        Args:
+            request: ScheduleRequest with cron, url, quality, duration, mode,
+                lead_time and readiness
+
+        Returns:
+            ScheduleResponse with the schedule id and next run time
+        """
+        logger.info("webhook_schedule_create", cron=request.cron, url=str(request.url))
+        try:
+            entry = app.state.scheduler.add(
+                request.cron,
+                str(request.url),
+                request.quality,
+                request.duration,
+                request.mode,
+                request.lead_time,
+                ReadinessStrategy(**request.readiness.model_dump()) if request.readiness else None
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        return ScheduleResponse(**entry.to_dict())
+
+    @app.get("/schedules", response_model=list[ScheduleResponse])
+    async def list_schedules():
+        """List scheduled casts."""
+        return [ScheduleResponse(**entry.to_dict()) for entry in app.state.scheduler.entries.values()]
+
+    @app.delete("/schedules/{schedule_id}", response_model=StopResponse)
+    async def delete_schedule(schedule_id: str):
+        """Delete a scheduled cast, releasing any pre-warmed pipeline.
+
+        A cast already started by the schedule keeps running until /stop.
+        """
+        if not await app.state.scheduler.remove(schedule_id):
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        return StopResponse(status="success", message="Schedule deleted")
+
+    @app.post("/schedules/{schedule_id}/skip", response_model=ScheduleResponse)
+    async def skip_schedule(schedule_id: str):
+        """Skip the next slot of a scheduled cast, releasing its pre-warm."""
+        entry = await app.state.scheduler.skip_next(schedule_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        return ScheduleResponse(**entry.to_dict())
 
     @app.get("/health", response_model=HealthResponse)
-    async def health_check():
+    async def health_check(refresh: bool = False):
         """Health check for monitoring.
 
-        Checks Cast device availability, active streams, and hardware acceleration status.
-        """
-        # Check Cast device
-        device = await get_cast_device()
-        device_available = device is not None
+        Serves the snapshot HealthMonitor refreshes in the background (Cast
+        device, encoder, stream liveness, disk space) with its age, so
+        frequent liveness probes cost nothing. In-memory counters (active
+        streams, interception, pooled connections, breakers) are always
+        current.
 
-        # Check hardware acceleration
-        hw_accel = HardwareAcceleration()
-        encoder_config = hw_accel.get_encoder_config()
+        Args:
+            refresh: Run the checks now instead of serving the snapshot
+                (?refresh=1)
+        """
+        health_monitor = app.state.health_monitor
+        snapshot = await health_monitor.get(refresh=refresh)
 
-        status = "healthy" if device_available else "degraded"
+        device_cache = getattr(app.state, "device_cache", None)
+        cast_registry = getattr(app.state, "cast_registry", None)
+        interceptor = get_interceptor()
+        breakers = get_breakers()
 
         return HealthResponse(
-            status=status,
+            **snapshot,
+            age_s=round(health_monitor.age, 1),
             active_streams=len(app.state.stream_tracker.active_tasks),
-            cast_device="available" if device_available else "unavailable",
-            hardware_acceleration={
-                "quicksync_available": hw_accel.is_qsv_available(),
-                "encoder": encoder_config['encoder']
-            }
+            request_interception=interceptor.stats() if interceptor else None,
+            cast_connections=cast_registry.stats() if cast_registry is not None else None,
+            cast_devices=(
+                [entry.to_dict() for entry in device_cache.devices()]
+                if device_cache is not None else None
+            ),
+            cast_device_health=breakers.stats() if breakers is not None else None
         )
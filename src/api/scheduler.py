@@ -0,0 +1,332 @@
+"""Scheduled casts with ahead-of-time pipeline pre-warming.
+
+Predictable casts (the 09:00 standup board, a status wall during business
+hours) are described by cron-style entries. Each entry pre-warms discovery,
+Xvfb, the browser and the page `lead_time` seconds before its slot, so at the
+slot time only the encoder and Cast playback remain and the cast starts on
+time. Pre-warmed resources are released if the slot is skipped or the entry
+is removed.
+"""
+
+import asyncio
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import structlog
+
+from src.api.state import StreamTracker
+from src.browser.readiness import ReadinessStrategy
+from src.video.stream import StreamManager
+from src.video.timeline import StartupTimeline
+
+logger = structlog.get_logger()
+
+# Common cron shorthands
+CRON_MACROS = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+# (min, max) for minute, hour, day of month, month, day of week
+CRON_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def _parse_cron_field(spec: str, low: int, high: int) -> set[int]:
+    """Parse one cron field ('*', '*/5', '1-5', '1,3,5', '8-18/2')."""
+    values = set()
+    for part in spec.split(','):
+        step = 1
+        if '/' in part:
+            part, step_str = part.split('/', 1)
+            step = int(step_str)
+            if step < 1:
+                raise ValueError(f"Invalid cron step: {step_str}")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start_str, end_str = part.split('-', 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron value out of range {low}-{high}: {part}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpression:
+    """Five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Supports '*', lists, ranges, steps and the @hourly/@daily/@weekly/@monthly
+    macros. Day of week is 0-7 with both 0 and 7 meaning Sunday. As in cron,
+    when both day fields are restricted a day matches if either matches.
+
+    Usage:
+        cron = CronExpression("0 9 * * 1-5")  # 09:00 on weekdays
+        next_run = cron.next_after(datetime.now())
+    """
+
+    def __init__(self, expression: str):
+        """Parse a cron expression.
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        self.expression = expression
+        fields = CRON_MACROS.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: {expression}")
+
+        try:
+            parsed = [
+                _parse_cron_field(spec, low, high)
+                for spec, (low, high) in zip(fields, CRON_FIELD_RANGES)
+            ]
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression '{expression}': {e}") from e
+
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {d % 7 for d in weekdays}
+        self._days_restricted = fields[2] != '*'
+        self._weekdays_restricted = fields[4] != '*'
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays  # cron: Sunday = 0
+        if self._days_restricted and self._weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """Get the first matching minute strictly after `after`.
+
+        Raises:
+            ValueError: If nothing matches within 5 years (e.g. '0 0 30 2 *')
+        """
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after + timedelta(days=5 * 366)
+
+        while t <= limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+
+@dataclass
+class ScheduleEntry:
+    """A recurring scheduled cast.
+
+    Attributes:
+        id: Schedule identifier
+        cron: When to start casting
+        url: Dashboard URL
+        quality: Quality preset
+        duration: Seconds to cast per slot (None = until the next /start or /stop)
+        mode: Streaming mode ('hls' or 'fmp4')
+        lead_time: Seconds before each slot to pre-warm the pipeline
+        readiness: Optional page readiness strategy
+        next_run: Next slot time (local time)
+        prewarmed: Whether a pre-warmed pipeline is waiting for next_run
+    """
+    id: str
+    cron: CronExpression
+    url: str
+    quality: str = "1080p"
+    duration: Optional[int] = None
+    mode: str = 'hls'
+    lead_time: float = 30.0
+    readiness: Optional[ReadinessStrategy] = None
+    next_run: Optional[datetime] = None
+    prewarmed: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'cron': self.cron.expression,
+            'url': self.url,
+            'quality': self.quality,
+            'duration': self.duration,
+            'mode': self.mode,
+            'lead_time': self.lead_time,
+            'next_run': self.next_run.isoformat() if self.next_run else None,
+            'prewarmed': self.prewarmed,
+        }
+
+
+class CastScheduler:
+    """Runs schedule entries on top of StreamTracker.
+
+    Each entry has one runner task that sleeps until `lead_time` before the
+    next slot, pre-warms a StreamManager, sleeps until the slot, then hands
+    the pre-warmed manager to StreamTracker (auto-stopping any current
+    stream, like /start). If pre-warming fails the slot falls back to a
+    normal cold start.
+    """
+
+    def __init__(self, tracker: StreamTracker):
+        self.tracker = tracker
+        self.entries: Dict[str, ScheduleEntry] = {}
+        self._runners: Dict[str, asyncio.Task] = {}
+
+    def add(
+        self,
+        cron: str,
+        url: str,
+        quality: str = "1080p",
+        duration: Optional[int] = None,
+        mode: str = 'hls',
+        lead_time: float = 30.0,
+        readiness: Optional[ReadinessStrategy] = None
+    ) -> ScheduleEntry:
+        """Add a schedule entry and start its runner.
+
+        Raises:
+            ValueError: If the cron expression is invalid
+        """
+        entry = ScheduleEntry(
+            id=str(uuid.uuid4()),
+            cron=CronExpression(cron),
+            url=url,
+            quality=quality,
+            duration=duration,
+            mode=mode,
+            lead_time=lead_time,
+            readiness=readiness,
+        )
+        entry.next_run = entry.cron.next_after(datetime.now())
+        self.entries[entry.id] = entry
+        self._runners[entry.id] = asyncio.create_task(self._run_entry(entry))
+        logger.info("schedule_added", schedule_id=entry.id, cron=cron, url=url,
+                    next_run=entry.next_run.isoformat())
+        return entry
+
+    async def remove(self, entry_id: str) -> bool:
+        """Remove an entry, releasing any pre-warmed pipeline.
+
+        Returns:
+            False if no such entry exists
+        """
+        entry = self.entries.pop(entry_id, None)
+        if entry is None:
+            return False
+        await self._cancel_runner(entry_id)
+        logger.info("schedule_removed", schedule_id=entry_id)
+        return True
+
+    async def skip_next(self, entry_id: str) -> Optional[ScheduleEntry]:
+        """Cancel only the upcoming slot of an entry, releasing its pre-warm.
+
+        Returns:
+            The entry (with next_run advanced), or None if no such entry exists
+        """
+        entry = self.entries.get(entry_id)
+        if entry is None:
+            return None
+        await self._cancel_runner(entry_id)
+        entry.next_run = entry.cron.next_after(entry.next_run)
+        self._runners[entry_id] = asyncio.create_task(self._run_entry(entry))
+        logger.info("schedule_slot_skipped", schedule_id=entry_id, next_run=entry.next_run.isoformat())
+        return entry
+
+    async def shutdown(self) -> None:
+        """Cancel all runners and release pre-warmed pipelines."""
+        await asyncio.gather(
+            *(self._cancel_runner(entry_id) for entry_id in list(self._runners)),
+            return_exceptions=True
+        )
+
+    async def _cancel_runner(self, entry_id: str) -> None:
+        task = self._runners.pop(entry_id, None)
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    @staticmethod
+    async def _sleep_until(when: datetime) -> None:
+        delay = (when - datetime.now()).total_seconds()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _run_entry(self, entry: ScheduleEntry) -> None:
+        """Runner loop: pre-warm before each slot, start the cast at the slot."""
+        while True:
+            slot = entry.next_run
+            # Pre-warms immediately if the entry was added inside its lead time
+            await self._sleep_until(slot - timedelta(seconds=entry.lead_time))
+
+            session_id = str(uuid.uuid4())
+            manager: Optional[StreamManager] = None
+            handed_over = False
+            try:
+                manager = await self._prewarm(entry, session_id)
+                await self._sleep_until(slot)
+
+                logger.info("schedule_slot_starting", schedule_id=entry.id, session_id=session_id,
+                            prewarmed=manager is not None)
+                if self.tracker.has_active_stream():
+                    await self.tracker.stop_current_stream()
+                await self.tracker.start_stream(
+                    session_id,
+                    entry.url,
+                    entry.quality,
+                    entry.duration,
+                    entry.mode,
+                    entry.readiness,
+                    manager=manager
+                )
+                handed_over = True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("schedule_slot_failed", schedule_id=entry.id, error=str(e))
+            finally:
+                entry.prewarmed = False
+                if manager is not None and not handed_over:
+                    await manager.release()
+
+            entry.next_run = entry.cron.next_after(max(slot, datetime.now()))
+
+    async def _prewarm(self, entry: ScheduleEntry, session_id: str) -> Optional[StreamManager]:
+        """Pre-warm a pipeline for a slot; None if it fails (cold start instead)."""
+        manager = StreamManager(
+            url=entry.url,
+            cast_device_name=os.getenv("CAST_DEVICE_NAME"),
+            quality_preset=entry.quality,
+            duration=entry.duration,
+            mode=entry.mode,
+            timeline=StartupTimeline(session_id),
+            streaming_server=self.tracker.streaming_server,
+            trace_log=self.tracker.trace_log,
+            readiness=entry.readiness,
+            browser_service=self.tracker.browser_service,
+            cast_registry=self.tracker.cast_registry
+        )
+        logger.info("schedule_prewarm", schedule_id=entry.id, session_id=session_id,
+                    slot=entry.next_run.isoformat())
+        try:
+            await manager.prewarm()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("schedule_prewarm_failed", schedule_id=entry.id, error=str(e))
+            return None
+        entry.prewarmed = True
+        return manager
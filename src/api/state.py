@@ -1,29 +1,113 @@
 """
 StreamTracker for managing active streaming tasks.
 
-Manages asyncio tasks for long-running streams with proper lifecycle and cleanup.
+Manages asyncio tasks for long-running streams with proper lifecycle and cleanup,
+and keeps a StreamSession record of each for /status.
 """
 import asyncio
 import os
 import structlog
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from src.browser.carousel import CarouselItem
+from src.browser.readiness import ReadinessStrategy
+from src.browser.service import BrowserService
+from src.cast.group import VideoWall
+from src.cast.registry import CastDeviceRegistry
+from src.video.server import StreamingServer
+from src.video.slate import SlateCache
 from src.video.stream import StreamManager
+from src.video.timeline import StartupTimeline, StartupTraceLog
 
 logger = structlog.get_logger()
 
 
+@dataclass
+class StreamSession:
+    """Record of one stream, as reported by /status.
+
+    Request parameters are fixed at start; live fields (device, stage,
+    encoder and receiver counters) are read from the StreamManager once it
+    exists, which keeps them current without any I/O.
+
+    Attributes:
+        session_id: Unique identifier of the session
+        url: Target URL (first item for carousels)
+        quality: Quality preset
+        mode: Streaming mode ('hls' or 'fmp4')
+        timeline: Startup stage timings
+        started_at: When the session was started (UTC)
+        manager: Pipeline running the stream (None until it is created)
+    """
+    session_id: str
+    url: str
+    quality: str
+    mode: str
+    timeline: StartupTimeline
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    manager: Optional[StreamManager] = None
+
+    def to_dict(self) -> dict:
+        live = self.manager.stats() if self.manager else {}
+        return {
+            "session_id": self.session_id,
+            "started_at": self.started_at.isoformat(),
+            "uptime_s": round((datetime.now(timezone.utc) - self.started_at).total_seconds(), 1),
+            "url": self.url,
+            "quality": self.quality,
+            "mode": self.mode,
+            "device": live.get("device"),
+            "stage": live.get("stage", "starting"),
+            "startup": self.timeline.to_dict(),
+            "encoder": live.get("encoder"),
+            "receiver": live.get("receiver"),
+            "playback": self.manager.playback_stats() if self.manager else None,
+        }
+
+
 class StreamTracker:
     """Manages active streaming tasks with proper lifecycle and cleanup."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        streaming_server: Optional[StreamingServer] = None,
+        trace_log: Optional[StartupTraceLog] = None,
+        browser_service: Optional[BrowserService] = None,
+        slate: Optional[SlateCache] = None,
+        cast_registry: Optional[CastDeviceRegistry] = None
+    ):
         self.active_tasks: Dict[str, asyncio.Task] = {}
+        self.sessions: Dict[str, StreamSession] = {}
         self.lock = asyncio.Lock()
+        self.stop_timeout = 10.0  # Seconds to wait for a graceful stop before cancelling
+        self.streaming_server = streaming_server
+        self.trace_log = trace_log
+        self.browser_service = browser_service
+        self.slate = slate
+        self.cast_registry = cast_registry
 
     def has_active_stream(self) -> bool:
         """Check if there are any active streaming tasks."""
         return len(self.active_tasks) > 0
 
-    async def start_stream(self, session_id: str, url: str, quality: str, duration: Optional[int], mode: str = 'hls') -> str:
+    def current_session(self) -> Optional[StreamSession]:
+        """Record of the active stream (single device, only one active)."""
+        return next(iter(self.sessions.values()), None)
+
+    async def start_stream(
+        self,
+        session_id: str,
+        url: str,
+        quality: str,
+        duration: Optional[int],
+        mode: str = 'hls',
+        readiness: Optional[ReadinessStrategy] = None,
+        carousel: Optional[List[CarouselItem]] = None,
+        carousel_refresh_ahead: float = 5.0,
+        manager: Optional[StreamManager] = None,
+        wall: Optional[VideoWall] = None
+    ) -> str:
         """Launch stream as background task.
 
         Args:
@@ -32,16 +116,42 @@ class StreamTracker:
             quality: Quality preset ('1080p', '720p', 'low-latency')
             duration: Optional duration in seconds (None = indefinite)
             mode: Streaming mode ('hls' or 'fmp4')
+            readiness: Optional page readiness strategy override
+            carousel: Optional items to rotate through (carousel session)
+            carousel_refresh_ahead: Seconds before an item's turn to reload it
+            manager: Optional pre-warmed StreamManager to run instead of
+                building a new one (scheduled casts)
+            wall: Optional video wall to cast to instead of CAST_DEVICE_NAME
 
         Returns:
             session_id for tracking
         """
-        task = asyncio.create_task(self._run_stream(session_id, url, quality, duration, mode))
+        self.sessions[session_id] = StreamSession(
+            session_id, url, quality, mode,
+            timeline=manager.timeline if manager else StartupTimeline(session_id),
+            manager=manager
+        )
+        task = asyncio.create_task(self._run_stream(
+            session_id, url, quality, duration, mode, readiness, carousel, carousel_refresh_ahead,
+            manager, wall
+        ))
         self.active_tasks[session_id] = task
         logger.info("stream_task_created", session_id=session_id, url=url, quality=quality)
         return session_id
 
-    async def _run_stream(self, session_id: str, url: str, quality: str, duration: Optional[int], mode: str = 'hls'):
+    async def _run_stream(
+        self,
+        session_id: str,
+        url: str,
+        quality: str,
+        duration: Optional[int],
+        mode: str = 'hls',
+        readiness: Optional[ReadinessStrategy] = None,
+        carousel: Optional[List[CarouselItem]] = None,
+        carousel_refresh_ahead: float = 5.0,
+        manager: Optional[StreamManager] = None,
+        wall: Optional[VideoWall] = None
+    ):
         """Execute stream (runs until duration expires or cancelled).
 
         This is the background task that actually runs the stream. It binds
@@ -58,13 +168,24 @@ class StreamTracker:
             # Get cast_device_name from env var, or None to use first available device
             cast_device_name = os.getenv("CAST_DEVICE_NAME")
 
-            stream_manager = StreamManager(
+            stream_manager = manager or StreamManager(
                 url=url,
                 cast_device_name=cast_device_name,
                 quality_preset=quality,
                 duration=duration,
-                mode=mode
+                mode=mode,
+                timeline=self.sessions[session_id].timeline,
+                streaming_server=self.streaming_server,
+                trace_log=self.trace_log,
+                readiness=readiness,
+                carousel=carousel,
+                carousel_refresh_ahead=carousel_refresh_ahead,
+                browser_service=self.browser_service,
+                slate=self.slate,
+                cast_registry=self.cast_registry,
+                wall=wall
             )
+            self.sessions[session_id].manager = stream_manager
             await stream_manager.start_stream()
 
             logger.info("stream_completed", session_id=session_id)
@@ -74,26 +195,58 @@ class StreamTracker:
             logger.error("stream_failed", session_id=session_id, error=str(e))
         finally:
             self.active_tasks.pop(session_id, None)
+            self.sessions.pop(session_id, None)
             structlog.contextvars.clear_contextvars()
 
-    async def stop_current_stream(self):
-        """Stop the active stream (single device, only one active)."""
+    async def _stop_session(self, session_id: str, task: asyncio.Task) -> Optional[float]:
+        """Signal a stream to stop, falling back to cancellation.
+
+        Returns:
+            Time-to-idle in milliseconds as reported by StreamManager, or None
+            if the stream had to be cancelled before a manager existed
+        """
+        logger.info("stopping_stream", session_id=session_id)
+        time_to_idle_ms = None
+
+        session = self.sessions.get(session_id)
+        manager = session.manager if session else None
+        if manager is not None:
+            try:
+                time_to_idle_ms = await asyncio.wait_for(
+                    manager.stop_stream(), timeout=self.stop_timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning("stream_stop_timeout", session_id=session_id, timeout=self.stop_timeout)
+
+        if not task.done():
+            task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        logger.info("stream_stopped", session_id=session_id, time_to_idle_ms=time_to_idle_ms)
+        return time_to_idle_ms
+
+    async def stop_current_stream(self) -> Optional[float]:
+        """Stop the active stream (single device, only one active).
+
+        Returns:
+            Time-to-idle in milliseconds, or None if nothing was running
+        """
         async with self.lock:
             if not self.active_tasks:
-                return
+                return None
 
             session_id, task = next(iter(self.active_tasks.items()))
-            logger.info("stopping_stream", session_id=session_id)
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+            return await self._stop_session(session_id, task)
 
     async def cleanup_all(self):
-        """Cancel all active streams on shutdown."""
-        tasks = list(self.active_tasks.values())
-        for task in tasks:
-            task.cancel()
-        await asyncio.gather(*tasks, return_exceptions=True)
+        """Stop all active streams concurrently on shutdown."""
+        sessions = list(self.active_tasks.items())
+        await asyncio.gather(
+            *(self._stop_session(session_id, task) for session_id, task in sessions),
+            return_exceptions=True
+        )
         self.active_tasks.clear()
+        self.sessions.clear()
@@ -6,5 +6,19 @@ injection and proper resource management.
 
 from .manager import BrowserManager
 from .auth import inject_auth
+from .readiness import ReadinessStrategy, resolve_readiness, wait_for_ready
+from .carousel import Carousel, CarouselItem
+from .render import RenderProfile
+from .service import BrowserService
 
-__all__ = ["BrowserManager", "inject_auth"]
+__all__ = [
+    "BrowserManager",
+    "inject_auth",
+    "ReadinessStrategy",
+    "resolve_readiness",
+    "wait_for_ready",
+    "Carousel",
+    "CarouselItem",
+    "RenderProfile",
+    "BrowserService",
+]
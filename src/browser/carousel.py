@@ -0,0 +1,177 @@
+"""Dashboard carousel: rotate pre-rendered pages inside one browser context.
+
+Rotating dashboards by firing /start repeatedly paid a full pipeline restart
+(Xvfb, browser, FFmpeg, Cast) per switch. A Carousel instead pre-loads every
+URL in its own Playwright page of the same BrowserManager context and brings
+the next page to the front on each rotation, so one encoder and one Cast
+session serve the whole rotation. Each page is reloaded in the background
+shortly before it comes back on screen, so it never shows stale data.
+"""
+
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+import asyncio
+import logging
+
+from playwright.async_api import Page
+
+from .manager import BrowserManager
+from .readiness import ReadinessStrategy, resolve_readiness, wait_for_ready
+
+if TYPE_CHECKING:
+    from ..video.timeline import StartupTimeline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CarouselItem:
+    """One dashboard in a carousel rotation.
+
+    Attributes:
+        url: Dashboard URL
+        dwell: Seconds the dashboard stays on screen per rotation
+        readiness: Optional readiness strategy (default: per-URL rule or env default)
+    """
+    url: str
+    dwell: float = 30.0
+    readiness: Optional[ReadinessStrategy] = None
+
+
+class Carousel:
+    """Pre-rendered page rotation with background refresh.
+
+    Usage:
+        async with BrowserManager() as browser:
+            async with Carousel(browser, items) as carousel:
+                # All pages loaded, first one in front
+                carousel.start_rotation()
+                ...
+            # Rotation stopped, pages closed
+
+    Attributes:
+        items: Carousel items in rotation order
+        pages: Page per item (same order), populated by __aenter__
+        current: Index of the item currently on screen
+    """
+
+    def __init__(
+        self,
+        browser: BrowserManager,
+        items: list[CarouselItem],
+        refresh_ahead: float = 5.0,
+        timeline: Optional["StartupTimeline"] = None
+    ):
+        """Initialize carousel.
+
+        Args:
+            browser: Entered BrowserManager whose context hosts the pages
+            items: Items to rotate through (at least one)
+            refresh_ahead: Seconds before an item's turn to reload it in the
+                background (0 disables refreshing)
+            timeline: Optional startup timeline to record the navigation and
+                page_ready spans of the pre-load
+
+        Raises:
+            ValueError: If items is empty
+        """
+        if not items:
+            raise ValueError("Carousel requires at least one item")
+
+        self.browser = browser
+        self.items = items
+        self.refresh_ahead = refresh_ahead
+        self.timeline = timeline
+        self.pages: list[Page] = []
+        self.current = 0
+        self._rotation_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _span(self, stage: str):
+        """Time a stage on the startup timeline, if one was provided."""
+        return self.timeline.span(stage) if self.timeline else nullcontext()
+
+    async def __aenter__(self) -> "Carousel":
+        """Pre-load every item concurrently and bring the first to the front.
+
+        All pages are navigated first, then awaited until ready, so the two
+        phases are timed separately.
+        """
+        logger.info(f"Pre-loading {len(self.items)} carousel page(s)")
+        with self._span('navigation'):
+            self.pages = list(await asyncio.gather(
+                *(self.browser.open_page(item.url) for item in self.items)
+            ))
+        with self._span('page_ready'):
+            await asyncio.gather(*(
+                wait_for_ready(page, resolve_readiness(item.url, item.readiness))
+                for page, item in zip(self.pages, self.items)
+            ))
+        await self.pages[0].bring_to_front()
+        self.current = 0
+        logger.info("Carousel pages pre-loaded")
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Stop rotation and close all carousel pages."""
+        for task in (self._rotation_task, self._refresh_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        for page in self.pages:
+            try:
+                await page.close()
+            except Exception as e:
+                logger.debug(f"Error closing carousel page: {e}")
+        self.pages = []
+
+        # Don't suppress exceptions
+        return False
+
+    @property
+    def current_page(self) -> Page:
+        """Page currently on screen."""
+        return self.pages[self.current]
+
+    async def _refresh(self, index: int) -> None:
+        """Reload an off-screen page so it is fresh when it comes back."""
+        item = self.items[index]
+        try:
+            logger.debug(f"Refreshing carousel page {index}: {item.url}")
+            await self.pages[index].reload(wait_until='domcontentloaded')
+            await wait_for_ready(self.pages[index], resolve_readiness(item.url, item.readiness))
+        except Exception as e:
+            # A failed refresh still leaves the previous render on the page
+            logger.warning(f"Failed to refresh carousel page {item.url}: {e}")
+
+    def start_rotation(self) -> None:
+        """Start rotating in the background (no-op for a single item)."""
+        if len(self.items) > 1 and self._rotation_task is None:
+            self._rotation_task = asyncio.create_task(self._rotate())
+
+    async def _rotate(self) -> None:
+        """Rotation loop: dwell, refresh the next page ahead of time, switch."""
+        while True:
+            dwell = self.items[self.current].dwell
+            next_index = (self.current + 1) % len(self.items)
+
+            self._refresh_task = None
+            if self.refresh_ahead > 0:
+                await asyncio.sleep(max(dwell - self.refresh_ahead, 0))
+                self._refresh_task = asyncio.create_task(self._refresh(next_index))
+                await asyncio.sleep(min(self.refresh_ahead, dwell))
+            else:
+                await asyncio.sleep(dwell)
+
+            if self._refresh_task is not None and not self._refresh_task.done():
+                # Give a slow reload a little extra time before switching to it
+                await asyncio.wait({self._refresh_task}, timeout=self.refresh_ahead)
+
+            await self.pages[next_index].bring_to_front()
+            self.current = next_index
+            logger.info(f"Carousel switched to item {next_index}: {self.items[next_index].url}")
@@ -0,0 +1,336 @@
+"""Page health monitoring for long-running casts.
+
+Dashboards left on screen for days leak memory in the page itself (chart
+libraries appending points forever, listeners never removed), until frames
+drop or the renderer crashes. A PageHealthMonitor samples every page of a
+cast in the background:
+
+- JS heap and DOM node count through the page's CDP Performance domain
+- renderer resident memory from /proc (see procstat.py)
+
+When a threshold is crossed the page is reloaded seamlessly: a replacement
+page is loaded in the same context, brought to the front once ready, and
+only then is the old page closed. Renderer crashes are recovered the same
+way. Xvfb keeps showing whatever page is in front, so the encoder and the
+Cast session are never restarted.
+
+Environment variables:
+    PAGE_HEALTH_INTERVAL: Seconds between samples (default: 60, 0 = disabled)
+    PAGE_HEALTH_MAX_HEAP_MB: JS heap above which a page is reloaded (default: 512)
+    PAGE_HEALTH_MAX_DOM_NODES: DOM nodes above which a page is reloaded
+                               (default: 200000)
+    PAGE_HEALTH_MAX_RENDERER_RSS_MB: Renderer resident memory above which the
+                                     page with the largest heap is reloaded
+                                     (default: 1024)
+    PAGE_HEALTH_RELOAD_COOLDOWN: Minimum seconds between reloads of the same
+                                 page, so a page that is over budget right
+                                 after loading isn't reloaded in a loop
+                                 (default: 600)
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+import asyncio
+import logging
+import os
+import time
+
+from playwright.async_api import CDPSession, Page
+
+from .manager import BrowserManager
+from .procstat import chromium_pids, rss_bytes
+from .readiness import ReadinessStrategy, resolve_readiness, wait_for_ready
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+@dataclass
+class HealthSample:
+    """Resource use of one page.
+
+    Attributes:
+        heap_bytes: Used JS heap
+        dom_nodes: Live DOM nodes
+        renderer_rss_bytes: Resident memory of the largest renderer process
+            on the display (None if /proc is unavailable)
+    """
+    heap_bytes: int
+    dom_nodes: int
+    renderer_rss_bytes: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        return {
+            'heap_mb': round(self.heap_bytes / MB, 1),
+            'dom_nodes': self.dom_nodes,
+            'renderer_rss_mb': (
+                round(self.renderer_rss_bytes / MB, 1)
+                if self.renderer_rss_bytes is not None else None
+            ),
+        }
+
+
+@dataclass
+class HealthThresholds:
+    """Limits above which a page is reloaded (0 disables a limit).
+
+    Attributes:
+        max_heap_mb: Used JS heap
+        max_dom_nodes: Live DOM nodes
+        max_renderer_rss_mb: Renderer resident memory
+    """
+    max_heap_mb: float = 512
+    max_dom_nodes: int = 200_000
+    max_renderer_rss_mb: float = 1024
+
+    @classmethod
+    def from_env(cls) -> "HealthThresholds":
+        """Build thresholds from PAGE_HEALTH_* env vars."""
+        return cls(
+            max_heap_mb=float(os.getenv('PAGE_HEALTH_MAX_HEAP_MB', '512')),
+            max_dom_nodes=int(os.getenv('PAGE_HEALTH_MAX_DOM_NODES', '200000')),
+            max_renderer_rss_mb=float(os.getenv('PAGE_HEALTH_MAX_RENDERER_RSS_MB', '1024')),
+        )
+
+    def page_violation(self, sample: HealthSample) -> Optional[str]:
+        """Reason a page is over its own budget (heap/DOM), or None."""
+        if self.max_heap_mb and sample.heap_bytes > self.max_heap_mb * MB:
+            return f"JS heap {sample.heap_bytes / MB:.0f}MB > {self.max_heap_mb:.0f}MB"
+        if self.max_dom_nodes and sample.dom_nodes > self.max_dom_nodes:
+            return f"{sample.dom_nodes} DOM nodes > {self.max_dom_nodes}"
+        return None
+
+    def renderer_violation(self, renderer_rss_bytes: Optional[int]) -> Optional[str]:
+        """Reason the renderer is over budget, or None."""
+        if (self.max_renderer_rss_mb and renderer_rss_bytes is not None
+                and renderer_rss_bytes > self.max_renderer_rss_mb * MB):
+            return (
+                f"renderer RSS {renderer_rss_bytes / MB:.0f}MB "
+                f"> {self.max_renderer_rss_mb:.0f}MB"
+            )
+        return None
+
+
+class PageHealthMonitor:
+    """Samples a cast's pages and replaces leaking or crashed ones.
+
+    Pages are tracked by index in a list shared with their owner (the
+    carousel's page list, or a one-element list for a single dashboard);
+    replacements are written back into that list.
+
+    Usage:
+        async with PageHealthMonitor(browser, [page], [url]) as monitor:
+            ...  # Stream
+        monitor.stats()  # {'reloads': 1, 'crash_recoveries': 0, ...}
+
+    Attributes:
+        pages: Monitored pages, updated in place when a page is replaced
+        reloads: Pages replaced because a threshold was crossed
+        crash_recoveries: Pages replaced after a renderer crash
+    """
+
+    def __init__(
+        self,
+        browser: BrowserManager,
+        pages: list[Page],
+        urls: list[str],
+        readiness: Optional[list[Optional[ReadinessStrategy]]] = None,
+        front: Callable[[], int] = lambda: 0,
+        on_replace: Optional[Callable[[int, Page], None]] = None,
+        thresholds: Optional[HealthThresholds] = None,
+        interval: Optional[float] = None,
+        reload_cooldown: Optional[float] = None
+    ):
+        """Initialize monitor.
+
+        Args:
+            browser: Entered BrowserManager whose context hosts the pages
+            pages: Pages to monitor (same order as urls)
+            urls: URL each page shows
+            readiness: Optional readiness strategy per page (default:
+                per-URL rule or env default)
+            front: Returns the index of the page currently on screen
+            on_replace: Called with (index, new_page) after a page is replaced
+            thresholds: Reload limits (default: PAGE_HEALTH_* env vars)
+            interval: Seconds between samples (default:
+                PAGE_HEALTH_INTERVAL env var, 0 = only crash recovery)
+            reload_cooldown: Minimum seconds between reloads of one page
+                (default: PAGE_HEALTH_RELOAD_COOLDOWN env var)
+        """
+        self.browser = browser
+        self.pages = pages
+        self.urls = urls
+        self.readiness = [
+            resolve_readiness(url, strategy)
+            for url, strategy in zip(urls, readiness or [None] * len(urls))
+        ]
+        self.front = front
+        self.on_replace = on_replace
+        self.thresholds = thresholds or HealthThresholds.from_env()
+        self.interval = interval if interval is not None else float(
+            os.getenv('PAGE_HEALTH_INTERVAL', '60')
+        )
+        self.reload_cooldown = reload_cooldown if reload_cooldown is not None else float(
+            os.getenv('PAGE_HEALTH_RELOAD_COOLDOWN', '600')
+        )
+        self.reloads = 0
+        self.crash_recoveries = 0
+        self.last_samples: dict[int, HealthSample] = {}
+        self._cdp: dict[Page, CDPSession] = {}
+        self._loaded_at = [time.monotonic()] * len(pages)
+        self._replacing: dict[int, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "PageHealthMonitor":
+        for page in self.pages:
+            self._watch(page)
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Page health monitor started: {len(self.pages)} page(s), "
+            f"interval={self.interval}s"
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        tasks = [t for t in [self._task, *self._replacing.values()] if t and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for cdp in self._cdp.values():
+            try:
+                await cdp.detach()
+            except Exception:
+                pass  # Page already closed
+        self._cdp.clear()
+        logger.info(
+            f"Page health monitor stopped: {self.reloads} reload(s), "
+            f"{self.crash_recoveries} crash recover(ies)"
+        )
+        # Don't suppress exceptions
+        return False
+
+    def stats(self) -> dict:
+        """Reload counters and the latest sample per page."""
+        return {
+            'reloads': self.reloads,
+            'crash_recoveries': self.crash_recoveries,
+            'pages': {index: sample.to_dict() for index, sample in self.last_samples.items()},
+        }
+
+    def _watch(self, page: Page) -> None:
+        page.on('crash', lambda crashed: self._on_crash(crashed))
+
+    def _on_crash(self, page: Page) -> None:
+        if page not in self.pages:
+            return  # Already replaced
+        index = self.pages.index(page)
+        logger.error(f"Renderer crashed for page {index}: {self.urls[index]}")
+        self._schedule_replace(index, crashed=True)
+
+    def _schedule_replace(self, index: int, crashed: bool = False) -> None:
+        task = self._replacing.get(index)
+        if task and not task.done():
+            return
+        self._replacing[index] = asyncio.create_task(self._replace(index, crashed))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._check()
+            except Exception as e:
+                logger.warning(f"Page health check failed: {e}")
+
+    async def _sample(self, page: Page) -> HealthSample:
+        cdp = self._cdp.get(page)
+        if cdp is None:
+            cdp = await page.context.new_cdp_session(page)
+            await cdp.send('Performance.enable')
+            self._cdp[page] = cdp
+        metrics = {
+            metric['name']: metric['value']
+            for metric in (await cdp.send('Performance.getMetrics'))['metrics']
+        }
+        return HealthSample(
+            heap_bytes=int(metrics.get('JSHeapUsedSize', 0)),
+            dom_nodes=int(metrics.get('Nodes', 0)),
+        )
+
+    def _renderer_rss(self) -> Optional[int]:
+        display = self.browser.display or os.environ.get('DISPLAY')
+        pids = chromium_pids(display, process_type='renderer') if display else None
+        if not pids:
+            return None
+        return max(rss_bytes([pid]) for pid in pids)
+
+    async def _check(self) -> None:
+        """Sample every page and replace those over budget."""
+        renderer_rss = await asyncio.to_thread(self._renderer_rss)
+        for index, page in enumerate(list(self.pages)):
+            if index in self._replacing and not self._replacing[index].done():
+                continue
+            try:
+                sample = await self._sample(page)
+            except Exception as e:
+                if page.is_closed():
+                    logger.error(f"Page {index} is gone ({e}), recovering")
+                    self._schedule_replace(index, crashed=True)
+                else:
+                    logger.debug(f"Could not sample page {index}: {e}")
+                continue
+            sample.renderer_rss_bytes = renderer_rss
+            self.last_samples[index] = sample
+            logger.debug(f"Page {index} health: {sample.to_dict()}")
+
+            reason = self.thresholds.page_violation(sample)
+            if reason:
+                self._reload(index, reason)
+
+        # Renderer memory can't be attributed to a page: blame the largest heap
+        reason = self.thresholds.renderer_violation(renderer_rss)
+        if reason and self.last_samples:
+            index = max(self.last_samples, key=lambda i: self.last_samples[i].heap_bytes)
+            self._reload(index, reason)
+
+    def _reload(self, index: int, reason: str) -> None:
+        if time.monotonic() - self._loaded_at[index] < self.reload_cooldown:
+            logger.warning(f"Page {index} over budget ({reason}) but reloaded recently")
+            return
+        logger.warning(f"Page {index} over budget ({reason}), reloading: {self.urls[index]}")
+        self._schedule_replace(index)
+
+    async def _replace(self, index: int, crashed: bool = False) -> None:
+        """Load a replacement page, swap it in, then close the old one."""
+        old = self.pages[index]
+        try:
+            # Load behind the page on screen (x11grab captures the front tab)
+            page = await self.browser.open_page(self.urls[index], behind=self.pages[self.front()])
+            await wait_for_ready(page, self.readiness[index])
+        except Exception as e:
+            # Keep showing the old page; the next check retries
+            logger.error(f"Failed to load replacement for page {index}: {e}")
+            return
+
+        self._watch(page)
+        if index == self.front():
+            await page.bring_to_front()
+        self.pages[index] = page
+        self._loaded_at[index] = time.monotonic()
+        self.last_samples.pop(index, None)
+        if crashed:
+            self.crash_recoveries += 1
+        else:
+            self.reloads += 1
+        if self.on_replace:
+            self.on_replace(index, page)
+        logger.info(f"Page {index} replaced ({'crash' if crashed else 'reload'})")
+
+        cdp = self._cdp.pop(old, None)
+        try:
+            if cdp:
+                await cdp.detach()
+            await old.close()
+        except Exception as e:
+            logger.debug(f"Error closing replaced page: {e}")
@@ -0,0 +1,555 @@
+"""Request interception: block third-party junk, serve assets from a local cache.
+
+Every BrowserContext starts with an empty HTTP cache, so each cast
+re-downloaded the dashboard's JS bundles, fonts and images, and trackers and
+analytics loaded on every page. A RequestInterceptor routes every request
+of a context:
+
+- Requests to blocked hosts (trackers/analytics by default, plus configured
+  patterns) are aborted.
+- Static assets (scripts, stylesheets, fonts, images) are served from a
+  persistent on-disk AssetCache shared by all sessions. Bodies are stored
+  content-addressed (by SHA-256, so identical files are stored once),
+  Cache-Control/Expires are honoured, stale entries with validators are
+  revalidated with a conditional request, and the cache is evicted
+  least-recently-used down to a size bound. The cache is shared and
+  unencrypted, so `private` responses are never stored, nor are responses to
+  requests carrying credentials (Authorization or Cookie) unless marked
+  `public` or `s-maxage`. The index is written a few seconds after it
+  changes, from a worker thread, and on close.
+- Everything else continues to the network untouched.
+
+Environment variables:
+    REQUEST_INTERCEPTION: Enable the interception layer (default: true)
+    BLOCK_LIST: Extra comma-separated host patterns to block
+                (e.g. 'ads.example.com,*.tracker.net')
+    BLOCK_LIST_FILE: File with one host pattern per line (# comments allowed)
+    BLOCK_DEFAULTS: Block the built-in tracker/analytics list (default: true)
+    ASSET_CACHE_DIR: Cache directory (default: /tmp/dashboard-cast/assets)
+    ASSET_CACHE_MAX_MB: Cache size bound (default: 256, 0 disables caching)
+"""
+
+from dataclasses import dataclass, asdict
+from email.utils import parsedate_to_datetime
+from fnmatch import fnmatch
+from typing import Optional
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from playwright.async_api import BrowserContext, Route
+
+logger = logging.getLogger(__name__)
+
+# Trackers and analytics a dashboard wall never needs
+DEFAULT_BLOCKED_HOSTS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'connect.facebook.net',
+    'hotjar.com',
+    'segment.io',
+    'cdn.segment.com',
+    'mixpanel.com',
+    'amplitude.com',
+    'fullstory.com',
+    'clarity.ms',
+    'bam.nr-data.net',
+    'js-agent.newrelic.com',
+    'stats.wp.com',
+)
+
+# Resource types served through the asset cache
+CACHEABLE_RESOURCE_TYPES = frozenset({'script', 'stylesheet', 'font', 'image'})
+
+# Response headers not replayed from the cache (body is stored decoded)
+_UNREPLAYED_HEADERS = frozenset({
+    'content-encoding', 'content-length', 'transfer-encoding', 'connection',
+    'keep-alive', 'set-cookie', 'date', 'age',
+})
+
+# Freshness assumed for responses with Last-Modified but no explicit lifetime
+_MAX_HEURISTIC_TTL = 24 * 3600
+
+DEFAULT_CACHE_DIR = '/tmp/dashboard-cast/assets'
+
+# Seconds after a change before the index is written (changes in between are
+# batched into one write)
+INDEX_FLUSH_DELAY = 5.0
+
+
+def _cache_control(headers: dict) -> dict[str, Optional[str]]:
+    directives = {}
+    for part in headers.get('cache-control', '').split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def shareable(request_headers: dict, response_headers: dict) -> bool:
+    """Whether a response may be stored for every session (RFC 9111 section 3.5).
+
+    Responses to requests with credentials are user-specific unless the
+    server explicitly marks them public or sets a shared-cache lifetime.
+    """
+    if 'authorization' not in request_headers and 'cookie' not in request_headers:
+        return True
+    cc = _cache_control(response_headers)
+    return 'public' in cc or 's-maxage' in cc
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: dict, now: float) -> Optional[float]:
+    """Compute how long a response may be served without revalidation.
+
+    Args:
+        headers: Response headers (lower-case names)
+        now: Current time (epoch seconds)
+
+    Returns:
+        Lifetime in seconds (0 = must revalidate before every use), or None
+        if the response must not be stored in a shared cache
+    """
+    cc = _cache_control(headers)
+    has_validators = 'etag' in headers or 'last-modified' in headers
+    if 'no-store' in cc or 'private' in cc:
+        return None
+    if headers.get('vary', '').strip().lower() not in ('', 'accept-encoding'):
+        return None  # Can't key on other request headers
+
+    max_age = cc.get('s-maxage') or cc.get('max-age')  # A shared cache honours s-maxage first
+    if 'no-cache' in cc:
+        lifetime = 0.0
+    elif max_age is not None:
+        try:
+            lifetime = max(float(max_age), 0.0)
+        except ValueError:
+            lifetime = 0.0
+    elif 'expires' in headers:
+        expires = _http_date(headers['expires'])
+        lifetime = max(expires - (_http_date(headers.get('date')) or now), 0.0) if expires else 0.0
+    elif 'last-modified' in headers:
+        # Heuristic freshness: 10% of the time since last modification
+        modified = _http_date(headers['last-modified'])
+        date = _http_date(headers.get('date')) or now
+        lifetime = min((date - modified) * 0.1, _MAX_HEURISTIC_TTL) if modified else 0.0
+    else:
+        lifetime = 0.0
+
+    if lifetime <= 0 and not has_validators:
+        return None  # Would never be usable
+    return lifetime
+
+
+@dataclass
+class CacheEntry:
+    """Index record for one cached URL.
+
+    Attributes:
+        digest: SHA-256 of the body (blob file name)
+        status: HTTP status
+        headers: Replayable response headers
+        size: Body size in bytes
+        expires_at: Epoch seconds until which the entry is fresh
+        last_access: Epoch seconds of last use (LRU eviction)
+    """
+    digest: str
+    status: int
+    headers: dict
+    size: int
+    expires_at: float
+    last_access: float
+
+    @property
+    def validators(self) -> dict:
+        """Conditional request headers for revalidation."""
+        validators = {}
+        if 'etag' in self.headers:
+            validators['if-none-match'] = self.headers['etag']
+        if 'last-modified' in self.headers:
+            validators['if-modified-since'] = self.headers['last-modified']
+        return validators
+
+
+class AssetCache:
+    """Persistent content-addressed asset cache with LRU size bound.
+
+    Layout:
+        <dir>/index.json           URL -> CacheEntry
+        <dir>/objects/ab/abcdef... Bodies, named by SHA-256
+
+    Usage:
+        cache = AssetCache('/tmp/assets', max_bytes=256 * 1024 * 1024)
+        entry = cache.lookup(url)
+        if entry and entry.expires_at > time.time():
+            body = await cache.read(entry)
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries: dict[str, CacheEntry] = {}
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._snapshots = 0      # Index snapshots taken
+        self._written = 0        # Newest snapshot on disk
+        self._write_lock = threading.Lock()
+        self._load()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, 'index.json')
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, 'objects', digest[:2], digest)
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                raw = json.load(f)
+            self.entries = {
+                url: CacheEntry(**entry) for url, entry in raw.items()
+                if os.path.exists(self._blob_path(entry['digest']))
+            }
+            logger.info(f"Asset cache loaded: {len(self.entries)} entries from {self.directory}")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable asset cache index {self.index_path}: {e}")
+
+    def flush(self) -> None:
+        """Write the index to disk now if it changed (on close)."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if not self._dirty:
+            return
+        try:
+            self._write_index(*self._snapshot())
+        except OSError as e:
+            self._dirty = True
+            logger.warning(f"Failed to write asset cache index: {e}")
+
+    def _schedule_flush(self) -> None:
+        """Write the index INDEX_FLUSH_DELAY seconds from now, off the event loop."""
+        if self._flush_task is not None:
+            return  # Already pending: this change goes into that write
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop: written by flush() on close
+        self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(INDEX_FLUSH_DELAY)
+        self._flush_task = None  # Changes from here on schedule the next write
+        if not self._dirty:
+            return
+        try:
+            await asyncio.to_thread(self._write_index, *self._snapshot())
+        except OSError as e:
+            self._dirty = True
+            logger.warning(f"Failed to write asset cache index: {e}")
+
+    def _snapshot(self) -> tuple[int, str]:
+        """Serialize the index as it is now (on the loop, so entries don't change meanwhile)."""
+        self._snapshots += 1
+        self._dirty = False
+        return self._snapshots, json.dumps({url: asdict(entry) for url, entry in self.entries.items()})
+
+    def _write_index(self, snapshot: int, data: str) -> None:
+        """Write a serialized index (atomic replace), unless a newer one is on disk."""
+        with self._write_lock:
+            if snapshot <= self._written:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.index_path)
+            self._written = snapshot
+
+    @property
+    def total_bytes(self) -> int:
+        """Size of all distinct stored bodies."""
+        return sum({entry.digest: entry.size for entry in self.entries.values()}.values())
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        return self.entries.get(url)
+
+    def touch(self, url: str, expires_at: Optional[float] = None) -> None:
+        """Mark an entry used (and optionally extend its freshness)."""
+        entry = self.entries.get(url)
+        if entry is None:
+            return
+        entry.last_access = time.time()
+        if expires_at is not None:
+            entry.expires_at = expires_at
+        self._dirty = True
+        self._schedule_flush()
+
+    async def read(self, entry: CacheEntry) -> Optional[bytes]:
+        """Read a cached body (None if the blob disappeared)."""
+        try:
+            return await asyncio.to_thread(_read_file, self._blob_path(entry.digest))
+        except OSError:
+            return None
+
+    async def store(self, url: str, status: int, headers: dict, body: bytes, lifetime: float) -> None:
+        """Store a response body and index it under its URL."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            try:
+                await asyncio.to_thread(_write_file, path, body)
+            except OSError as e:
+                logger.warning(f"Failed to store cached asset {url}: {e}")
+                return
+
+        now = time.time()
+        self.entries[url] = CacheEntry(
+            digest=digest,
+            status=status,
+            headers={k: v for k, v in headers.items() if k not in _UNREPLAYED_HEADERS},
+            size=len(body),
+            expires_at=now + lifetime,
+            last_access=now,
+        )
+        self._dirty = True
+        self._evict()
+        self._schedule_flush()
+
+    def remove(self, url: str) -> None:
+        entry = self.entries.pop(url, None)
+        if entry is not None:
+            self._dirty = True
+            self._delete_unreferenced(entry.digest)
+            self._schedule_flush()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until within max_bytes."""
+        total = self.total_bytes
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(self.entries.items(), key=lambda item: item[1].last_access):
+            if total <= self.max_bytes:
+                break
+            del self.entries[url]
+            if self._delete_unreferenced(entry.digest):
+                total -= entry.size
+        logger.debug(f"Asset cache evicted down to {total} bytes")
+
+    def _delete_unreferenced(self, digest: str) -> bool:
+        """Delete a blob no URL refers to any more. Returns True if deleted."""
+        if any(entry.digest == digest for entry in self.entries.values()):
+            return False
+        try:
+            os.remove(self._blob_path(digest))
+        except OSError:
+            pass
+        return True
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _write_file(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_block_list(path: Optional[str] = None) -> list[str]:
+    """Build host patterns from defaults, BLOCK_LIST and BLOCK_LIST_FILE."""
+    patterns = []
+    if os.getenv('BLOCK_DEFAULTS', 'true').lower() == 'true':
+        patterns.extend(DEFAULT_BLOCKED_HOSTS)
+    patterns.extend(p.strip() for p in os.getenv('BLOCK_LIST', '').split(',') if p.strip())
+
+    path = path or os.getenv('BLOCK_LIST_FILE')
+    if path:
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.split('#', 1)[0].strip()
+                    if line:
+                        patterns.append(line)
+        except OSError as e:
+            logger.warning(f"Ignoring block list file {path}: {e}")
+    return patterns
+
+
+def host_blocked(host: str, patterns: list[str]) -> bool:
+    """Match a host against patterns (glob, or domain suffix for plain names)."""
+    host = host.lower()
+    for pattern in patterns:
+        pattern = pattern.lower()
+        if fnmatch(host, pattern) or host == pattern or host.endswith('.' + pattern):
+            return True
+    return False
+
+
+class RequestInterceptor:
+    """Routes a context's requests through the block list and asset cache.
+
+    One interceptor (and its cache) is shared by all sessions in the process
+    - see get_interceptor().
+
+    Usage:
+        interceptor = RequestInterceptor(block_list, cache)
+        await interceptor.attach(context)
+        ...
+        interceptor.stats()  # {'hits': 42, 'misses': 3, 'hit_rate': 0.93, ...}
+    """
+
+    def __init__(self, block_list: list[str], cache: Optional[AssetCache]):
+        """Initialize interceptor.
+
+        Args:
+            block_list: Host patterns to abort requests to
+            cache: Asset cache (None = block only)
+        """
+        self.block_list = block_list
+        self.cache = cache
+        self.counters = {
+            'blocked': 0,
+            'hits': 0,
+            'revalidated': 0,
+            'misses': 0,
+            'bytes_from_cache': 0,
+            'bytes_from_network': 0,
+        }
+
+    async def attach(self, context: BrowserContext) -> None:
+        """Route all requests of a context through this interceptor."""
+        await context.route('**/*', self._handle)
+
+    def stats(self) -> dict:
+        """Counters plus the cache hit rate and size."""
+        lookups = self.counters['hits'] + self.counters['revalidated'] + self.counters['misses']
+        stats = dict(self.counters)
+        stats['hit_rate'] = round(
+            (self.counters['hits'] + self.counters['revalidated']) / lookups, 3
+        ) if lookups else None
+        if self.cache is not None:
+            stats['cache_entries'] = len(self.cache.entries)
+            stats['cache_bytes'] = self.cache.total_bytes
+        return stats
+
+    async def _handle(self, route: Route) -> None:
+        request = route.request
+        try:
+            if host_blocked(urlparse(request.url).hostname or '', self.block_list):
+                self.counters['blocked'] += 1
+                await route.abort('blockedbyclient')
+                return
+
+            if (
+                self.cache is None
+                or request.method != 'GET'
+                or request.resource_type not in CACHEABLE_RESOURCE_TYPES
+                or 'range' in request.headers
+            ):
+                await route.continue_()
+                return
+
+            await self._handle_cacheable(route)
+        except Exception as e:
+            # Never break page loading because of the cache
+            logger.debug(f"Interception failed for {request.url}: {e}")
+            try:
+                await route.continue_()
+            except Exception:
+                pass
+
+    async def _handle_cacheable(self, route: Route) -> None:
+        url = route.request.url
+        entry = self.cache.lookup(url)
+        now = time.time()
+
+        if entry is not None and entry.expires_at > now:
+            body = await self.cache.read(entry)
+            if body is not None:
+                self.counters['hits'] += 1
+                self.counters['bytes_from_cache'] += len(body)
+                self.cache.touch(url)
+                await route.fulfill(status=entry.status, headers=entry.headers, body=body)
+                return
+            self.cache.remove(url)
+            entry = None
+
+        headers = dict(route.request.headers)
+        if entry is not None:
+            headers.update(entry.validators)
+        response = await route.fetch(headers=headers)
+
+        if response.status == 304 and entry is not None:
+            body = await self.cache.read(entry)
+            if body is not None:
+                lifetime = freshness_lifetime(response.headers, now) or 0.0
+                self.counters['revalidated'] += 1
+                self.counters['bytes_from_cache'] += len(body)
+                self.cache.touch(url, expires_at=now + lifetime)
+                await route.fulfill(status=entry.status, headers=entry.headers, body=body)
+                return
+            response = await route.fetch()  # Blob vanished: refetch unconditionally
+
+        body = await response.body()
+        self.counters['misses'] += 1
+        self.counters['bytes_from_network'] += len(body)
+        replay_headers = {
+            k: v for k, v in response.headers.items() if k not in _UNREPLAYED_HEADERS
+        }
+        if response.status == 200:
+            lifetime = freshness_lifetime(response.headers, now)
+            # headers omits cookies; all_headers() has what was actually sent
+            request_headers = await route.request.all_headers()
+            if lifetime is not None and shareable(request_headers, response.headers):
+                await self.cache.store(url, response.status, response.headers, body, lifetime)
+        await route.fulfill(status=response.status, headers=replay_headers, body=body)
+
+    def flush(self) -> None:
+        """Persist the cache index."""
+        if self.cache is not None:
+            self.cache.flush()
+
+
+_interceptor: Optional[RequestInterceptor] = None
+
+
+def get_interceptor() -> Optional[RequestInterceptor]:
+    """Get the process-wide interceptor built from environment variables.
+
+    Returns:
+        Shared RequestInterceptor, or None if REQUEST_INTERCEPTION is disabled
+    """
+    global _interceptor
+    if os.getenv('REQUEST_INTERCEPTION', 'true').lower() != 'true':
+        return None
+    if _interceptor is None:
+        max_mb = int(os.getenv('ASSET_CACHE_MAX_MB', '256'))
+        cache = AssetCache(
+            os.getenv('ASSET_CACHE_DIR', DEFAULT_CACHE_DIR),
+            max_bytes=max_mb * 1024 * 1024
+        ) if max_mb > 0 else None
+        _interceptor = RequestInterceptor(load_block_list(), cache)
+    return _interceptor
@@ -0,0 +1,118 @@
+"""Chromium launch profiles.
+
+Playwright already launches Chromium without extensions, sync, component
+updates or background networking. For a dashboard wall that still leaves
+crash reporting, notification/speech services, default-size disk caches and
+audio on - and Playwright's defaults also *disable* background throttling,
+so hidden carousel tabs keep rendering at full speed.
+
+Profiles:
+    standard: Playwright defaults plus the flags needed for Xvfb capture
+    kiosk: standard plus everything a capture-only dashboard wall doesn't
+           need turned off, small caches, and Chromium's background
+           throttling restored (default)
+
+Environment variables:
+    BROWSER_LAUNCH_PROFILE: Profile name (default: 'kiosk')
+
+Compare profiles with scripts/bench_launch_profile.py (cold-launch time and
+steady-state RSS).
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+import os
+
+# Flags needed for rendering into an Xvfb display
+CHROMIUM_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',  # Prevent shared memory issues in Docker
+    '--disable-gpu',
+    '--start-fullscreen',  # Fill the Xvfb display
+    # Throttle what isn't captured: hidden tabs and hidden cross-origin iframes.
+    # Replaces Playwright's own --enable-features, so keep its CDPScreenshotNewSurface.
+    '--enable-features=IntensiveWakeUpThrottling,'
+    'ThrottleDisplayNoneAndVisibilityHiddenCrossOriginIframes,CDPScreenshotNewSurface',
+]
+
+# Services and caches a capture-only dashboard wall doesn't need
+KIOSK_ARGS = [
+    '--disable-crash-reporter',
+    '--disable-domain-reliability',
+    '--disable-notifications',
+    '--disable-speech-api',
+    '--disable-print-preview',
+    '--no-pings',
+    '--mute-audio',  # Cast audio is a silent track anyway
+    '--hide-scrollbars',
+    '--noerrdialogs',
+    '--disk-cache-size=33554432',  # 32MB
+    '--media-cache-size=33554432',
+    '--aggressive-cache-discard',
+]
+
+# Playwright defaults that keep hidden pages rendering at full speed
+BACKGROUND_THROTTLING_BLOCKERS = [
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+]
+
+
+@dataclass(frozen=True)
+class LaunchProfile:
+    """Chromium launch flags.
+
+    Attributes:
+        name: Profile name
+        args: Extra Chromium switches
+        ignore_default_args: Playwright default switches to drop
+    """
+    name: str
+    args: tuple[str, ...]
+    ignore_default_args: tuple[str, ...] = field(default=())
+
+    def launch_options(self, window_size: Optional[tuple[int, int]] = None) -> dict:
+        """Keyword arguments for BrowserType.launch().
+
+        Args:
+            window_size: Initial window size in pixels (the Xvfb screen size)
+        """
+        options = {'args': list(self.args)}
+        if window_size:
+            options['args'].append(f'--window-size={window_size[0]},{window_size[1]}')
+        if self.ignore_default_args:
+            options['ignore_default_args'] = list(self.ignore_default_args)
+        return options
+
+
+LAUNCH_PROFILES: dict[str, LaunchProfile] = {
+    'standard': LaunchProfile('standard', tuple(CHROMIUM_ARGS)),
+    'kiosk': LaunchProfile(
+        'kiosk',
+        tuple(CHROMIUM_ARGS + KIOSK_ARGS),
+        ignore_default_args=tuple(BACKGROUND_THROTTLING_BLOCKERS),
+    ),
+}
+
+
+def get_launch_profile(name: Optional[str] = None) -> LaunchProfile:
+    """Get a launch profile by name.
+
+    Args:
+        name: Profile name (default: BROWSER_LAUNCH_PROFILE env var or 'kiosk')
+
+    Returns:
+        LaunchProfile for the requested name
+
+    Raises:
+        ValueError: If the profile name is not recognized
+    """
+    name = name or os.getenv('BROWSER_LAUNCH_PROFILE', 'kiosk')
+    if name not in LAUNCH_PROFILES:
+        available = ', '.join(LAUNCH_PROFILES.keys())
+        raise ValueError(
+            f"Unknown browser launch profile: {name}. "
+            f"Available profiles: {available}"
+        )
+    return LAUNCH_PROFILES[name]
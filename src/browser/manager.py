@@ -5,11 +5,18 @@ instances, and ensuring proper resource cleanup to prevent memory leaks.
 """
 
 from typing import Optional, Dict, Any
+import asyncio
+import os
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 import logging
 
-logger = logging.getLogger(__name__)
+from .intercept import get_interceptor
+from .launch import get_launch_profile
+from .readiness import ReadinessStrategy, resolve_readiness, wait_for_ready
+from .render import RenderProfile
+from .storage import get_storage_store
 
+logger = logging.getLogger(__name__)
 
 class BrowserManager:
     """Manages browser lifecycle with automatic cleanup.
@@ -21,59 +28,116 @@ class BrowserManager:
         # Browser automatically cleaned up on exit
     """
 
-    def __init__(self):
-        """Initialize browser manager."""
+    def __init__(
+        self,
+        display: Optional[str] = None,
+        close_timeout: float = 3.0,
+        render_profile: Optional[RenderProfile] = None,
+        launch_profile: Optional[str] = None,
+        storage_urls: Optional[list[str]] = None,
+        viewport: tuple[int, int] = (1920, 1080),
+        device_scale_factor: float = 1.0
+    ):
+        """Initialize browser manager.
+
+        Args:
+            display: X display to render into (default: DISPLAY env var).
+                Passed explicitly so concurrent pipelines on different Xvfb
+                displays don't depend on the process-wide DISPLAY.
+            close_timeout: Seconds allowed for each cleanup step (context,
+                browser, driver) before giving up on it
+            render_profile: Render budget for the context (None = render
+                at Chromium's native rate without motion preferences)
+            launch_profile: Chromium launch profile name (default:
+                BROWSER_LAUNCH_PROFILE env var, see launch.py)
+            storage_urls: URLs the session will show; their origins' saved
+                storage state (see storage.py) is restored into the context
+            viewport: CSS viewport (width, height)
+            device_scale_factor: Device pixels per CSS pixel; the window is
+                sized to viewport * device_scale_factor, which should match
+                the display's resolution
+
+        Raises:
+            ValueError: If launch_profile is not recognized
+        """
+        self.display = display
+        self.close_timeout = close_timeout
+        self.render_profile = render_profile
+        self.launch_profile = get_launch_profile(launch_profile)
+        self.interceptor = get_interceptor()  # Shared block list + asset cache
+        self.storage_urls = storage_urls
+        self.viewport = viewport
+        self.device_scale_factor = device_scale_factor
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
 
     async def __aenter__(self):
         """Enter context manager - launch browser."""
-        logger.info("Launching browser...")
+        logger.info(f"Launching browser (profile={self.launch_profile.name})...")
         self.playwright = await async_playwright().start()
 
         # Launch Chrome to render on Xvfb display (NOT headless - need X11 for FFmpeg capture)
-        # DISPLAY env var must be set to Xvfb display before calling this
+        # Uses the explicit display if given, else DISPLAY env var must be set to the Xvfb display
+        env = {**os.environ, 'DISPLAY': self.display} if self.display else None
         self.browser = await self.playwright.chromium.launch(
             headless=False,  # Must be False for x11grab capture to work
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',  # Prevent shared memory issues in Docker
-                '--disable-gpu',
-                '--start-fullscreen',  # Fill the Xvfb display
-            ]
+            env=env,
+            **self.launch_profile.launch_options(window_size=(
+                round(self.viewport[0] * self.device_scale_factor),
+                round(self.viewport[1] * self.device_scale_factor),
+            ))
         )
 
-        # Create browser context with viewport
-        self.context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            ignore_https_errors=False,  # Enforce HTTPS security
-        )
+        self.context = await self._new_context(self.browser)
 
         logger.info("Browser launched successfully")
         return self
 
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        """Create a browser context with viewport, scale and render profile."""
+        options = self.render_profile.context_options() if self.render_profile else {}
+        store = get_storage_store() if self.storage_urls else None
+        if store:
+            state = store.load(self.storage_urls)
+            if state:
+                options['storage_state'] = state
+        context = await browser.new_context(
+            viewport={'width': self.viewport[0], 'height': self.viewport[1]},
+            device_scale_factor=self.device_scale_factor,
+            ignore_https_errors=False,  # Enforce HTTPS security
+            **options
+        )
+        if self.render_profile:
+            await self.render_profile.apply(context)
+        if self.interceptor:
+            await self.interceptor.attach(context)
+        return context
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Exit context manager - clean up resources."""
         logger.info("Cleaning up browser resources...")
 
         try:
             if self.context:
-                await self.context.close()
+                await asyncio.wait_for(self.context.close(), timeout=self.close_timeout)
                 logger.debug("Browser context closed")
         except Exception as e:
             logger.warning(f"Error closing context: {e}")
 
+        if self.interceptor:
+            self.interceptor.flush()
+
         try:
             if self.browser:
-                await self.browser.close()
+                await asyncio.wait_for(self.browser.close(), timeout=self.close_timeout)
                 logger.debug("Browser closed")
         except Exception as e:
             logger.warning(f"Error closing browser: {e}")
 
         try:
             if self.playwright:
-                await self.playwright.stop()
+                await asyncio.wait_for(self.playwright.stop(), timeout=self.close_timeout)
                 logger.debug("Playwright stopped")
         except Exception as e:
             logger.warning(f"Error stopping playwright: {e}")
@@ -82,22 +146,25 @@ class BrowserManager:
         # Don't suppress exceptions
         return False
 
-    async def get_page(
+    async def open_page(
         self,
         url: str,
-        auth: Optional[Dict[str, Any]] = None
+        auth: Optional[Dict[str, Any]] = None,
+        behind: Optional[Page] = None
     ) -> Page:
-        """Navigate to URL with optional authentication.
+        """Create a page and navigate to URL without waiting for readiness.
+
+        Navigation returns at DOMContentLoaded; use wait_for_ready() (or
+        get_page()) to wait until the dashboard has actually painted.
 
         Args:
             url: Target URL to load
-            auth: Optional authentication dict with:
-                - cookies: Dict of cookie name->value pairs
-                - localStorage: Dict of localStorage key->value pairs
-                - domain: Domain for cookies (extracted from URL if not provided)
+            auth: Optional authentication dict (see get_page)
+            behind: Page to keep on screen; new tabs open in the foreground,
+                so it is brought back in front before the new page loads
 
         Returns:
-            Page object ready for interaction
+            Page object with navigation committed
 
         Raises:
             ValueError: If browser not initialized
@@ -107,6 +174,11 @@ class BrowserManager:
 
         logger.info(f"Creating new page for {url}")
         page = await self.context.new_page()
+        if behind is not None:
+            try:
+                await behind.bring_to_front()
+            except Exception as e:
+                logger.debug(f"Could not bring page back to front: {e}")
 
         # Inject authentication if provided
         if auth:
@@ -115,6 +187,33 @@ class BrowserManager:
 
         # Navigate to URL
         logger.info(f"Navigating to {url}")
-        await page.goto(url, wait_until='networkidle', timeout=30000)
+        await page.goto(url, wait_until='domcontentloaded', timeout=30000)
 
         return page
+
+    async def get_page(
+        self,
+        url: str,
+        auth: Optional[Dict[str, Any]] = None,
+        readiness: Optional[ReadinessStrategy] = None
+    ) -> Page:
+        """Navigate to URL with optional authentication and wait until ready.
+
+        Args:
+            url: Target URL to load
+            auth: Optional authentication dict with:
+                - cookies: Dict of cookie name->value pairs
+                - localStorage: Dict of localStorage key->value pairs
+                - domain: Domain for cookies (extracted from URL if not provided)
+            readiness: Readiness strategy (default: per-URL rule or
+                PAGE_READINESS environment default)
+
+        Returns:
+            Page object ready for interaction
+
+        Raises:
+            ValueError: If browser not initialized
+        """
+        page = await self.open_page(url, auth)
+        await wait_for_ready(page, resolve_readiness(url, readiness))
+        return page
@@ -0,0 +1,76 @@
+"""Linux /proc helpers for measuring Chromium (and encoder) resource use.
+
+Chromium processes belonging to one pipeline are identified by their command
+line and the DISPLAY in their environment, so browsers rendering into
+different Xvfb displays are told apart.
+"""
+
+import os
+from typing import Iterable, Optional
+
+# Clock ticks per second for /proc/<pid>/stat CPU times
+_CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def chromium_pids(display: str, process_type: Optional[str] = None) -> Optional[list[int]]:
+    """Find Chromium processes rendering into an X display.
+
+    Args:
+        display: X display (e.g., ':99')
+        process_type: Only processes of this Chromium type (e.g.,
+            'renderer', 'gpu-process'; None = all, including the browser)
+
+    Returns:
+        List of PIDs, or None if /proc is unavailable (non-Linux)
+    """
+    if not os.path.isdir('/proc'):
+        return None
+
+    needle = f'DISPLAY={display}'.encode()
+    type_switch = f'--type={process_type}'.encode() if process_type else None
+    pids = []
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                argv = f.read().split(b'\0')
+            if b'chrom' not in os.path.basename(argv[0]).lower():
+                continue
+            if type_switch and type_switch not in argv:
+                continue
+            with open(f'/proc/{pid}/environ', 'rb') as f:
+                if needle in f.read().split(b'\0'):
+                    pids.append(int(pid))
+        except OSError:
+            continue  # Process exited or is not ours
+    return pids
+
+
+def rss_bytes(pids: Iterable[int]) -> int:
+    """Sum resident memory of processes (exited processes count as 0)."""
+    total = 0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+def cpu_seconds(pids: Iterable[int]) -> float:
+    """Sum user + system CPU time of processes (exited processes count as 0)."""
+    total = 0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                # Fields after the parenthesised command name; utime/stime are 14/15
+                fields = f.read().rsplit(')', 1)[1].split()
+            total += int(fields[11]) + int(fields[12])
+        except (OSError, ValueError, IndexError):
+            continue
+    return total / _CLK_TCK
@@ -0,0 +1,175 @@
+"""Page readiness strategies for deciding when a dashboard is ready to capture.
+
+Waiting for 'networkidle' never succeeds on dashboards that hold websockets
+open or long-poll, so every cast paid the full timeout. Readiness is instead
+decided by a configurable strategy:
+
+- fcp: First contentful paint has happened (default)
+- selector: A DOM selector is visible
+- js: A JavaScript predicate returns truthy
+- settle: Fixed short settle time after DOMContentLoaded
+- networkidle: Legacy behaviour - no network activity for 500ms
+
+Strategies can be given per request, or matched per URL from a JSON rules file.
+
+Environment variables:
+    PAGE_READINESS: Default strategy name (default: 'fcp')
+    PAGE_READINESS_TIMEOUT_MS: Default readiness timeout (default: 10000)
+    READINESS_RULES_FILE: JSON file with per-URL rules, e.g.
+        [{"match": "https://grafana.local/*", "strategy": "selector",
+          "selector": ".react-grid-layout"}]
+"""
+
+from dataclasses import dataclass, asdict
+from fnmatch import fnmatch
+from typing import Literal, Optional, get_args
+import asyncio
+import json
+import logging
+import os
+
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+logger = logging.getLogger(__name__)
+
+ReadinessKind = Literal['fcp', 'selector', 'js', 'settle', 'networkidle']
+
+# Resolves once the browser has recorded a first-contentful-paint entry
+FCP_PREDICATE = (
+    "() => performance.getEntriesByType('paint')"
+    ".some(e => e.name === 'first-contentful-paint')"
+)
+
+
+@dataclass
+class ReadinessStrategy:
+    """How to decide that a page has painted and is ready to capture.
+
+    Attributes:
+        strategy: Readiness check to run after DOMContentLoaded
+        selector: CSS selector that must be visible ('selector' strategy)
+        expression: JS predicate that must return truthy ('js' strategy)
+        settle_ms: Extra settle time after the check passes (the full wait
+            for the 'settle' strategy)
+        timeout_ms: Maximum time to wait for the check before giving up
+    """
+    strategy: ReadinessKind = 'fcp'
+    selector: Optional[str] = None
+    expression: Optional[str] = None
+    settle_ms: int = 0
+    timeout_ms: int = 10000
+
+    def __post_init__(self):
+        if self.strategy not in get_args(ReadinessKind):
+            raise ValueError(
+                f"Unknown readiness strategy: {self.strategy}. "
+                f"Available strategies: {', '.join(get_args(ReadinessKind))}"
+            )
+        if self.strategy == 'selector' and not self.selector:
+            raise ValueError("Readiness strategy 'selector' requires a selector")
+        if self.strategy == 'js' and not self.expression:
+            raise ValueError("Readiness strategy 'js' requires an expression")
+        if self.strategy == 'settle' and not self.settle_ms:
+            self.settle_ms = 1000
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def default_readiness() -> ReadinessStrategy:
+    """Build the default strategy from PAGE_READINESS* environment variables."""
+    return ReadinessStrategy(
+        strategy=os.getenv('PAGE_READINESS', 'fcp'),
+        timeout_ms=int(os.getenv('PAGE_READINESS_TIMEOUT_MS', '10000')),
+    )
+
+
+def load_readiness_rules(path: Optional[str] = None) -> list[tuple[str, ReadinessStrategy]]:
+    """Load per-URL readiness rules from a JSON file.
+
+    Args:
+        path: Rules file (default: READINESS_RULES_FILE env var)
+
+    Returns:
+        List of (glob pattern, strategy) in file order. Empty if no file is
+        configured or it can't be parsed.
+    """
+    path = path or os.getenv('READINESS_RULES_FILE')
+    if not path:
+        return []
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+        rules = []
+        for entry in entries:
+            entry = dict(entry)
+            pattern = entry.pop('match')
+            rules.append((pattern, ReadinessStrategy(**entry)))
+        return rules
+    except (OSError, ValueError, TypeError, KeyError) as e:
+        logger.warning(f"Ignoring readiness rules file {path}: {e}")
+        return []
+
+
+def resolve_readiness(
+    url: str,
+    override: Optional[ReadinessStrategy] = None,
+    rules: Optional[list[tuple[str, ReadinessStrategy]]] = None
+) -> ReadinessStrategy:
+    """Pick the readiness strategy for a URL.
+
+    Precedence: explicit per-request override, first matching per-URL rule
+    (glob match, or prefix match for patterns without wildcards), then the
+    environment default.
+    """
+    if override is not None:
+        return override
+
+    for pattern, strategy in (rules if rules is not None else load_readiness_rules()):
+        if fnmatch(url, pattern) or url.startswith(pattern):
+            logger.debug(f"Readiness rule '{pattern}' matched {url}")
+            return strategy
+
+    return default_readiness()
+
+
+async def wait_for_ready(page: Page, readiness: ReadinessStrategy) -> bool:
+    """Wait until the page satisfies the readiness strategy.
+
+    A page that never satisfies its predicate is still shown - the timeout
+    is logged rather than raised so the cast goes ahead with whatever has
+    rendered.
+
+    Args:
+        page: Page that has been navigated (at least DOMContentLoaded)
+        readiness: Strategy to apply
+
+    Returns:
+        True if the check passed, False if it timed out
+    """
+    logger.info(f"Waiting for page readiness: {readiness.strategy}")
+    timeout = readiness.timeout_ms
+    ready = True
+
+    try:
+        if readiness.strategy == 'fcp':
+            await page.wait_for_function(FCP_PREDICATE, timeout=timeout)
+        elif readiness.strategy == 'selector':
+            await page.wait_for_selector(readiness.selector, state='visible', timeout=timeout)
+        elif readiness.strategy == 'js':
+            await page.wait_for_function(readiness.expression, timeout=timeout)
+        elif readiness.strategy == 'networkidle':
+            await page.wait_for_load_state('networkidle', timeout=timeout)
+        # 'settle' has no predicate - settle_ms below is the whole wait
+    except PlaywrightTimeoutError:
+        logger.warning(
+            f"Page readiness '{readiness.strategy}' not reached within {timeout}ms, "
+            f"continuing with current render"
+        )
+        ready = False
+
+    if readiness.settle_ms:
+        await asyncio.sleep(readiness.settle_ms / 1000)
+
+    return ready
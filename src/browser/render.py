@@ -0,0 +1,126 @@
+"""Render budget for Chromium pages captured from Xvfb.
+
+Chromium renders at its own frame rate while FFmpeg samples the display at
+QualityConfig.framerate, so animated dashboards burn CPU on frames that are
+never captured. A RenderProfile trims that work per browser context:
+
+- requestAnimationFrame callbacks are batched down to the capture frame rate
+  (JS-driven charts, canvases and tickers)
+- prefers-reduced-motion is emulated, so dashboards that honour it drop
+  decorative animation
+- CSS animations and transitions can optionally be paused entirely
+
+Hidden pages (carousel tabs off screen) and display:none / hidden
+cross-origin iframes are throttled by Chromium itself via the background
+throttling features enabled in the launch profile (see launch.py).
+
+Environment variables:
+    RENDER_REDUCED_MOTION: Emulate prefers-reduced-motion (default: true)
+    RENDER_PAUSE_ANIMATIONS: Pause CSS animations/transitions (default: false)
+    RENDER_CAP_FPS: Cap requestAnimationFrame to the capture rate (default: true)
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Chromium's own frame rate under Xvfb; caps at or above this are no-ops
+NATIVE_FPS = 60
+
+# Batches requestAnimationFrame callbacks so they run at most %(fps)s times a second
+RAF_THROTTLE_SCRIPT = """
+(() => {
+  const interval = 1000 / %(fps)s;
+  const nativeRaf = window.requestAnimationFrame.bind(window);
+  let queue = new Map();
+  let nextId = 1;
+  let handle = 0;
+  let last = 0;
+  const tick = (ts) => {
+    if (ts - last < interval - 1) {
+      handle = nativeRaf(tick);
+      return;
+    }
+    last = ts;
+    handle = 0;
+    const callbacks = queue;
+    queue = new Map();
+    callbacks.forEach((cb) => {
+      try { cb(ts); } catch (e) { setTimeout(() => { throw e; }); }
+    });
+  };
+  window.requestAnimationFrame = (cb) => {
+    const id = nextId++;
+    queue.set(id, cb);
+    if (!handle) handle = nativeRaf(tick);
+    return id;
+  };
+  window.cancelAnimationFrame = (id) => { queue.delete(id); };
+})();
+"""
+
+# Freezes CSS animations and transitions once the DOM exists
+PAUSE_ANIMATIONS_SCRIPT = """
+document.addEventListener('DOMContentLoaded', () => {
+  const style = document.createElement('style');
+  style.textContent = '*, *::before, *::after { animation-play-state: paused !important; ' +
+    'transition: none !important; }';
+  document.head.appendChild(style);
+});
+"""
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() == 'true'
+
+
+@dataclass
+class RenderProfile:
+    """Per-context render budget.
+
+    Attributes:
+        max_fps: requestAnimationFrame cap (None or >= 60 = uncapped)
+        reduced_motion: Emulate prefers-reduced-motion: reduce
+        pause_animations: Pause CSS animations and transitions
+    """
+    max_fps: Optional[int] = None
+    reduced_motion: bool = True
+    pause_animations: bool = False
+
+    @classmethod
+    def for_framerate(cls, framerate: int) -> "RenderProfile":
+        """Build the profile for a capture frame rate from RENDER_* env vars."""
+        return cls(
+            max_fps=framerate if _env_flag('RENDER_CAP_FPS', True) else None,
+            reduced_motion=_env_flag('RENDER_REDUCED_MOTION', True),
+            pause_animations=_env_flag('RENDER_PAUSE_ANIMATIONS', False),
+        )
+
+    def context_options(self) -> dict:
+        """Extra keyword arguments for Browser.new_context()."""
+        return {'reduced_motion': 'reduce' if self.reduced_motion else 'no-preference'}
+
+    def init_scripts(self) -> list[str]:
+        """Scripts to add to every page of the context, in order."""
+        scripts = []
+        if self.max_fps and self.max_fps < NATIVE_FPS:
+            scripts.append(RAF_THROTTLE_SCRIPT % {'fps': self.max_fps})
+        if self.pause_animations:
+            scripts.append(PAUSE_ANIMATIONS_SCRIPT)
+        return scripts
+
+    async def apply(self, context) -> None:
+        """Install the profile's init scripts on a new context.
+
+        Args:
+            context: BrowserContext created with context_options()
+        """
+        for script in self.init_scripts():
+            await context.add_init_script(script)
+        logger.debug(
+            f"Render profile applied: max_fps={self.max_fps}, "
+            f"reduced_motion={self.reduced_motion}, pause_animations={self.pause_animations}"
+        )
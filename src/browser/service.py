@@ -0,0 +1,421 @@
+"""Long-lived Chromium service with per-session browser contexts.
+
+BrowserManager starts a Playwright driver, Xvfb and a Chromium process for
+every stream, and cold Chromium startup dominates time-to-picture. The
+BrowserService keeps "hosts" (an Xvfb display plus the Chromium process
+rendering into it) alive across sessions and hands each session a fresh
+BrowserContext on an idle host. Contexts are cheap to create and keep
+cookies/storage isolated between sessions; the process is what is reused.
+
+Hosts are relaunched when Chromium crashes and recycled after a configured
+number of sessions or when their resident memory grows too large. Beyond
+BROWSER_MAX_IDLE_HOSTS idle hosts, the least recently used ones are closed,
+so the resolutions cast most recently stay warm.
+
+Environment variables:
+    BROWSER_RECYCLE_SESSIONS: Sessions a host serves before being
+                              relaunched (default: 50, 0 = never)
+    BROWSER_RECYCLE_RSS_MB: Chromium resident memory (all processes of the
+                            host) above which it is relaunched after the
+                            current session (default: 1500, 0 = never)
+    BROWSER_MAX_IDLE_HOSTS: Idle hosts kept warm (default: 1)
+"""
+
+from typing import Callable, Optional
+import asyncio
+import logging
+import os
+import time
+
+from playwright.async_api import async_playwright, Browser
+
+from .launch import LaunchProfile, get_launch_profile
+from .manager import BrowserManager
+from .procstat import chromium_pids, rss_bytes
+from .render import RenderProfile
+from ..video.capture import XvfbManager, find_free_display
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserHost:
+    """One Xvfb display and the Chromium process rendering into it.
+
+    Attributes:
+        resolution: Display resolution (width, height)
+        display: X display (e.g., ':99'), set by launch()
+        browser: Chromium instance, set by launch()
+        sessions_served: Sessions handed out since launch
+        crashed: Set when Chromium disconnects unexpectedly
+        in_use: Whether a session currently holds this host
+        last_used: time.monotonic() of the last release (or of the launch)
+    """
+
+    def __init__(
+        self,
+        resolution: tuple[int, int],
+        launch_profile: LaunchProfile,
+        close_timeout: float = 3.0,
+        on_crash: Optional[Callable[["BrowserHost"], None]] = None
+    ):
+        self.resolution = resolution
+        self.launch_profile = launch_profile
+        self.close_timeout = close_timeout
+        self.on_crash = on_crash
+        self.display: Optional[str] = None
+        self.browser: Optional[Browser] = None
+        self.sessions_served = 0
+        self.crashed = False
+        self.in_use = False
+        self.last_used = time.monotonic()
+        self._xvfb: Optional[XvfbManager] = None
+        self._closing = False
+
+    @property
+    def alive(self) -> bool:
+        return self.browser is not None and not self.crashed and self.browser.is_connected()
+
+    async def launch(self, playwright) -> None:
+        """Start Xvfb and Chromium.
+
+        Raises:
+            RuntimeError: If Xvfb fails to start
+        """
+        started = time.monotonic()
+        self._xvfb = XvfbManager(display=find_free_display(), resolution=self.resolution)
+        self.display = await self._xvfb.__aenter__()
+        try:
+            self.browser = await playwright.chromium.launch(
+                headless=False,  # Must be False for x11grab capture to work
+                env={**os.environ, 'DISPLAY': self.display},
+                **self.launch_profile.launch_options(window_size=self.resolution)
+            )
+        except BaseException:
+            await self._xvfb.__aexit__(None, None, None)
+            raise
+        self.browser.on('disconnected', self._on_disconnected)
+        logger.info(
+            f"Browser host launched on {self.display} "
+            f"({self.resolution[0]}x{self.resolution[1]}) in "
+            f"{(time.monotonic() - started) * 1000:.0f}ms"
+        )
+
+    def _on_disconnected(self, _browser) -> None:
+        if not self._closing:
+            logger.warning(f"Chromium on {self.display} disconnected unexpectedly (crash?)")
+            self.crashed = True
+            if self.on_crash:
+                self.on_crash(self)
+
+    def rss_bytes(self) -> Optional[int]:
+        """Current Chromium resident memory for this host (None if unknown)."""
+        pids = chromium_pids(self.display) if self.display else None
+        return rss_bytes(pids) if pids is not None else None
+
+    async def close(self) -> None:
+        """Close Chromium and Xvfb, logging (not raising) errors."""
+        self._closing = True
+        try:
+            if self.browser and self.browser.is_connected():
+                await asyncio.wait_for(self.browser.close(), timeout=self.close_timeout)
+        except Exception as e:
+            logger.warning(f"Error closing browser on {self.display}: {e}")
+        if self._xvfb:
+            await self._xvfb.__aexit__(None, None, None)
+        logger.info(f"Browser host on {self.display} closed after {self.sessions_served} session(s)")
+
+
+class BrowserSession(BrowserManager):
+    """BrowserManager backed by a BrowserService host instead of its own Chromium.
+
+    Entering leases an idle host (launching one if needed) and creates a
+    fresh context on it; exiting closes only the context and returns the
+    host to the service. open_page()/get_page() work as for BrowserManager.
+
+    Attributes:
+        display: X display of the leased host (valid once entered)
+    """
+
+    def __init__(
+        self,
+        service: "BrowserService",
+        resolution: tuple[int, int],
+        render_profile: Optional[RenderProfile] = None,
+        storage_urls: Optional[list[str]] = None,
+        viewport: Optional[tuple[int, int]] = None,
+        device_scale_factor: float = 1.0
+    ):
+        super().__init__(
+            close_timeout=service.close_timeout,
+            render_profile=render_profile,
+            storage_urls=storage_urls,
+            viewport=viewport or resolution,
+            device_scale_factor=device_scale_factor
+        )
+        self.service = service
+        self.resolution = resolution
+        self.host: Optional[BrowserHost] = None
+
+    async def __aenter__(self):
+        """Lease a host and create this session's context."""
+        self.host = await self.service.acquire(self.resolution)
+        try:
+            self.browser = self.host.browser
+            self.display = self.host.display
+            self.context = await self._new_context(self.browser)
+        except BaseException:
+            await self.service.release(self.host)
+            self.host = None
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close this session's context and return the host."""
+        try:
+            if self.context:
+                await asyncio.wait_for(self.context.close(), timeout=self.close_timeout)
+        except Exception as e:
+            logger.warning(f"Error closing session context: {e}")
+        self.context = None
+        if self.interceptor:
+            self.interceptor.flush()
+        self.browser = None
+
+        if self.host:
+            await self.service.release(self.host)
+            self.host = None
+
+        # Don't suppress exceptions
+        return False
+
+
+class BrowserService:
+    """Pool of long-lived browser hosts handing out per-session contexts.
+
+    Usage:
+        service = BrowserService()
+        await service.start()
+        async with service.session((1920, 1080)) as browser:
+            page = await browser.get_page("https://example.com")
+        ...
+        await service.stop()
+    """
+
+    def __init__(
+        self,
+        recycle_sessions: Optional[int] = None,
+        recycle_rss_mb: Optional[int] = None,
+        max_idle_hosts: Optional[int] = None,
+        close_timeout: float = 3.0,
+        launch_profile: Optional[str] = None
+    ):
+        """Initialize browser service.
+
+        Args:
+            recycle_sessions: Sessions per host before relaunch
+                (default: BROWSER_RECYCLE_SESSIONS env var, 0 = never)
+            recycle_rss_mb: RSS threshold in MB for relaunch
+                (default: BROWSER_RECYCLE_RSS_MB env var, 0 = never)
+            max_idle_hosts: Idle hosts kept warm
+                (default: BROWSER_MAX_IDLE_HOSTS env var)
+            close_timeout: Seconds allowed for each close step
+            launch_profile: Chromium launch profile name
+                (default: BROWSER_LAUNCH_PROFILE env var)
+
+        Raises:
+            ValueError: If launch_profile is not recognized
+        """
+        self.recycle_sessions = recycle_sessions if recycle_sessions is not None else int(
+            os.getenv('BROWSER_RECYCLE_SESSIONS', '50')
+        )
+        self.recycle_rss_mb = recycle_rss_mb if recycle_rss_mb is not None else int(
+            os.getenv('BROWSER_RECYCLE_RSS_MB', '1500')
+        )
+        self.max_idle_hosts = max_idle_hosts if max_idle_hosts is not None else int(
+            os.getenv('BROWSER_MAX_IDLE_HOSTS', '1')
+        )
+        self.close_timeout = close_timeout
+        self.launch_profile = get_launch_profile(launch_profile)
+        self.hosts: list[BrowserHost] = []
+        self._playwright = None
+        self._lock = asyncio.Lock()
+        self._background: set[asyncio.Task] = set()
+
+    async def start(self, prelaunch: Optional[tuple[int, int]] = None) -> None:
+        """Start the Playwright driver, optionally launching a first host.
+
+        Args:
+            prelaunch: Resolution of a host to launch in the background so
+                the first session is already warm (None = launch lazily)
+        """
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+            logger.info("Browser service started")
+        if prelaunch:
+            self._spawn(self._launch_idle(prelaunch))
+
+    async def stop(self) -> None:
+        """Close all hosts and stop the Playwright driver."""
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+
+        hosts, self.hosts = self.hosts, []
+        await asyncio.gather(*(host.close() for host in hosts))
+
+        if self._playwright:
+            try:
+                await asyncio.wait_for(self._playwright.stop(), timeout=self.close_timeout)
+            except Exception as e:
+                logger.warning(f"Error stopping playwright: {e}")
+            self._playwright = None
+        logger.info("Browser service stopped")
+
+    async def __aenter__(self) -> "BrowserService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+        return False
+
+    def session(
+        self,
+        resolution: tuple[int, int] = (1920, 1080),
+        render_profile: Optional[RenderProfile] = None,
+        storage_urls: Optional[list[str]] = None,
+        viewport: Optional[tuple[int, int]] = None,
+        device_scale_factor: float = 1.0
+    ) -> BrowserSession:
+        """Create a session context manager leasing a host at a resolution.
+
+        The context's viewport defaults to the display resolution at a
+        device scale factor of 1.
+        """
+        return BrowserSession(
+            self, resolution, render_profile, storage_urls, viewport, device_scale_factor
+        )
+
+    async def acquire(self, resolution: tuple[int, int]) -> BrowserHost:
+        """Lease an idle host at the resolution, launching one if needed."""
+        if self._playwright is None:
+            await self.start()
+
+        async with self._lock:
+            dead = [host for host in self.hosts if not host.in_use and not host.alive]
+            for host in dead:
+                self.hosts.remove(host)
+            host = next(
+                (h for h in self.hosts if not h.in_use and h.resolution == resolution),
+                None
+            )
+            if host is not None:
+                host.in_use = True
+
+        for stale in dead:
+            self._spawn(stale.close())
+
+        if host is None:
+            host = self._new_host(resolution)
+            host.in_use = True
+            await host.launch(self._playwright)
+            self.hosts.append(host)
+        else:
+            logger.info(f"Reusing warm browser host on {host.display}")
+
+        host.sessions_served += 1
+        return host
+
+    async def release(self, host: BrowserHost) -> None:
+        """Return a leased host, recycling it if crashed, old or too large.
+
+        Beyond max_idle_hosts, the least recently used idle hosts are closed
+        (not necessarily this one).
+        """
+        host.in_use = False
+        host.last_used = time.monotonic()
+        if host not in self.hosts:
+            # Crashed during the session and already replaced
+            await host.close()
+            return
+
+        reason = self._recycle_reason(host)
+        if reason is not None:
+            logger.info(f"Recycling browser host on {host.display}: {reason}")
+            self.hosts.remove(host)
+            await host.close()
+            if self.max_idle_hosts > 0:
+                # Relaunch in the background so the next session is warm
+                self._spawn(self._launch_idle(host.resolution))
+        await self._close_surplus_idle()
+
+    async def _close_surplus_idle(self) -> None:
+        """Close the least recently used idle hosts beyond max_idle_hosts."""
+        idle = sorted((h for h in self.hosts if not h.in_use), key=lambda h: h.last_used)
+        surplus = idle[:max(len(idle) - self.max_idle_hosts, 0)]
+        for host in surplus:
+            logger.info(
+                f"Closing least recently used idle browser host on {host.display} "
+                f"({host.resolution[0]}x{host.resolution[1]})"
+            )
+            self.hosts.remove(host)
+        await asyncio.gather(*(host.close() for host in surplus))
+
+    def _recycle_reason(self, host: BrowserHost) -> Optional[str]:
+        if not host.alive:
+            return "browser crashed"
+        if self.recycle_sessions and host.sessions_served >= self.recycle_sessions:
+            return f"served {host.sessions_served} sessions"
+        if self.recycle_rss_mb:
+            rss = host.rss_bytes()
+            if rss is not None and rss > self.recycle_rss_mb * 1024 * 1024:
+                return f"RSS {rss / (1024 * 1024):.0f}MB over {self.recycle_rss_mb}MB"
+        return None
+
+    def _new_host(self, resolution: tuple[int, int]) -> BrowserHost:
+        return BrowserHost(
+            resolution,
+            self.launch_profile,
+            close_timeout=self.close_timeout,
+            on_crash=self._on_host_crash
+        )
+
+    def _on_host_crash(self, host: BrowserHost) -> None:
+        """Replace a host whose Chromium crashed.
+
+        A leased host is closed when its session releases it; the
+        replacement is launched right away so the next session is warm.
+        """
+        if host not in self.hosts:
+            return
+        self.hosts.remove(host)
+        if host.in_use:
+            logger.warning(
+                f"Browser host on {host.display} crashed during a session, launching a replacement"
+            )
+        else:
+            self._spawn(host.close())
+        if self.max_idle_hosts > 0:
+            self._spawn(self._launch_idle(host.resolution))
+
+    async def _launch_idle(self, resolution: tuple[int, int]) -> None:
+        """Launch a host that waits idle for the next session."""
+        host = self._new_host(resolution)
+        host.in_use = True  # Not leasable until launched
+        try:
+            await host.launch(self._playwright)
+        except asyncio.CancelledError:
+            await host.close()
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to launch idle browser host: {e}")
+            await host.close()
+            return
+        host.in_use = False
+        self.hosts.append(host)
+        await self._close_surplus_idle()
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
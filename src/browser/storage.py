@@ -0,0 +1,333 @@
+"""Encrypted per-origin browser storage state.
+
+inject_auth re-injects static cookies/localStorage on every cast, and
+dashboards behind interactive or SSO logins can't be automated that way.
+Instead the full Playwright storage state of a session (cookies including
+the identity provider's, localStorage and IndexedDB) is saved per target
+origin once the dashboard has loaded, and restored into the next session's
+context before navigation, so an authenticated dashboard loads in one
+navigation instead of a login redirect chain.
+
+States are encrypted at rest with Fernet (AES-128-CBC + HMAC-SHA256). A
+state's expiry is that of its session/auth cookies (STORAGE_STATE_AUTH_COOKIES),
+not of any cookie on the host: a short-lived tracking cookie neither discards
+the login nor drives refreshes. Expired cookies are dropped on restore. While a
+session runs, the dashboard is loaded again in a background tab shortly
+before the auth cookies expire, so sliding sessions renew without touching
+the page on screen, and the renewed state is saved.
+
+To seed a login once, cast the dashboard after logging in through any
+mechanism that sets cookies in the session (e.g. inject_auth), or log in
+interactively on the Xvfb display; the state is captured from then on.
+
+Environment variables:
+    STORAGE_STATE: Enable persisted storage state (default: true)
+    STORAGE_STATE_DIR: Directory for encrypted states
+                       (default: /tmp/dashboard-cast/storage)
+    STORAGE_STATE_KEY: Fernet key (urlsafe base64, 32 bytes). If unset a key
+                       is generated into <STORAGE_STATE_DIR>/.key (0600) -
+                       provide the key from a secret to keep it off the disk.
+    STORAGE_STATE_REFRESH_MARGIN: Seconds before cookie expiry to refresh
+                                  (default: 300)
+    STORAGE_STATE_AUTH_COOKIES: Comma-separated names (glob patterns, any
+                                case) of the cookies holding the login
+                                (default: *session*,*auth*,*token*)
+"""
+
+from typing import Optional
+from urllib.parse import urlparse
+import asyncio
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import time
+
+from cryptography.fernet import Fernet, InvalidToken
+from playwright.async_api import BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORAGE_DIR = '/tmp/dashboard-cast/storage'
+DEFAULT_AUTH_COOKIES = '*session*,*auth*,*token*'
+
+
+def origin_of(url: str) -> str:
+    """scheme://host[:port] of a URL."""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def _auth_cookie_patterns() -> list[str]:
+    value = os.getenv('STORAGE_STATE_AUTH_COOKIES', DEFAULT_AUTH_COOKIES)
+    return [pattern.strip().lower() for pattern in value.split(',') if pattern.strip()]
+
+
+def _cookie_expiry(state: dict, url: str) -> Optional[float]:
+    """Earliest expiry among the persistent auth cookies sent to the URL's host.
+
+    Only cookies named like STORAGE_STATE_AUTH_COOKIES count; None if there
+    are none (session cookies, or no login cookie recognized).
+    """
+    host = urlparse(url).hostname or ''
+    patterns = _auth_cookie_patterns()
+    expiries = [
+        cookie['expires'] for cookie in state.get('cookies', [])
+        if cookie.get('expires', -1) > 0
+        and any(fnmatch.fnmatchcase(cookie.get('name', '').lower(), p) for p in patterns)
+        and (host == cookie.get('domain', '').lstrip('.')
+             or host.endswith('.' + cookie.get('domain', '').lstrip('.')))
+    ]
+    return min(expiries) if expiries else None
+
+
+def _unexpired(cookies: list[dict], now: float) -> list[dict]:
+    """Cookies that are session cookies or haven't expired yet."""
+    return [cookie for cookie in cookies if not 0 < cookie.get('expires', -1) <= now]
+
+
+class StorageStateStore:
+    """Encrypted on-disk storage states keyed by target origin.
+
+    Usage:
+        store = StorageStateStore('/data/storage', key)
+        state = store.load(['https://grafana.local/d/abc'])
+        context = await browser.new_context(storage_state=state)
+        ...
+        await store.save(context, 'https://grafana.local/d/abc')
+    """
+
+    def __init__(self, directory: str, key: bytes):
+        """Initialize store.
+
+        Args:
+            directory: Directory holding one encrypted file per origin
+            key: Fernet key
+
+        Raises:
+            ValueError: If the key is not a valid Fernet key
+        """
+        self.directory = directory
+        self._fernet = Fernet(key)
+
+    def _path(self, origin: str) -> str:
+        name = hashlib.sha256(origin.encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f"{name}.state")
+
+    def _read(self, origin: str) -> Optional[dict]:
+        try:
+            with open(self._path(origin), 'rb') as f:
+                return json.loads(self._fernet.decrypt(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, InvalidToken, ValueError) as e:
+            logger.warning(f"Discarding unreadable storage state for {origin}: {e}")
+            return None
+
+    def load(self, urls: list[str]) -> Optional[dict]:
+        """Merge the saved states of the URLs' origins.
+
+        States whose auth cookies have expired are skipped; other expired
+        cookies are dropped individually.
+
+        Returns:
+            Playwright storage_state dict, or None if nothing is saved
+        """
+        merged = {'cookies': [], 'origins': []}
+        seen_origins = set()
+        now = time.time()
+        for origin in dict.fromkeys(origin_of(url) for url in urls):
+            record = self._read(origin)
+            if record is None:
+                continue
+            if record.get('expires_at') and record['expires_at'] <= now:
+                logger.info(f"Saved login for {origin} has expired")
+                continue
+            state = record['state']
+            merged['cookies'].extend(_unexpired(state.get('cookies', []), now))
+            for entry in state.get('origins', []):
+                if entry.get('origin') not in seen_origins:
+                    seen_origins.add(entry.get('origin'))
+                    merged['origins'].append(entry)
+            logger.info(f"Restoring saved storage state for {origin}")
+        return merged if merged['cookies'] or merged['origins'] else None
+
+    def expires_at(self, url: str) -> Optional[float]:
+        """Auth cookie expiry of the saved state for a URL's origin (None if unknown)."""
+        record = self._read(origin_of(url))
+        return record.get('expires_at') if record else None
+
+    async def save(self, context: BrowserContext, url: str) -> bool:
+        """Save a context's storage state under the URL's origin.
+
+        Returns:
+            True if saved
+        """
+        try:
+            state = await context.storage_state(indexed_db=True)
+        except TypeError:
+            state = await context.storage_state()  # Playwright < 1.51: no IndexedDB
+        except Exception as e:
+            logger.warning(f"Failed to read storage state for {url}: {e}")
+            return False
+
+        record = {
+            'origin': origin_of(url),
+            'saved_at': time.time(),
+            'expires_at': _cookie_expiry(state, url),
+            'state': state,
+        }
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            path = self._path(record['origin'])
+            tmp_path = f"{path}.tmp"
+            with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as f:
+                f.write(self._fernet.encrypt(json.dumps(record).encode()))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to save storage state for {record['origin']}: {e}")
+            return False
+        logger.debug(f"Saved storage state for {record['origin']}")
+        return True
+
+
+def _load_key(directory: str) -> bytes:
+    """STORAGE_STATE_KEY, or a generated key persisted in <directory>/.key."""
+    key = os.getenv('STORAGE_STATE_KEY')
+    if key:
+        return key.encode()
+
+    path = os.path.join(directory, '.key')
+    try:
+        with open(path, 'rb') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
+
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    key = Fernet.generate_key()
+    with open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'wb') as f:
+        f.write(key)
+    logger.warning(f"Generated storage state key at {path}; set STORAGE_STATE_KEY to keep it off disk")
+    return key
+
+
+_store: Optional[StorageStateStore] = None
+
+
+def get_storage_store() -> Optional[StorageStateStore]:
+    """Get the process-wide store built from environment variables.
+
+    Returns:
+        Shared StorageStateStore, or None if STORAGE_STATE is disabled or
+        the key is unusable
+    """
+    global _store
+    if os.getenv('STORAGE_STATE', 'true').lower() != 'true':
+        return None
+    if _store is None:
+        directory = os.getenv('STORAGE_STATE_DIR', DEFAULT_STORAGE_DIR)
+        try:
+            _store = StorageStateStore(directory, _load_key(directory))
+        except (OSError, ValueError) as e:
+            logger.error(f"Storage state disabled: {e}")
+            return None
+    return _store
+
+
+class StorageKeeper:
+    """Saves and proactively refreshes a page's storage state while it is shown.
+
+    On entry the state is saved (if the page ended up on the target origin,
+    i.e. not on a login page). While active, the URL is loaded again in a
+    background tab of the same context `refresh_margin` seconds before the
+    auth cookies expire, so sliding sessions renew without reloading the
+    page on screen, and the renewed state is saved. Refreshing stops once a
+    refresh doesn't move the expiry forward (the session doesn't slide). On
+    exit the final state is saved.
+
+    Usage:
+        async with StorageKeeper(page, url, store):
+            ...  # Stream
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        url: str,
+        store: StorageStateStore,
+        refresh_margin: Optional[float] = None
+    ):
+        self.page = page
+        self.url = url
+        self.store = store
+        self.refresh_margin = refresh_margin if refresh_margin is not None else float(
+            os.getenv('STORAGE_STATE_REFRESH_MARGIN', '300')
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    async def _save(self) -> bool:
+        if origin_of(self.page.url) != origin_of(self.url):
+            # Redirected to a login page: don't overwrite a good state with it
+            logger.info(f"Not saving storage state: page is on {origin_of(self.page.url)}")
+            return False
+        return await self.store.save(self.page.context, self.url)
+
+    async def __aenter__(self) -> "StorageKeeper":
+        await self._save()
+        self._task = asyncio.create_task(self._refresh_loop())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if not self.page.is_closed():
+            await self._save()
+        return False
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            expires_at = self.store.expires_at(self.url)
+            if expires_at is None or expires_at <= time.time():
+                return  # Nothing expires, nothing saved, or too late to renew
+            await asyncio.sleep(max(expires_at - self.refresh_margin - time.time(), 0))
+            logger.info(f"Refreshing session for {origin_of(self.url)} before it expires")
+            try:
+                await self._refresh()
+            except Exception as e:
+                logger.warning(f"Storage state refresh failed for {self.url}: {e}")
+            renewed = self.store.expires_at(self.url)
+            if renewed is None or renewed <= expires_at:
+                logger.info(f"Session for {origin_of(self.url)} was not extended, no longer refreshing")
+                return
+
+    async def _refresh(self) -> None:
+        """Load the URL in a background tab so the server renews the session, then save."""
+        context = self.page.context
+        front = await _front_page(context) or self.page
+        page = await context.new_page()
+        try:
+            await front.bring_to_front()  # New tabs open in the foreground
+            await page.goto(self.url, wait_until='domcontentloaded')
+            if origin_of(page.url) != origin_of(self.url):
+                logger.info(f"Not saving storage state: refresh ended on {origin_of(page.url)}")
+                return
+            await self.store.save(context, self.url)
+        finally:
+            await page.close()
+
+
+async def _front_page(context: BrowserContext) -> Optional[Page]:
+    """The context's page currently on screen (the visible tab), if any."""
+    for page in context.pages:
+        try:
+            if await page.evaluate("document.visibilityState") == 'visible':
+                return page
+        except Exception:
+            continue
+    return None
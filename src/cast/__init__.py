@@ -7,6 +7,7 @@ Features:
     - Cast device discovery via mDNS using pychromecast
     - Session management with context manager pattern
     - Exponential backoff retry for connection reliability
+    - Per-device circuit breakers and health scores
     - Automatic HDMI-CEC wake capability to turn on TV
     - Graceful error handling with async/await patterns
 
@@ -26,7 +27,7 @@ Basic Usage:
     # Start Cast session with automatic cleanup
     async with CastSessionManager(device) as session:
         # TV is now awake via HDMI-CEC
-        session.start_cast("http://example.com/video.mp4")
+        await session.start_cast("http://example.com/video.mp4")
         # Session automatically cleaned up on exit
     ```
 
@@ -58,6 +59,7 @@ Network Requirements:
 from .discovery import discover_devices, get_cast_device, get_device_name
 from .session import CastSessionManager
 from .retry import retry_with_backoff
+from .breaker import CircuitBreaker, CircuitOpenError, get_breakers
 
 __all__ = [
     'discover_devices',
@@ -65,4 +67,7 @@ __all__ = [
     'get_device_name',
     'CastSessionManager',
     'retry_with_backoff',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'get_breakers',
 ]
@@ -0,0 +1,355 @@
+"""Per-device circuit breakers and health scores.
+
+retry_with_backoff() keeps no memory between calls, so a TV that is
+unplugged cost every /start the full retry ladder before it failed. Each
+Cast device (by host:port) instead gets a CircuitBreaker:
+
+- closed: calls go through; consecutive connection failures are counted
+- open: after CAST_BREAKER_FAILURES consecutive failures calls fail at once
+  with CircuitOpenError (a ConnectionError), so get_cast_device() falls
+  through to mDNS and sessions error out without waiting on the device
+- half-open: once the cooldown is over a background probe (a TCP connect to
+  the Cast port) tests the device; success closes the breaker, failure
+  reopens it with a longer cooldown
+
+Cooldowns grow with decorrelated jitter (see retry.decorrelated_jitter), so
+the probes of several dead devices don't synchronize.
+
+Every breaker also keeps a DeviceHealth: a rolling window of connection
+outcomes and latencies condensed into a 0-100 score, exposed by /health.
+
+Environment variables:
+    CAST_BREAKER: Fail fast on devices that keep failing (default: true)
+    CAST_BREAKER_FAILURES: Consecutive failures that open a device's breaker
+                           (default: 3)
+    CAST_BREAKER_RESET_TIMEOUT: Base cooldown in seconds before an open
+                                breaker is probed (default: 30)
+    CAST_BREAKER_MAX_RESET_TIMEOUT: Cooldown cap in seconds (default: 300)
+    CAST_HEALTH_WINDOW: Connection outcomes kept per device (default: 20)
+    CAST_HEALTH_LATENCY_TARGET_MS: Median connect latency above which the
+                                   health score is scaled down (default: 1000)
+"""
+
+from collections import deque
+from typing import Awaitable, Callable, Optional
+import asyncio
+import logging
+import os
+import time
+
+from .discovery import parse_cast_address
+from .retry import decorrelated_jitter
+
+logger = logging.getLogger(__name__)
+
+CAST_PORT = 8009
+
+
+class CircuitOpenError(ConnectionError):
+    """A call to a device was refused because its breaker is open."""
+
+    def __init__(self, device: str, retry_in: float):
+        super().__init__(f"Circuit open for {device}, next probe in {retry_in:.0f}s")
+        self.device = device
+        self.retry_in = retry_in
+
+
+class DeviceHealth:
+    """Rolling success rate and connect latency of one device.
+
+    Attributes:
+        outcomes: Latest (succeeded, latency_ms) pairs, oldest first
+        latency_target_ms: Median latency the score tolerates without penalty
+    """
+
+    def __init__(self, window: Optional[int] = None, latency_target_ms: Optional[float] = None):
+        window = window if window is not None else int(os.getenv('CAST_HEALTH_WINDOW', '20'))
+        self.outcomes: deque[tuple[bool, Optional[float]]] = deque(maxlen=max(window, 1))
+        self.latency_target_ms = latency_target_ms if latency_target_ms is not None else float(
+            os.getenv('CAST_HEALTH_LATENCY_TARGET_MS', '1000')
+        )
+
+    def record(self, succeeded: bool, latency_ms: Optional[float] = None) -> None:
+        self.outcomes.append((succeeded, latency_ms if succeeded else None))
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        if not self.outcomes:
+            return None
+        return sum(1 for ok, _ in self.outcomes if ok) / len(self.outcomes)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Nearest-rank latency percentile of the successful attempts."""
+        latencies = sorted(ms for ok, ms in self.outcomes if ok and ms is not None)
+        if not latencies:
+            return None
+        rank = max(0, min(len(latencies) - 1, round(percentile / 100 * len(latencies)) - 1))
+        return latencies[rank]
+
+    @property
+    def score(self) -> Optional[float]:
+        """0-100: success rate, scaled down when the median latency exceeds the target."""
+        rate = self.success_rate
+        if rate is None:
+            return None
+        median = self.latency_percentile(50)
+        speed = min(1.0, self.latency_target_ms / median) if median else 1.0
+        return 100 * rate * speed
+
+    def to_dict(self) -> dict:
+        rate = self.success_rate
+        p50 = self.latency_percentile(50)
+        p95 = self.latency_percentile(95)
+        score = self.score
+        return {
+            'score': round(score, 1) if score is not None else None,
+            'success_rate': round(rate, 3) if rate is not None else None,
+            'latency_p50_ms': round(p50, 1) if p50 is not None else None,
+            'latency_p95_ms': round(p95, 1) if p95 is not None else None,
+            'samples': len(self.outcomes),
+        }
+
+
+class CircuitBreaker:
+    """Fails calls to a device fast while it is known to be down.
+
+    Usage:
+        breaker = CircuitBreaker("10.10.0.31:8009", probe=ping)
+        breaker.check()                      # Raises CircuitOpenError when open
+        try:
+            await connect()
+        except ConnectionError:
+            breaker.record_failure()
+            raise
+        breaker.record_success(latency_ms)
+
+    Attributes:
+        name: Device the breaker guards (host:port)
+        state: 'closed', 'open' or 'half_open'
+        failures: Consecutive failures
+        trips: Times the breaker opened
+        health: Rolling success/latency score
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        name: str,
+        probe: Optional[Callable[[], Awaitable[None]]] = None,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+        max_reset_timeout: Optional[float] = None,
+        health: Optional[DeviceHealth] = None
+    ):
+        """Initialize breaker.
+
+        Args:
+            name: Device the breaker guards, for logs and stats
+            probe: Async check of the device run in the background once an
+                open breaker's cooldown is over (raises if the device is
+                still down). Without one, the first call after the cooldown
+                is let through as the trial.
+            failure_threshold: Consecutive failures that open the breaker
+                (default: CAST_BREAKER_FAILURES env var)
+            reset_timeout: Base cooldown in seconds (default:
+                CAST_BREAKER_RESET_TIMEOUT env var)
+            max_reset_timeout: Cooldown cap in seconds (default:
+                CAST_BREAKER_MAX_RESET_TIMEOUT env var)
+            health: Health tracker (default: a new DeviceHealth)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold if failure_threshold is not None else int(
+            os.getenv('CAST_BREAKER_FAILURES', '3')
+        )
+        self.reset_timeout = reset_timeout if reset_timeout is not None else float(
+            os.getenv('CAST_BREAKER_RESET_TIMEOUT', '30')
+        )
+        self.max_reset_timeout = max_reset_timeout if max_reset_timeout is not None else float(
+            os.getenv('CAST_BREAKER_MAX_RESET_TIMEOUT', '300')
+        )
+        self.health = health or DeviceHealth()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.cooldown = 0.0
+        self.opened_at: Optional[float] = None
+        self._probe = probe
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the open breaker is probed (0 when not open)."""
+        if self.state != self.OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call to the device may go ahead now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self._probe is None and self.retry_in == 0:
+            # No background probe: this call is the trial
+            self.state = self.HALF_OPEN
+            return True
+        return False
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if calls to the device should fail fast."""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in)
+
+    def record_success(self, latency_ms: Optional[float] = None) -> None:
+        self.health.record(True, latency_ms)
+        self.failures = 0
+        if self.state != self.CLOSED:
+            logger.info(f"Cast device {self.name} is back, closing its circuit")
+            self.state = self.CLOSED
+            self.cooldown = 0.0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.health.record(False)
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        if self.state == self.CLOSED:
+            self.trips += 1
+        self.cooldown = decorrelated_jitter(
+            self.cooldown or self.reset_timeout, self.reset_timeout, self.max_reset_timeout
+        )
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        logger.warning(
+            f"Cast device {self.name} failed {self.failures} time(s), "
+            f"failing fast for {self.cooldown:.0f}s"
+        )
+        self._schedule_probe()
+
+    def _schedule_probe(self) -> None:
+        if self._probe is None or (self._probe_task and not self._probe_task.done()):
+            return
+        try:
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_when_due())
+        except RuntimeError:
+            # No loop (synchronous caller): fall back to a trial call
+            self._probe = None
+
+    async def _probe_when_due(self) -> None:
+        """Half-open the breaker after each cooldown and probe the device."""
+        while self.state == self.OPEN:
+            await asyncio.sleep(self.retry_in)
+            self.state = self.HALF_OPEN
+            started = time.monotonic()
+            try:
+                await self._probe()
+            except Exception as e:
+                logger.info(f"Probe of Cast device {self.name} failed: {e}")
+                self.record_failure()
+                continue
+            self.record_success((time.monotonic() - started) * 1000)
+
+    async def stop(self) -> None:
+        """Cancel the background probe."""
+        task, self._probe_task = self._probe_task, None
+        if task and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def to_dict(self) -> dict:
+        return {
+            'device': self.name,
+            'state': self.state,
+            'failures': self.failures,
+            'trips': self.trips,
+            'retry_in_s': round(self.retry_in, 1),
+            **self.health.to_dict(),
+        }
+
+
+def device_address(device) -> Optional[str]:
+    """host:port of a pychromecast device (None if it has no known host)."""
+    info = getattr(device, 'cast_info', None)
+    host = getattr(info, 'host', None)
+    if not isinstance(host, str) or not host:
+        return None
+    port = getattr(info, 'port', None)
+    return f"{host}:{port if isinstance(port, int) else CAST_PORT}"
+
+
+def _normalize(address: str) -> str:
+    host, port = parse_cast_address(address)
+    return f"{host}:{port or CAST_PORT}"
+
+
+async def probe_cast_port(address: str, timeout: float = 5.0) -> None:
+    """Open (and close) a TCP connection to a device's Cast port.
+
+    Raises:
+        OSError: If the device doesn't accept the connection
+        asyncio.TimeoutError: If it doesn't answer within timeout
+    """
+    host, port = parse_cast_address(address)
+    _, writer = await asyncio.wait_for(asyncio.open_connection(host, port or CAST_PORT), timeout)
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+
+
+class DeviceBreakers:
+    """Circuit breakers of every Cast device the service has talked to.
+
+    Usage:
+        breaker = get_breakers().get("10.10.0.31")   # Keyed by host:port
+        get_breakers().stats()                       # For /health
+    """
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, address: str) -> CircuitBreaker:
+        """Breaker of the device at host[:port], created on first use."""
+        key = _normalize(address)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(key, probe=lambda: probe_cast_port(key))
+            self._breakers[key] = breaker
+        return breaker
+
+    def for_device(self, device) -> Optional[CircuitBreaker]:
+        """Breaker of a pychromecast device (None if its address is unknown)."""
+        address = device_address(device)
+        return self.get(address) if address else None
+
+    def stats(self) -> list[dict]:
+        return [breaker.to_dict() for breaker in self._breakers.values()]
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(breaker.stop() for breaker in self._breakers.values()))
+
+
+_breakers: Optional[DeviceBreakers] = None
+
+
+def get_breakers() -> Optional[DeviceBreakers]:
+    """Get the process-wide device breakers (None if CAST_BREAKER=false)."""
+    global _breakers
+    if os.getenv('CAST_BREAKER', 'true').lower() != 'true':
+        return None
+    if _breakers is None:
+        _breakers = DeviceBreakers()
+    return _breakers
+
+
+async def stop_breakers() -> None:
+    """Cancel every background probe."""
+    if _breakers is not None:
+        await _breakers.stop()
@@ -0,0 +1,239 @@
+"""Background mDNS device table.
+
+discover_devices() runs a full blocking pychromecast.get_chromecasts(timeout=5)
+browse, and every /start and /health probe paid for one. A DeviceCache
+instead keeps a zeroconf browser running for the life of the service and
+maintains an in-memory table of Cast devices from its add/update/remove
+events, indexed by friendly name and UUID, so lookups are O(1) dictionary
+hits. Announcements are also recorded in the device index (see
+device_index.py), so the next start knows where each device was.
+
+The process-wide cache is started by the API lifespan (start_device_cache)
+and used by get_cast_device() whenever it is running.
+
+Environment variables:
+    MDNS_CACHE: Keep a background mDNS browser and device table (default: true)
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+from uuid import UUID
+import asyncio
+import logging
+import threading
+import time
+
+import pychromecast
+import zeroconf
+from pychromecast.discovery import CastBrowser, SimpleCastListener
+from pychromecast.models import CastInfo
+
+from .device_index import get_device_index, parse_uuid
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedDevice:
+    """A Cast device seen on the network.
+
+    Attributes:
+        cast_info: pychromecast CastInfo from the latest announcement
+        first_seen: Wall-clock time of the first announcement
+        last_seen: Wall-clock time of the latest add/update event
+        updates: Update events received since it was added
+    """
+    cast_info: CastInfo
+    first_seen: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.time)
+    updates: int = 0
+
+    @property
+    def uuid(self) -> UUID:
+        return self.cast_info.uuid
+
+    @property
+    def name(self) -> str:
+        return self.cast_info.friendly_name or f"Cast@{self.cast_info.host}"
+
+    def to_dict(self) -> dict:
+        return {
+            'uuid': str(self.uuid),
+            'name': self.name,
+            'model': self.cast_info.model_name,
+            'host': self.cast_info.host,
+            'port': self.cast_info.port,
+            'last_seen': self.last_seen,
+        }
+
+
+class DeviceCache:
+    """Cast device table maintained by a long-running zeroconf browser.
+
+    Usage:
+        async with DeviceCache() as cache:
+            entry = cache.lookup("Living Room TV")         # O(1), never blocks
+            entry = await cache.wait_for("Living Room TV", timeout=5)
+            device = cache.get_chromecast(entry)
+    """
+
+    def __init__(self, interfaces=zeroconf.InterfaceChoice.All):
+        """Initialize cache.
+
+        Args:
+            interfaces: zeroconf interfaces to browse on (e.g. ['127.0.0.1']
+                for a local fake responder)
+        """
+        self.interfaces = interfaces
+        self._devices: dict[UUID, CachedDevice] = {}
+        self._by_name: dict[str, UUID] = {}
+        self._lock = threading.Lock()  # zeroconf callbacks run on its own thread
+        self._zconf: Optional[zeroconf.Zeroconf] = None
+        self._browser: Optional[CastBrowser] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._browser is not None
+
+    async def start(self) -> None:
+        """Start browsing in the background (returns immediately)."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+
+        def start_browser():
+            self._zconf = zeroconf.Zeroconf(interfaces=self.interfaces)
+            browser = CastBrowser(
+                SimpleCastListener(self._on_add, self._on_remove, self._on_update),
+                self._zconf
+            )
+            browser.start_discovery()
+            return browser
+
+        self._browser = await self._loop.run_in_executor(None, start_browser)
+        logger.info("mDNS device cache started")
+
+    async def stop(self) -> None:
+        """Stop browsing (also closes the zeroconf instance)."""
+        if not self.running:
+            return
+        browser, self._browser = self._browser, None
+        await asyncio.get_running_loop().run_in_executor(None, browser.stop_discovery)
+        self._zconf = None
+        logger.info("mDNS device cache stopped")
+
+    async def __aenter__(self) -> "DeviceCache":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+        return False
+
+    def devices(self) -> list[CachedDevice]:
+        """All devices currently announced, most recently seen first."""
+        with self._lock:
+            return sorted(self._devices.values(), key=lambda d: d.last_seen, reverse=True)
+
+    def lookup(self, name: Optional[str] = None) -> Optional[CachedDevice]:
+        """Find a device by friendly name (case-insensitive) or UUID (None = any).
+
+        Never blocks: returns None if the device hasn't been announced.
+        """
+        with self._lock:
+            if name is None:
+                return max(self._devices.values(), key=lambda d: d.last_seen, default=None)
+            uuid = parse_uuid(name) or self._by_name.get(name.lower())
+            return self._devices.get(uuid) if uuid else None
+
+    async def wait_for(self, name: Optional[str] = None, timeout: float = 5.0) -> Optional[CachedDevice]:
+        """Look up a device, waiting up to timeout for it to be announced.
+
+        Returns as soon as the device appears (e.g. right after startup),
+        rather than after a full browse.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = self.lookup(name)
+            remaining = deadline - time.monotonic()
+            if entry or remaining <= 0 or self._changed is None:
+                return entry
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return self.lookup(name)
+
+    def get_chromecast(self, entry: CachedDevice) -> pychromecast.Chromecast:
+        """Chromecast object for a cached device (not yet connected)."""
+        return pychromecast.get_chromecast_from_cast_info(entry.cast_info, self._zconf)
+
+    def _notify(self) -> None:
+        if self._loop is not None and self._changed is not None:
+            self._loop.call_soon_threadsafe(self._changed.set)
+
+    def _store(self, uuid: UUID, update: bool) -> None:
+        browser = self._browser
+        cast_info = browser.devices.get(uuid) if browser else None
+        if cast_info is None:
+            return
+        with self._lock:
+            entry = self._devices.get(uuid)
+            if entry is None:
+                entry = self._devices[uuid] = CachedDevice(cast_info)
+            else:
+                entry.cast_info = cast_info
+                entry.last_seen = time.time()
+                entry.updates += update
+            # Re-index: the friendly name may have changed
+            for name in [n for n, u in self._by_name.items() if u == uuid]:
+                del self._by_name[name]
+            self._by_name[entry.name.lower()] = uuid
+        get_device_index().remember_cast_info(cast_info)
+        self._notify()
+
+    def _on_add(self, uuid: UUID, service: str) -> None:
+        self._store(uuid, update=False)
+        entry = self._devices.get(uuid)
+        if entry:
+            logger.info(f"Cast device announced: {entry.name} at {entry.cast_info.host}")
+
+    def _on_update(self, uuid: UUID, service: str) -> None:
+        self._store(uuid, update=True)
+
+    def _on_remove(self, uuid: UUID, service: str, cast_info: CastInfo) -> None:
+        with self._lock:
+            entry = self._devices.pop(uuid, None)
+            if entry:
+                self._by_name.pop(entry.name.lower(), None)
+        if entry:
+            logger.info(f"Cast device went away: {entry.name}")
+        self._notify()
+
+
+_cache: Optional[DeviceCache] = None
+
+
+def get_device_cache() -> Optional[DeviceCache]:
+    """Get the process-wide device cache, if it is running."""
+    return _cache if _cache is not None and _cache.running else None
+
+
+async def start_device_cache(interfaces=zeroconf.InterfaceChoice.All) -> DeviceCache:
+    """Start the process-wide device cache used by get_cast_device()."""
+    global _cache
+    if _cache is None:
+        _cache = DeviceCache(interfaces=interfaces)
+    await _cache.start()
+    return _cache
+
+
+async def stop_device_cache() -> None:
+    """Stop the process-wide device cache."""
+    global _cache
+    if _cache is not None:
+        await _cache.stop()
+        _cache = None
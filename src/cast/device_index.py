@@ -0,0 +1,176 @@
+"""Index of Cast devices seen before, by friendly name and UUID.
+
+Targeted discovery (see discovery.get_cast_device) races an mDNS browse that
+stops at the first matching announcement against a direct connection to the
+host the device was last seen at. The index remembers every announcement
+(and successful direct connection), so that host is known even right after
+a restart.
+
+Environment variables:
+    CAST_DEVICE_INDEX_FILE: JSON file the index is kept in across restarts
+                            (default: /tmp/dashboard-cast/cast_devices.json,
+                            empty = keep it in memory only)
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Optional
+from uuid import UUID
+import json
+import logging
+import os
+import threading
+import time
+
+from pychromecast.models import CastInfo
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_FILE = '/tmp/dashboard-cast/cast_devices.json'
+
+
+def parse_uuid(target: str) -> Optional[UUID]:
+    """The UUID a device target names, or None if it is a friendly name."""
+    try:
+        return UUID(target)
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+@dataclass
+class KnownDevice:
+    """Where a device was last seen.
+
+    Attributes:
+        name: Friendly name
+        host: IP address
+        port: Cast port
+        uuid: Device UUID (string)
+        model: Model name
+        seen_at: Wall-clock time of the latest announcement or connection
+    """
+    name: str
+    host: str
+    port: int = 8009
+    uuid: Optional[str] = None
+    model: Optional[str] = None
+    seen_at: float = 0.0
+
+    def matches(self, target: str) -> bool:
+        """Whether target is this device's friendly name (any case) or UUID."""
+        uuid = parse_uuid(target)
+        if uuid is not None:
+            return self.uuid == str(uuid)
+        return self.name.lower() == target.lower()
+
+    def host_tuple(self) -> tuple:
+        """(host, port, uuid, model_name, friendly_name) for get_chromecast_from_host."""
+        return (self.host, self.port, UUID(self.uuid) if self.uuid else None, self.model, self.name)
+
+
+class DeviceIndex:
+    """Known devices by friendly name and UUID, optionally persisted as JSON.
+
+    Thread-safe: zeroconf announces devices from its own thread.
+
+    Usage:
+        index = DeviceIndex("/tmp/cast_devices.json")
+        index.remember_cast_info(cast_info)     # From an mDNS announcement
+        known = index.find("Living Room TV")    # or a UUID string
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize index, loading it from path if the file exists.
+
+        Args:
+            path: JSON file (None or empty = memory only)
+        """
+        self.path = path or None
+        self._devices: dict[str, KnownDevice] = {}  # By UUID, or by name when unknown
+        self._lock = threading.Lock()
+        self._load()
+
+    def find(self, target: Optional[str]) -> Optional[KnownDevice]:
+        """Device a friendly name or UUID string refers to (None if never seen)."""
+        if not target:
+            return None
+        with self._lock:
+            return next((d for d in self._devices.values() if d.matches(target)), None)
+
+    def devices(self) -> list[KnownDevice]:
+        with self._lock:
+            return list(self._devices.values())
+
+    def remember(
+        self,
+        name: str,
+        host: str,
+        port: int = 8009,
+        uuid: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> None:
+        """Record where a device was seen (saved if anything but the time changed)."""
+        if not name or not host:
+            return
+        device = KnownDevice(name=name, host=host, port=port, uuid=uuid, model=model, seen_at=time.time())
+        with self._lock:
+            previous = self._devices.get(uuid or name)
+            if previous is None:
+                # The device may be known under its name only
+                previous = self._devices.pop(name, None) if uuid else None
+            self._devices[uuid or name] = device
+            changed = previous is None or (
+                (previous.name, previous.host, previous.port, previous.uuid)
+                != (name, host, port, uuid)
+            )
+        if changed:
+            logger.debug(f"Indexed Cast device {name} at {host}:{port}")
+            self._save()
+
+    def remember_cast_info(self, cast_info: CastInfo) -> None:
+        """Record a device from a pychromecast CastInfo (e.g. an mDNS announcement)."""
+        self.remember(
+            cast_info.friendly_name,
+            cast_info.host,
+            cast_info.port or 8009,
+            str(cast_info.uuid) if cast_info.uuid else None,
+            cast_info.model_name
+        )
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                records = json.load(f)
+            for record in records:
+                device = KnownDevice(**record)
+                self._devices[device.uuid or device.name] = device
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable Cast device index {self.path}: {e}")
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            records = [asdict(d) for d in self._devices.values()]
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(records, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save Cast device index {self.path}: {e}")
+
+
+_index: Optional[DeviceIndex] = None
+
+
+def get_device_index() -> DeviceIndex:
+    """Get the process-wide device index (CAST_DEVICE_INDEX_FILE)."""
+    global _index
+    if _index is None:
+        _index = DeviceIndex(os.getenv('CAST_DEVICE_INDEX_FILE', DEFAULT_INDEX_FILE))
+    return _index
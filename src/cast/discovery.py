@@ -6,18 +6,59 @@ using pychromecast's built-in mDNS discovery.
 Environment variables:
     CAST_DEVICE_IP: Static IP address for Cast device (bypasses mDNS discovery).
                     Useful for WSL2 environments where mDNS doesn't work.
-    CAST_DEVICE_NAME: Friendly name of Cast device to discover.
+                    host:port selects a non-standard Cast port (e.g. a
+                    local FakeCastDevice, see simulator.py). A comma-separated
+                    list of hosts/hostnames is tried in parallel; with
+                    CAST_DEVICE_NAME set, the one that is that device wins.
+    CAST_DEVICE_IP_TIMEOUT: Seconds allowed per CAST_DEVICE_IP candidate
+                            (default: 3)
+    CAST_DEVICE_IP_TTL: Seconds the candidate that answered is tried alone
+                        before all are probed again (default: 300)
+    CAST_DEVICE_NAME: Friendly name (or UUID) of Cast device to discover.
+    CAST_LAST_KNOWN_TIMEOUT: Seconds allowed for connecting to the address a
+                             named device was last seen at, raced against
+                             the mDNS lookup (default: 3)
 """
 
 from typing import List, Optional
 import asyncio
+import dataclasses
 import logging
 import os
+import time
 import pychromecast
+import zeroconf
+from pychromecast import dial
+from pychromecast.discovery import CastBrowser, SimpleCastListener
+from pychromecast.models import CastInfo
+
+from .device_index import parse_uuid
 
 logger = logging.getLogger(__name__)
 
 
+def parse_cast_addresses(value: str) -> list[str]:
+    """Split a CAST_DEVICE_IP value into its candidate host[:port] addresses."""
+    return [address.strip() for address in value.split(',') if address.strip()]
+
+
+def parse_cast_address(address: str) -> tuple[str, Optional[int]]:
+    """Split one CAST_DEVICE_IP address into host and port (None = default 8009).
+
+    Accepts host, host:port, an IPv6 address, or [IPv6]:port; anything else
+    is taken as a bare host.
+    """
+    address = address.strip()
+    if address.startswith('['):
+        host, _, rest = address[1:].partition(']')
+        port = rest[1:] if rest.startswith(':') else ''
+    elif address.count(':') == 1:
+        host, _, port = address.rpartition(':')
+    else:
+        return address, None  # Bare IPv4 address, hostname or IPv6 address
+    return (host, int(port)) if port.isdigit() else (host, None)
+
+
 def get_device_name(device: pychromecast.Chromecast) -> str:
     """Get a friendly name for a Cast device.
 
@@ -96,20 +137,28 @@ async def get_cast_device(
     """Get a specific Cast device or the first available device.
 
     Checks CAST_DEVICE_IP environment variable first for static IP configuration.
-    If set, attempts connection to that IP before falling back to mDNS discovery.
+    If set, connects to that IP - or to the first of a comma-separated list
+    of candidates that answers and is the named device - before falling back
+    to mDNS discovery.
+    mDNS lookups are answered from the background device cache (see
+    device_cache.py) when it is running, else by a one-off browse. A named
+    device the cache already holds is returned right away; otherwise it
+    resolves as soon as it is announced, or as soon as it answers at the
+    address it was last seen at (see device_index.py), whichever is first.
 
     This is useful for WSL2 environments where mDNS doesn't work due to
     virtualized NAT network limitations.
 
     Args:
-        device_name: Friendly name of device to find (None = first device)
-        timeout: Discovery duration in seconds (default: 5)
+        device_name: Friendly name or UUID of device to find (None = first
+            device)
+        timeout: Maximum discovery duration in seconds (default: 5)
 
     Returns:
         Chromecast object if found, None otherwise
 
     Environment Variables:
-        CAST_DEVICE_IP: Static IP address of Cast device (bypasses mDNS)
+        CAST_DEVICE_IP: Static IP address(es) of Cast device (bypasses mDNS)
         CAST_DEVICE_NAME: Alternative to device_name parameter
 
     Example:
@@ -127,53 +176,315 @@ async def get_cast_device(
     static_ip = os.getenv("CAST_DEVICE_IP")
     if static_ip:
         logger.info(f"Using static Cast device IP from CAST_DEVICE_IP environment variable: {static_ip}")
-        try:
-            # Connect directly to known IP using get_chromecast_from_host
-            loop = asyncio.get_event_loop()
-
-            def connect_to_host():
-                # Tuple: (host, port, uuid, model_name, friendly_name)
-                host_tuple = (static_ip, None, None, None, None)
-                cc = pychromecast.get_chromecast_from_host(host_tuple)
-                # Wait for connection with timeout (default wait() blocks forever)
-                cc.wait(timeout=10)
-                return cc
-
-            device = await loop.run_in_executor(None, connect_to_host)
-
-            if device and device.socket_client:
-                friendly_name = get_device_name(device)
-                logger.info(f"Connected to Cast device at {static_ip}: {friendly_name}")
-                return device
-            else:
-                logger.warning(f"Failed to connect to Cast device at {static_ip}, falling back to mDNS discovery")
-
-        except Exception as e:
-            logger.warning(f"Error connecting to static IP {static_ip}: {e}, falling back to mDNS discovery")
+        device = await _connect_static(static_ip, device_name or os.getenv("CAST_DEVICE_NAME"))
+        if device is not None:
+            return device
+        logger.warning(f"No Cast device answered at {static_ip}, falling back to mDNS discovery")
 
     # Fall back to mDNS discovery
     # Check for device name from environment if not provided
     if device_name is None:
         device_name = os.getenv("CAST_DEVICE_NAME")
 
+    # Answer from the background device table when it's running (MDNS_CACHE)
+    from .device_cache import get_device_cache
+    cache = get_device_cache()
+
+    if device_name:
+        entry = cache.lookup(device_name) if cache is not None else None
+        if entry is not None:
+            # Already announced: no need to connect to its last known address
+            logger.info(f"Found device in mDNS cache: {entry.name} at {entry.cast_info.host}")
+            return cache.get_chromecast(entry)
+
+        # Targeted: take whichever answers first, mDNS announcement or the
+        # host the device was last seen at
+        from .device_index import get_device_index
+        attempts = [
+            _from_cache(cache, device_name, timeout) if cache is not None
+            else discover_device(device_name, timeout)
+        ]
+        known = get_device_index().find(device_name)
+        if known is not None:
+            attempts.append(_connect_last_known(known))
+        device = await _first_found(attempts)
+        if device is None:
+            logger.warning(f"Device '{device_name}' not found within {timeout}s")
+        return device
+
+    if cache is not None:
+        entry = await cache.wait_for(None, timeout=timeout)
+        if entry is None:
+            logger.warning("No device in mDNS device cache")
+            return None
+        logger.info(f"Found device in mDNS cache: {entry.name} at {entry.cast_info.host}")
+        return cache.get_chromecast(entry)
+
     devices = await discover_devices(timeout)
 
     if not devices:
         logger.warning("No Cast devices available")
         return None
 
-    # If no device name specified, return first discovered
-    if device_name is None:
-        selected = devices[0]
-        logger.info(f"Selected first available device: {get_device_name(selected)}")
-        return selected
-
-    # Search for device by friendly name
-    for device in devices:
-        found_name = get_device_name(device)
-        if found_name.lower() == device_name.lower():
-            logger.info(f"Found requested device: {found_name}")
-            return device
+    # No device name specified: return first discovered
+    selected = devices[0]
+    logger.info(f"Selected first available device: {get_device_name(selected)}")
+    return selected
+
+
+def _matches(cast_info: CastInfo, target: str) -> bool:
+    """Whether an announced device is target (friendly name, any case, or UUID)."""
+    uuid = parse_uuid(target)
+    if uuid is not None:
+        return cast_info.uuid == uuid
+    return (cast_info.friendly_name or '').lower() == target.lower()
+
+
+async def discover_device(
+    target: str,
+    timeout: float = 5,
+    interfaces=zeroconf.InterfaceChoice.All
+) -> Optional[pychromecast.Chromecast]:
+    """Browse mDNS until a device is announced, instead of for a fixed time.
+
+    Every announcement seen on the way is recorded in the device index.
+
+    Args:
+        target: Friendly name (case-insensitive) or UUID
+        timeout: Maximum seconds to browse
+        interfaces: zeroconf interfaces to browse on
+
+    Returns:
+        Chromecast (not yet connected) as soon as it is announced, or None
+    """
+    from .device_index import get_device_index
+    loop = asyncio.get_running_loop()
+    found: asyncio.Future = loop.create_future()
+    index = get_device_index()
+    browser: dict = {}
+
+    def on_announce(uuid, service: str) -> None:
+        # zeroconf thread
+        cast_info = browser['browser'].devices.get(uuid) if 'browser' in browser else None
+        if cast_info is None:
+            return
+        index.remember_cast_info(cast_info)
+        if _matches(cast_info, target):
+            loop.call_soon_threadsafe(lambda: found.done() or found.set_result(cast_info))
+
+    def start() -> None:
+        zconf = zeroconf.Zeroconf(interfaces=interfaces)
+        browser['browser'] = CastBrowser(
+            SimpleCastListener(on_announce, update_callback=on_announce), zconf
+        )
+        browser['browser'].start_discovery()
+
+    started = loop.time()
+    try:
+        await loop.run_in_executor(None, start)
+        cast_info = await asyncio.wait_for(found, timeout=timeout)
+    except asyncio.TimeoutError:
+        return None
+    except Exception as e:
+        logger.error(f"Error during Cast device discovery: {e}")
+        return None
+    finally:
+        if 'browser' in browser:
+            await loop.run_in_executor(None, browser['browser'].stop_discovery)
+
+    logger.info(
+        f"Found requested device: {cast_info.friendly_name} at {cast_info.host}:{cast_info.port} "
+        f"after {(loop.time() - started) * 1000:.0f}ms"
+    )
+    # Looks up the cast type over HTTP when the announcement didn't carry it
+    return await loop.run_in_executor(None, lambda: pychromecast.get_chromecast_from_host((
+        cast_info.host, cast_info.port, cast_info.uuid,
+        cast_info.model_name, cast_info.friendly_name
+    )))
+
+
+async def _from_cache(cache, target: str, timeout: float) -> Optional[pychromecast.Chromecast]:
+    entry = await cache.wait_for(target, timeout=timeout)
+    if entry is None:
+        return None
+    logger.info(f"Found device in mDNS cache: {entry.name} at {entry.cast_info.host}")
+    return cache.get_chromecast(entry)
+
+
+def _connect(host_tuple: tuple, timeout: float, target: Optional[str] = None) -> tuple[pychromecast.Chromecast, bool]:
+    """Connect to a host (blocking) and check it is the device asked for.
+
+    Returns:
+        (connected Chromecast, whether the device info confirmed target)
+
+    Raises:
+        LookupError: If the device at the host is a different device
+    """
+    # Default tries: the socket client keeps reconnecting after a later drop
+    # for as long as the device is in use. Only this first attempt is bounded,
+    # by wait(timeout), and a host that doesn't answer is disconnected below.
+    cc = pychromecast.get_chromecast_from_host(host_tuple)
+    try:
+        cc.wait(timeout=timeout)
+        if not target:
+            return cc, True
+        info = dial.get_device_info(host_tuple[0], timeout=timeout)
+        if info is None:
+            return cc, False  # Doesn't serve its device info: can't tell
+        uuid = parse_uuid(target)
+        if (info.uuid == uuid) if uuid else (info.friendly_name or '').lower() == target.lower():
+            # Name the device (a host tuple carries no identity)
+            cc.cast_info = dataclasses.replace(
+                cc.cast_info,
+                uuid=info.uuid or cc.cast_info.uuid,
+                friendly_name=info.friendly_name,
+                model_name=info.model_name
+            )
+            return cc, True
+        raise LookupError(f"{host_tuple[0]} is {info.friendly_name}, not {target}")
+    except Exception:
+        cc.disconnect(timeout=0)
+        raise
+
+
+async def _connect_host(
+    host_tuple: tuple,
+    timeout: float,
+    target: Optional[str] = None
+) -> Optional[tuple[pychromecast.Chromecast, bool]]:
+    """_connect() from a worker thread, guarded by the host's circuit breaker.
+
+    Returns None if the host is known to be down or didn't answer in time.
+    Cancelling drops the connection once the attempt finishes.
+    """
+    from .breaker import get_breakers
+    host, port = host_tuple[0], host_tuple[1] or 8009
+    breakers = get_breakers()
+    breaker = breakers.get(f"{host}:{port}") if breakers else None
+    if breaker and not breaker.allow():
+        logger.debug(f"Skipping {host}:{port}, its circuit is open")
+        return None
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    future = loop.run_in_executor(None, _connect, host_tuple, timeout, target)
+    try:
+        result = await asyncio.shield(future)
+    except asyncio.CancelledError:
+        future.add_done_callback(
+            lambda f: f.cancelled() or f.exception() or f.result()[0].disconnect(timeout=0)
+        )
+        raise
+    except Exception as e:
+        logger.info(f"No usable Cast device at {host}:{port}: {e}")
+        if breaker and not isinstance(e, LookupError):
+            breaker.record_failure()
+        return None
+    if breaker:
+        breaker.record_success((loop.time() - started) * 1000)
+    return result
+
 
-    logger.warning(f"Device '{device_name}' not found among {len(devices)} discovered device(s)")
-    return None
+# CAST_DEVICE_IP candidate that last answered, per (CAST_DEVICE_IP, target):
+# (address, expiry)
+_static_hits: dict[tuple[str, Optional[str]], tuple[str, float]] = {}
+
+
+async def _connect_static(static_ip: str, target: Optional[str] = None) -> Optional[pychromecast.Chromecast]:
+    """Connect to the first healthy CAST_DEVICE_IP candidate that is target.
+
+    A single address is used whatever the name. Several candidates are tried
+    at once with a short timeout: a device confirmed by its device info wins
+    immediately, one that doesn't serve device info is taken only if no
+    candidate confirms. The winner is cached for CAST_DEVICE_IP_TTL seconds
+    and tried alone next time.
+    """
+    candidates = parse_cast_addresses(static_ip)
+    if len(candidates) == 1:
+        target = None  # A single CAST_DEVICE_IP takes precedence over the name
+    timeout = float(os.getenv('CAST_DEVICE_IP_TIMEOUT', '3'))
+    key = (static_ip, target.lower() if target else None)
+
+    def host_tuple(address: str) -> tuple:
+        # (host, port, uuid, model_name, friendly_name)
+        host, port = parse_cast_address(address)
+        return (host, port, None, None, None)
+
+    hit = _static_hits.get(key)
+    if hit and hit[1] > time.monotonic():
+        result = await _connect_host(host_tuple(hit[0]), timeout, target)
+        if result is not None:
+            logger.info(f"Connected to Cast device at {hit[0]} (cached): {get_device_name(result[0])}")
+            return result[0]
+    _static_hits.pop(key, None)
+
+    async def attempt(address: str):
+        result = await _connect_host(host_tuple(address), timeout, target)
+        return (address, *result) if result else None
+
+    tasks = [asyncio.ensure_future(attempt(address)) for address in candidates]
+    chosen: Optional[tuple[str, pychromecast.Chromecast]] = None
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if result is None:
+                continue
+            address, device, confirmed = result
+            if chosen is not None and not confirmed:
+                device.disconnect(timeout=0)
+                continue
+            if chosen is not None:
+                chosen[1].disconnect(timeout=0)
+            chosen = (address, device)
+            if confirmed:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if chosen is None:
+        return None
+    address, device = chosen
+    ttl = float(os.getenv('CAST_DEVICE_IP_TTL', '300'))
+    if ttl > 0:
+        _static_hits[key] = (address, time.monotonic() + ttl)
+    logger.info(f"Connected to Cast device at {address}: {get_device_name(device)}")
+    return device
+
+
+async def _connect_last_known(known) -> Optional[pychromecast.Chromecast]:
+    """Connect straight to the host a device was last seen at.
+
+    The device must still answer there, and when it serves its device info
+    its UUID (or name) must match: DHCP may have handed the address to
+    another device.
+    """
+    from .device_index import get_device_index
+    timeout = float(os.getenv('CAST_LAST_KNOWN_TIMEOUT', '3'))
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = await _connect_host(known.host_tuple(), timeout, known.uuid or known.name)
+    if result is None:
+        return None
+    get_device_index().remember(known.name, known.host, known.port, known.uuid, known.model)
+    logger.info(
+        f"Connected to {known.name} at last known address {known.host}:{known.port} "
+        f"after {(loop.time() - started) * 1000:.0f}ms"
+    )
+    return result[0]
+
+
+async def _first_found(attempts: list) -> Optional[pychromecast.Chromecast]:
+    """Run lookups concurrently; the first to find the device wins, the rest are cancelled."""
+    tasks = [asyncio.ensure_future(attempt) for attempt in attempts]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            device = await next_done
+            if device is not None:
+                return device
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
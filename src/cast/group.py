@@ -0,0 +1,379 @@
+"""Synchronized group casts for multi-screen video walls.
+
+A video wall shows one stream - or one tile of a larger capture per screen
+(see FFmpegEncoder's tiles) - on several Cast devices. Running a pipeline
+per screen costs N browsers and N encoders, and the screens start seconds
+apart. A CastGroup instead drives one CastSessionManager per device from a
+single pipeline:
+
+- all devices are connected (and woken) in parallel
+- every screen loads its stream paused; screens that landed at a different
+  live position are reloaded at the group's shared live edge, then PLAY is
+  released to all of them at the same instant
+- playback positions are polled while casting and screens drifting from the
+  group median are seeked back into line
+
+Environment variables:
+    CAST_GROUP_MAX_DRIFT_MS: Position difference from the group median above
+                             which a screen is re-synchronized (default: 500)
+    CAST_GROUP_SYNC_INTERVAL: Seconds between drift checks (default: 10,
+                              0 = don't monitor)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator, Optional, Union
+import asyncio
+import logging
+import math
+import os
+import statistics
+import threading
+import time
+
+import pychromecast
+
+from .discovery import get_device_name
+from .session import CastSessionManager
+
+if TYPE_CHECKING:
+    from ..video.timeline import StartupTimeline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VideoWall:
+    """Screens of a video wall.
+
+    Attributes:
+        devices: Friendly names of the Cast devices, in wall order (row-major)
+        tiled: Give each screen its own tile of one large capture (False =
+            every screen shows the same stream)
+        columns: Screens per row (0 = one row)
+    """
+    devices: list[str]
+    tiled: bool = False
+    columns: int = 0
+
+    @property
+    def grid(self) -> tuple[int, int]:
+        """(columns, rows) of the wall."""
+        columns = self.columns or len(self.devices)
+        return columns, math.ceil(len(self.devices) / columns)
+
+
+class _GroupSpans:
+    """Startup timeline shared by a group's sessions.
+
+    A stage spans from the first screen starting it to the last screen
+    finishing it, so it shows the slowest device. Spans are closed by
+    close() once every screen is done (a screen that finished early must not
+    end the span while others are still in it).
+    """
+
+    def __init__(self, timeline: "StartupTimeline"):
+        self.timeline = timeline
+        self._ended: dict[str, float] = {}
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        self.timeline.begin(stage)  # No-op while another screen has it open
+        yield
+        self._ended[stage] = max(self._ended.get(stage, 0.0), time.monotonic())
+
+    def close(self) -> None:
+        """End every stage at the time its last screen finished it."""
+        for stage, ended in self._ended.items():
+            self.timeline.end(stage, at=ended)
+        self._ended.clear()
+
+
+class _Screen:
+    """One device of a group and its sync state."""
+
+    def __init__(self, session: CastSessionManager):
+        self.session = session
+        self.name = get_device_name(session.device)
+        self.media_url: Optional[str] = None
+        self.drift_ms: Optional[float] = None
+        self.corrections = 0
+
+    @property
+    def media_controller(self):
+        return self.session.device.media_controller
+
+    def to_dict(self) -> dict:
+        return {
+            'device': self.name,
+            'drift_ms': round(self.drift_ms, 1) if self.drift_ms is not None else None,
+            'corrections': self.corrections,
+            'playback': self.session.playback_stats(),
+        }
+
+
+class CastGroup:
+    """Casts to several devices in lockstep.
+
+    Has the CastSessionManager interface, so a StreamManager can drive a
+    wall like a single screen.
+
+    Usage:
+        async with CastGroup([tv1, tv2, tv3]) as group:
+            await group.start_cast("http://host/stream.m3u8")    # Mirrored
+            # or: await group.start_cast([url1, url2, url3])     # One per screen
+            group.playback_stats()  # {'screens': [{'device': ..., 'drift_ms': ...}]}
+    """
+
+    def __init__(
+        self,
+        devices: list[pychromecast.Chromecast],
+        timeline: Optional["StartupTimeline"] = None,
+        keep_connection: bool = False,
+        max_drift_ms: Optional[float] = None,
+        sync_interval: Optional[float] = None
+    ):
+        """Initialize group.
+
+        Args:
+            devices: Cast devices, in wall order
+            timeline: Optional startup timeline (connect/wake spans of the
+                slowest device)
+            keep_connection: Leave the devices connected on exit (pooled)
+            max_drift_ms: Drift above which a screen is re-synchronized
+                (default: CAST_GROUP_MAX_DRIFT_MS env var)
+            sync_interval: Seconds between drift checks (default:
+                CAST_GROUP_SYNC_INTERVAL env var)
+        """
+        self._spans = _GroupSpans(timeline) if timeline else None
+        self.sessions = [
+            CastSessionManager(device, timeline=self._spans, keep_connection=keep_connection)
+            for device in devices
+        ]
+        self.max_drift_ms = max_drift_ms if max_drift_ms is not None else float(
+            os.getenv('CAST_GROUP_MAX_DRIFT_MS', '500')
+        )
+        self.sync_interval = sync_interval if sync_interval is not None else float(
+            os.getenv('CAST_GROUP_SYNC_INTERVAL', '10')
+        )
+        self.screens: list[_Screen] = []
+        self._sync_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_active(self) -> bool:
+        return any(screen.session.is_active for screen in self.screens)
+
+    async def __aenter__(self) -> "CastGroup":
+        """Connect and wake every device in parallel.
+
+        Devices that fail to connect are left out of the group.
+
+        Raises:
+            RuntimeError: If no device could be connected
+        """
+        logger.info(f"Starting group Cast session on {len(self.sessions)} device(s)")
+        results = await asyncio.gather(
+            *(session.__aenter__() for session in self.sessions),
+            return_exceptions=True
+        )
+        if self._spans:
+            self._spans.close()
+        for session, result in zip(self.sessions, results):
+            if isinstance(result, BaseException):
+                logger.error(f"{get_device_name(session.device)} left out of the group: {result}")
+            else:
+                self.screens.append(_Screen(session))
+        if not self.screens:
+            raise RuntimeError("No device of the group could be connected")
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._stop_sync()
+        await asyncio.gather(
+            *(screen.session.__aexit__(exc_type, exc_val, exc_tb) for screen in self.screens),
+            return_exceptions=True
+        )
+        self.screens = []
+        # Don't suppress exceptions
+        return False
+
+    def playback_stats(self) -> Optional[dict]:
+        """Per-screen drift, corrections and playback QoE."""
+        if not self.screens:
+            return None
+        return {'screens': [screen.to_dict() for screen in self.screens]}
+
+    async def start_cast(
+        self,
+        media_url: Union[str, list[str]],
+        mode: str = 'hls',
+        timeout: float = 10.0
+    ) -> bool:
+        """Start the same stream, or one stream per screen, on every device together.
+
+        Args:
+            media_url: URL for all screens, or one URL per device (in the
+                order the devices were given)
+            mode: Streaming mode ('hls', 'fmp4' or 'clip')
+            timeout: Seconds to wait for each screen's media session
+
+        Returns:
+            True if every screen reported its media loaded
+        """
+        urls = media_url if isinstance(media_url, list) else [media_url] * len(self.sessions)
+        if len(urls) != len(self.sessions):
+            raise ValueError(f"Got {len(urls)} stream(s) for {len(self.sessions)} device(s)")
+        for screen in self.screens:
+            screen.media_url = urls[self.sessions.index(screen.session)]
+
+        await self._stop_sync()
+        if mode == 'clip':
+            # Slates don't need to be in lockstep
+            results = await asyncio.gather(*(
+                screen.session.start_cast(screen.media_url, mode=mode, timeout=timeout)
+                for screen in self.screens
+            ))
+            return all(results)
+
+        # Load paused everywhere, so no screen runs ahead while others load
+        results = await asyncio.gather(*(
+            screen.session.start_cast(screen.media_url, mode=mode, timeout=timeout, autoplay=False)
+            for screen in self.screens
+        ))
+
+        # Screens that loaded a newer playlist start further ahead: reload
+        # them at the position every screen has (the shared live edge)
+        positions = await self._positions()
+        known = [p for p in positions.values() if p is not None]
+        if known:
+            edge = min(known)
+            ahead = [
+                screen for screen, position in positions.items()
+                if position is not None and (position - edge) * 1000 > self.max_drift_ms
+            ]
+            if ahead:
+                logger.info(f"Aligning {len(ahead)} screen(s) to the shared live edge at {edge:.2f}s")
+                await asyncio.gather(*(
+                    screen.session.start_cast(
+                        screen.media_url, mode=mode, timeout=timeout,
+                        autoplay=False, current_time=edge
+                    )
+                    for screen in ahead
+                ))
+
+        await self._play_together()
+        logger.info(f"Group playback started on {len(self.screens)} screen(s)")
+        if self.sync_interval > 0:
+            self._sync_task = asyncio.create_task(self._sync())
+        return all(results)
+
+    async def stop_cast(self):
+        """Stop playback on every screen."""
+        await self._stop_sync()
+        await asyncio.gather(
+            *(screen.session.stop_cast() for screen in self.screens),
+            return_exceptions=True
+        )
+
+    async def _play_together(self) -> None:
+        """Release PLAY on every screen at the same instant.
+
+        Runs on a pool with a thread per screen: on the shared default
+        executor, busy with other blocking calls, some parties might not be
+        scheduled before the barrier times out.
+        """
+        loop = asyncio.get_running_loop()
+        barrier = threading.Barrier(len(self.screens))
+        executor = ThreadPoolExecutor(max_workers=len(self.screens), thread_name_prefix='cast-group-play')
+
+        def play(screen: _Screen) -> None:
+            try:
+                barrier.wait(timeout=5)
+            except threading.BrokenBarrierError:
+                pass  # Another screen failed; play anyway
+            screen.media_controller.play()
+
+        try:
+            results = await asyncio.gather(
+                *(loop.run_in_executor(executor, play, screen) for screen in self.screens),
+                return_exceptions=True
+            )
+        finally:
+            executor.shutdown(wait=False)
+        for screen, result in zip(self.screens, results):
+            if isinstance(result, Exception):
+                logger.warning(f"PLAY failed on {screen.name}: {result}")
+
+    async def _refresh_status(self, screen: _Screen, timeout: float = 2.0) -> None:
+        """Ask a receiver for its media status and wait for the answer."""
+        loop = asyncio.get_running_loop()
+        answered = loop.create_future()
+
+        def on_status(msg_sent: bool, response) -> None:
+            loop.call_soon_threadsafe(lambda: answered.done() or answered.set_result(msg_sent))
+
+        await loop.run_in_executor(
+            None, lambda: screen.media_controller.update_status(callback_function=on_status)
+        )
+        await asyncio.wait_for(answered, timeout=timeout)
+
+    async def _positions(self) -> dict[_Screen, Optional[float]]:
+        """Current playback position of every screen (None if unknown)."""
+        results = await asyncio.gather(
+            *(self._refresh_status(screen) for screen in self.screens),
+            return_exceptions=True
+        )
+        positions = {}
+        for screen, result in zip(self.screens, results):
+            status = screen.media_controller.status
+            position = None
+            if not isinstance(result, Exception) and status is not None:
+                position = status.adjusted_current_time
+            positions[screen] = position if isinstance(position, (int, float)) else None
+        return positions
+
+    async def check_drift(self) -> list[_Screen]:
+        """Measure each screen's drift from the group median and re-sync outliers.
+
+        Returns:
+            Screens that were seeked back into line
+        """
+        loop = asyncio.get_running_loop()
+        positions = await self._positions()
+        measured_at = loop.time()
+        known = {screen: p for screen, p in positions.items() if p is not None}
+        if len(known) < 2:
+            return []
+        median = statistics.median(known.values())
+        drifting = []
+        for screen in self.screens:
+            position = known.get(screen)
+            screen.drift_ms = (position - median) * 1000 if position is not None else None
+            if screen.drift_ms is not None and abs(screen.drift_ms) > self.max_drift_ms:
+                drifting.append(screen)
+
+        for screen in drifting:
+            logger.warning(f"{screen.name} drifted {screen.drift_ms:+.0f}ms, re-synchronizing")
+            # Where the median screen is now
+            target = median + loop.time() - measured_at
+            try:
+                await loop.run_in_executor(None, lambda s=screen: s.media_controller.seek(target))
+                screen.corrections += 1
+            except Exception as e:
+                logger.warning(f"Re-sync of {screen.name} failed: {e}")
+        return drifting
+
+    async def _sync(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.check_drift()
+            except Exception as e:
+                logger.warning(f"Group drift check failed: {e}")
+
+    async def _stop_sync(self) -> None:
+        task, self._sync_task = self._sync_task, None
+        if task and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,300 @@
+"""Receiver playback monitoring and recovery.
+
+Once a stream is cast nothing used to watch the receiver: after a Wi-Fi
+blip it could go IDLE, sit in BUFFERING, or keep showing a frozen frame
+until someone noticed. A PlaybackMonitor listens to the receiver's media
+status (and polls it, since receivers only push status on changes), keeps
+quality-of-experience counters for the session, and reissues the LOAD
+request - which starts the live playlist again at its live edge - when
+playback stays broken for longer than a threshold.
+
+Someone else taking the TV is not breakage: when another sender replaces the
+media (INTERRUPTED), the cast is stopped (CANCELLED, e.g. from a phone) or
+another receiver app starts, monitoring ends. Polling then would relaunch
+the media receiver and take the TV back.
+
+Environment variables:
+    CAST_PLAYBACK_POLL_INTERVAL: Seconds between media status requests
+                                 (default: 10, 0 = don't monitor)
+    CAST_STALL_TIMEOUT: Seconds in BUFFERING before reloading (default: 15)
+    CAST_IDLE_TIMEOUT: Seconds IDLE before reloading (default: 5)
+    CAST_STALE_TIMEOUT: Seconds PLAYING without the position advancing
+                        before reloading (default: 30)
+    CAST_MAX_RECOVERIES: Reloads allowed per session (default: 10)
+"""
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+import asyncio
+import logging
+import os
+import time
+
+from pychromecast.controllers.media import MediaStatusListener
+
+logger = logging.getLogger(__name__)
+
+# Receiver player states (MediaStatus.player_state)
+PLAYING = 'PLAYING'
+BUFFERING = 'BUFFERING'
+PAUSED = 'PAUSED'
+IDLE = 'IDLE'
+UNKNOWN = 'UNKNOWN'
+
+# Idle reasons when another sender replaced our media or a user stopped
+# it: not ours to fix
+IDLE_REASON_INTERRUPTED = 'INTERRUPTED'
+IDLE_REASON_CANCELLED = 'CANCELLED'
+ENDED_BY_USER = (IDLE_REASON_INTERRUPTED, IDLE_REASON_CANCELLED)
+
+MAX_TRANSITIONS = 50
+
+
+@dataclass
+class PlaybackThresholds:
+    """How long playback may stay broken before it is reloaded (0 disables a check).
+
+    Attributes:
+        stall_timeout: Seconds in BUFFERING
+        idle_timeout: Seconds IDLE
+        stale_timeout: Seconds PLAYING with a frozen position
+        max_recoveries: Reloads allowed per session
+    """
+    stall_timeout: float = 15
+    idle_timeout: float = 5
+    stale_timeout: float = 30
+    max_recoveries: int = 10
+
+    @classmethod
+    def from_env(cls) -> "PlaybackThresholds":
+        """Build thresholds from CAST_* env vars."""
+        return cls(
+            stall_timeout=float(os.getenv('CAST_STALL_TIMEOUT', '15')),
+            idle_timeout=float(os.getenv('CAST_IDLE_TIMEOUT', '5')),
+            stale_timeout=float(os.getenv('CAST_STALE_TIMEOUT', '30')),
+            max_recoveries=int(os.getenv('CAST_MAX_RECOVERIES', '10')),
+        )
+
+
+class PlaybackMonitor(MediaStatusListener):
+    """Tracks a cast's receiver state and reloads stalled playback.
+
+    Usage:
+        monitor = PlaybackMonitor(request_status, recover=reload_media)
+        media_controller.register_status_listener(monitor)
+        async with monitor:
+            ...  # Stream
+        monitor.stats()  # {'state': 'PLAYING', 'stalls': 1, ...}
+
+    Attributes:
+        state: Latest receiver player state
+        stalls: Times playback went from PLAYING back to BUFFERING
+        recoveries: Reloads issued
+        ended: Why monitoring ended ('INTERRUPTED', 'CANCELLED' or
+            'app_changed'; None while monitoring)
+    """
+
+    def __init__(
+        self,
+        request_status: Callable[[], None],
+        recover: Callable[[], Awaitable[None]],
+        thresholds: Optional[PlaybackThresholds] = None,
+        poll_interval: Optional[float] = None,
+        app_running: Optional[Callable[[], bool]] = None
+    ):
+        """Initialize monitor.
+
+        Args:
+            request_status: Asks the receiver for a media status (blocking
+                call, run in a worker thread)
+            recover: Reloads the media at its live edge
+            app_running: Whether the receiver app the media was cast to is
+                still running (checked before each poll; None = always)
+            thresholds: Recovery thresholds (default: CAST_* env vars)
+            poll_interval: Seconds between status requests (default:
+                CAST_PLAYBACK_POLL_INTERVAL env var)
+        """
+        self.request_status = request_status
+        self.recover = recover
+        self.app_running = app_running
+        self.thresholds = thresholds or PlaybackThresholds.from_env()
+        self.poll_interval = poll_interval if poll_interval is not None else float(
+            os.getenv('CAST_PLAYBACK_POLL_INTERVAL', '10')
+        )
+        self.state = UNKNOWN
+        self.idle_reason: Optional[str] = None
+        self.stalls = 0
+        self.recoveries = 0
+        self.transitions: list[dict] = []
+        self.ended: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._recovering = False
+        self._recovered_at = 0.0
+        self._started_at = time.monotonic()
+        self._state_since = self._started_at
+        self._state_seconds: dict[str, float] = {}
+        self._first_playing_at: Optional[float] = None
+        self._position: Optional[float] = None
+        self._position_since = self._started_at
+
+    async def __aenter__(self) -> "PlaybackMonitor":
+        self._loop = asyncio.get_running_loop()
+        if self.poll_interval > 0:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._loop = None  # Ignore statuses still in flight
+        logger.info(f"Playback monitor stopped: {self.stats()}")
+        # Don't suppress exceptions
+        return False
+
+    # MediaStatusListener (called on pychromecast's socket thread)
+
+    def new_media_status(self, status) -> None:
+        loop = self._loop
+        if loop is not None:
+            # Copy the fields: pychromecast updates the status object in place
+            loop.call_soon_threadsafe(
+                self.on_status, status.player_state, status.idle_reason,
+                status.current_time
+            )
+
+    def load_media_failed(self, queue_item_id: int, error_code: int) -> None:
+        logger.warning(f"Receiver failed to load media (error {error_code})")
+
+    # Event loop side
+
+    def on_status(
+        self,
+        state: str,
+        idle_reason: Optional[str] = None,
+        position: Optional[float] = None
+    ) -> None:
+        """Record a receiver status."""
+        now = time.monotonic()
+        state = state or UNKNOWN
+        if state != self.state:
+            self._state_seconds[self.state] = (
+                self._state_seconds.get(self.state, 0.0) + now - self._state_since
+            )
+            if state == BUFFERING and self.state == PLAYING:
+                self.stalls += 1
+            if state == PLAYING and self._first_playing_at is None:
+                self._first_playing_at = now
+            logger.info(
+                f"Receiver {self.state} -> {state}"
+                + (f" ({idle_reason})" if idle_reason else "")
+            )
+            self.transitions.append({
+                'state': state, 'idle_reason': idle_reason,
+                'at': round(now - self._started_at, 1),
+            })
+            del self.transitions[:-MAX_TRANSITIONS]
+            self.state = state
+            self._state_since = now
+            self._position_since = now
+        self.idle_reason = idle_reason
+        if position is not None and position != self._position:
+            self._position = position
+            self._position_since = now
+        if state == IDLE and idle_reason in ENDED_BY_USER:
+            self._end(idle_reason)
+
+    def _end(self, reason: str) -> None:
+        """Stop monitoring: the TV is someone else's now."""
+        if self.ended is not None:
+            return
+        self.ended = reason
+        logger.info(f"Playback ended by another sender or user ({reason}), no longer monitoring")
+        if self._task and not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    def stats(self) -> dict:
+        """Quality-of-experience counters for the session."""
+        now = time.monotonic()
+        seconds = dict(self._state_seconds)
+        seconds[self.state] = seconds.get(self.state, 0.0) + now - self._state_since
+        playing = seconds.get(PLAYING, 0.0)
+        buffering = seconds.get(BUFFERING, 0.0)
+        return {
+            'state': self.state,
+            'idle_reason': self.idle_reason,
+            'time_to_first_play_s': (
+                round(self._first_playing_at - self._started_at, 2)
+                if self._first_playing_at is not None else None
+            ),
+            'playing_s': round(playing, 1),
+            'buffering_s': round(buffering, 1),
+            'rebuffer_ratio': round(buffering / (playing + buffering), 4) if playing + buffering else 0.0,
+            'stalls': self.stalls,
+            'recoveries': self.recoveries,
+            'ended': self.ended,
+            'transitions': list(self.transitions),
+        }
+
+    def problem(self, now: Optional[float] = None) -> Optional[str]:
+        """Why playback needs a reload right now, or None."""
+        if self.ended is not None:
+            return None
+        now = time.monotonic() if now is None else now
+        # Give a reload a full threshold before judging it
+        in_state = now - max(self._state_since, self._recovered_at)
+        t = self.thresholds
+        if self.state == BUFFERING and t.stall_timeout and in_state >= t.stall_timeout:
+            return f"buffering for {in_state:.0f}s"
+        if (self.state == IDLE and self.idle_reason not in ENDED_BY_USER
+                and t.idle_timeout and in_state >= t.idle_timeout):
+            return f"idle ({self.idle_reason or 'no media'}) for {in_state:.0f}s"
+        frozen = now - max(self._position_since, self._recovered_at)
+        if self.state == PLAYING and t.stale_timeout and frozen >= t.stale_timeout:
+            return f"position frozen for {frozen:.0f}s"
+        return None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self.ended is None:
+            # A status request to another app would relaunch the media receiver
+            if self.app_running is not None and not self.app_running():
+                self._end('app_changed')
+                return
+            try:
+                await loop.run_in_executor(None, self.request_status)
+            except Exception as e:
+                logger.debug(f"Media status request failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+            await self.check()
+
+    async def check(self) -> bool:
+        """Reload playback if it has been broken too long.
+
+        Returns:
+            True if a reload was issued
+        """
+        reason = self.problem()
+        if reason is None or self._recovering:
+            return False
+        if self.recoveries >= self.thresholds.max_recoveries:
+            logger.error(f"Playback {reason}, but recovery limit reached")
+            return False
+        self.recoveries += 1
+        logger.warning(
+            f"Playback {reason}, reloading at the live edge "
+            f"({self.recoveries}/{self.thresholds.max_recoveries})"
+        )
+        self._recovering = True
+        try:
+            await self.recover()
+        except Exception as e:
+            logger.error(f"Playback recovery failed: {e}")
+        finally:
+            self._recovering = False
+            self._recovered_at = time.monotonic()
+        return True
@@ -0,0 +1,399 @@
+"""Persistent Cast device connections shared across sessions.
+
+Every stream used to discover its device (mDNS, or get_chromecast_from_host
+for CAST_DEVICE_IP), wait for the TLS connection and receiver status, and
+disconnect again when the session ended, so each start paid for discovery,
+the handshake and the device wait. A CastDeviceRegistry keeps the
+pychromecast connections open between sessions and hands out the already
+connected device.
+
+pychromecast's socket client heartbeats the connection (PING/PONG) and
+reports connection status changes. The registry listens to those reports and
+also polls each connection. A connection that stays down is rebuilt from its
+host and port with exponential backoff (decorrelated jitter), so the next
+session finds it connected again. Reconnect outcomes feed the device's
+circuit breaker (see breaker.py).
+
+Environment variables:
+    CAST_POOL: Keep Cast connections open between sessions (default: true)
+    CAST_POOL_CHECK_INTERVAL: Seconds between connection health checks
+                              (default: 15)
+    CAST_POOL_CONNECT_TIMEOUT: Seconds to wait for a (re)connection
+                               (default: 10)
+    CAST_POOL_MAX_BACKOFF: Maximum delay between reconnection attempts in
+                           seconds (default: 60)
+"""
+
+from typing import Optional
+import asyncio
+import logging
+import os
+import time
+
+import pychromecast
+from pychromecast.socket_client import (
+    CONNECTION_STATUS_CONNECTED,
+    CONNECTION_STATUS_DISCONNECTED,
+    CONNECTION_STATUS_FAILED,
+    CONNECTION_STATUS_LOST,
+)
+
+from .breaker import CircuitBreaker, get_breakers
+from .device_index import parse_uuid
+from .discovery import get_cast_device, get_device_name, parse_cast_address, parse_cast_addresses
+from .retry import decorrelated_jitter
+
+logger = logging.getLogger(__name__)
+
+
+class _ConnectionListener:
+    """Forwards pychromecast connection status (socket thread) to the registry loop."""
+
+    def __init__(self, registry: "CastDeviceRegistry", pooled: "PooledDevice"):
+        self.registry = registry
+        self.pooled = pooled
+
+    def new_connection_status(self, status) -> None:
+        self.registry._loop.call_soon_threadsafe(
+            self.registry._on_connection_status, self.pooled, status.status
+        )
+
+
+class PooledDevice:
+    """A Cast device connection kept open by the registry.
+
+    Attributes:
+        device: Connected pychromecast Chromecast
+        name: Friendly name at registration
+        host: Device IP
+        port: Cast port
+        connected_at: monotonic time of the last successful connection
+        disconnected_since: monotonic time the connection was last seen down
+            (None while connected)
+        reconnects: Connections rebuilt by the registry
+    """
+
+    def __init__(self, device: pychromecast.Chromecast):
+        self.device = device
+        self.name = get_device_name(device)
+        info = getattr(device, 'cast_info', None)
+        self.host = (info.host if info else None) or getattr(device, 'host', None)
+        self.port = (info.port if info else None) or getattr(device, 'port', None) or 8009
+        self.connected_at = time.monotonic()
+        self.disconnected_since: Optional[float] = None
+        self.reconnects = 0
+        self.reconnect_task: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        socket_client = getattr(self.device, 'socket_client', None)
+        return bool(socket_client and socket_client.is_connected)
+
+    @property
+    def named(self) -> bool:
+        """Whether the device's friendly name is known (not just its host)."""
+        return bool(getattr(getattr(self.device, 'cast_info', None), 'friendly_name', None))
+
+    def matches(self, device_name: Optional[str]) -> bool:
+        """Whether this device answers to a friendly name or UUID (None = any)."""
+        if device_name is None or self.name.lower() == device_name.lower():
+            return True
+        uuid = getattr(getattr(self.device, 'cast_info', None), 'uuid', None)
+        return uuid is not None and uuid == parse_uuid(device_name)
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'host': self.host,
+            'connected': self.connected,
+            'reconnects': self.reconnects,
+        }
+
+
+class CastDeviceRegistry:
+    """Pool of open Cast device connections.
+
+    Usage:
+        async with CastDeviceRegistry() as registry:
+            device = await registry.get_device("Living Room TV")  # Connected
+            async with CastSessionManager(device, keep_connection=True):
+                ...
+            # Connection stays open for the next session
+    """
+
+    def __init__(
+        self,
+        check_interval: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+        max_backoff: Optional[float] = None
+    ):
+        """Initialize registry.
+
+        Args:
+            check_interval: Seconds between health checks (default:
+                CAST_POOL_CHECK_INTERVAL env var)
+            connect_timeout: Seconds to wait for a connection (default:
+                CAST_POOL_CONNECT_TIMEOUT env var)
+            max_backoff: Maximum reconnect delay (default:
+                CAST_POOL_MAX_BACKOFF env var)
+        """
+        self.check_interval = check_interval if check_interval is not None else float(
+            os.getenv('CAST_POOL_CHECK_INTERVAL', '15')
+        )
+        self.connect_timeout = connect_timeout if connect_timeout is not None else float(
+            os.getenv('CAST_POOL_CONNECT_TIMEOUT', '10')
+        )
+        self.max_backoff = max_backoff if max_backoff is not None else float(
+            os.getenv('CAST_POOL_MAX_BACKOFF', '60')
+        )
+        self.devices: list[PooledDevice] = []
+        # In-flight lookups by device name: concurrent lookups of one device
+        # share its discovery, lookups of different devices run in parallel
+        self._lookups: dict[str, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def start(self, prewarm: Optional[str] = None) -> None:
+        """Start health monitoring.
+
+        Args:
+            prewarm: Connect to this device (friendly name, '' = first
+                available) in the background right away
+        """
+        self._loop = asyncio.get_running_loop()
+        if self._monitor_task is None and self.check_interval > 0:
+            self._monitor_task = asyncio.create_task(self._monitor())
+        if prewarm is not None:
+            self._spawn(self.get_device(prewarm or None))
+        logger.info("Cast device registry started")
+
+    async def stop(self) -> None:
+        """Stop monitoring and disconnect every pooled device."""
+        tasks = [
+            t for t in [self._monitor_task, *self._tasks, *self._lookups.values()] if t and not t.done()
+        ]
+        for pooled in self.devices:
+            if pooled.reconnect_task and not pooled.reconnect_task.done():
+                tasks.append(pooled.reconnect_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._monitor_task = None
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(None, lambda d=pooled.device: d.disconnect(timeout=2))
+            for pooled in self.devices
+        ), return_exceptions=True)
+        self.devices = []
+        logger.info("Cast device registry stopped")
+
+    async def __aenter__(self) -> "CastDeviceRegistry":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+        return False
+
+    def stats(self) -> list[dict]:
+        """State of every pooled connection."""
+        return [pooled.to_dict() for pooled in self.devices]
+
+    async def get_device(self, device_name: Optional[str] = None) -> Optional[pychromecast.Chromecast]:
+        """Get a connected device, discovering and connecting it only if not pooled.
+
+        Args:
+            device_name: Friendly name (None = CAST_DEVICE_NAME env var, or
+                any device)
+
+        Returns:
+            Connected Chromecast, or None if it can't be found
+        """
+        if self._loop is None:
+            await self.start()
+        if device_name is None:
+            device_name = os.getenv('CAST_DEVICE_NAME')
+
+        key = (device_name or '').lower()
+        lookup = self._lookups.get(key)
+        if lookup is None:
+            lookup = asyncio.create_task(self._lookup(device_name))
+            self._lookups[key] = lookup
+            lookup.add_done_callback(lambda _: self._lookups.pop(key, None))
+        # A cancelled caller leaves the lookup running for the others
+        return await asyncio.shield(lookup)
+
+    async def _lookup(self, device_name: Optional[str]) -> Optional[pychromecast.Chromecast]:
+        """Find a device in the pool, or discover, connect and pool it."""
+        # get_cast_device() connects to a single CAST_DEVICE_IP whatever the
+        # name, and picks the named device among several
+        static_ip = os.getenv('CAST_DEVICE_IP')
+        static_hosts = [
+            parse_cast_address(address)[0] for address in parse_cast_addresses(static_ip)
+        ] if static_ip else []
+
+        if len(static_hosts) == 1:
+            pooled = next((p for p in self.devices if p.host == static_hosts[0]), None)
+        elif static_hosts:
+            candidates = [p for p in self.devices if p.host in static_hosts]
+            # Devices that don't serve their device info stay unnamed
+            pooled = next((p for p in candidates if p.matches(device_name)), None) or next(
+                (p for p in candidates if not p.named), None
+            )
+        else:
+            pooled = next((p for p in self.devices if p.matches(device_name)), None)
+        if pooled is not None:
+            if pooled.connected:
+                logger.info(f"Reusing open connection to {pooled.name}")
+                return pooled.device
+            # Reconnecting: give it the connect timeout before rediscovering,
+            # unless its breaker already knows it is down
+            self._schedule_reconnect(pooled)
+            breaker = self._breaker(pooled)
+            if breaker is None or breaker.allow():
+                await asyncio.wait({pooled.reconnect_task}, timeout=self.connect_timeout)
+            if pooled.connected:
+                return pooled.device
+            logger.warning(f"Pooled connection to {pooled.name} is down, rediscovering")
+            await self._remove(pooled)
+
+        device = await get_cast_device(device_name)
+        if device is None:
+            return None
+        return (await self._add(device)).device
+
+    async def _add(self, device: pychromecast.Chromecast) -> PooledDevice:
+        """Wait for a device's connection and register it in the pool.
+
+        A device that doesn't connect in time is pooled anyway; the monitor
+        rebuilds its connection if it stays down.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, lambda: device.wait(timeout=self.connect_timeout))
+        except Exception as e:
+            logger.warning(f"Could not connect to {get_device_name(device)} yet: {e}")
+        pooled = PooledDevice(device)
+        # Read and insert without awaiting in between, so a lookup under
+        # another name that pooled the same host meanwhile is seen
+        existing = next(
+            (p for p in self.devices if p.host == pooled.host and p.port == pooled.port and p.connected),
+            None
+        )
+        if existing is not None:
+            logger.info(f"{existing.name} was pooled meanwhile, dropping the duplicate connection")
+            await loop.run_in_executor(None, lambda: device.disconnect(timeout=2))
+            return existing
+        stale = [p for p in self.devices if p.host == pooled.host]
+        device.register_connection_listener(_ConnectionListener(self, pooled))
+        self.devices.append(pooled)
+        logger.info(f"Pooled Cast connection to {pooled.name} ({pooled.host}:{pooled.port})")
+        for old in stale:
+            await self._remove(old)
+        return pooled
+
+    async def _remove(self, pooled: PooledDevice) -> None:
+        if pooled in self.devices:
+            self.devices.remove(pooled)
+        if pooled.reconnect_task and not pooled.reconnect_task.done():
+            pooled.reconnect_task.cancel()
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, lambda: pooled.device.disconnect(timeout=2))
+        except Exception as e:
+            logger.debug(f"Error disconnecting {pooled.name}: {e}")
+
+    def _on_connection_status(self, pooled: PooledDevice, status: str) -> None:
+        """Connection status from pychromecast's socket thread (via the loop)."""
+        if pooled not in self.devices:
+            return
+        if status == CONNECTION_STATUS_CONNECTED:
+            if pooled.disconnected_since is not None:
+                logger.info(f"Cast connection to {pooled.name} restored")
+            pooled.disconnected_since = None
+            pooled.connected_at = time.monotonic()
+        elif status in (CONNECTION_STATUS_LOST, CONNECTION_STATUS_FAILED,
+                        CONNECTION_STATUS_DISCONNECTED):
+            logger.warning(f"Cast connection to {pooled.name}: {status}")
+            if pooled.disconnected_since is None:
+                pooled.disconnected_since = time.monotonic()
+            if status != CONNECTION_STATUS_LOST:
+                # The socket client gave up: rebuild the connection ourselves
+                self._schedule_reconnect(pooled)
+
+    async def _monitor(self) -> None:
+        """Rebuild connections that stay down for longer than a check interval."""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            now = time.monotonic()
+            for pooled in list(self.devices):
+                if pooled.connected:
+                    pooled.disconnected_since = None
+                    continue
+                if pooled.disconnected_since is None:
+                    pooled.disconnected_since = now
+                elif now - pooled.disconnected_since >= self.check_interval:
+                    self._schedule_reconnect(pooled)
+
+    def _schedule_reconnect(self, pooled: PooledDevice) -> None:
+        if pooled.reconnect_task is None or pooled.reconnect_task.done():
+            pooled.reconnect_task = asyncio.create_task(self._reconnect(pooled))
+
+    async def _reconnect(self, pooled: PooledDevice) -> None:
+        """Replace a dead connection, backing off (with decorrelated jitter) between attempts."""
+        loop = asyncio.get_running_loop()
+        breaker = self._breaker(pooled)
+        delay = 1.0
+        while pooled in self.devices:
+            logger.info(f"Reconnecting to {pooled.name} at {pooled.host}:{pooled.port}...")
+
+            def connect():
+                # Tuple: (host, port, uuid, model_name, friendly_name)
+                info = getattr(pooled.device, 'cast_info', None)
+                device = pychromecast.get_chromecast_from_host((
+                    pooled.host, pooled.port,
+                    info.uuid if info else None,
+                    info.model_name if info else None,
+                    info.friendly_name if info else None,
+                ), tries=1)
+                device.wait(timeout=self.connect_timeout)
+                return device
+
+            started = loop.time()
+            try:
+                device = await loop.run_in_executor(None, connect)
+                if device.socket_client.is_connected:
+                    if breaker:
+                        breaker.record_success((loop.time() - started) * 1000)
+                    old = pooled.device
+                    pooled.device = device
+                    pooled.reconnects += 1
+                    pooled.disconnected_since = None
+                    pooled.connected_at = time.monotonic()
+                    device.register_connection_listener(_ConnectionListener(self, pooled))
+                    await loop.run_in_executor(None, lambda: old.disconnect(timeout=1))
+                    logger.info(f"Reconnected to {pooled.name}")
+                    return
+                await loop.run_in_executor(None, lambda: device.disconnect(timeout=1))
+            except Exception as e:
+                logger.warning(f"Reconnect to {pooled.name} failed: {e}")
+            if breaker:
+                breaker.record_failure()
+
+            logger.info(f"Retrying connection to {pooled.name} in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = decorrelated_jitter(delay, 1.0, self.max_backoff)
+
+    @staticmethod
+    def _breaker(pooled: PooledDevice) -> Optional[CircuitBreaker]:
+        breakers = get_breakers()
+        if breakers is None or not isinstance(pooled.host, str) or not isinstance(pooled.port, int):
+            return None
+        return breakers.get(f"{pooled.host}:{pooled.port}")
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
@@ -1,11 +1,14 @@
 """Exponential backoff retry mechanism for Cast operations.
 
 Provides retry logic with exponential backoff for handling transient
-connection failures and network issues.
+connection failures and network issues. With jitter, delays follow the
+"decorrelated jitter" schedule, so callers retrying the same device at the
+same time spread out instead of retrying in lockstep.
 """
 
 import asyncio
 import logging
+import random
 from typing import Callable, TypeVar, Any
 
 logger = logging.getLogger(__name__)
@@ -13,13 +16,25 @@ logger = logging.getLogger(__name__)
 T = TypeVar('T')
 
 
+def decorrelated_jitter(previous: float, base: float, cap: float) -> float:
+    """Next delay after previous: uniform between base and 3x previous, capped.
+
+    Args:
+        previous: Last delay (base for the first one)
+        base: Minimum delay
+        cap: Maximum delay
+    """
+    return min(cap, random.uniform(base, max(base, previous * 3)))
+
+
 async def retry_with_backoff(
     func: Callable[..., T],
     max_retries: int = 3,
     initial_delay: float = 1.0,
     max_delay: float = 60.0,
     backoff_factor: float = 2.0,
-    exceptions: tuple = (Exception,)
+    exceptions: tuple = (Exception,),
+    jitter: bool = False
 ) -> T:
     """
     Retry async function with exponential backoff.
@@ -31,6 +46,8 @@ async def retry_with_backoff(
         max_delay: Maximum delay cap in seconds
         backoff_factor: Multiplier for delay (typically 2.0)
         exceptions: Tuple of exceptions to catch and retry
+        jitter: Randomize delays with decorrelated jitter (backoff_factor is
+            then unused)
 
     Returns:
         Result of successful function call
@@ -47,9 +64,12 @@ async def retry_with_backoff(
         except exceptions as e:
             last_exception = e
             if attempt < max_retries:
-                logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {delay}s...")
+                if jitter:
+                    delay = decorrelated_jitter(delay, initial_delay, max_delay)
+                logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {delay:.2f}s...")
                 await asyncio.sleep(delay)
-                delay = min(delay * backoff_factor, max_delay)
+                if not jitter:
+                    delay = min(delay * backoff_factor, max_delay)
             else:
                 logger.error(f"All {max_retries} retries exhausted: {e}")
                 raise last_exception
@@ -2,24 +2,128 @@
 
 Provides a context manager for managing Cast sessions with automatic
 HDMI-CEC wake and proper resource cleanup.
+
+Environment variables:
+    CAST_WAKE_TIMEOUT: Maximum seconds to wait for a TV in standby to report
+                       it is on after the wake signal (default: 10)
 """
 
-from typing import Optional
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Optional
 import asyncio
 import logging
+import os
 import pychromecast
+from pychromecast.controllers.media import MediaStatusListener
+from pychromecast.error import ChromecastConnectionError, NotConnected, RequestTimeout
+from pychromecast.controllers.receiver import CastStatusListener
+from .breaker import get_breakers
+from .playback import PlaybackMonitor
 from .retry import retry_with_backoff
 from .discovery import get_device_name
 
+if TYPE_CHECKING:
+    from ..video.timeline import StartupTimeline
+
 logger = logging.getLogger(__name__)
 
+# Wait after the wake signal for devices that don't report standby/input state
+BLIND_WAKE_DELAY = 2.0
+
+# Connection errors worth retrying; anything else (bad device object,
+# programming errors) fails on the first attempt
+TRANSIENT_ERRORS = (
+    ConnectionError, TimeoutError, OSError,
+    ChromecastConnectionError, NotConnected, RequestTimeout,
+)
+
+
+def _remove_listener(controller, listener) -> None:
+    """Detach a pychromecast listener (pychromecast has no public unregister)."""
+    listeners = getattr(controller, '_status_listeners', None)
+    if isinstance(listeners, list) and listener in listeners:
+        listeners.remove(listener)
+
+
+def _reports_power(status) -> bool:
+    """Whether a CastStatus says anything about the TV's power/input state."""
+    return isinstance(getattr(status, 'is_stand_by', None), bool) or \
+        isinstance(getattr(status, 'is_active_input', None), bool)
+
+
+def _is_awake(status) -> bool:
+    """Whether a CastStatus shows the TV on and showing the Cast input."""
+    return (
+        getattr(status, 'is_stand_by', None) is not True
+        and getattr(status, 'is_active_input', None) is not False
+    )
+
+
+class _AwakeListener(CastStatusListener):
+    """Resolves a future once the receiver reports the TV awake (socket thread -> loop)."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future: asyncio.Future = loop.create_future()
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(True)
+
+    def new_cast_status(self, status) -> None:
+        if _reports_power(status) and _is_awake(status):
+            self.loop.call_soon_threadsafe(self._resolve)
+
+
+class _MediaActiveListener(MediaStatusListener):
+    """Resolves a future once the receiver reports a media session for a URL.
+
+    pychromecast calls listeners from its socket thread; results are handed
+    to the event loop with call_soon_threadsafe.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        media_url: str,
+        previous_session: Optional[int] = None
+    ):
+        self.loop = loop
+        self.media_url = media_url
+        self.previous_session = previous_session  # Session to replace (reloads of the same URL)
+        self.future: asyncio.Future = loop.create_future()
+
+    def _resolve(self, error: Optional[str] = None) -> None:
+        if self.future.done():
+            return
+        if error:
+            self.future.set_exception(RuntimeError(error))
+        else:
+            self.future.set_result(True)
+
+    def fail(self, error: str) -> None:
+        self.loop.call_soon_threadsafe(self._resolve, error)
+
+    def new_media_status(self, status) -> None:
+        if (status.media_session_id not in (None, self.previous_session)
+                and status.content_id == self.media_url):
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def load_media_failed(self, queue_item_id: int, error_code: int) -> None:
+        self.fail(f"Cast device failed to load media (error {error_code})")
+
+    def detach(self, media_controller) -> None:
+        """Stop listening."""
+        _remove_listener(media_controller, self)
+
 
 class CastSessionManager:
     """Manages Cast session lifecycle with automatic cleanup and HDMI-CEC wake.
 
     Provides async context manager pattern for Cast sessions with:
     - Automatic HDMI-CEC wake signal to turn on TV
-    - Exponential backoff retry for connection reliability
+    - Exponential backoff retry (with jitter) for connection reliability
+    - Fail fast on devices whose circuit breaker is open (see breaker.py)
     - Proper resource cleanup on exit
     - Graceful error handling
 
@@ -29,34 +133,61 @@ class CastSessionManager:
     Usage:
         device = await get_cast_device("Living Room TV")
         async with CastSessionManager(device) as session:
-            session.start_cast("http://example.com/video.mp4")
+            await session.start_cast("http://example.com/video.mp4")
             # Session automatically cleaned up on exit
 
     Attributes:
         device: The pychromecast Chromecast device
         is_active: Boolean indicating if session is currently active
+        playback: Monitor of the live cast's receiver state (see playback.py)
     """
 
-    def __init__(self, device: pychromecast.Chromecast):
+    def __init__(
+        self,
+        device: pychromecast.Chromecast,
+        timeline: Optional["StartupTimeline"] = None,
+        stop_timeout: float = 2.0,
+        keep_connection: bool = False,
+        wake_timeout: Optional[float] = None
+    ):
         """Initialize session manager with Cast device.
 
         Args:
             device: Chromecast device from discovery
+            timeline: Optional startup timeline to record connect/wake spans
+            stop_timeout: Seconds allowed for media stop and for disconnect
+                during cleanup
+            keep_connection: Leave the device connected on exit (the
+                connection belongs to a CastDeviceRegistry)
+            wake_timeout: Maximum seconds to wait for the TV to wake
+                (default: CAST_WAKE_TIMEOUT env var)
         """
         self.device = device
+        self.timeline = timeline
+        self.stop_timeout = stop_timeout
+        self.keep_connection = keep_connection
+        self.wake_timeout = wake_timeout if wake_timeout is not None else float(
+            os.getenv('CAST_WAKE_TIMEOUT', '10')
+        )
         self.is_active = False
+        self.playback: Optional[PlaybackMonitor] = None
+
+    def _span(self, stage: str):
+        """Time a stage on the startup timeline, if one was provided."""
+        return self.timeline.span(stage) if self.timeline else nullcontext()
 
     async def __aenter__(self):
         """Enter context manager - start Cast session with HDMI-CEC wake and retry logic.
 
         Establishes connection to the Cast device with automatic retry on failure,
-        then sends HDMI-CEC wake signal to turn on the TV. Includes a 2-second
-        delay after wake to allow TV to fully initialize.
+        then wakes the TV over HDMI-CEC if the receiver reports it idle or in
+        standby (see _wake).
 
         Returns:
             Self for context manager pattern
 
         Raises:
+            CircuitOpenError: If the device's circuit breaker is open
             Exception: If connection fails after all retry attempts
         """
         logger.info(f"Starting Cast session for device: {get_device_name(self.device)}")
@@ -64,18 +195,75 @@ class CastSessionManager:
         try:
             loop = asyncio.get_event_loop()
 
+            # Devices that keep failing are refused at once (see breaker.py)
+            breakers = get_breakers()
+            breaker = breakers.for_device(self.device) if breakers else None
+            if breaker:
+                breaker.check()
+
             # Wait for device to be ready with retry (blocking call)
             async def wait_for_device():
                 await loop.run_in_executor(None, self.device.wait)
                 logger.debug("Device ready")
 
-            await retry_with_backoff(
-                wait_for_device,
-                max_retries=3,
-                initial_delay=1.0,
-                exceptions=(ConnectionError, TimeoutError, Exception)
-            )
+            with self._span('cast_connect'):
+                started = loop.time()
+                try:
+                    await retry_with_backoff(
+                        wait_for_device,
+                        max_retries=3,
+                        initial_delay=1.0,
+                        exceptions=TRANSIENT_ERRORS,
+                        jitter=True
+                    )
+                except Exception:
+                    if breaker:
+                        breaker.record_failure()
+                    raise
+                if breaker:
+                    breaker.record_success((loop.time() - started) * 1000)
+
+            with self._span('wake'):
+                await self._wake()
+
+            self.is_active = True
+            logger.info("Cast session active")
+            return self
 
+        except Exception as e:
+            logger.error(f"Failed to start Cast session: {e}")
+            raise
+
+    def _needs_wake(self) -> bool:
+        """Whether the receiver reports the TV idle, in standby or on another input.
+
+        Most dongles and Google TV sets report neither standby nor input
+        state; for those a running Cast app is taken to mean the TV is on.
+        """
+        status = getattr(self.device, 'status', None)
+        if status is None:
+            return True
+        if _reports_power(status) and not _is_awake(status):
+            return True
+        return bool(self.device.is_idle)
+
+    async def _wake(self) -> None:
+        """Wake the TV via HDMI-CEC and wait until it reports being on.
+
+        Skipped when a Cast app is running and the TV doesn't report being
+        in standby or on another input. The wait ends on the receiver's
+        status change (standby off / Cast input active); devices that report
+        neither get a short fixed delay.
+        """
+        if not self._needs_wake():
+            logger.info("Cast device already awake, skipping wake")
+            return
+
+        loop = asyncio.get_running_loop()
+        receiver = self.device.socket_client.receiver_controller
+        awake = _AwakeListener(loop)
+        receiver.register_status_listener(awake)
+        try:
             # Wake TV via HDMI-CEC by unmuting volume
             # This triggers HDMI-CEC wake signal built into pychromecast
             await loop.run_in_executor(
@@ -84,16 +272,20 @@ class CastSessionManager:
             )
             logger.info("HDMI-CEC wake signal sent (unmute)")
 
-            # Give TV time to wake up and establish connection
-            await asyncio.sleep(2)
-
-            self.is_active = True
-            logger.info("Cast session active")
-            return self
-
-        except Exception as e:
-            logger.error(f"Failed to start Cast session: {e}")
-            raise
+            status = getattr(self.device, 'status', None)
+            if not _reports_power(status):
+                # Nothing to observe: give the TV time to wake up
+                await asyncio.sleep(BLIND_WAKE_DELAY)
+            elif _is_awake(status):
+                logger.debug("TV already on")
+            else:
+                try:
+                    await asyncio.wait_for(awake.future, timeout=self.wake_timeout)
+                    logger.info("TV reported awake")
+                except asyncio.TimeoutError:
+                    logger.warning(f"TV did not report awake within {self.wake_timeout}s, continuing")
+        finally:
+            _remove_listener(receiver, awake)
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Exit context manager - clean up Cast session."""
@@ -104,10 +296,17 @@ class CastSessionManager:
             if self.is_active:
                 await self.stop_cast()
 
-            # Disconnect from device
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self.device.disconnect)
-            logger.debug("Device disconnected")
+            # Disconnect from device (pooled connections stay open for the next session)
+            if not self.keep_connection:
+                loop = asyncio.get_event_loop()
+                await asyncio.wait_for(
+                    loop.run_in_executor(
+                        None,
+                        lambda: self.device.disconnect(timeout=self.stop_timeout)
+                    ),
+                    timeout=self.stop_timeout + 1
+                )
+                logger.debug("Device disconnected")
 
             self.is_active = False
             logger.info("Cast session cleanup complete")
@@ -118,17 +317,38 @@ class CastSessionManager:
         # Don't suppress exceptions
         return False
 
-    def start_cast(self, media_url: str, mode: str = 'hls'):
+    async def start_cast(
+        self,
+        media_url: str,
+        mode: str = 'hls',
+        timeout: float = 10.0,
+        autoplay: bool = True,
+        current_time: Optional[float] = None
+    ) -> bool:
         """Start casting media to device.
 
-        Initiates media playback on the Cast device using media_controller.play_media().
+        Sends the LOAD request from a worker thread and waits, without
+        blocking the event loop, for the receiver to report a media session
+        for the URL. The streaming server keeps serving the playlist the
+        receiver is fetching in the meantime. Cancelling the call stops
+        waiting (the LOAD request may still have been sent).
 
         Args:
             media_url: URL of media to cast (HLS playlist or fMP4 stream)
-            mode: Streaming mode ('hls' or 'fmp4') - determines content_type and stream_type
+            mode: Streaming mode ('hls' or 'fmp4', or 'clip' for a finite MP4
+                such as a slate) - determines content_type and stream_type
+            timeout: Seconds to wait for the media session to become active
+            autoplay: Start playing once loaded (False = load paused, e.g. to
+                start several screens together, see group.py)
+            current_time: Position to load at (None = the live edge)
+
+        Returns:
+            True once the receiver reports the media active, False if it
+            didn't within timeout (playback may still start)
 
         Raises:
-            RuntimeError: If session not initialized (must use context manager)
+            RuntimeError: If session not initialized (must use context manager),
+                or the receiver rejected the request
         """
         if not self.is_active:
             logger.error("Cannot start cast - session not active")
@@ -138,21 +358,116 @@ class CastSessionManager:
         if mode == 'fmp4':
             content_type = 'video/mp4'
             stream_type = 'LIVE'
+        elif mode == 'clip':
+            content_type = 'video/mp4'
+            stream_type = 'BUFFERED'
         else:  # hls (default)
             content_type = 'application/vnd.apple.mpegurl'
             stream_type = 'BUFFERED'
 
         logger.info(f"Starting cast: url={media_url}, mode={mode}, content_type={content_type}, stream_type={stream_type}")
 
-        # Play media on Cast device
-        self.device.media_controller.play_media(
-            media_url,
-            content_type,
-            stream_type=stream_type
+        # A new LOAD replaces whatever the monitor was watching
+        await self._stop_playback_monitor()
+        started = await self._load(
+            media_url, content_type, stream_type, timeout, autoplay, current_time
         )
-        self.device.media_controller.block_until_active(timeout=10)
+        if mode != 'clip':
+            # Watch live playback (even if unconfirmed) and reload it at the
+            # live edge if it breaks
+            await self._start_playback_monitor(
+                lambda: self._load(media_url, content_type, stream_type, timeout)
+            )
+        elif started:
+            await self._repeat_clip()
+        if started:
+            logger.info("Cast playback started successfully")
+        return started
+
+    async def _load(
+        self,
+        media_url: str,
+        content_type: str,
+        stream_type: str,
+        timeout: float,
+        autoplay: bool = True,
+        current_time: Optional[float] = None
+    ) -> bool:
+        """Send a LOAD request and wait for the receiver's new media session."""
+        loop = asyncio.get_running_loop()
+        media_controller = self.device.media_controller
+        previous_session = getattr(media_controller.status, 'media_session_id', None)
+        active = _MediaActiveListener(loop, media_url, previous_session)
+        media_controller.register_status_listener(active)
+
+        def on_sent(msg_sent: bool, response) -> None:
+            # pychromecast callback (socket thread)
+            if not msg_sent:
+                active.fail(f"Cast device did not accept the load request: {response}")
 
-        logger.info("Cast playback started successfully")
+        try:
+            # Play media on Cast device (may launch the media receiver first)
+            await loop.run_in_executor(None, lambda: media_controller.play_media(
+                media_url,
+                content_type,
+                stream_type=stream_type,
+                autoplay=autoplay,
+                current_time=current_time,
+                callback_function=on_sent
+            ))
+            await asyncio.wait_for(active.future, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Cast media not active after {timeout}s, continuing")
+            return False
+        finally:
+            active.detach(media_controller)
+        return True
+
+    async def _repeat_clip(self) -> None:
+        """Have the receiver loop the loaded clip (slates are a few seconds long)."""
+        media_controller = self.device.media_controller
+        session_id = getattr(media_controller.status, 'media_session_id', None)
+        if session_id is None:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, lambda: media_controller.send_message(
+                {'type': 'QUEUE_UPDATE', 'mediaSessionId': session_id, 'repeatMode': 'REPEAT_SINGLE'},
+                inc_session_id=True
+            ))
+        except Exception as e:
+            # Plays once and holds its last frame instead
+            logger.debug(f"Could not set the clip to repeat: {e}")
+
+    async def _start_playback_monitor(self, recover) -> None:
+        monitor = PlaybackMonitor(
+            request_status=self.device.media_controller.update_status,
+            recover=recover,
+            app_running=self._media_app_running
+        )
+        if monitor.poll_interval <= 0:
+            return
+        self.device.media_controller.register_status_listener(monitor)
+        self.playback = await monitor.__aenter__()
+
+    def _media_app_running(self) -> bool:
+        """Whether the media receiver the stream was cast to still runs on the device."""
+        media_controller = self.device.media_controller
+        socket_client = self.device.socket_client
+        return (
+            socket_client.receiver_controller.app_id == media_controller.supporting_app_id
+            and media_controller.namespace in socket_client.app_namespaces
+        )
+
+    async def _stop_playback_monitor(self) -> None:
+        monitor, self.playback = self.playback, None
+        if monitor is None:
+            return
+        await monitor.__aexit__(None, None, None)
+        _remove_listener(self.device.media_controller, monitor)
+
+    def playback_stats(self) -> Optional[dict]:
+        """Quality-of-experience counters of the live cast (None if not monitored)."""
+        return self.playback.stats() if self.playback else None
 
     async def stop_cast(self):
         """Stop active media playback and disconnect cast session.
@@ -168,13 +483,17 @@ class CastSessionManager:
             return
 
         logger.info("Stopping active cast...")
+        await self._stop_playback_monitor()
 
         try:
             # Stop media playback
             loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: self.device.media_controller.stop()
+            await asyncio.wait_for(
+                loop.run_in_executor(
+                    None,
+                    lambda: self.device.media_controller.stop()
+                ),
+                timeout=self.stop_timeout
             )
             logger.debug("Media playback stopped")
 
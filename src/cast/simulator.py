@@ -0,0 +1,705 @@
+"""Local stand-ins for Cast devices, for tests and development without a TV.
+
+FakeMdnsResponder announces Cast devices (_googlecast._tcp) over mDNS with
+the TXT records a real device publishes, so discovery and the device cache
+can be exercised on loopback:
+
+    async with FakeMdnsResponder(interfaces=['127.0.0.1']) as responder:
+        uuid = await responder.add_device("Test TV", host='127.0.0.1')
+        await responder.update_device(uuid, name="Renamed TV")
+        await responder.remove_device(uuid)
+
+FakeCastDevice is a receiver speaking enough of the Cast v2 protocol (TLS
+socket, heartbeat, connection, receiver and media namespaces) for
+pychromecast - and so get_cast_device() with CAST_DEVICE_IP=host:port and
+CastSessionManager - to work against it. LOADed streams are really fetched
+(HLS playlists are followed and their segments downloaded, e.g. from
+StreamingServer), so control-path and first-segment latencies can be
+measured without a TV or network (see scripts/bench_cast_control.py):
+
+    async with FakeCastDevice(standby=True, wake_delay=0.5) as tv:
+        os.environ['CAST_DEVICE_IP'] = tv.address  # e.g. 127.0.0.1:38211
+        device = await get_cast_device()
+        ...
+        tv.stats()  # {'loads': 1, 'segments_fetched': 3, ...}
+"""
+
+from typing import Optional
+from urllib.parse import urljoin
+from uuid import UUID, uuid4
+import asyncio
+import datetime
+import json
+import logging
+import os
+import socket
+import ssl
+import struct
+import tempfile
+import time
+
+import aiohttp
+import zeroconf
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from pychromecast.generated.cast_channel_pb2 import CastMessage
+
+logger = logging.getLogger(__name__)
+
+CAST_SERVICE_TYPE = '_googlecast._tcp.local.'
+
+# Cast v2 namespaces
+NS_CONNECTION = 'urn:x-cast:com.google.cast.tp.connection'
+NS_HEARTBEAT = 'urn:x-cast:com.google.cast.tp.heartbeat'
+NS_RECEIVER = 'urn:x-cast:com.google.cast.receiver'
+NS_MEDIA = 'urn:x-cast:com.google.cast.media'
+
+PLATFORM_ID = 'receiver-0'
+MEDIA_RECEIVER_APP_ID = 'CC1AD845'
+SUPPORTED_MEDIA_COMMANDS = 274447
+
+# MediaStatus detailedErrorCode values
+ERROR_HLS_NETWORK_PLAYLIST = 312
+ERROR_MEDIA_NETWORK = 103
+
+
+class FakeMdnsResponder:
+    """Announces fake Cast devices over mDNS."""
+
+    def __init__(self, interfaces=zeroconf.InterfaceChoice.All):
+        """Initialize responder.
+
+        Args:
+            interfaces: zeroconf interfaces to announce on (e.g. ['127.0.0.1'])
+        """
+        self.interfaces = interfaces
+        self._zconf: Optional[zeroconf.Zeroconf] = None
+        self._services: dict[UUID, zeroconf.ServiceInfo] = {}
+
+    async def start(self) -> None:
+        if self._zconf is None:
+            self._zconf = await asyncio.to_thread(zeroconf.Zeroconf, interfaces=self.interfaces)
+
+    async def stop(self) -> None:
+        """Withdraw every announced device and close zeroconf."""
+        if self._zconf is None:
+            return
+        for uuid in list(self._services):
+            await self.remove_device(uuid)
+        zconf, self._zconf = self._zconf, None
+        await asyncio.to_thread(zconf.close)
+
+    async def __aenter__(self) -> "FakeMdnsResponder":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+        return False
+
+    @staticmethod
+    def _service_info(
+        uuid: UUID,
+        name: str,
+        host: str,
+        port: int,
+        model: str
+    ) -> zeroconf.ServiceInfo:
+        instance = f"Chromecast-{uuid.hex}"
+        return zeroconf.ServiceInfo(
+            CAST_SERVICE_TYPE,
+            f"{instance}.{CAST_SERVICE_TYPE}",
+            addresses=[socket.inet_aton(host)],
+            port=port,
+            properties={'id': uuid.hex, 'fn': name, 'md': model, 'ca': '4101'},
+            server=f"{uuid}.local.",
+        )
+
+    async def add_device(
+        self,
+        name: str,
+        host: str = '127.0.0.1',
+        port: int = 8009,
+        uuid: Optional[UUID] = None,
+        model: str = 'Chromecast'
+    ) -> UUID:
+        """Announce a device.
+
+        Args:
+            name: Friendly name
+            host: IPv4 address the device claims
+            port: Cast port it claims
+            uuid: Device UUID (default: random)
+            model: Model name
+
+        Returns:
+            The device's UUID
+        """
+        await self.start()
+        uuid = uuid or uuid4()
+        info = self._service_info(uuid, name, host, port, model)
+        await asyncio.to_thread(self._zconf.register_service, info)
+        self._services[uuid] = info
+        logger.debug(f"Announced fake Cast device {name} ({uuid}) at {host}:{port}")
+        return uuid
+
+    async def update_device(
+        self,
+        uuid: UUID,
+        name: Optional[str] = None,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        model: Optional[str] = None
+    ) -> None:
+        """Re-announce a device with changed records (unchanged fields are kept)."""
+        old = self._services[uuid]
+        props = {k.decode(): v.decode() for k, v in old.properties.items() if v is not None}
+        info = self._service_info(
+            uuid,
+            name or props['fn'],
+            host or socket.inet_ntoa(old.addresses[0]),
+            port or old.port,
+            model or props['md'],
+        )
+        await asyncio.to_thread(self._zconf.update_service, info)
+        self._services[uuid] = info
+
+    async def remove_device(self, uuid: UUID) -> None:
+        """Withdraw a device (sends a goodbye packet)."""
+        info = self._services.pop(uuid)
+        await asyncio.to_thread(self._zconf.unregister_service, info)
+
+
+def _self_signed_context() -> ssl.SSLContext:
+    """Server TLS context with a throwaway certificate (senders don't verify it)."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'fake-cast-device')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=2))
+        .sign(key, hashes.SHA256())
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    # load_cert_chain only reads files
+    with tempfile.TemporaryDirectory() as tmp:
+        cert_path = os.path.join(tmp, 'cert.pem')
+        key_path = os.path.join(tmp, 'key.pem')
+        with open(cert_path, 'wb') as f:
+            f.write(cert.public_bytes(serialization.Encoding.PEM))
+        with open(key_path, 'wb') as f:
+            f.write(key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            ))
+        context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+def _encode(source_id: str, destination_id: str, namespace: str, data: dict) -> bytes:
+    """Frame a JSON payload as a length-prefixed CastMessage."""
+    message = CastMessage()
+    message.protocol_version = message.CASTV2_1_0
+    message.source_id = source_id
+    message.destination_id = destination_id
+    message.namespace = namespace
+    message.payload_type = CastMessage.STRING
+    message.payload_utf8 = json.dumps(data)
+    payload = message.SerializeToString()
+    return struct.pack('>I', len(payload)) + payload
+
+
+class _SenderConnection:
+    """One sender's TLS connection to a FakeCastDevice."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.sender_id = '*'
+        self.channels: set[str] = set()  # Destinations the sender CONNECTed to
+
+    def send(self, source_id: str, namespace: str, data: dict) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(_encode(source_id, self.sender_id, namespace, data))
+
+
+class _Media:
+    """The media receiver's current media session."""
+
+    def __init__(self, session_id: int, media: dict):
+        self.session_id = session_id
+        self.content_id: str = media.get('contentId', '')
+        self.content_type: str = media.get('contentType', '')
+        self.stream_type: str = media.get('streamType', 'BUFFERED')
+        self.state = 'BUFFERING'
+        self.idle_reason: Optional[str] = None
+        self.autoplay = True
+        self._position = 0.0
+        self._since = time.monotonic()
+
+    @property
+    def position(self) -> float:
+        if self.state == 'PLAYING':
+            return self._position + time.monotonic() - self._since
+        return self._position
+
+    def set_state(self, state: str, position: Optional[float] = None) -> None:
+        self._position = self.position if position is None else position
+        self._since = time.monotonic()
+        self.state = state
+
+    def to_dict(self) -> dict:
+        status = {
+            'mediaSessionId': self.session_id,
+            'playbackRate': 1,
+            'playerState': self.state,
+            'currentTime': round(self.position, 3),
+            'supportedMediaCommands': SUPPORTED_MEDIA_COMMANDS,
+            'media': {
+                'contentId': self.content_id,
+                'contentType': self.content_type,
+                'streamType': self.stream_type,
+            },
+        }
+        if self.idle_reason:
+            status['idleReason'] = self.idle_reason
+        return status
+
+
+class FakeCastDevice:
+    """Cast v2 receiver on a local TLS port, with a built-in stream fetcher.
+
+    Behaves like a TV with the Default Media Receiver: it reports standby
+    until woken (HDMI-CEC volume unmute or an app launch, after
+    wake_delay), launches the media receiver on LOAD, fetches the stream,
+    and reports BUFFERING until the first segment has downloaded, then
+    PLAYING (or PAUSED without autoplay). Playback keeps following a live
+    playlist until it is stopped.
+
+    Attributes:
+        name: Friendly name (only reported over mDNS, see FakeMdnsResponder)
+        host: Address the device listens on
+        port: Listening port (assigned on start when 0)
+        standby: Whether the TV is in standby
+    """
+
+    def __init__(
+        self,
+        name: str = 'Simulated TV',
+        host: str = '127.0.0.1',
+        port: int = 0,
+        standby: bool = False,
+        wake_delay: float = 0.0,
+        launch_delay: float = 0.05,
+        fetch_media: bool = True
+    ):
+        """Initialize device.
+
+        Args:
+            name: Friendly name
+            host: Address to listen on
+            port: Port to listen on (0 = any free port)
+            standby: Start with the TV in standby
+            wake_delay: Seconds from the wake signal until the TV reports
+                being on
+            launch_delay: Seconds the media receiver app takes to start.
+                Real TVs take far longer; replying instantly also races
+                pychromecast, which writes to its TLS socket from several
+                threads without a lock.
+            fetch_media: Download LOADed streams (False = report PLAYING
+                right away without touching the URL)
+        """
+        self.name = name
+        self.host = host
+        self.port = port
+        self.standby = standby
+        self.wake_delay = wake_delay
+        self.launch_delay = launch_delay
+        self.fetch_media = fetch_media
+        self.muted = False
+        self.volume = 1.0
+        self.app_session: Optional[str] = None
+        self.media: Optional[_Media] = None
+        self._loading: Optional[_Media] = None  # LOADed, first segment not fetched yet
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._connections: set[_SenderConnection] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._serving: set[asyncio.Task] = set()
+        self._player: Optional[asyncio.Task] = None
+        self._media_sessions = 0
+        self._messages: dict[str, int] = {}
+        self._fetch_stats = {
+            'loads': 0,
+            'playlist_fetches': 0,
+            'segments_fetched': 0,
+            'bytes_fetched': 0,
+            'fetch_errors': 0,
+        }
+        self._load_to_first_segment_ms: list[float] = []
+
+    @property
+    def address(self) -> str:
+        """host:port, as accepted by CAST_DEVICE_IP."""
+        return f"{self.host}:{self.port}"
+
+    @property
+    def transport_id(self) -> Optional[str]:
+        return f"transport-{self.app_session}" if self.app_session else None
+
+    async def start(self) -> None:
+        if self._server is not None:
+            return
+        context = await asyncio.to_thread(_self_signed_context)
+        self._server = await asyncio.start_server(
+            self._serve, self.host, self.port, ssl=context
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Fake Cast device {self.name} listening on {self.address}")
+
+    async def stop(self) -> None:
+        """Close every sender connection and stop listening."""
+        if self._server is None:
+            return
+        server, self._server = self._server, None
+        server.close()
+        self._cancel_player()
+        for connection in list(self._connections):
+            connection.writer.close()
+        if self._serving:
+            # Closed connections end their reader tasks
+            await asyncio.wait(self._serving, timeout=2)
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await server.wait_closed()
+
+    async def __aenter__(self) -> "FakeCastDevice":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+        return False
+
+    def stats(self) -> dict:
+        """Messages received per type and what the stream fetcher did."""
+        latencies = self._load_to_first_segment_ms
+        return {
+            'connections': len(self._connections),
+            'messages': dict(self._messages),
+            **self._fetch_stats,
+            'load_to_first_segment_ms': [round(ms, 1) for ms in latencies],
+            'standby': self.standby,
+            'player_state': self.media.state if self.media else None,
+        }
+
+    # Connection handling
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._serving.add(task)
+        connection = _SenderConnection(reader, writer)
+        self._connections.add(connection)
+        try:
+            while True:
+                size = struct.unpack('>I', await reader.readexactly(4))[0]
+                message = CastMessage()
+                message.ParseFromString(await reader.readexactly(size))
+                self._handle(connection, message)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ssl.SSLError):
+            pass  # Sender went away
+        finally:
+            self._connections.discard(connection)
+            self._serving.discard(task)
+            writer.close()
+
+    def _handle(self, connection: _SenderConnection, message: CastMessage) -> None:
+        data = json.loads(message.payload_utf8) if message.payload_utf8 else {}
+        kind = data.get('type', '')
+        if message.namespace != NS_HEARTBEAT:
+            self._messages[kind] = self._messages.get(kind, 0) + 1
+        connection.sender_id = message.source_id
+        request_id = data.get('requestId', 0)
+
+        if message.namespace == NS_CONNECTION:
+            if kind == 'CONNECT':
+                connection.channels.add(message.destination_id)
+            elif kind == 'CLOSE':
+                connection.channels.discard(message.destination_id)
+        elif message.namespace == NS_HEARTBEAT:
+            if kind == 'PING':
+                connection.send(message.destination_id, NS_HEARTBEAT, {'type': 'PONG'})
+        elif message.namespace == NS_RECEIVER:
+            self._handle_receiver(connection, kind, data, request_id)
+        elif message.namespace == NS_MEDIA:
+            self._handle_media(connection, kind, data, request_id)
+
+    def _broadcast(self, source_id: str, namespace: str, data: dict) -> None:
+        for connection in list(self._connections):
+            if source_id == PLATFORM_ID or source_id in connection.channels:
+                connection.send(source_id, namespace, data)
+
+    def _reply(
+        self,
+        connection: _SenderConnection,
+        source_id: str,
+        namespace: str,
+        data: dict,
+        request_id: int
+    ) -> None:
+        """Answer the requester, and tell every other sender about the change."""
+        connection.send(source_id, namespace, {**data, 'requestId': request_id})
+        for other in list(self._connections):
+            if other is not connection and (source_id == PLATFORM_ID or source_id in other.channels):
+                other.send(source_id, namespace, {**data, 'requestId': 0})
+
+    # Receiver namespace
+
+    def _receiver_status(self) -> dict:
+        applications = []
+        if self.app_session:
+            applications.append({
+                'appId': MEDIA_RECEIVER_APP_ID,
+                'displayName': 'Default Media Receiver',
+                'isIdleScreen': False,
+                'namespaces': [{'name': NS_MEDIA}],
+                'sessionId': self.app_session,
+                'statusText': 'Ready To Cast',
+                'transportId': self.transport_id,
+            })
+        return {
+            'type': 'RECEIVER_STATUS',
+            'status': {
+                'applications': applications,
+                'isActiveInput': not self.standby,
+                'isStandBy': self.standby,
+                'volume': {
+                    'controlType': 'attenuation',
+                    'level': self.volume,
+                    'muted': self.muted,
+                    'stepInterval': 0.05,
+                },
+            },
+        }
+
+    def _handle_receiver(
+        self, connection: _SenderConnection, kind: str, data: dict, request_id: int
+    ) -> None:
+        if kind == 'LAUNCH':
+            if data.get('appId') != MEDIA_RECEIVER_APP_ID:
+                connection.send(PLATFORM_ID, NS_RECEIVER, {
+                    'type': 'LAUNCH_ERROR', 'reason': 'NOT_FOUND', 'requestId': request_id
+                })
+                return
+            self._wake()
+            if self.app_session is None:
+                self._spawn(self._launch(connection, request_id))
+                return
+        elif kind == 'STOP':
+            self._cancel_player()
+            self.app_session = None
+            self.media = self._loading = None
+        elif kind == 'SET_VOLUME':
+            volume = data.get('volume', {})
+            self.volume = volume.get('level', self.volume)
+            if 'muted' in volume:
+                self.muted = volume['muted']
+                # A volume command over HDMI-CEC turns the TV on
+                self._wake()
+        elif kind != 'GET_STATUS':
+            return
+        self._reply(connection, PLATFORM_ID, NS_RECEIVER, self._receiver_status(), request_id)
+
+    async def _launch(self, connection: _SenderConnection, request_id: int) -> None:
+        await asyncio.sleep(self.launch_delay)
+        if self.app_session is None:
+            self.app_session = uuid4().hex
+        self._reply(connection, PLATFORM_ID, NS_RECEIVER, self._receiver_status(), request_id)
+
+    def _wake(self) -> None:
+        if not self.standby:
+            return
+
+        async def turn_on() -> None:
+            await asyncio.sleep(self.wake_delay)
+            if self.standby:
+                self.standby = False
+                logger.debug(f"Fake Cast device {self.name} woke up")
+                self._broadcast(PLATFORM_ID, NS_RECEIVER, {**self._receiver_status(), 'requestId': 0})
+
+        self._spawn(turn_on())
+
+    # Media namespace
+
+    def _media_status(self) -> dict:
+        return {
+            'type': 'MEDIA_STATUS',
+            'status': [self.media.to_dict()] if self.media else [],
+        }
+
+    def _send_media_status(self, connection: Optional[_SenderConnection] = None, request_id: int = 0) -> None:
+        if self.transport_id is None:
+            return
+        if connection is None:
+            self._broadcast(self.transport_id, NS_MEDIA, {**self._media_status(), 'requestId': 0})
+        else:
+            self._reply(connection, self.transport_id, NS_MEDIA, self._media_status(), request_id)
+
+    def _handle_media(
+        self, connection: _SenderConnection, kind: str, data: dict, request_id: int
+    ) -> None:
+        if self.transport_id is None:
+            return  # No media receiver running
+        media = self.media
+        if kind == 'LOAD':
+            self._media_sessions += 1
+            self._fetch_stats['loads'] += 1
+            self._cancel_player()
+            # The media session exists once the stream has loaded
+            self._loading = _Media(self._media_sessions, data.get('media', {}))
+            self._loading.autoplay = data.get('autoplay', True)
+            self._player = self._spawn(self._play(
+                connection, request_id, self._loading, data.get('currentTime')
+            ))
+            return
+        if media is not None and data.get('mediaSessionId') == media.session_id:
+            if kind == 'PLAY' and media.state == 'PAUSED':
+                media.set_state('PLAYING')
+            elif kind == 'PAUSE' and media.state == 'PLAYING':
+                media.set_state('PAUSED')
+            elif kind == 'SEEK':
+                state = 'PLAYING' if data.get('resumeState') == 'PLAYBACK_START' else media.state
+                media.set_state(state, position=float(data.get('currentTime', media.position)))
+            elif kind == 'STOP':
+                self._cancel_player()
+                media.idle_reason = 'CANCELLED'
+                media.set_state('IDLE')
+        elif kind != 'GET_STATUS':
+            connection.send(self.transport_id, NS_MEDIA, {
+                'type': 'INVALID_REQUEST', 'reason': 'INVALID_MEDIA_SESSION_ID',
+                'requestId': request_id,
+            })
+            return
+        self._send_media_status(connection, request_id)
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _cancel_player(self) -> None:
+        player, self._player = self._player, None
+        if player and not player.done():
+            player.cancel()
+
+    # Stream fetcher
+
+    async def _play(
+        self,
+        connection: _SenderConnection,
+        request_id: int,
+        media: _Media,
+        current_time: Optional[float]
+    ) -> None:
+        """Fetch the stream like a receiver: load, report, then follow the live playlist."""
+        started = time.monotonic()
+
+        def loaded(live_edge: float) -> None:
+            self._load_to_first_segment_ms.append((time.monotonic() - started) * 1000)
+            self.media, self._loading = media, None
+            position = current_time if current_time is not None else live_edge
+            media.set_state('PLAYING' if media.autoplay else 'PAUSED', position=position)
+            self._send_media_status(connection, request_id)
+
+        if not self.fetch_media:
+            loaded(0.0)
+            return
+        try:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as http:
+                if media.content_type == 'application/x-mpegurl' or media.content_id.endswith('.m3u8'):
+                    await self._follow_playlist(http, media, loaded)
+                else:
+                    async with http.get(media.content_id) as response:
+                        response.raise_for_status()
+                        chunk = await response.content.read(64 * 1024)
+                        self._fetch_stats['bytes_fetched'] += len(chunk)
+                    loaded(0.0)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._fetch_stats['fetch_errors'] += 1
+            logger.debug(f"Fake Cast device failed to fetch {media.content_id}: {e}")
+            if media is self.media:
+                # Mid-stream: the receiver stalls
+                media.set_state('BUFFERING')
+                self._send_media_status()
+            elif media is self._loading:
+                self._loading = None
+                playlist = media.content_id.endswith('.m3u8')
+                connection.send(self.transport_id, NS_MEDIA, {
+                    'type': 'LOAD_FAILED', 'itemId': 1, 'requestId': request_id,
+                    'detailedErrorCode': ERROR_HLS_NETWORK_PLAYLIST if playlist else ERROR_MEDIA_NETWORK,
+                })
+
+    async def _follow_playlist(self, http: aiohttp.ClientSession, media: _Media, loaded) -> None:
+        url = media.content_id
+        next_sequence: Optional[int] = None  # Media sequence number of the next segment to fetch
+        while True:
+            async with http.get(url) as response:
+                response.raise_for_status()
+                text = await response.text()
+            self._fetch_stats['playlist_fetches'] += 1
+            lines = [line.strip() for line in text.splitlines() if line.strip()]
+            variants = [
+                lines[i + 1] for i, line in enumerate(lines[:-1])
+                if line.startswith('#EXT-X-STREAM-INF')
+            ]
+            if variants:
+                url = urljoin(url, variants[0])  # Master playlist: first rendition
+                continue
+
+            target = 2.0
+            sequence = 0
+            segments: list[tuple[str, float]] = []
+            duration = 0.0
+            for line in lines:
+                if line.startswith('#EXT-X-TARGETDURATION:'):
+                    target = float(line.split(':', 1)[1])
+                elif line.startswith('#EXT-X-MEDIA-SEQUENCE:'):
+                    sequence = int(line.split(':', 1)[1])
+                elif line.startswith('#EXTINF:'):
+                    duration = float(line.split(':', 1)[1].split(',')[0])
+                elif not line.startswith('#'):
+                    segments.append((urljoin(url, line), duration))
+
+            live_edge = sequence * target + sum(d for _, d in segments[:-1])
+            if next_sequence is None and segments:
+                # Start at the live edge: the newest segment
+                next_sequence = sequence + len(segments) - 1
+            for number, (segment_url, _) in enumerate(segments, start=sequence):
+                if number < next_sequence:
+                    continue
+                async with http.get(segment_url) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+                next_sequence = number + 1
+                self._fetch_stats['segments_fetched'] += 1
+                self._fetch_stats['bytes_fetched'] += len(body)
+                if media is self._loading:
+                    loaded(live_edge)
+                elif media.state == 'BUFFERING':
+                    media.set_state('PLAYING')  # Recovered from a stall
+                    self._send_media_status()
+            if '#EXT-X-ENDLIST' in lines and media is not self._loading:
+                return
+            await asyncio.sleep(target / 2)
@@ -13,6 +13,28 @@ from typing import Optional
 logger = logging.getLogger(__name__)
 
 
+def find_free_display(start: int = 99, limit: int = 20) -> str:
+    """Find an X display number with no running server.
+
+    Checks the X server lock file and socket, so a second pipeline (e.g. a
+    pre-warmed one) does not collide with a display already in use.
+
+    Args:
+        start: First display number to try (default: 99)
+        limit: Number of consecutive display numbers to try
+
+    Returns:
+        Display string (e.g., ':99'). Falls back to the start display if all
+        candidates appear taken (Xvfb will then report the conflict).
+    """
+    for number in range(start, start + limit):
+        if not os.path.exists(f'/tmp/.X{number}-lock') and \
+                not os.path.exists(f'/tmp/.X11-unix/X{number}'):
+            return f':{number}'
+    logger.warning(f"No free X display in :{start}-:{start + limit - 1}")
+    return f':{start}'
+
+
 class XvfbManager:
     """Manages Xvfb virtual display lifecycle.
 
@@ -36,7 +58,8 @@ class XvfbManager:
         self,
         display: str = ':99',
         resolution: tuple[int, int] = (1920, 1080),
-        depth: int = 24
+        depth: int = 24,
+        stop_timeout: float = 1.0
     ):
         """Initialize Xvfb manager with display configuration.
 
@@ -44,10 +67,12 @@ class XvfbManager:
             display: Display number (e.g., ':99')
             resolution: Tuple of (width, height) for display resolution
             depth: Color depth in bits (default: 24)
+            stop_timeout: Seconds to wait after SIGTERM before escalating to SIGKILL
         """
         self.display = display
         self.width, self.height = resolution
         self.depth = depth
+        self.stop_timeout = stop_timeout
         self.process: Optional[asyncio.subprocess.Process] = None
 
         logger.info(
@@ -138,14 +163,14 @@ class XvfbManager:
         """
         logger.info("Cleaning up Xvfb process")
 
-        if self.process:
+        if self.process and self.process.returncode is None:
             try:
                 # Terminate gracefully
                 self.process.terminate()
 
                 try:
                     # Wait for graceful shutdown
-                    await asyncio.wait_for(self.process.wait(), timeout=3)
+                    await asyncio.wait_for(self.process.wait(), timeout=self.stop_timeout)
                     logger.info("Xvfb terminated gracefully")
                 except asyncio.TimeoutError:
                     # Force kill if still running
@@ -10,18 +10,64 @@ import asyncio
 import logging
 import os
 import shutil
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional
 from uuid import uuid4
 
 from .network import get_host_ip
-from .quality import QualityConfig
+from .quality import QualityConfig, Tile
 from .hardware import HardwareAcceleration
 
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class EncoderProgress:
+    """Live encoding statistics, updated from FFmpeg's -progress reports.
+
+    Attributes:
+        frame: Frames encoded so far
+        fps: Encoding rate in frames per second
+        speed: Encoding speed relative to real time (1.0 = keeping up)
+        segments: HLS segments written
+        updated_at: time.monotonic() of the latest progress report
+    """
+    frame: int = 0
+    fps: Optional[float] = None
+    speed: Optional[float] = None
+    segments: int = 0
+    updated_at: Optional[float] = None
+
+    def update(self, key: str, value: str) -> None:
+        """Apply one key=value line of FFmpeg -progress output."""
+        try:
+            if key == 'frame':
+                self.frame = int(value)
+            elif key == 'fps':
+                self.fps = float(value)
+            elif key == 'speed':
+                self.speed = float(value.rstrip('x')) if value != 'N/A' else None
+            elif key == 'progress':
+                self.updated_at = time.monotonic()
+        except ValueError:
+            pass  # N/A and friends before the first frame
+
+    def to_dict(self) -> dict:
+        return {
+            'frame': self.frame,
+            'fps': self.fps,
+            'speed': self.speed,
+            'segments': self.segments,
+            'reported_s_ago': (
+                round(time.monotonic() - self.updated_at, 1)
+                if self.updated_at is not None else None
+            ),
+        }
+
+
 class FFmpegEncoder:
     """Manages FFmpeg encoding process for video streaming.
 
@@ -45,7 +91,10 @@ class FFmpegEncoder:
         display: str = ':99',
         output_dir: str = '/tmp/streams',
         port: int = 8080,
-        mode: Literal['hls', 'fmp4'] = 'hls'
+        mode: Literal['hls', 'fmp4'] = 'hls',
+        stop_timeout: float = 2.0,
+        capture_resolution: Optional[tuple[int, int]] = None,
+        tiles: Optional[list[Tile]] = None
     ):
         """Initialize FFmpeg encoder.
 
@@ -55,15 +104,28 @@ class FFmpegEncoder:
             output_dir: Directory for output stream files
             port: Streaming server port for URL construction
             mode: Output format - 'hls' for buffered streaming, 'fmp4' for low-latency
+            stop_timeout: Seconds to wait after SIGTERM before escalating to SIGKILL
+            capture_resolution: Size of the display to capture (default:
+                quality.resolution); smaller captures are upscaled to
+                quality.resolution before encoding
+            tiles: Regions of the capture to encode as separate streams
+                (video walls); each is scaled to quality.resolution and the
+                context yields one URL per tile
         """
         self.quality = quality
         self.display = display
         self.output_dir = output_dir
         self.port = port
         self.mode = mode
+        self.stop_timeout = stop_timeout
+        self.capture_resolution = capture_resolution or quality.resolution
+        self.tiles = tiles
         self.process = None
         self.output_path = None
+        self.output_paths: list[str] = []
         self.log_task = None  # Background task for FFmpeg output logging
+        self.progress_task = None  # Background task parsing -progress reports
+        self.progress = EncoderProgress()
         self.hw_accel = HardwareAcceleration()  # Detect QuickSync availability
         self.encoder = None  # Store encoder name for logging in __aenter__
 
@@ -91,17 +153,57 @@ class FFmpegEncoder:
         Returns:
             List of FFmpeg arguments (excludes 'ffmpeg' command itself)
         """
-        width, height = self.quality.resolution
-        bitrate = self.quality.bitrate
+        args = self._input_args()
+        args.extend([
+            # Map video and audio inputs
+            '-map', '0:v',  # Video from x11grab
+            '-map', '1:a',  # Audio from anullsrc
+        ])
+
+        # Upscale a reduced-resolution capture to the output resolution
+        video_filter = self._video_filter()
+        if video_filter:
+            args.extend(['-vf', video_filter])
+        args.extend(self._output_args(output_file))
+        return args
+
+    def build_tiled_ffmpeg_args(self, output_files: list[str]) -> list[str]:
+        """Construct FFmpeg arguments encoding one output per tile from a single capture.
+
+        The capture is decoded once and split; each branch is cropped to its
+        tile, scaled to the output resolution and encoded with the same
+        settings as a single-screen stream.
+
+        Args:
+            output_files: Full path of each tile's output file (same order
+                as self.tiles)
+
+        Returns:
+            List of FFmpeg arguments (excludes 'ffmpeg' command itself)
+        """
+        args = self._input_args()
+        branches = ''.join(f'[c{i}]' for i in range(len(self.tiles)))
+        graph = [f'[0:v]split={len(self.tiles)}{branches}']
+        for i, tile in enumerate(self.tiles):
+            chain = self._video_filter(crop=tile)
+            graph.append(f'[c{i}]{chain}[v{i}]')
+        args.extend(['-filter_complex', ';'.join(graph)])
+        for i, output_file in enumerate(output_files):
+            args.extend(['-map', f'[v{i}]', '-map', '1:a'])
+            args.extend(self._output_args(output_file))
+        return args
+
+    def _input_args(self) -> list[str]:
+        """Hardware device and input (x11grab + silent audio) arguments."""
+        capture_width, capture_height = self.capture_resolution
         framerate = self.quality.framerate
-        preset = self.quality.preset
 
         # Get hardware-aware encoder configuration
-        encoder_config = self.hw_accel.get_encoder_config()
-        self.encoder = encoder_config['encoder']  # Store for logging
+        self._encoder_config = self.hw_accel.get_encoder_config()
+        self.encoder = self._encoder_config['encoder']  # Store for logging
 
-        # Base arguments for x11grab input (video source)
-        args = []
+        # Machine-readable progress (frame, fps, speed) on stdout
+        args = ['-progress', 'pipe:1']
 
         # Initialize VAAPI hardware device if using hardware encoding
         if self.encoder == 'h264_vaapi':
@@ -112,27 +214,45 @@ class FFmpegEncoder:
         args.extend([
             # Video input configuration
             '-f', 'x11grab',
-            '-video_size', f'{width}x{height}',
+            '-video_size', f'{capture_width}x{capture_height}',
             '-framerate', str(framerate),
             '-i', self.display,
 
             # Silent audio source (required for Cast playback)
             '-f', 'lavfi',
             '-i', 'anullsrc=r=44100:cl=stereo',
-
-            # Map video and audio inputs
-            '-map', '0:v',  # Video from x11grab
-            '-map', '1:a',  # Audio from anullsrc
         ])
+        return args
+
+    def _video_filter(self, crop: Optional[Tile] = None) -> str:
+        """Filter chain from the captured frame (or a tile of it) to encoder input."""
+        width, height = self.quality.resolution
+        source = (crop.width, crop.height) if crop else self.capture_resolution
+        upscale = source != (width, height)
+        filters = [crop.crop_filter()] if crop else []
+
+        if self.encoder == 'h264_vaapi':
+            # Upload frames to GPU (and scale there)
+            filters.append('format=nv12,hwupload')
+            if upscale:
+                filters.append(f'scale_vaapi=w={width}:h={height}')
+        elif upscale:
+            filters.append(f'scale={width}:{height}:flags=bicubic')
+        return ','.join(filters)
+
+    def _output_args(self, output_file: str) -> list[str]:
+        """Codec, latency tuning and muxer arguments for one output."""
+        bitrate = self.quality.bitrate
+        framerate = self.quality.framerate
+        preset = self.quality.preset
+        args = []
 
         # Hardware encoding setup
         if self.encoder == 'h264_vaapi':
             args.extend([
-                # Upload frames to GPU and encode
-                '-vf', 'format=nv12,hwupload',
                 '-c:v', 'h264_vaapi',
             ])
-            args.extend(encoder_config['encoder_args'])
+            args.extend(self._encoder_config['encoder_args'])
         else:
             # libx264: Use existing bitrate/preset configuration
             args.extend([
@@ -225,6 +345,10 @@ class FFmpegEncoder:
                     logger.error(f"FFmpeg: {output}")
                 elif 'warning' in output.lower():
                     logger.warning(f"FFmpeg: {output}")
+                elif "Opening '" in output and output.endswith(".ts' for writing"):
+                    # The HLS muxer starting a new segment
+                    self.progress.segments += 1
+                    logger.debug(f"FFmpeg: {output}")
                 elif output.startswith('frame=') or output.startswith('size='):
                     # Encoding progress updates - debug level to avoid spam
                     logger.debug(f"FFmpeg: {output}")
@@ -239,6 +363,23 @@ class FFmpegEncoder:
         except Exception as e:
             logger.error(f"Error reading FFmpeg output: {e}")
 
+    async def _read_progress(self):
+        """Parse FFmpeg's -progress key=value lines from stdout into self.progress."""
+        if not self.process or not self.process.stdout:
+            return
+
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                key, _, value = line.decode('utf-8', errors='replace').strip().partition('=')
+                self.progress.update(key, value.strip())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error reading FFmpeg progress: {e}")
+
     async def __aenter__(self) -> str:
         """Start FFmpeg encoding process.
 
@@ -257,20 +398,34 @@ class FFmpegEncoder:
 
         # Generate unique output filename based on mode
         stream_id = uuid4().hex
-        if self.mode == 'hls':
-            output_filename = f"stream_{stream_id}.m3u8"
+        extension = 'm3u8' if self.mode == 'hls' else 'mp4'
+        if self.tiles:
+            output_filenames = [
+                f"stream_{stream_id}_t{i}.{extension}" for i in range(len(self.tiles))
+            ]
         else:
-            output_filename = f"stream_{stream_id}.mp4"
-        self.output_path = os.path.join(self.output_dir, output_filename)
+            output_filenames = [f"stream_{stream_id}.{extension}"]
+        self.output_paths = [os.path.join(self.output_dir, name) for name in output_filenames]
+        self.output_path = self.output_paths[0]
 
         # Build FFmpeg arguments
-        args = self.build_ffmpeg_args(self.output_path)
+        if self.tiles:
+            args = self.build_tiled_ffmpeg_args(self.output_paths)
+        else:
+            args = self.build_ffmpeg_args(self.output_path)
 
         logger.info(
             f"Starting FFmpeg encoder: {self.encoder} @ {self.quality.resolution[0]}x{self.quality.resolution[1]} "
             f"{self.quality.bitrate}kbps, preset={self.quality.preset}, "
             f"latency_mode={self.quality.latency_mode}, mode={self.mode}"
         )
+        if self.capture_resolution != self.quality.resolution:
+            logger.info(
+                f"Capturing at {self.capture_resolution[0]}x{self.capture_resolution[1]}, "
+                f"upscaled to output resolution"
+            )
+        if self.tiles:
+            logger.info(f"Encoding {len(self.tiles)} tiles of the capture as separate streams")
 
         # Start FFmpeg subprocess
         self.process = await asyncio.create_subprocess_exec(
@@ -284,6 +439,7 @@ class FFmpegEncoder:
 
         # Start background task to forward FFmpeg output to logs
         self.log_task = asyncio.create_task(self._log_ffmpeg_output())
+        self.progress_task = asyncio.create_task(self._read_progress())
 
         # Wait for output file to be created
         # HLS needs segment time (2s) + overhead, fMP4 needs less time
@@ -292,7 +448,7 @@ class FFmpegEncoder:
 
         for i in range(max_wait):
             await asyncio.sleep(1)
-            if os.path.exists(self.output_path):
+            if all(os.path.exists(path) for path in self.output_paths):
                 break
             # Check if process died
             if self.process.returncode is not None:
@@ -304,8 +460,9 @@ class FFmpegEncoder:
                 )
             logger.debug(f"Waiting for {file_type}... ({i+1}/{max_wait}s)")
 
-        # Verify output file exists
-        if not os.path.exists(self.output_path):
+        # Verify output files exist
+        missing = [path for path in self.output_paths if not os.path.exists(path)]
+        if missing:
             # FFmpeg still running but no output - check stderr
             try:
                 stderr = await asyncio.wait_for(
@@ -317,15 +474,16 @@ class FFmpegEncoder:
                 error_msg = "No error output available (process still running)"
 
             raise RuntimeError(
-                f"FFmpeg failed to create {file_type} at {self.output_path} after {max_wait}s. "
+                f"FFmpeg failed to create {file_type} at {missing[0]} after {max_wait}s. "
                 f"Stderr: {error_msg}"
             )
 
-        logger.info(f"{file_type} created: {self.output_path}")
+        logger.info(f"{file_type} created: {', '.join(self.output_paths)}")
 
-        # Return HTTP URL accessible from Cast device on local network
+        # Return HTTP URL(s) accessible from Cast device on local network
         host_ip = get_host_ip()
-        return f"http://{host_ip}:{self.port}/{output_filename}"
+        urls = [f"http://{host_ip}:{self.port}/{name}" for name in output_filenames]
+        return urls if self.tiles else urls[0]
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Stop FFmpeg process and clean up output files.
@@ -340,45 +498,52 @@ class FFmpegEncoder:
 
         logger.info(f"Stopping FFmpeg process (PID: {self.process.pid})")
 
-        # Cancel log forwarding task before terminating process
+        # Cancel log forwarding and progress tasks before terminating process
         # This must happen BEFORE terminate() to prevent reading from a closed pipe
-        if self.log_task and not self.log_task.done():
-            self.log_task.cancel()
+        for task in (self.log_task, self.progress_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass  # Expected cancellation
+
+        # Terminate gracefully (the process may already have exited)
+        if self.process.returncode is None:
             try:
-                await self.log_task
-            except asyncio.CancelledError:
-                pass  # Expected cancellation
-
-        # Terminate gracefully
-        self.process.terminate()
-
-        try:
-            # Wait up to 5 seconds for graceful shutdown
-            await asyncio.wait_for(self.process.wait(), timeout=5.0)
-            logger.info("FFmpeg process terminated gracefully")
-        except asyncio.TimeoutError:
-            # Force kill if still running
-            logger.warning("FFmpeg did not terminate gracefully, forcing kill")
-            self.process.kill()
-            await self.process.wait()
-            logger.info("FFmpeg process killed")
+                self.process.terminate()
+                # Output is discarded on exit, so there is nothing worth a long wait
+                await asyncio.wait_for(self.process.wait(), timeout=self.stop_timeout)
+                logger.info("FFmpeg process terminated gracefully")
+            except asyncio.TimeoutError:
+                # Force kill if still running
+                logger.warning(
+                    f"FFmpeg did not terminate within {self.stop_timeout}s, forcing kill"
+                )
+                self.process.kill()
+                await self.process.wait()
+                logger.info("FFmpeg process killed")
+            except ProcessLookupError:
+                pass  # Exited between the returncode check and terminate()
 
         # Clean up output files
-        if self.output_path and os.path.exists(self.output_path):
+        for output_path in self.output_paths:
+            if not os.path.exists(output_path):
+                continue
             try:
                 # Remove main output file (m3u8 or mp4)
-                os.remove(self.output_path)
+                os.remove(output_path)
 
                 # For HLS mode, also remove segment files (*.ts files with same base name)
                 if self.mode == 'hls':
-                    output_dir = os.path.dirname(self.output_path)
-                    base_name = os.path.splitext(os.path.basename(self.output_path))[0]
+                    output_dir = os.path.dirname(output_path)
+                    base_name = os.path.splitext(os.path.basename(output_path))[0]
                     for file in os.listdir(output_dir):
                         if file.startswith(base_name) and file.endswith('.ts'):
                             segment_path = os.path.join(output_dir, file)
                             os.remove(segment_path)
 
-                logger.info(f"Cleaned up output files: {self.output_path}")
+                logger.info(f"Cleaned up output files: {output_path}")
             except OSError as e:
                 logger.warning(f"Failed to clean up output files: {e}")
 
@@ -4,10 +4,23 @@ Provides configurable quality presets for different streaming scenarios:
 - 1080p: High quality for detailed dashboards
 - 720p: Balanced quality and performance
 - low-latency: Optimized for minimal delay
+
+RenderGeometry derives the Xvfb screen, Chromium viewport and device scale
+factor from a preset, so Chromium rasterizes exactly the pixels FFmpeg
+captures.
+
+Environment variables:
+    RENDER_SCALE: Fraction of the output resolution to render and capture
+                  at; FFmpeg upscales to the output (default: 1.0). Use
+                  e.g. 0.75 when the host is CPU-bound.
+    RENDER_LAYOUT_WIDTH: CSS width dashboards are laid out at (default: 0 =
+                         the output width). E.g. 1920 keeps the 1080p layout
+                         at 720p, scaled down instead of reflowed.
 """
 
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, Optional
+import os
 
 
 @dataclass
@@ -77,3 +90,103 @@ def get_quality_config(preset_name: str) -> QualityConfig:
         )
 
     return QUALITY_PRESETS[preset_name]
+
+
+@dataclass(frozen=True)
+class RenderGeometry:
+    """Pixel and CSS sizes for rendering one quality preset.
+
+    Attributes:
+        output: Encoded resolution (the preset's resolution)
+        display: Xvfb screen / Chromium window / x11grab capture size
+        viewport: Chromium CSS viewport
+        device_scale_factor: Device pixels per CSS pixel
+            (viewport * device_scale_factor == display)
+    """
+    output: tuple[int, int]
+    display: tuple[int, int]
+    viewport: tuple[int, int]
+    device_scale_factor: float
+
+    @property
+    def upscaled(self) -> bool:
+        """Whether the encoder scales the capture up to the output."""
+        return self.display != self.output
+
+    @classmethod
+    def for_quality(
+        cls,
+        quality: QualityConfig,
+        render_scale: Optional[float] = None,
+        layout_width: Optional[int] = None
+    ) -> "RenderGeometry":
+        """Derive render geometry for a preset.
+
+        Args:
+            quality: Quality configuration
+            render_scale: Fraction of the output resolution to render at
+                (default: RENDER_SCALE env var or 1.0)
+            layout_width: CSS layout width (default: RENDER_LAYOUT_WIDTH
+                env var, 0 = the output width, so the layout doesn't
+                change with render_scale)
+
+        Returns:
+            RenderGeometry for the preset
+
+        Raises:
+            ValueError: If render_scale is not in (0, 1]
+        """
+        if render_scale is None:
+            render_scale = float(os.getenv('RENDER_SCALE', '1.0'))
+        if layout_width is None:
+            layout_width = int(os.getenv('RENDER_LAYOUT_WIDTH', '0'))
+        if not 0 < render_scale <= 1:
+            raise ValueError(f"Render scale must be in (0, 1], got {render_scale}")
+
+        width, height = quality.resolution
+        # Even dimensions: x11grab feeds yuv420p encoders
+        display = (int(width * render_scale) // 2 * 2, int(height * render_scale) // 2 * 2)
+        scale = display[0] / (layout_width or width)
+        viewport = (round(display[0] / scale), round(display[1] / scale))
+        return cls(
+            output=quality.resolution,
+            display=display,
+            viewport=viewport,
+            device_scale_factor=scale,
+        )
+
+    def tiled(self, columns: int, rows: int) -> "RenderGeometry":
+        """Geometry of a video wall of columns x rows screens of this geometry.
+
+        The wall is rendered as one large page and captured once; each
+        screen's tile (see tiles()) is cropped from the capture and encoded
+        at this geometry's output resolution.
+        """
+        return RenderGeometry(
+            output=(self.output[0] * columns, self.output[1] * rows),
+            display=(self.display[0] * columns, self.display[1] * rows),
+            viewport=(self.viewport[0] * columns, self.viewport[1] * rows),
+            device_scale_factor=self.device_scale_factor,
+        )
+
+    def tiles(self, columns: int, rows: int) -> list["Tile"]:
+        """Capture regions of each screen of a columns x rows wall (row-major)."""
+        width, height = self.display
+        return [
+            Tile(x=column * width, y=row * height, width=width, height=height)
+            for row in range(rows)
+            for column in range(columns)
+        ]
+
+
+@dataclass(frozen=True)
+class Tile:
+    """Region of a video wall capture shown on one screen (capture pixels)."""
+    x: int
+    y: int
+    width: int
+    height: int
+
+    def crop_filter(self) -> str:
+        """FFmpeg crop filter selecting this tile."""
+        return f"crop={self.width}:{self.height}:{self.x}:{self.y}"
@@ -6,7 +6,7 @@ playlists and video segments with proper CORS headers for Cast device access.
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from aiohttp import web
 
@@ -23,6 +23,9 @@ CONTENT_TYPES = {
     ".mp4": "video/mp4",
 }
 
+# Called with (filename, bytes_served) after each successful file response
+RequestListener = Callable[[str, int], None]
+
 
 class StreamingServer:
     """HTTP server for serving video streams to Cast devices.
@@ -52,6 +55,7 @@ class StreamingServer:
         self._app: Optional[web.Application] = None
         self._runner: Optional[web.AppRunner] = None
         self._site: Optional[web.TCPSite] = None
+        self._request_listeners: list[RequestListener] = []
 
         # Ensure stream directory exists
         self.stream_dir.mkdir(parents=True, exist_ok=True)
@@ -70,6 +74,29 @@ class StreamingServer:
         response.headers["Access-Control-Allow-Headers"] = "*"
         return response
 
+    def add_request_listener(self, listener: RequestListener) -> None:
+        """Register a callback invoked after each file is served.
+
+        Used to observe receiver activity (e.g. first segment fetched).
+
+        Args:
+            listener: Callable receiving (filename, bytes_served)
+        """
+        self._request_listeners.append(listener)
+
+    def remove_request_listener(self, listener: RequestListener) -> None:
+        """Unregister a callback added with add_request_listener (idempotent)."""
+        if listener in self._request_listeners:
+            self._request_listeners.remove(listener)
+
+    def _notify_request_listeners(self, filename: str, size: int) -> None:
+        """Invoke request listeners, isolating the response from their errors."""
+        for listener in list(self._request_listeners):
+            try:
+                listener(filename, size)
+            except Exception as e:
+                logger.warning("request_listener_error", filename=filename, error=str(e))
+
     def _get_content_type(self, filename: str) -> str:
         """Get the Content-Type for a file based on extension.
 
@@ -133,6 +160,7 @@ class StreamingServer:
                 body=content,
                 content_type=content_type,
             )
+            self._notify_request_listeners(filename, len(content))
             return self._add_cors_headers(response)
         except OSError as e:
             logger.error("file_read_error", filepath=str(filepath), error=str(e))
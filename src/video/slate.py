@@ -0,0 +1,265 @@
+"""Instant "last frame" slates shown while a pipeline warms up.
+
+Between /start and the first live segment the TV shows the previous stream
+or a Cast spinner for as long as the display, browser, page load and encoder
+take to start. A SlateCache keeps the last rendered frame of each dashboard
+(captured periodically from the live page by a SlateRecorder) pre-encoded as
+a short still-image MP4 in the streaming server's directory. On /start the
+Cast session plays that clip on repeat - or a default slate for dashboards
+never seen before - as soon as the device is found, while the rest of the
+pipeline starts; the live stream then replaces it. Clips are a few seconds
+long and encoded on one thread at low CPU priority, so re-encoding them
+during a cast doesn't compete with the live encoder.
+
+Environment variables:
+    SLATE: Enable slates (default: true)
+    SLATE_DIR: Directory for captured frames (default: /tmp/dashboard-cast/slates)
+    SLATE_CAPTURE_INTERVAL: Seconds between frame captures of a live
+                            dashboard (default: 120)
+    SLATE_DURATION: Length of the slate clips in seconds; the receiver
+                    loops them (default: 5)
+    SLATE_DEFAULT_IMAGE: Image for the default slate (default: a plain
+                         dark frame)
+"""
+
+from typing import Callable, Optional
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+
+from playwright.async_api import Page
+
+from .network import get_host_ip
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLATE_DIR = '/tmp/dashboard-cast/slates'
+DEFAULT_SLATE_CLIP = 'slate_default.mp4'
+# Plain frame used when no SLATE_DEFAULT_IMAGE is configured (no fonts needed)
+DEFAULT_SLATE_COLOR = '0x101820'
+
+
+class SlateCache:
+    """Per-dashboard still-image clips served by the streaming server.
+
+    Usage:
+        cache = SlateCache(stream_dir='/tmp/streams')
+        await cache.prepare_default()
+        clip_url = cache.clip_url('https://grafana.local/d/abc')
+        ...
+        await cache.capture(page, 'https://grafana.local/d/abc')
+    """
+
+    def __init__(
+        self,
+        stream_dir: str = '/tmp/streams',
+        port: int = 8080,
+        directory: Optional[str] = None,
+        duration: Optional[float] = None,
+        default_image: Optional[str] = None
+    ):
+        """Initialize slate cache.
+
+        Args:
+            stream_dir: Directory served by the StreamingServer (clips go here)
+            port: Streaming server port for URL construction
+            directory: Directory for captured frames (default: SLATE_DIR env var)
+            duration: Clip length in seconds (default: SLATE_DURATION env var)
+            default_image: Image for the default slate (default:
+                SLATE_DEFAULT_IMAGE env var, or a plain dark frame)
+        """
+        self.stream_dir = stream_dir
+        self.port = port
+        self.directory = directory or os.getenv('SLATE_DIR', DEFAULT_SLATE_DIR)
+        self.duration = duration if duration is not None else float(
+            os.getenv('SLATE_DURATION', '5')
+        )
+        self.default_image = default_image or os.getenv('SLATE_DEFAULT_IMAGE')
+        os.makedirs(self.directory, exist_ok=True)
+        os.makedirs(self.stream_dir, exist_ok=True)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+    def frame_path(self, url: str) -> str:
+        """Path of the last captured frame for a dashboard URL."""
+        return os.path.join(self.directory, f"{self._key(url)}.jpg")
+
+    def clip_name(self, url: str) -> str:
+        """File name (in stream_dir) of a dashboard's slate clip."""
+        return f"slate_{self._key(url)}.mp4"
+
+    def clip_url(self, url: str) -> Optional[str]:
+        """URL of the slate to show for a dashboard.
+
+        Returns:
+            The dashboard's own slate, else the default slate, else None
+        """
+        for name in (self.clip_name(url), DEFAULT_SLATE_CLIP):
+            if os.path.isfile(os.path.join(self.stream_dir, name)):
+                return f"http://{get_host_ip()}:{self.port}/{name}"
+        return None
+
+    async def prepare_default(self) -> bool:
+        """Encode the default slate clip (if not already present)."""
+        if os.path.isfile(os.path.join(self.stream_dir, DEFAULT_SLATE_CLIP)):
+            return True
+        if self.default_image:
+            source = ['-loop', '1', '-framerate', '30', '-i', self.default_image]
+        else:
+            source = ['-f', 'lavfi', '-i', f'color=c={DEFAULT_SLATE_COLOR}:s=1920x1080:r=30']
+        return await self._encode(source, DEFAULT_SLATE_CLIP)
+
+    async def capture(self, page: Page, url: str) -> bool:
+        """Capture a page's current frame and re-encode the URL's slate clip.
+
+        Returns:
+            True if the clip was updated
+        """
+        frame_path = self.frame_path(url)
+        try:
+            image = await page.screenshot(type='jpeg', quality=85, timeout=10000)
+            tmp_path = f"{frame_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(image)
+            os.replace(tmp_path, frame_path)
+        except Exception as e:
+            logger.warning(f"Failed to capture slate frame for {url}: {e}")
+            return False
+        return await self._encode(
+            ['-loop', '1', '-framerate', '30', '-i', frame_path], self.clip_name(url)
+        )
+
+    def build_encode_args(self, source: list[str], output_file: str) -> list[str]:
+        """FFmpeg arguments encoding a still image source into a slate clip.
+
+        Args:
+            source: Input arguments producing the image stream
+            output_file: Output path (MP4)
+
+        Returns:
+            List of FFmpeg arguments (excludes 'ffmpeg' command itself)
+        """
+        return [
+            '-y', '-loglevel', 'error',
+            *source,
+            '-f', 'lavfi', '-i', 'anullsrc=r=44100:cl=stereo',  # Cast wants an audio track
+            '-t', str(self.duration),
+            '-map', '0:v', '-map', '1:a',
+            '-vf', 'scale=trunc(iw/2)*2:trunc(ih/2)*2,format=yuv420p',
+            '-c:v', 'libx264',
+            '-preset', 'veryfast',
+            '-tune', 'stillimage',
+            '-threads', '1',  # Leave the cores to the live encoder
+            '-profile:v', 'high',
+            '-level:v', '4.1',
+            '-c:a', 'aac', '-b:a', '64k',
+            '-shortest',
+            '-movflags', '+faststart',  # Playable before fully downloaded
+            '-f', 'mp4',
+            output_file,
+        ]
+
+    async def _encode(self, source: list[str], clip_name: str) -> bool:
+        if not shutil.which('ffmpeg'):
+            logger.warning("ffmpeg not found in PATH, slates disabled")
+            return False
+        output_path = os.path.join(self.stream_dir, clip_name)
+        tmp_path = f"{output_path}.part"
+        # Lowest CPU priority: slates are refreshed while a live stream encodes
+        nice = ['nice', '-n', '19'] if shutil.which('nice') else []
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *nice, 'ffmpeg', *self.build_encode_args(source, tmp_path),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except OSError as e:
+            logger.warning(f"Failed to start slate encoder for {clip_name}: {e}")
+            return False
+        try:
+            _, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            logger.warning(f"Failed to encode slate {clip_name}: {stderr.decode(errors='replace').strip()}")
+            return False
+        # Swap atomically so a receiver never fetches a half-written clip
+        try:
+            os.replace(tmp_path, output_path)
+        except OSError as e:
+            logger.warning(f"Failed to store slate {clip_name}: {e}")
+            return False
+        logger.debug(f"Slate clip updated: {clip_name}")
+        return True
+
+
+class SlateRecorder:
+    """Periodically captures a live dashboard into its slate.
+
+    Usage:
+        async with SlateRecorder(cache, url, page=lambda: pages[0]):
+            ...  # Stream
+
+    The page is looked up on every capture so pages replaced by the health
+    monitor are followed; captures are skipped while `visible()` is False
+    (a carousel showing another dashboard).
+    """
+
+    def __init__(
+        self,
+        cache: SlateCache,
+        url: str,
+        page: Callable[[], Page],
+        visible: Callable[[], bool] = lambda: True,
+        interval: Optional[float] = None,
+        first_capture: float = 10.0
+    ):
+        """Initialize recorder.
+
+        Args:
+            cache: Slate cache to write to
+            url: Dashboard URL the slate is keyed by
+            page: Returns the page currently showing the dashboard
+            visible: Returns whether that page is on screen
+            interval: Seconds between captures (default: SLATE_CAPTURE_INTERVAL
+                env var)
+            first_capture: Seconds after entry before the first capture
+                (once the dashboard has settled)
+        """
+        self.cache = cache
+        self.url = url
+        self.page = page
+        self.visible = visible
+        self.interval = interval if interval is not None else float(
+            os.getenv('SLATE_CAPTURE_INTERVAL', '120')
+        )
+        self.first_capture = first_capture
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "SlateRecorder":
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        # Don't suppress exceptions
+        return False
+
+    async def _run(self) -> None:
+        await asyncio.sleep(min(self.first_capture, self.interval))
+        while True:
+            if self.visible():
+                await self.cache.capture(self.page(), self.url)
+            await asyncio.sleep(self.interval)
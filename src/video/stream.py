@@ -6,19 +6,34 @@ Manages the lifecycle of all pipeline components:
 3. FFmpeg video encoding
 4. Cast session to Android TV
 
-Supports automatic timeout/duration to stop streaming after configured time.
+Supports automatic timeout/duration to stop streaming after configured time,
+and an explicit stop signal (stop_stream) with concurrent component teardown.
 """
 
 import asyncio
 import logging
-from typing import Optional
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional, Union
 
-from .capture import XvfbManager
+from .capture import XvfbManager, find_free_display
 from .encoder import FFmpegEncoder
-from .quality import get_quality_config
+from .quality import RenderGeometry, get_quality_config
+from .server import StreamingServer
+from .slate import SlateCache, SlateRecorder
+from .timeline import StartupTimeline, StartupTraceLog
 from ..browser.manager import BrowserManager
 from ..browser.auth import inject_auth
+from ..browser.readiness import ReadinessStrategy, resolve_readiness, wait_for_ready
+from ..browser.carousel import Carousel, CarouselItem
+from ..browser.health import PageHealthMonitor
+from ..browser.render import RenderProfile
+from ..browser.service import BrowserService
+from ..browser.storage import StorageKeeper, get_storage_store, origin_of
 from ..cast.discovery import get_cast_device, get_device_name
+from ..cast.group import CastGroup, VideoWall
+from ..cast.registry import CastDeviceRegistry
 from ..cast.session import CastSessionManager
 
 logger = logging.getLogger(__name__)
@@ -33,7 +48,8 @@ class StreamManager:
     3. FFmpeg video encoding
     4. Cast session to Android TV
 
-    Supports automatic timeout/duration to stop streaming after configured time.
+    Supports automatic timeout/duration to stop streaming after configured time,
+    or an explicit stop via stop_stream().
 
     Usage:
         manager = StreamManager(
@@ -52,7 +68,17 @@ class StreamManager:
         quality_preset: str = "720p",
         duration: Optional[int] = None,
         auth_config: Optional[dict] = None,
-        mode: str = 'hls'
+        mode: str = 'hls',
+        timeline: Optional[StartupTimeline] = None,
+        streaming_server: Optional[StreamingServer] = None,
+        trace_log: Optional[StartupTraceLog] = None,
+        readiness: Optional[ReadinessStrategy] = None,
+        carousel: Optional[list[CarouselItem]] = None,
+        carousel_refresh_ahead: float = 5.0,
+        browser_service: Optional[BrowserService] = None,
+        slate: Optional[SlateCache] = None,
+        cast_registry: Optional[CastDeviceRegistry] = None,
+        wall: Optional[VideoWall] = None
     ):
         """Initialize streaming manager.
 
@@ -63,6 +89,30 @@ class StreamManager:
             duration: Optional duration in seconds (None = stream indefinitely)
             auth_config: Optional authentication dict with cookies/localStorage
             mode: Streaming mode ('hls' or 'fmp4')
+            timeline: Startup timeline to record stage spans into
+                (a private one is created if omitted)
+            streaming_server: Server serving the stream, used to detect the
+                receiver's first segment fetch
+            trace_log: Trace file the timeline is appended to once startup
+                completes (None = don't persist)
+            readiness: Page readiness strategy (None = per-URL rule or
+                PAGE_READINESS default)
+            carousel: Optional items to rotate through instead of a single
+                page (url is then ignored in favour of the items)
+            carousel_refresh_ahead: Seconds before a carousel item's turn to
+                reload it in the background
+            browser_service: Long-lived browser service to lease a warm
+                display and Chromium from (None = launch Xvfb and a
+                browser for this stream only)
+            slate: Slate cache; when given, the dashboard's last frame is
+                cast as soon as the device is found and the slate is kept
+                up to date while streaming (None = no slate)
+            cast_registry: Registry to borrow an already connected Cast
+                device from; the connection is left open afterwards
+                (None = discover, connect and disconnect per stream)
+            wall: Cast to a synchronized group of devices instead of
+                cast_device_name; a tiled wall renders the page across all
+                screens and gives each its own tile
 
         Raises:
             ValueError: If quality_preset is not recognized
@@ -73,13 +123,52 @@ class StreamManager:
         self.duration = duration
         self.auth_config = auth_config
         self.mode = mode
+        self.carousel_items = carousel
+        self.carousel_refresh_ahead = carousel_refresh_ahead
+        self.carousel: Optional[Carousel] = None
+        self.health: Optional[PageHealthMonitor] = None
+        self.browser_service = browser_service
+        self.slate = slate
+        self.cast_registry = cast_registry
+        self.wall = wall
+        self._cast_task: Optional[asyncio.Task] = None
+        self._slate_url: Optional[str] = None
+        self.readiness = resolve_readiness(url, readiness)
+        self.timeline = timeline or StartupTimeline()
+        self.streaming_server = streaming_server
+        self.trace_log = trace_log
+        self._stream_prefix: Optional[str] = None
+        self._trace_recorded = False
+
+        # What the receiver fetched from the streaming server
+        self.bytes_served = 0
+        self.files_served = 0
+        self.last_fetch_at: Optional[datetime] = None
+
+        # Stop signalling and teardown state
+        self._stop_event = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._streaming = False
+        self._components: dict = {}
+        self._stop_requested_at: Optional[float] = None
+        self.time_to_idle_ms: Optional[float] = None
+
+        # Pre-encoder stage results (see prewarm/_prepare)
+        self._prepared = False
+        self._quality = None
+        self._geometry = None
+        self._tiles = None
+        self._cast_device = None
+        self._display: Optional[str] = None
 
         # Validate quality preset exists
         get_quality_config(quality_preset)  # Raises ValueError if invalid
 
         logger.info(
             f"StreamManager initialized: url={url}, device={cast_device_name}, "
-            f"quality={quality_preset}, duration={duration}, mode={mode}"
+            f"quality={quality_preset}, duration={duration}, mode={mode}, "
+            f"readiness={self.readiness.strategy}"
         )
 
     async def start_stream(self) -> dict:
@@ -91,112 +180,467 @@ class StreamManager:
         3. Launch browser with authentication
         4. Start FFmpeg encoding
         5. Start Cast session
-        6. Stream for configured duration or indefinitely
+        6. Stream for configured duration, or until stop_stream() is called
+
+        Steps 1-3 are skipped if prewarm() already ran. With a slate cache the
+        Cast session is connected right after discovery and shows the
+        dashboard's slate while steps 2-4 run. Components are torn
+        down concurrently on exit (see _teardown), whether the stream ended
+        normally, failed, or was cancelled.
 
         Returns:
-            Dictionary with status, stream_url, device info, and duration
+            Dictionary with status, stream_url, device info, duration and
+            time_to_idle_ms
 
         Raises:
             ValueError: If Cast device not found
             RuntimeError: If any component fails to start
         """
         logger.info("Starting complete streaming pipeline...")
+        self._task = asyncio.current_task()
+        self._idle.clear()
 
         try:
-            # Get quality configuration
-            quality = get_quality_config(self.quality_preset)
-            logger.info(
-                f"Using quality preset '{self.quality_preset}': "
-                f"{quality.resolution[0]}x{quality.resolution[1]} @ {quality.bitrate}kbps"
-            )
-
-            # Discover Cast device
-            logger.info(f"Discovering Cast device: {self.cast_device_name}")
-            cast_device = await get_cast_device(self.cast_device_name)
-            if not cast_device:
-                raise ValueError(f"Cast device not found: {self.cast_device_name}")
-
-            device_name = get_device_name(cast_device)
-            logger.info(f"Found Cast device: {device_name}")
-
-            # Start Xvfb virtual display
-            logger.info("Starting Xvfb virtual display...")
-            async with XvfbManager(resolution=quality.resolution) as display:
-                logger.info(f"Xvfb started on display {display}")
-
-                # Launch browser with auth
-                logger.info("Launching browser...")
-                async with BrowserManager() as browser:
-                    logger.info(f"Navigating to {self.url}")
-                    page = await browser.get_page(self.url)
-
-                    # Inject authentication if provided
-                    if self.auth_config:
-                        logger.info("Injecting authentication...")
-                        await inject_auth(page, self.url, self.auth_config)
-
-                    # Wait for page to load
-                    logger.info("Waiting for page to load...")
-                    await page.wait_for_load_state('networkidle', timeout=10000)
-                    logger.info("Page loaded successfully")
-
-                    # Start FFmpeg encoding
-                    logger.info("Starting FFmpeg encoder...")
-                    async with FFmpegEncoder(quality, display=display, mode=self.mode) as stream_url:
-                        logger.info(f"FFmpeg encoding started: {stream_url}")
-
-                        # Start Cast session
-                        logger.info("Starting Cast session...")
-                        async with CastSessionManager(cast_device) as cast_session:
-                            logger.info(f"Cast session active: {device_name}")
-
-                            # Start playback on Cast device
-                            logger.info(f"Starting playback: {stream_url}")
-                            cast_session.start_cast(stream_url, mode=self.mode)
-
-                            # If duration specified, wait for timeout
-                            if self.duration:
-                                logger.info(
-                                    f"Streaming for {self.duration} seconds..."
-                                )
-                                await asyncio.sleep(self.duration)
-                                logger.info("Duration reached, stopping stream")
-                            else:
-                                # Stream indefinitely (until external stop signal)
-                                logger.info(
-                                    "Streaming indefinitely (no duration set). "
-                                    "Use stop_stream() to terminate."
-                                )
-                                # Placeholder for Phase 4 webhook stop
-                                await asyncio.sleep(float('inf'))
-
+            if self._prepared:
+                logger.info("Using pre-warmed display, browser and page")
+            else:
+                await self._prepare(connect_cast=True)
+
+            quality = self._quality
+            display = self._display
+            cast_device = self._cast_device
+            device_name = self._device_name(cast_device)
+
+            # Start FFmpeg encoding
+            logger.info("Starting FFmpeg encoder...")
+            with self.timeline.span('encoder_first_segment'):
+                stream_url = await self._enter(
+                    'encoder', FFmpegEncoder(
+                        quality, display=display, mode=self.mode,
+                        capture_resolution=self._geometry.display,
+                        tiles=self._tiles
+                    )
+                )
+            logger.info(f"FFmpeg encoding started: {stream_url}")
+
+            # Start Cast session (normally already connected and awake by now)
+            cast_session = await self._connected_session()
+            if cast_session is None:
+                logger.info("Starting Cast session...")
+                cast_session = await self._enter('cast', self._cast_session(cast_device))
+            logger.info(f"Cast session active: {device_name}")
+
+            # Start playback on Cast device
+            logger.info(f"Starting playback: {stream_url}")
+            self._watch_first_fetch(stream_url if isinstance(stream_url, str) else stream_url[0])
+            with self.timeline.span('play_media'):
+                await cast_session.start_cast(stream_url, mode=self.mode)
+            self.timeline.begin('first_segment_fetch')
+            if self.carousel:
+                self.carousel.start_rotation()
+            if self.slate:
+                # Keep this dashboard's slate showing its latest render
+                pages = self.health.pages
+                carousel = self.carousel
+                await self._enter('slate', SlateRecorder(
+                    self.slate, self._slate_url, page=lambda: pages[0],
+                    visible=lambda: carousel is None or carousel.current == 0
+                ))
+
+            # Stream until the duration expires or stop_stream() is called
+            self._streaming = True
+            if self.duration:
+                logger.info(f"Streaming for {self.duration} seconds...")
+            else:
+                logger.info(
+                    "Streaming indefinitely (no duration set). "
+                    "Use stop_stream() to terminate."
+                )
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.duration or None)
+                logger.info("Stop requested, stopping stream")
+            except asyncio.TimeoutError:
+                logger.info("Duration reached, stopping stream")
+
+            await self._teardown()
             logger.info("Streaming pipeline completed successfully")
 
             return {
                 "status": "completed",
                 "stream_url": stream_url,
                 "device": device_name,
-                "duration": self.duration
+                "duration": self.duration,
+                "time_to_idle_ms": self.time_to_idle_ms
             }
 
         except Exception as e:
             logger.error(f"Streaming failed: {e}", exc_info=True)
             raise
+        finally:
+            # No-op if already torn down; covers failures and cancellation
+            await self._teardown()
+            self._streaming = False
+            self._prepared = False
+            self._idle.set()
+            if self.streaming_server:
+                self.streaming_server.remove_request_listener(self._on_file_served)
+            # Persist partial timelines too (failed or never-fetched streams)
+            self._record_trace()
+
+    async def prewarm(self) -> None:
+        """Run the pre-encoder stages ahead of start_stream().
+
+        Discovers the Cast device, starts Xvfb and the browser and loads the
+        page, then holds them so a later start_stream() only has to start
+        the encoder and Cast playback. Call release() if the stream will not
+        be started after all.
 
-    async def stop_stream(self):
-        """Stop active stream (placeholder for Phase 4).
+        Raises:
+            ValueError: If Cast device not found
+            RuntimeError: If any component fails to start
+        """
+        if self._prepared:
+            return
+        logger.info("Pre-warming streaming pipeline...")
+        try:
+            await self._prepare()
+        except BaseException:
+            await self._teardown()
+            raise
+        logger.info("Streaming pipeline pre-warmed")
+
+    async def release(self) -> None:
+        """Release pre-warmed resources without starting the stream."""
+        if self._task is not None:
+            await self.stop_stream()
+            return
+        logger.info("Releasing pre-warmed pipeline")
+        await self._teardown()
+        self._prepared = False
 
-        This method is a placeholder for Phase 4 webhook-triggered stop.
-        Currently, duration timeout handles auto-stop. In Phase 4, this
-        will use asyncio.Event to signal stop and break out of indefinite stream.
+    async def _prepare(self, connect_cast: bool = False) -> None:
+        """Discovery, Xvfb, browser launch and page load (pre-encoder stages).
 
-        Note:
-            When streaming with duration=None, the stream runs indefinitely
-            until the context managers exit (which currently never happens).
-            Phase 4 will implement proper stop signaling via webhooks.
+        Args:
+            connect_cast: Connect to the Cast device, wake the TV and play
+                the dashboard's slate (if any) in the background as soon as
+                it is discovered, concurrently with the remaining stages
+                (not when pre-warming, which must not touch the TV yet)
         """
-        logger.info("stop_stream called (placeholder for Phase 4)")
+        # Get quality configuration
+        quality = get_quality_config(self.quality_preset)
         logger.info(
-            "Currently, streams with duration=None run indefinitely. "
-            "Phase 4 will implement webhook-triggered stop via asyncio.Event."
+            f"Using quality preset '{self.quality_preset}': "
+            f"{quality.resolution[0]}x{quality.resolution[1]} @ {quality.bitrate}kbps"
         )
+        self._quality = quality
+        # Render exactly the pixels FFmpeg captures (optionally fewer, upscaled)
+        geometry = RenderGeometry.for_quality(quality)
+        self._geometry = geometry
+        if geometry.upscaled:
+            logger.info(
+                f"Rendering at {geometry.display[0]}x{geometry.display[1]}, "
+                f"upscaled to {quality.resolution[0]}x{quality.resolution[1]}"
+            )
+        if self.wall and self.wall.tiled:
+            # Render the page across the whole wall; each screen gets a tile
+            columns, rows = self.wall.grid
+            self._tiles = geometry.tiles(columns, rows)
+            self._geometry = geometry = geometry.tiled(columns, rows)
+            logger.info(
+                f"Rendering a {columns}x{rows} video wall at "
+                f"{geometry.display[0]}x{geometry.display[1]}"
+            )
+
+        # Discover Cast device(s)
+        names = self.wall.devices if self.wall else [self.cast_device_name]
+        logger.info(f"Discovering Cast device(s): {', '.join(map(str, names))}")
+        with self.timeline.span('discovery'):
+            devices = await asyncio.gather(*(self._discover(name) for name in names))
+        missing = [name for name, device in zip(names, devices) if not device]
+        if missing:
+            raise ValueError(f"Cast device not found: {', '.join(map(str, missing))}")
+        cast_device = list(devices) if self.wall else devices[0]
+        self._cast_device = cast_device
+        logger.info(f"Found Cast device(s): {self._device_name(cast_device)}")
+
+        self._slate_url = self.carousel_items[0].url if self.carousel_items else self.url
+        if connect_cast:
+            clip_url = self.slate.clip_url(self._slate_url) if self.slate else None
+            self._cast_task = asyncio.create_task(self._connect_cast(cast_device, clip_url))
+
+        # Don't render animation frames faster than FFmpeg captures them
+        render_profile = RenderProfile.for_framerate(quality.framerate)
+        # Saved logins for these origins are restored before navigation
+        urls = [item.url for item in self.carousel_items] if self.carousel_items else [self.url]
+
+        if self.browser_service is not None:
+            # Lease a warm display + Chromium (launched only if none is idle)
+            logger.info("Leasing browser from browser service...")
+            with self.timeline.span('browser_launch'):
+                browser = await self._enter(
+                    'browser',
+                    self.browser_service.session(
+                        geometry.display, render_profile, urls,
+                        viewport=geometry.viewport,
+                        device_scale_factor=geometry.device_scale_factor
+                    )
+                )
+            display = browser.display
+        else:
+            # Start Xvfb virtual display (on a free display number, so a
+            # pre-warmed pipeline can coexist with the stream currently playing)
+            logger.info("Starting Xvfb virtual display...")
+            with self.timeline.span('xvfb'):
+                display = await self._enter(
+                    'xvfb', XvfbManager(display=find_free_display(), resolution=geometry.display)
+                )
+            logger.info(f"Xvfb started on display {display}")
+
+            # Launch browser with auth
+            logger.info("Launching browser...")
+            with self.timeline.span('browser_launch'):
+                browser = await self._enter('browser', BrowserManager(
+                    display=display, render_profile=render_profile, storage_urls=urls,
+                    viewport=geometry.viewport,
+                    device_scale_factor=geometry.device_scale_factor
+                ))
+        self._display = display
+
+        if self.carousel_items:
+            # Pre-render every carousel page in the same context
+            self.carousel = await self._enter('carousel', Carousel(
+                browser, self.carousel_items, refresh_ahead=self.carousel_refresh_ahead,
+                timeline=self.timeline
+            ))
+        else:
+            logger.info(f"Navigating to {self.url}")
+            with self.timeline.span('navigation'):
+                page = await browser.open_page(self.url)
+
+            # Inject authentication if provided
+            if self.auth_config:
+                logger.info("Injecting authentication...")
+                await inject_auth(page, self.url, self.auth_config)
+
+            # Wait until the dashboard has painted (not networkidle -
+            # dashboards holding websockets open never reach it)
+            with self.timeline.span('page_ready'):
+                ready = await wait_for_ready(page, self.readiness)
+            logger.info(f"Page ready (strategy={self.readiness.strategy}, satisfied={ready})")
+
+        # Reload leaking pages and recover crashed renderers without
+        # touching the encoder or Cast session
+        if self.carousel:
+            pages = self.carousel.pages
+            readiness = [item.readiness for item in self.carousel_items]
+            carousel = self.carousel
+            front = lambda: carousel.current  # noqa: E731
+        else:
+            pages, readiness, front = [page], [self.readiness], lambda: 0  # noqa: E731
+        self.health = await self._enter('health', PageHealthMonitor(
+            browser, pages, urls, readiness=readiness, front=front,
+            on_replace=self._on_page_replaced
+        ))
+
+        # Save (and keep refreshing) each origin's login for the next cast
+        store = get_storage_store()
+        if store:
+            for index, (url, shown) in enumerate(zip(urls, pages)):
+                if origin_of(url) not in (origin_of(u) for u in urls[:index]):
+                    await self._enter(f'storage:{index}', StorageKeeper(shown, url, store))
+
+        self._prepared = True
+
+    async def _discover(self, name: Optional[str]):
+        """Find a Cast device (through the connection pool when there is one)."""
+        if self.cast_registry is not None:
+            return await self.cast_registry.get_device(name)
+        return await get_cast_device(name)
+
+    @staticmethod
+    def _device_name(cast_device) -> str:
+        if isinstance(cast_device, list):
+            return ', '.join(get_device_name(device) for device in cast_device)
+        return get_device_name(cast_device)
+
+    def _cast_session(self, cast_device) -> Union[CastSessionManager, CastGroup]:
+        """Session for one device, or a synchronized group for a video wall."""
+        keep_connection = self.cast_registry is not None
+        if isinstance(cast_device, list):
+            return CastGroup(cast_device, timeline=self.timeline, keep_connection=keep_connection)
+        return CastSessionManager(cast_device, timeline=self.timeline, keep_connection=keep_connection)
+
+    async def _connect_cast(
+        self, cast_device, clip_url: Optional[str]
+    ) -> Union[CastSessionManager, CastGroup]:
+        """Connect the Cast session (waking the TV) and play a slate clip while the pipeline starts."""
+        logger.info("Starting Cast session...")
+        cast_session = await self._enter('cast', self._cast_session(cast_device))
+        if clip_url is None:
+            return cast_session
+        try:
+            await cast_session.start_cast(clip_url, mode='clip')
+            logger.info(f"Slate playing: {clip_url}")
+        except Exception as e:
+            # The session is still usable for the live stream
+            logger.warning(f"Failed to play slate: {e}")
+        return cast_session
+
+    async def _connected_session(self) -> Optional[Union[CastSessionManager, CastGroup]]:
+        """Cast session connected in the background, if it succeeded."""
+        task, self._cast_task = self._cast_task, None
+        if task is None:
+            return None
+        try:
+            return await task
+        except Exception as e:
+            logger.warning(f"Background Cast session failed, reconnecting: {e}")
+            return None
+
+    def _on_page_replaced(self, index: int, page) -> None:
+        """Health monitor callback: point the page's storage keeper at its replacement."""
+        keeper = self._components.get(f'storage:{index}')
+        if keeper is not None:
+            keeper.page = page
+
+    @property
+    def stage(self) -> str:
+        """Pipeline stage: a startup stage, 'streaming', 'stopping' or 'stopped'."""
+        if self._task is not None and self._idle.is_set():
+            return 'stopped'
+        if self._stop_requested_at is not None:
+            return 'stopping'
+        if self._streaming:
+            return 'streaming'
+        return self.timeline.current_stage() or ('prewarmed' if self._prepared else 'starting')
+
+    def stats(self) -> dict:
+        """Live session statistics for /status (cheap: no I/O, nothing awaited)."""
+        encoder = self._components.get('encoder')
+        return {
+            'device': self._device_name(self._cast_device) if self._cast_device else None,
+            'stage': self.stage,
+            'encoder': encoder.progress.to_dict() if encoder else None,
+            'receiver': {
+                'last_fetch_at': self.last_fetch_at.isoformat() if self.last_fetch_at else None,
+                'files_served': self.files_served,
+                'bytes_served': self.bytes_served,
+            },
+        }
+
+    def playback_stats(self) -> Optional[dict]:
+        """Receiver quality-of-experience counters (None until live playback starts)."""
+        cast_session = self._components.get('cast')
+        return cast_session.playback_stats() if cast_session else None
+
+    async def stop_stream(self) -> Optional[float]:
+        """Signal the stream to stop and wait until the pipeline is idle.
+
+        While streaming, sets the stop event so start_stream() leaves its
+        wait and tears down. During startup there is nothing to signal, so
+        the startup task is cancelled instead (teardown still runs).
+
+        Returns:
+            Time from the stop request until all components were torn down,
+            in milliseconds (None if the stream was never started)
+        """
+        if self._task is None:
+            logger.info("stop_stream called before stream started")
+            return None
+
+        logger.info("Stop requested")
+        self._stop_requested_at = time.monotonic()
+        self._stop_event.set()
+        if not self._streaming and not self._task.done():
+            self._task.cancel()
+
+        await self._idle.wait()
+        return self.time_to_idle_ms
+
+    async def _enter(self, name: str, component):
+        """Enter a component's async context and register it for teardown."""
+        value = await component.__aenter__()
+        self._components[name] = component
+        return value
+
+    async def _exit(self, name: str) -> None:
+        """Exit one registered component, logging (not raising) errors."""
+        component = self._components.pop(name, None)
+        if component is None:
+            return
+        try:
+            await component.__aexit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"Error tearing down {name}: {e}")
+
+    async def _teardown(self) -> None:
+        """Tear down all entered components concurrently.
+
+        Cast media stop, encoder shutdown and the display stack (page health
+        monitor, storage state save, carousel pages, browser, then the Xvfb
+        it renders into) are independent, so they run in parallel instead of
+        unwinding one after another. Each component
+        escalates its own process shutdown with tight deadlines.
+        """
+        if self._cast_task is not None:
+            self._cast_task.cancel()
+            await asyncio.gather(self._cast_task, return_exceptions=True)
+            self._cast_task = None
+
+        if not self._components:
+            return
+
+        teardown_start = time.monotonic()
+        logger.info(f"Tearing down pipeline: {', '.join(self._components)}")
+
+        async def display_stack():
+            await self._exit('slate')
+            await self._exit('health')
+            for name in [n for n in self._components if n.startswith('storage:')]:
+                await self._exit(name)
+            await self._exit('carousel')
+            await self._exit('browser')
+            await self._exit('xvfb')
+
+        await asyncio.gather(self._exit('cast'), self._exit('encoder'), display_stack())
+
+        started = self._stop_requested_at or teardown_start
+        self.time_to_idle_ms = round((time.monotonic() - started) * 1000, 1)
+        logger.info(f"Pipeline idle after {self.time_to_idle_ms:.0f}ms")
+
+    def _watch_first_fetch(self, stream_url: str) -> None:
+        """Start watching the streaming server for the receiver's first fetch.
+
+        Args:
+            stream_url: URL returned by FFmpegEncoder (its basename identifies
+                the playlist/segments belonging to this session)
+        """
+        if not self.streaming_server:
+            return
+        # HLS segments share the playlist's base name (stream_<id>N.ts)
+        self._stream_prefix = os.path.splitext(os.path.basename(stream_url))[0]
+        self.streaming_server.add_request_listener(self._on_file_served)
+
+    def _on_file_served(self, filename: str, size: int) -> None:
+        """Streaming server callback: count the fetch and close the first_segment_fetch span."""
+        if not self._stream_prefix or not filename.startswith(self._stream_prefix):
+            return
+        self.bytes_served += size
+        self.files_served += 1
+        self.last_fetch_at = datetime.now(timezone.utc)
+        if filename.endswith('.m3u8'):
+            return  # Playlist fetch precedes media - wait for the first segment
+        if self.timeline.end('first_segment_fetch'):
+            logger.info(
+                f"Receiver fetched first segment {self.timeline.durations()['first_segment_fetch']:.0f}ms "
+                f"after play_media"
+            )
+            self._record_trace()
+
+    def _record_trace(self) -> None:
+        """Append the timeline to the trace log once per session."""
+        if self.trace_log is None or self._trace_recorded:
+            return
+        self._trace_recorded = True
+        self.trace_log.append(self.timeline)
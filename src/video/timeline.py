@@ -0,0 +1,260 @@
+"""Startup timeline tracing for the streaming pipeline.
+
+Records monotonic spans for each startup stage of a streaming session
+(discovery, Xvfb, browser launch, navigation, ...) so it is possible to see
+which stage dominates time-to-picture. Completed timelines are appended to a
+rolling JSONL trace file that can be summarised into per-stage percentiles.
+
+Environment variables:
+    STARTUP_TRACE_FILE: Path of the JSONL trace file
+                        (default: /tmp/dashboard-cast/startup_trace.jsonl)
+    STARTUP_TRACE_MAX_BYTES: Size at which the trace file is rotated to
+                             '<path>.1' (default: 1048576)
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Startup stages in pipeline order
+STARTUP_STAGES = (
+    'discovery',
+    'xvfb',
+    'browser_launch',
+    'navigation',
+    'page_ready',
+    'encoder_first_segment',
+    'cast_connect',
+    'wake',
+    'play_media',
+    'first_segment_fetch',
+)
+
+DEFAULT_TRACE_FILE = '/tmp/dashboard-cast/startup_trace.jsonl'
+DEFAULT_TRACE_MAX_BYTES = 1024 * 1024
+
+
+class StartupTimeline:
+    """Monotonic span recorder for one streaming session.
+
+    Span offsets are measured with time.monotonic() relative to the moment
+    the timeline was created, so they are immune to wall clock changes.
+
+    Usage:
+        timeline = StartupTimeline(session_id="abc")
+        with timeline.span('discovery'):
+            device = await get_cast_device()
+
+        # Spans that end somewhere else (e.g. in a callback)
+        timeline.begin('first_segment_fetch')
+        ...
+        timeline.end('first_segment_fetch')
+    """
+
+    def __init__(self, session_id: Optional[str] = None):
+        """Initialize an empty timeline.
+
+        Args:
+            session_id: Optional session identifier included in trace records
+        """
+        self.session_id = session_id
+        self.started_at = datetime.now(timezone.utc)
+        self._origin = time.monotonic()
+        self._spans: dict[str, dict[str, Optional[float]]] = {}
+
+    def _now_ms(self) -> float:
+        return (time.monotonic() - self._origin) * 1000
+
+    def begin(self, stage: str) -> None:
+        """Mark the start of a stage. Restarting an open stage is a no-op."""
+        span = self._spans.get(stage)
+        if span is not None and span['end'] is None:
+            return
+        self._spans[stage] = {'start': self._now_ms(), 'end': None}
+
+    def end(self, stage: str, at: Optional[float] = None) -> bool:
+        """Mark the end of a stage.
+
+        Args:
+            stage: Stage name
+            at: time.monotonic() at which the stage ended (default: now)
+
+        Returns:
+            True if an open span was closed, False if the stage was never
+            started or has already ended
+        """
+        span = self._spans.get(stage)
+        if span is None or span['end'] is not None:
+            return False
+        span['end'] = (at - self._origin) * 1000 if at is not None else self._now_ms()
+        logger.debug(f"Startup stage '{stage}' took {span['end'] - span['start']:.1f}ms")
+        return True
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as a stage.
+
+        The span is left open if the block raises, so failed stages show up
+        as incomplete in /status and the trace file.
+        """
+        self.begin(stage)
+        yield
+        self.end(stage)
+
+    def is_complete(self, stage: str = STARTUP_STAGES[-1]) -> bool:
+        """Check whether a stage (by default the final startup stage) has ended."""
+        span = self._spans.get(stage)
+        return span is not None and span['end'] is not None
+
+    def current_stage(self) -> Optional[str]:
+        """The most recently started stage that hasn't ended (None if none is open)."""
+        open_spans = [(span['start'], stage) for stage, span in self._spans.items() if span['end'] is None]
+        return max(open_spans)[1] if open_spans else None
+
+    def durations(self) -> dict[str, float]:
+        """Get durations in milliseconds for all completed stages."""
+        return {
+            stage: round(span['end'] - span['start'], 1)
+            for stage, span in self._spans.items()
+            if span['end'] is not None
+        }
+
+    def to_dict(self) -> dict:
+        """Serialize the timeline for /status and the trace file."""
+        spans = {}
+        for stage, span in self._spans.items():
+            spans[stage] = {
+                'start_ms': round(span['start'], 1),
+                'end_ms': round(span['end'], 1) if span['end'] is not None else None,
+                'duration_ms': (
+                    round(span['end'] - span['start'], 1)
+                    if span['end'] is not None else None
+                ),
+            }
+
+        ends = [span['end'] for span in self._spans.values() if span['end'] is not None]
+        return {
+            'session_id': self.session_id,
+            'started_at': self.started_at.isoformat(),
+            'complete': self.is_complete(),
+            'total_ms': round(max(ends), 1) if ends else None,
+            'spans': spans,
+        }
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile of a non-empty list."""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class StartupTraceLog:
+    """Rolling JSONL file of completed startup timelines.
+
+    Each line is one StartupTimeline.to_dict() record. When the file grows
+    beyond max_bytes it is rotated to '<path>.1' (replacing the previous
+    rotation), so at most two files' worth of history is kept.
+
+    Usage:
+        trace_log = StartupTraceLog()
+        trace_log.append(timeline)
+        summary = trace_log.summarize()
+        # {'discovery': {'count': 12, 'p50': 410.2, 'p90': 5003.1, ...}, ...}
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        """Initialize trace log.
+
+        Args:
+            path: Trace file path (default: STARTUP_TRACE_FILE env var)
+            max_bytes: Rotation threshold (default: STARTUP_TRACE_MAX_BYTES env var)
+        """
+        self.path = path or os.getenv('STARTUP_TRACE_FILE', DEFAULT_TRACE_FILE)
+        self.max_bytes = max_bytes or int(
+            os.getenv('STARTUP_TRACE_MAX_BYTES', DEFAULT_TRACE_MAX_BYTES)
+        )
+
+    @property
+    def rotated_path(self) -> str:
+        return f"{self.path}.1"
+
+    def append(self, timeline: StartupTimeline) -> None:
+        """Append a timeline record, rotating the file if it is too large.
+
+        Errors are logged rather than raised - tracing must never break a stream.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                os.replace(self.path, self.rotated_path)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(timeline.to_dict()) + '\n')
+        except OSError as e:
+            logger.warning(f"Failed to append startup trace to {self.path}: {e}")
+
+    def load(self) -> list[dict]:
+        """Load all trace records, oldest first (rotated file included)."""
+        records = []
+        for path in (self.rotated_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.debug(f"Skipping malformed trace line in {path}")
+        return records
+
+    def summarize(self, percentiles: tuple[float, ...] = (50, 90, 99)) -> dict[str, dict]:
+        """Summarize stage durations across all recorded sessions.
+
+        Args:
+            percentiles: Percentiles to compute for each stage
+
+        Returns:
+            Mapping of stage (plus 'total') to count, min, max and requested
+            percentiles in milliseconds, e.g. {'xvfb': {'count': 3, 'p50': ...}}
+        """
+        samples: dict[str, list[float]] = {}
+        for record in self.load():
+            for stage, span in record.get('spans', {}).items():
+                if span.get('duration_ms') is not None:
+                    samples.setdefault(stage, []).append(span['duration_ms'])
+            if record.get('complete') and record.get('total_ms') is not None:
+                samples.setdefault('total', []).append(record['total_ms'])
+
+        order = {stage: i for i, stage in enumerate(STARTUP_STAGES + ('total',))}
+        summary = {}
+        for stage in sorted(samples, key=lambda s: order.get(s, len(order))):
+            values = samples[stage]
+            stats = {
+                'count': len(values),
+                'min': round(min(values), 1),
+                'max': round(max(values), 1),
+            }
+            for pct in percentiles:
+                stats[f"p{pct:g}"] = round(_percentile(values, pct), 1)
+            summary[stage] = stats
+        return summary
+
+
+if __name__ == '__main__':
+    # Print per-stage percentile summary: python -m src.video.timeline [trace_file]
+    trace_path = sys.argv[1] if len(sys.argv) > 1 else None
+    print(json.dumps(StartupTraceLog(trace_path).summarize(), indent=2))
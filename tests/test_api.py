@@ -1,7 +1,14 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, patch, MagicMock
 from src.api.main import app
+from src.api.health import HealthMonitor
+from src.api.scheduler import CastScheduler, CronExpression
+from src.api.state import StreamTracker
+from src.video.timeline import StartupTimeline
 
 
 @pytest.fixture
@@ -81,3 +88,161 @@ def test_start_invalid_url(client):
         "quality": "1080p"
     })
     assert response.status_code == 422  # Pydantic validation error
+
+
+def test_cron_next_after():
+    """Cron expressions resolve to the next matching minute."""
+    # 2026-10-19 is a Monday
+    now = datetime(2026, 10, 19, 9, 30)
+    assert CronExpression("0 9 * * 1-5").next_after(now) == datetime(2026, 10, 20, 9, 0)
+    assert CronExpression("*/15 * * * *").next_after(now) == datetime(2026, 10, 19, 9, 45)
+    assert CronExpression("0 8 * * 0").next_after(now) == datetime(2026, 10, 25, 8, 0)
+    assert CronExpression("0 8 * * 7").next_after(now) == datetime(2026, 10, 25, 8, 0)
+    assert CronExpression("@monthly").next_after(now) == datetime(2026, 11, 1, 0, 0)
+    # Day-of-month and day-of-week are OR'd when both are restricted
+    assert CronExpression("0 0 1 * 3").next_after(now) == datetime(2026, 10, 21, 0, 0)
+
+
+def test_cron_invalid():
+    """Malformed cron expressions are rejected."""
+    for expression in ("* * * *", "60 * * * *", "*/0 * * * *", "a * * * *"):
+        with pytest.raises(ValueError):
+            CronExpression(expression)
+    with pytest.raises(ValueError):
+        CronExpression("0 0 30 2 *").next_after(datetime(2026, 1, 1))
+
+
+@pytest.mark.asyncio
+async def test_scheduler_hands_prewarmed_manager_to_tracker():
+    """A slot pre-warms ahead of time and starts the tracker with that manager."""
+    tracker = MagicMock()
+    tracker.has_active_stream.return_value = False
+    tracker.start_stream = AsyncMock()
+
+    with patch("src.api.scheduler.StreamManager") as manager_cls:
+        manager = manager_cls.return_value
+        manager.prewarm = AsyncMock()
+        manager.release = AsyncMock()
+
+        scheduler = CastScheduler(tracker)
+        entry = scheduler.add("@daily", "https://example.com", lead_time=0.1)
+        await scheduler._cancel_runner(entry.id)
+        entry.next_run = datetime.now() + timedelta(seconds=0.2)
+        scheduler._runners[entry.id] = asyncio.create_task(scheduler._run_entry(entry))
+
+        await asyncio.sleep(0.4)
+        await scheduler.shutdown()
+
+    manager.prewarm.assert_awaited_once()
+    assert tracker.start_stream.await_args.kwargs["manager"] is manager
+    manager.release.assert_not_awaited()
+    assert entry.next_run > datetime.now()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_skip_releases_prewarm():
+    """Skipping a slot releases the pre-warmed pipeline and advances next_run."""
+    tracker = MagicMock()
+    with patch("src.api.scheduler.StreamManager") as manager_cls:
+        manager = manager_cls.return_value
+        manager.prewarm = AsyncMock()
+        manager.release = AsyncMock()
+
+        scheduler = CastScheduler(tracker)
+        # Lead time longer than a day: pre-warms immediately
+        entry = scheduler.add("@daily", "https://example.com", lead_time=2 * 86400)
+        await asyncio.sleep(0.05)
+        assert entry.prewarmed
+
+        first_slot = entry.next_run
+        await scheduler.skip_next(entry.id)
+        manager.release.assert_awaited()
+        assert entry.next_run > first_slot
+
+        assert await scheduler.remove(entry.id)
+        assert not await scheduler.remove(entry.id)
+
+
+@pytest.mark.asyncio
+async def test_tracker_keeps_session_record():
+    """The active session's parameters and live pipeline stats are reported without I/O."""
+    tracker = StreamTracker()
+    assert tracker.current_session() is None
+
+    manager = MagicMock()
+    manager.timeline = StartupTimeline("abc")
+    manager.start_stream = lambda: asyncio.sleep(10)
+    manager.stop_stream = AsyncMock(return_value=12.5)
+    manager.stats.return_value = {
+        "device": "Test TV", "stage": "streaming",
+        "encoder": {"fps": 30.0, "speed": 1.0, "segments": 4},
+        "receiver": {"bytes_served": 4096, "files_served": 3, "last_fetch_at": None},
+    }
+    manager.playback_stats.return_value = None
+
+    await tracker.start_stream("abc", "https://example.com", "720p", None, mode="fmp4", manager=manager)
+    record = tracker.current_session().to_dict()
+    assert (record["url"], record["quality"], record["mode"]) == ("https://example.com", "720p", "fmp4")
+    assert record["device"] == "Test TV" and record["stage"] == "streaming"
+    assert record["encoder"]["segments"] == 4 and record["receiver"]["bytes_served"] == 4096
+    assert record["started_at"] and record["startup"]["session_id"] == "abc"
+
+    assert await tracker.stop_current_stream() == 12.5
+    assert tracker.current_session() is None
+
+
+@pytest.mark.asyncio
+async def test_health_monitor_serves_cached_snapshot(tmp_path, monkeypatch):
+    """/health answers from the background snapshot; refresh=True re-runs the checks."""
+    monkeypatch.delenv("CAST_DEVICE_IP", raising=False)
+    device_cache = MagicMock()
+    device_cache.lookup.return_value = MagicMock()
+    monitor = HealthMonitor(StreamTracker(), stream_dir=str(tmp_path), device_cache=device_cache, interval=3600)
+    monitor.min_free_mb = 0
+
+    with patch.object(monitor.hw_accel, "is_qsv_available", return_value=False) as probe:
+        await monitor.start()
+        snapshot = await monitor.get()
+        assert snapshot["cast_device"] == "available" and snapshot["stream"] == {"state": "idle"}
+        assert snapshot["disk"]["path"] == str(tmp_path) and snapshot["disk"]["low"] is False
+        assert snapshot["hardware_acceleration"]["encoder"] == "libx264"
+
+        await monitor.get()
+        assert device_cache.lookup.call_count == 1  # Served from the snapshot
+        assert monitor.age is not None and monitor.age < 1
+
+        device_cache.lookup.return_value = None
+        snapshot = await monitor.get(refresh=True)
+        assert device_cache.lookup.call_count == 2
+        assert snapshot["status"] == "degraded" and snapshot["cast_device"] == "unavailable"
+        await monitor.stop()
+    assert probe.called
+
+
+@pytest.mark.asyncio
+async def test_health_monitor_stream_stall_by_mode(tmp_path):
+    """HLS stalls when the receiver stops fetching; fMP4 (fetched once) only on encoder silence."""
+    tracker = StreamTracker()
+    monitor = HealthMonitor(tracker, stream_dir=str(tmp_path), interval=3600)
+    manager = MagicMock()
+    manager.start_stream = lambda: asyncio.sleep(10)
+    manager.stop_stream = AsyncMock(return_value=0.0)
+    manager.playback_stats.return_value = None
+    fetched_at = (datetime.now(timezone.utc) - timedelta(seconds=600)).isoformat()
+    manager.stats.return_value = {
+        "device": "Test TV", "stage": "streaming",
+        "encoder": {"reported_s_ago": 1.0},
+        "receiver": {"bytes_served": 4096, "files_served": 1, "last_fetch_at": fetched_at},
+    }
+
+    for mode, state in (("fmp4", "live"), ("hls", "stalled")):
+        manager.timeline = StartupTimeline(mode)
+        await tracker.start_stream(mode, "https://example.com", "720p", None, mode=mode, manager=manager)
+        stream = monitor._check_stream()
+        assert (stream["mode"], stream["state"]) == (mode, state)
+        await tracker.stop_current_stream()
+
+    manager.stats.return_value["encoder"] = {"reported_s_ago": 600.0}
+    await tracker.start_stream("quiet", "https://example.com", "720p", None, mode="fmp4", manager=manager)
+    assert monitor._check_stream()["state"] == "stalled"
+    await tracker.stop_current_stream()
@@ -1,10 +1,20 @@
 """Tests for browser automation module."""
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.browser.manager import BrowserManager
 from src.browser.auth import inject_auth
+from src.browser.readiness import (
+    ReadinessStrategy,
+    FCP_PREDICATE,
+    load_readiness_rules,
+    resolve_readiness,
+    wait_for_ready,
+)
+from src.browser.carousel import Carousel, CarouselItem
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 
 @pytest.mark.asyncio
@@ -151,3 +161,583 @@ async def test_browser_manager_with_auth():
         assert page is not None
         title = await page.title()
         assert "Example" in title
+
+
+def test_readiness_strategy_validation():
+    """Test strategies requiring an argument reject missing values."""
+    with pytest.raises(ValueError, match="requires a selector"):
+        ReadinessStrategy(strategy='selector')
+    with pytest.raises(ValueError, match="Unknown readiness strategy"):
+        ReadinessStrategy(strategy='bogus')
+
+
+def test_resolve_readiness_precedence(tmp_path, monkeypatch):
+    """Test per-request override beats per-URL rule beats env default."""
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(
+        '[{"match": "https://grafana.local/*", "strategy": "selector", "selector": ".panel"}]'
+    )
+    monkeypatch.setenv("READINESS_RULES_FILE", str(rules_file))
+    monkeypatch.setenv("PAGE_READINESS", "settle")
+
+    override = ReadinessStrategy(strategy='js', expression="() => window.ready")
+    assert resolve_readiness("https://grafana.local/d/1", override) is override
+    assert resolve_readiness("https://grafana.local/d/1").selector == ".panel"
+    assert resolve_readiness("https://other.local/").strategy == 'settle'
+    assert len(load_readiness_rules()) == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_ready_fcp():
+    """Test fcp strategy waits on the paint timing predicate."""
+    mock_page = AsyncMock()
+
+    ready = await wait_for_ready(mock_page, ReadinessStrategy(strategy='fcp', timeout_ms=500))
+
+    assert ready is True
+    mock_page.wait_for_function.assert_called_once_with(FCP_PREDICATE, timeout=500)
+    mock_page.wait_for_load_state.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_ready_timeout_does_not_raise():
+    """Test a predicate that never passes is reported, not raised."""
+    mock_page = AsyncMock()
+    mock_page.wait_for_selector.side_effect = PlaywrightTimeoutError("timeout")
+
+    ready = await wait_for_ready(
+        mock_page, ReadinessStrategy(strategy='selector', selector='.panel', timeout_ms=10)
+    )
+
+    assert ready is False
+
+
+@pytest.mark.asyncio
+async def test_carousel_preloads_and_rotates():
+    """Test carousel pre-loads every page and rotates with background refresh."""
+    pages = [AsyncMock(name="page_a"), AsyncMock(name="page_b")]
+    mock_browser = MagicMock()
+    mock_browser.open_page = AsyncMock(side_effect=pages)
+
+    items = [
+        CarouselItem("https://a.local", dwell=0.2),
+        CarouselItem("https://b.local", dwell=0.2),
+    ]
+
+    async with Carousel(mock_browser, items, refresh_ahead=0.1) as carousel:
+        # Both pages loaded up-front, first one in front
+        assert mock_browser.open_page.call_count == 2
+        pages[0].bring_to_front.assert_called_once()
+        assert carousel.current_page is pages[0]
+
+        carousel.start_rotation()
+        await asyncio.sleep(0.3)
+
+        # Second page refreshed before coming on screen, then switched to
+        pages[1].reload.assert_called_once()
+        pages[1].bring_to_front.assert_called_once()
+        assert carousel.current == 1
+
+    # Pages closed on exit
+    pages[0].close.assert_called_once()
+    pages[1].close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_carousel_times_navigation_and_readiness_separately():
+    """Test the pre-load records navigation and page_ready as consecutive spans."""
+    from src.video.timeline import StartupTimeline
+
+    timeline = StartupTimeline("abc")
+
+    async def open_page(url):
+        await asyncio.sleep(0.05)
+        return AsyncMock(name=url)
+
+    async def ready(page, strategy):
+        assert timeline.is_complete('navigation')  # Every page navigated first
+        await asyncio.sleep(0.05)
+        return True
+
+    mock_browser = MagicMock()
+    mock_browser.open_page = open_page
+    items = [CarouselItem("https://a.local"), CarouselItem("https://b.local")]
+
+    with patch('src.browser.carousel.wait_for_ready', side_effect=ready):
+        async with Carousel(mock_browser, items, refresh_ahead=0, timeline=timeline):
+            durations = timeline.durations()
+
+    assert 40 <= durations['navigation'] < 100
+    assert 40 <= durations['page_ready'] < 100
+
+
+def test_carousel_requires_items():
+    """Test carousel rejects an empty item list."""
+    with pytest.raises(ValueError, match="at least one item"):
+        Carousel(MagicMock(), [])
+
+
+def _mock_browser_service_playwright():
+    """Playwright driver mock whose launch() returns a fresh connected browser."""
+    def new_browser(*args, **kwargs):
+        browser = MagicMock()
+        browser.is_connected.return_value = True
+        browser.new_context = AsyncMock(side_effect=lambda **kw: AsyncMock())
+        browser.close = AsyncMock()
+        return browser
+
+    playwright = MagicMock()
+    playwright.chromium.launch = AsyncMock(side_effect=new_browser)
+    playwright.stop = AsyncMock()
+    return playwright
+
+
+def _mock_xvfb(*args, display=':99', **kwargs):
+    xvfb = MagicMock()
+    xvfb.__aenter__ = AsyncMock(return_value=display)
+    xvfb.__aexit__ = AsyncMock(return_value=False)
+    return xvfb
+
+
+@pytest.mark.asyncio
+async def test_browser_service_reuses_chromium_across_sessions():
+    """Sessions get fresh contexts on one long-lived Chromium process."""
+    from src.browser.service import BrowserService
+
+    playwright = _mock_browser_service_playwright()
+    with patch("src.browser.service.async_playwright") as mock_ap, \
+            patch("src.browser.service.XvfbManager", side_effect=_mock_xvfb):
+        mock_ap.return_value.start = AsyncMock(return_value=playwright)
+
+        async with BrowserService(recycle_sessions=0, recycle_rss_mb=0) as service:
+            async with service.session((1920, 1080)) as first:
+                first_context = first.context
+                assert first.display == ':99'
+            async with service.session((1920, 1080)) as second:
+                assert second.context is not first_context
+
+            assert playwright.chromium.launch.await_count == 1
+            first_context.close.assert_awaited_once()
+            browser = service.hosts[0].browser
+
+        browser.close.assert_awaited_once()
+        playwright.stop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_browser_service_recycles_and_relaunches_after_crash():
+    """Hosts are relaunched after N sessions and when Chromium crashes."""
+    from src.browser.service import BrowserService
+
+    playwright = _mock_browser_service_playwright()
+    with patch("src.browser.service.async_playwright") as mock_ap, \
+            patch("src.browser.service.XvfbManager", side_effect=_mock_xvfb):
+        mock_ap.return_value.start = AsyncMock(return_value=playwright)
+
+        async with BrowserService(recycle_sessions=2, recycle_rss_mb=0) as service:
+            for _ in range(2):
+                async with service.session():
+                    pass
+            await asyncio.gather(*service._background)
+            # Recycled after 2 sessions, replacement launched in the background
+            assert playwright.chromium.launch.await_count == 2
+            assert len(service.hosts) == 1
+
+            # Simulate a crash of the idle host
+            host = service.hosts[0]
+            host.browser.is_connected.return_value = False
+            host._on_disconnected(host.browser)
+            await asyncio.gather(*service._background)
+            assert playwright.chromium.launch.await_count == 3
+            assert service.hosts[0] is not host
+            assert service.hosts[0].alive
+
+
+@pytest.mark.asyncio
+async def test_browser_service_keeps_recently_used_resolution_warm():
+    """The least recently used idle host is closed, not the one just released;
+    a host crashing mid-session is replaced right away."""
+    from src.browser.service import BrowserService
+
+    playwright = _mock_browser_service_playwright()
+    with patch("src.browser.service.async_playwright") as mock_ap, \
+            patch("src.browser.service.XvfbManager", side_effect=_mock_xvfb):
+        mock_ap.return_value.start = AsyncMock(return_value=playwright)
+
+        async with BrowserService(recycle_sessions=0, recycle_rss_mb=0, max_idle_hosts=1) as service:
+            await service.start(prelaunch=(1920, 1080))
+            await asyncio.gather(*service._background)
+
+            for _ in range(2):
+                async with service.session((1280, 720)):
+                    pass
+            assert playwright.chromium.launch.await_count == 2  # Second 720p session was warm
+            assert [host.resolution for host in service.hosts] == [(1280, 720)]
+
+            async with service.session((1280, 720)) as session:
+                crashed = session.host
+                crashed.browser.is_connected.return_value = False
+                crashed._on_disconnected(crashed.browser)
+                await asyncio.gather(*service._background)
+                assert crashed not in service.hosts
+                assert [host.alive for host in service.hosts] == [True]  # Replacement ready
+            crashed.browser.close.assert_not_awaited()  # Already disconnected
+            assert playwright.chromium.launch.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_render_profile_caps_fps_and_motion(monkeypatch):
+    """Render profile caps rAF to the capture rate and emulates reduced motion."""
+    from src.browser.render import RenderProfile
+
+    monkeypatch.setenv("RENDER_PAUSE_ANIMATIONS", "true")
+    profile = RenderProfile.for_framerate(30)
+    assert profile.max_fps == 30
+    assert profile.context_options() == {'reduced_motion': 'reduce'}
+
+    scripts = profile.init_scripts()
+    assert len(scripts) == 2
+    assert "1000 / 30" in scripts[0]
+    assert "animation-play-state: paused" in scripts[1]
+
+    # Capture at Chromium's native rate: nothing to throttle
+    assert RenderProfile(max_fps=60).init_scripts() == []
+
+    context = AsyncMock()
+    await profile.apply(context)
+    assert context.add_init_script.await_count == 2
+
+
+def test_launch_profiles(monkeypatch):
+    """Kiosk profile adds lean flags and restores background throttling."""
+    from src.browser.launch import get_launch_profile
+
+    standard = get_launch_profile('standard').launch_options()
+    assert '--start-fullscreen' in standard['args']
+    assert 'ignore_default_args' not in standard
+
+    kiosk = get_launch_profile('kiosk').launch_options()
+    assert set(standard['args']) < set(kiosk['args'])
+    assert '--disable-renderer-backgrounding' in kiosk['ignore_default_args']
+
+    monkeypatch.setenv('BROWSER_LAUNCH_PROFILE', 'standard')
+    assert get_launch_profile().name == 'standard'
+    with pytest.raises(ValueError, match="Unknown browser launch profile"):
+        get_launch_profile('turbo')
+
+
+def test_freshness_lifetime_and_block_list():
+    """Cache headers decide storability; host patterns match suffixes and globs."""
+    from src.browser.intercept import freshness_lifetime, host_blocked
+
+    assert freshness_lifetime({'cache-control': 'public, max-age=600'}, 0) == 600
+    assert freshness_lifetime({'cache-control': 'no-store'}, 0) is None
+    assert freshness_lifetime({'cache-control': 'private, max-age=600'}, 0) is None
+    assert freshness_lifetime({'cache-control': 'no-cache', 'etag': '"a"'}, 0) == 0
+    assert freshness_lifetime({}, 0) is None  # No lifetime and no validators
+    assert freshness_lifetime({'cache-control': 'max-age=60', 'vary': 'Cookie'}, 0) is None
+
+    patterns = ['google-analytics.com', '*.tracker.net']
+    assert host_blocked('www.google-analytics.com', patterns)
+    assert host_blocked('cdn.tracker.net', patterns)
+    assert not host_blocked('grafana.local', patterns)
+
+
+@pytest.mark.asyncio
+async def test_asset_cache_dedupes_evicts_and_persists(tmp_path):
+    """Bodies are content-addressed, LRU-evicted and the index survives reloads."""
+    from src.browser.intercept import AssetCache
+
+    cache = AssetCache(str(tmp_path), max_bytes=10)
+    await cache.store('http://a/1.js', 200, {'content-type': 'text/javascript'}, b'12345', 60)
+    await cache.store('http://a/2.js', 200, {}, b'12345', 60)  # Same content
+    assert cache.total_bytes == 5
+    assert len(list((tmp_path / 'objects').rglob('*'))) == 2  # One dir, one blob
+
+    cache.entries['http://a/1.js'].last_access = 0  # Least recently used
+    await cache.store('http://a/3.js', 200, {}, b'abcdefgh', 60)
+    assert 'http://a/1.js' not in cache.entries
+    assert cache.total_bytes <= 10
+
+    cache.flush()
+    reloaded = AssetCache(str(tmp_path), max_bytes=10)
+    assert set(reloaded.entries) == set(cache.entries)
+    assert await reloaded.read(reloaded.lookup('http://a/3.js')) == b'abcdefgh'
+
+
+@pytest.mark.asyncio
+async def test_asset_cache_index_write_is_debounced_off_loop(tmp_path, monkeypatch):
+    """Changes are batched into one delayed index write from a worker thread."""
+    import threading
+    from src.browser import intercept
+
+    monkeypatch.setattr(intercept, 'INDEX_FLUSH_DELAY', 0.05)
+    cache = intercept.AssetCache(str(tmp_path), max_bytes=1024)
+    writers = []
+    write_index = cache._write_index
+    monkeypatch.setattr(cache, '_write_index', lambda *args: (
+        writers.append(threading.current_thread()), write_index(*args)
+    ))
+
+    await cache.store('http://a/1.js', 200, {}, b'one', 60)
+    await cache.store('http://a/2.js', 200, {}, b'two', 60)
+    cache.touch('http://a/1.js')
+    assert not (tmp_path / 'index.json').exists()  # Nothing written on the loop
+
+    await asyncio.sleep(0.2)
+    assert len(writers) == 1 and writers[0] is not threading.main_thread()
+    assert set(intercept.AssetCache(str(tmp_path), max_bytes=1024).entries) == {
+        'http://a/1.js', 'http://a/2.js'
+    }
+
+    cache.remove('http://a/2.js')
+    cache.flush()  # On close: written right away, pending write dropped
+    await asyncio.sleep(0.1)
+    assert len(writers) == 2
+    assert set(intercept.AssetCache(str(tmp_path), max_bytes=1024).entries) == {'http://a/1.js'}
+
+
+@pytest.mark.asyncio
+async def test_interceptor_blocks_caches_and_counts(tmp_path):
+    """Trackers are aborted; a cached asset is served without the network."""
+    from src.browser.intercept import AssetCache, RequestInterceptor
+
+    def make_route(url, resource_type='script', request_headers=None, cache_control='max-age=600'):
+        route = MagicMock()
+        route.request.url = url
+        route.request.method = 'GET'
+        route.request.resource_type = resource_type
+        route.request.headers = {}
+        route.request.all_headers = AsyncMock(return_value=request_headers or {})
+        route.abort = AsyncMock()
+        route.continue_ = AsyncMock()
+        route.fulfill = AsyncMock()
+        response = MagicMock(status=200, headers={'cache-control': cache_control})
+        response.body = AsyncMock(return_value=b'bundle')
+        route.fetch = AsyncMock(return_value=response)
+        return route
+
+    interceptor = RequestInterceptor(['google-analytics.com'], AssetCache(str(tmp_path), 1024))
+
+    tracker = make_route('https://www.google-analytics.com/analytics.js')
+    await interceptor._handle(tracker)
+    tracker.abort.assert_awaited_once()
+
+    first = make_route('https://grafana.local/app.js')
+    await interceptor._handle(first)
+    first.fetch.assert_awaited_once()
+
+    second = make_route('https://grafana.local/app.js')
+    await interceptor._handle(second)
+    second.fetch.assert_not_awaited()
+    assert second.fulfill.await_args.kwargs['body'] == b'bundle'
+
+    document = make_route('https://grafana.local/', resource_type='document')
+    await interceptor._handle(document)
+    document.continue_.assert_awaited_once()
+
+    stats = interceptor.stats()
+    assert stats['blocked'] == 1 and stats['hits'] == 1 and stats['misses'] == 1
+    assert stats['hit_rate'] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_interceptor_never_shares_private_or_credentialed_responses(tmp_path):
+    """Private responses and responses to credentialed requests stay out of the shared cache."""
+    from src.browser.intercept import AssetCache, RequestInterceptor
+
+    def make_route(url, request_headers, cache_control):
+        route = MagicMock()
+        route.request.url = url
+        route.request.method = 'GET'
+        route.request.resource_type = 'image'
+        route.request.headers = {}
+        route.request.all_headers = AsyncMock(return_value=request_headers)
+        route.fulfill = AsyncMock()
+        response = MagicMock(status=200, headers={'cache-control': cache_control})
+        response.body = AsyncMock(return_value=b'png')
+        route.fetch = AsyncMock(return_value=response)
+        return route
+
+    cache = AssetCache(str(tmp_path), 1024)
+    interceptor = RequestInterceptor([], cache)
+    cases = [
+        ('https://grafana.local/render/d-solo/1.png', {}, 'private, max-age=600', False),
+        ('https://grafana.local/render/d-solo/2.png', {'cookie': 'grafana_session=a'}, 'max-age=600', False),
+        ('https://grafana.local/render/d-solo/3.png', {'authorization': 'Bearer a'}, 'max-age=600', False),
+        ('https://grafana.local/public/img/4.png', {'cookie': 'grafana_session=a'}, 'public, max-age=600', True),
+        ('https://grafana.local/public/img/5.png', {'authorization': 'Bearer a'}, 's-maxage=600', True),
+    ]
+    for url, request_headers, cache_control, stored in cases:
+        route = make_route(url, request_headers, cache_control)
+        await interceptor._handle(route)
+        assert route.fulfill.await_args.kwargs['body'] == b'png'
+        assert (cache.lookup(url) is not None) is stored, url
+    cache.flush()
+
+
+@pytest.mark.asyncio
+async def test_storage_state_round_trip_encrypted_and_expiry(tmp_path):
+    """States are encrypted per origin, merged on load and skipped once expired."""
+    import time
+    from cryptography.fernet import Fernet
+    from src.browser.storage import StorageStateStore
+
+    store = StorageStateStore(str(tmp_path), Fernet.generate_key())
+    state = {
+        'cookies': [{'name': 'grafana_session', 'value': 'secret-token',
+                     'domain': 'grafana.local', 'expires': time.time() + 3600}],
+        'origins': [{'origin': 'https://grafana.local', 'localStorage': []}],
+    }
+    context = MagicMock()
+    context.storage_state = AsyncMock(return_value=state)
+
+    assert await store.save(context, 'https://grafana.local/d/abc')
+    context.storage_state.assert_awaited_once_with(indexed_db=True)
+    assert all(b'secret-token' not in f.read_bytes() for f in tmp_path.glob('*.state'))
+
+    loaded = store.load(['https://grafana.local/d/abc', 'https://grafana.local/d/xyz'])
+    assert loaded == state
+    assert store.load(['https://other.local/']) is None
+
+    state['cookies'][0]['expires'] = time.time() - 1
+    await store.save(context, 'https://grafana.local/d/abc')
+    assert store.load(['https://grafana.local/d/abc']) is None
+
+
+@pytest.mark.asyncio
+async def test_storage_state_expiry_follows_auth_cookies(tmp_path):
+    """Short-lived non-auth cookies are dropped on load; the login is kept."""
+    import time
+    from cryptography.fernet import Fernet
+    from src.browser.storage import StorageStateStore
+
+    store = StorageStateStore(str(tmp_path), Fernet.generate_key())
+    session = {'name': 'grafana_session', 'value': 'secret-token',
+               'domain': 'grafana.local', 'expires': time.time() + 3600}
+    tracker = {'name': '_ga_tmp', 'value': 'x',
+               'domain': 'grafana.local', 'expires': time.time() + 60}
+    state = {'cookies': [session, tracker], 'origins': []}
+    context = MagicMock()
+    context.storage_state = AsyncMock(return_value=state)
+
+    await store.save(context, 'https://grafana.local/')
+    assert store.expires_at('https://grafana.local/') == session['expires']
+
+    tracker['expires'] = time.time() - 1
+    await store.save(context, 'https://grafana.local/')
+    assert store.load(['https://grafana.local/'])['cookies'] == [session]
+
+
+@pytest.mark.asyncio
+async def test_storage_keeper_refreshes_offscreen_and_stops_when_not_extended(tmp_path):
+    """Refreshes load a background tab, keep the front page in front and stop
+    once the server no longer extends the session."""
+    import time
+    from cryptography.fernet import Fernet
+    from src.browser.storage import StorageKeeper, StorageStateStore
+
+    store = StorageStateStore(str(tmp_path), Fernet.generate_key())
+    expires = time.time() + 1
+    state = {'cookies': [{'name': 'grafana_session', 'value': 'token',
+                          'domain': 'grafana.local', 'expires': expires}], 'origins': []}
+    page = MagicMock(url='https://grafana.local/d/abc')
+    page.reload = AsyncMock()
+    page.bring_to_front = AsyncMock()
+    page.evaluate = AsyncMock(return_value='visible')
+    background = MagicMock(url='https://grafana.local/d/abc')
+    background.goto = AsyncMock()
+    background.close = AsyncMock()
+    page.context.pages = [page]
+    page.context.new_page = AsyncMock(return_value=background)
+    page.context.storage_state = AsyncMock(return_value=state)
+
+    keeper = StorageKeeper(page, 'https://grafana.local/d/abc', store, refresh_margin=0.9)
+    async with keeper:
+        await asyncio.wait_for(keeper._task, timeout=5)  # Ends: expiry didn't move
+
+    page.reload.assert_not_called()
+    page.bring_to_front.assert_awaited_once()
+    background.goto.assert_awaited_once_with('https://grafana.local/d/abc', wait_until='domcontentloaded')
+    background.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_health_monitor_swaps_leaking_and_crashed_pages():
+    """Over-budget pages are replaced behind the old one; crashes recover in place."""
+    from src.browser.health import HealthThresholds, PageHealthMonitor
+
+    def make_page(heap_mb):
+        page = MagicMock()
+        page.is_closed.return_value = False
+        page.close = AsyncMock()
+        page.bring_to_front = AsyncMock()
+        cdp = MagicMock()
+        cdp.detach = AsyncMock()
+        cdp.send = AsyncMock(return_value={'metrics': [
+            {'name': 'JSHeapUsedSize', 'value': heap_mb * 1024 * 1024},
+            {'name': 'Nodes', 'value': 1000},
+        ]})
+        page.context.new_cdp_session = AsyncMock(return_value=cdp)
+        return page
+
+    leaking, fresh, recovered = make_page(800), make_page(50), make_page(50)
+    browser = MagicMock(display=None)
+    browser.open_page = AsyncMock(side_effect=[fresh, recovered])
+    pages = [leaking]
+    replaced = []
+
+    with patch('src.browser.health.wait_for_ready', new=AsyncMock(return_value=True)), \
+         patch.dict('os.environ', {'DISPLAY': ''}):
+        monitor = PageHealthMonitor(
+            browser, pages, ['https://grafana.local/d/abc'],
+            on_replace=lambda index, page: replaced.append((index, page)),
+            thresholds=HealthThresholds(max_heap_mb=512), interval=0, reload_cooldown=0
+        )
+        async with monitor:
+            await monitor._check()
+            await monitor._replacing[0]
+            assert pages == [fresh] and monitor.reloads == 1
+            fresh.bring_to_front.assert_awaited_once()
+            leaking.close.assert_awaited_once()  # Only after the swap
+
+            monitor._on_crash(fresh)
+            await monitor._replacing[0]
+            assert pages == [recovered] and monitor.crash_recoveries == 1
+
+    assert replaced == [(0, fresh), (0, recovered)]
+    assert monitor.stats()['reloads'] == 1
+
+
+@pytest.mark.asyncio
+async def test_health_monitor_replaces_offscreen_page_behind_front():
+    """An off-screen carousel page is reloaded without its tab ever taking the screen."""
+    from src.browser.health import HealthThresholds, PageHealthMonitor
+
+    order = []
+    on_screen, leaking, fresh = MagicMock(), MagicMock(), MagicMock()
+    for name, page in (("on_screen", on_screen), ("leaking", leaking), ("fresh", fresh)):
+        page.is_closed.return_value = False
+        page.close = AsyncMock()
+        page.bring_to_front = AsyncMock(side_effect=lambda name=name: order.append(f"front:{name}"))
+    fresh.goto = AsyncMock(side_effect=lambda *args, **kwargs: order.append("goto"))
+
+    # Real open_page on a mocked context: the new tab opens in the foreground
+    browser = BrowserManager()
+    browser.context = MagicMock()
+    browser.context.new_page = AsyncMock(side_effect=lambda: order.append("new_page") or fresh)
+    pages = [on_screen, leaking]
+
+    with patch('src.browser.health.wait_for_ready', new=AsyncMock(return_value=True)):
+        monitor = PageHealthMonitor(
+            browser, pages, ['https://a.local', 'https://b.local'],
+            front=lambda: 0, thresholds=HealthThresholds(), interval=0, reload_cooldown=0
+        )
+        async with monitor:
+            monitor._schedule_replace(1)
+            await monitor._replacing[1]
+
+    assert pages == [on_screen, fresh]
+    assert order == ["new_page", "front:on_screen", "goto"]  # Front page restored before loading
+    fresh.bring_to_front.assert_not_awaited()
+    leaking.close.assert_awaited_once()
@@ -42,6 +42,41 @@ def mock_chromecast_list(mock_chromecast):
     return [device1, device2]
 
 
+@pytest.fixture
+def device_index(monkeypatch):
+    """Empty in-memory device index for targeted discovery."""
+    from src.cast import device_index as device_index_module
+    index = device_index_module.DeviceIndex(None)
+    monkeypatch.setattr(device_index_module, '_index', index)
+    return index
+
+
+def _announcing(*names):
+    """Stand in for the mDNS browser: announce devices as soon as discovery starts."""
+    import uuid
+    from pychromecast.models import CastInfo
+
+    infos = [
+        CastInfo(set(), uuid.uuid4(), "Chromecast", name, f"192.168.1.{100 + i}", 8009, "cast", "Google")
+        for i, name in enumerate(names)
+    ]
+
+    class Browser:
+        def __init__(self, listener, zconf):
+            self.listener = listener
+            self.devices = {}
+
+        def start_discovery(self):
+            for info in infos:
+                self.devices[info.uuid] = info
+                self.listener.add_cast(info.uuid, f"{info.friendly_name}._googlecast._tcp.local.")
+
+        def stop_discovery(self):
+            pass
+
+    return patch.multiple('src.cast.discovery', CastBrowser=Browser, zeroconf=MagicMock())
+
+
 # Discovery Tests
 @pytest.mark.asyncio
 async def test_discover_devices_success(mock_chromecast_list):
@@ -95,19 +130,16 @@ async def test_discover_devices_exception():
 
 
 @pytest.mark.asyncio
-async def test_get_cast_device_by_name(mock_chromecast_list):
+async def test_get_cast_device_by_name(device_index):
     """Test getting device by specific name."""
-    mock_browser = MagicMock()
-    mock_browser.stop_discovery = MagicMock()
-
-    with patch('pychromecast.get_chromecasts') as mock_get:
-        mock_get.return_value = (mock_chromecast_list, mock_browser)
-
+    with _announcing("Living Room TV", "Bedroom TV"):
         # Case-insensitive search
         device = await get_cast_device("bedroom tv")
 
         assert device is not None
-        assert device.device.friendly_name == "Bedroom TV"
+        assert device.cast_info.friendly_name == "Bedroom TV"
+    # Announcements are remembered for the next lookup
+    assert device_index.find("living room tv").host == "192.168.1.100"
 
 
 @pytest.mark.asyncio
@@ -127,30 +159,20 @@ async def test_get_cast_device_first(mock_chromecast_list):
 
 
 @pytest.mark.asyncio
-async def test_get_cast_device_not_found(mock_chromecast_list):
+async def test_get_cast_device_not_found(device_index):
     """Test getting device that doesn't exist."""
-    mock_browser = MagicMock()
-    mock_browser.stop_discovery = MagicMock()
-
-    with patch('pychromecast.get_chromecasts') as mock_get:
-        mock_get.return_value = (mock_chromecast_list, mock_browser)
-
-        device = await get_cast_device("Kitchen TV")
+    with _announcing("Living Room TV", "Bedroom TV"):
+        device = await get_cast_device("Kitchen TV", timeout=0.5)
 
         # Should return None when not found
         assert device is None
 
 
 @pytest.mark.asyncio
-async def test_get_cast_device_empty_list():
+async def test_get_cast_device_empty_list(device_index):
     """Test getting device when no devices available."""
-    mock_browser = MagicMock()
-    mock_browser.stop_discovery = MagicMock()
-
-    with patch('pychromecast.get_chromecasts') as mock_get:
-        mock_get.return_value = ([], mock_browser)
-
-        device = await get_cast_device("Any TV")
+    with _announcing():
+        device = await get_cast_device("Any TV", timeout=0.5)
 
         # Should return None when no devices
         assert device is None
@@ -192,6 +214,63 @@ async def test_hdmi_cec_wake(mock_chromecast):
         mock_chromecast.set_volume_muted.assert_called_once_with(False)
 
 
+@pytest.mark.asyncio
+async def test_wake_skipped_when_tv_already_on(mock_chromecast):
+    """No wake signal or delay when the receiver reports the TV on and casting."""
+    mock_chromecast.status = MagicMock(is_stand_by=False, is_active_input=True)
+    mock_chromecast.is_idle = False
+
+    with patch('src.cast.session.asyncio.sleep', new=AsyncMock()) as sleep:
+        async with CastSessionManager(mock_chromecast):
+            pass
+
+    mock_chromecast.set_volume_muted.assert_not_called()
+    sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_wake_skipped_when_app_runs_without_power_state(mock_chromecast):
+    """A receiver that reports no power state but runs a Cast app is not woken."""
+    mock_chromecast.status = MagicMock(is_stand_by=None, is_active_input=None)
+    mock_chromecast.is_idle = False
+
+    with patch('src.cast.session.asyncio.sleep', new=AsyncMock()) as sleep:
+        async with CastSessionManager(mock_chromecast):
+            pass
+
+    mock_chromecast.set_volume_muted.assert_not_called()
+    sleep.assert_not_awaited()  # No BLIND_WAKE_DELAY
+
+
+@pytest.mark.asyncio
+async def test_wake_ends_on_status_change(mock_chromecast):
+    """A TV in standby is woken and the wait ends when it reports being on."""
+    import threading
+    import time
+
+    mock_chromecast.status = MagicMock(is_stand_by=True, is_active_input=False)
+    receiver = mock_chromecast.socket_client.receiver_controller
+    receiver._status_listeners = []
+    receiver.register_status_listener.side_effect = receiver._status_listeners.append
+
+    def unmute(muted):
+        def tv_turns_on():
+            time.sleep(0.2)
+            for listener in list(receiver._status_listeners):
+                listener.new_cast_status(MagicMock(is_stand_by=False, is_active_input=True))
+        threading.Thread(target=tv_turns_on).start()
+
+    mock_chromecast.set_volume_muted.side_effect = unmute
+
+    started = time.monotonic()
+    async with CastSessionManager(mock_chromecast, wake_timeout=5):
+        elapsed = time.monotonic() - started
+
+    mock_chromecast.set_volume_muted.assert_called_once_with(False)
+    assert 0.2 <= elapsed < 1.5  # Status-driven, not the timeout
+    assert receiver._status_listeners == []
+
+
 @pytest.mark.asyncio
 async def test_session_start_cast_not_active():
     """Test start_cast raises error when session not active."""
@@ -200,17 +279,97 @@ async def test_session_start_cast_not_active():
 
     # Should raise error when called outside context manager
     with pytest.raises(RuntimeError, match="Session not initialized"):
-        manager.start_cast("http://example.com/video.mp4")
+        await manager.start_cast("http://example.com/video.mp4")
+
+
+def _media_status_on_load(mock_chromecast, fire):
+    """Make play_media report to registered listeners from another thread, like pychromecast."""
+    import threading
+
+    listeners = []
+    mock_chromecast.media_controller._status_listeners = listeners
+    mock_chromecast.media_controller.register_status_listener.side_effect = listeners.append
+
+    def play_media(url, content_type, **kwargs):
+        thread = threading.Thread(target=fire, args=(list(listeners), url, kwargs))
+        thread.start()
+
+    mock_chromecast.media_controller.play_media.side_effect = play_media
+    return listeners
 
 
 @pytest.mark.asyncio
 async def test_session_start_cast_active(mock_chromecast):
-    """Test start_cast works when session is active."""
+    """Test start_cast waits for the receiver's media session without blocking the loop."""
+    import time
+
+    def fire(listeners, url, kwargs):
+        time.sleep(0.2)  # Receiver fetching the playlist
+        status = MagicMock(media_session_id=1, content_id=url)
+        for listener in listeners:
+            listener.new_media_status(status)
+
+    listeners = _media_status_on_load(mock_chromecast, fire)
+    manager = CastSessionManager(mock_chromecast)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async with manager:
+        tick_task = asyncio.create_task(ticker())
+        assert await manager.start_cast("http://example.com/video.m3u8") is True
+        tick_task.cancel()
+
+    assert ticks >= 5  # The loop kept running while waiting for the receiver
+    _, kwargs = mock_chromecast.media_controller.play_media.call_args
+    assert kwargs['stream_type'] == 'BUFFERED'
+    assert listeners == []  # Listener detached
+
+
+@pytest.mark.asyncio
+async def test_session_start_cast_repeats_clips(mock_chromecast):
+    """Test a slate clip is looped by the receiver and not watched as a live stream."""
+    def fire(listeners, url, kwargs):
+        mock_chromecast.media_controller.status = MagicMock(media_session_id=7, content_id=url)
+        for listener in listeners:
+            listener.new_media_status(mock_chromecast.media_controller.status)
+
+    _media_status_on_load(mock_chromecast, fire)
+    manager = CastSessionManager(mock_chromecast)
+
+    async with manager:
+        assert await manager.start_cast("http://example.com/slate.mp4", mode='clip') is True
+        assert manager.playback is None
+
+    message = mock_chromecast.media_controller.send_message.call_args.args[0]
+    assert message == {'type': 'QUEUE_UPDATE', 'mediaSessionId': 7, 'repeatMode': 'REPEAT_SINGLE'}
+
+
+@pytest.mark.asyncio
+async def test_session_start_cast_failure_and_timeout(mock_chromecast):
+    """Test start_cast surfaces load failures and gives up waiting after the timeout."""
+    outcome = {}
+
+    def fire(listeners, url, kwargs):
+        if outcome.get('fail'):
+            for listener in listeners:
+                listener.load_media_failed(1, 104)
+
+    _media_status_on_load(mock_chromecast, fire)
     manager = CastSessionManager(mock_chromecast)
 
     async with manager:
-        # Should not raise error when session is active
-        manager.start_cast("http://example.com/video.mp4")
+        outcome['fail'] = True
+        with pytest.raises(RuntimeError, match="failed to load"):
+            await manager.start_cast("http://example.com/video.m3u8")
+
+        outcome['fail'] = False
+        assert await manager.start_cast("http://example.com/video.m3u8", timeout=0.1) is False
 
 
 @pytest.mark.asyncio
@@ -348,3 +507,537 @@ async def test_retry_with_custom_exceptions():
             initial_delay=0.1,
             exceptions=(ConnectionError, TimeoutError)  # ValueError not in list
         )
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_and_probes_back(mock_chromecast, monkeypatch):
+    """A device that keeps failing is refused at once until a background probe reaches it."""
+    from src.cast import breaker as breaker_module
+    from src.cast.breaker import CircuitBreaker, CircuitOpenError, DeviceBreakers
+
+    probes = []
+
+    async def probe():
+        probes.append(asyncio.get_running_loop().time())
+        if len(probes) == 1:
+            raise OSError("Connection refused")
+
+    breaker = CircuitBreaker("10.0.0.5:8009", probe=probe, failure_threshold=2,
+                             reset_timeout=0.05, max_reset_timeout=0.1)
+    breaker.record_success(200)
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    # First probe fails and reopens with a jittered cooldown, the second closes it
+    for _ in range(50):
+        if breaker.state == 'closed':
+            break
+        await asyncio.sleep(0.02)
+    assert breaker.state == 'closed'
+    assert len(probes) == 2
+    assert 0.05 <= probes[1] - probes[0] <= 0.2
+    stats = breaker.to_dict()
+    assert stats['trips'] == 1
+    assert stats['success_rate'] == 0.4  # 2 successes out of 5 outcomes
+    assert 0 < stats['score'] <= 40
+
+    # Sessions refuse a device whose breaker is open without waiting on it
+    breakers = DeviceBreakers()
+    monkeypatch.setattr(breaker_module, '_breakers', breakers)
+    mock_chromecast.cast_info.host = "10.0.0.6"
+    mock_chromecast.cast_info.port = 8009
+    tripped = breakers.for_device(mock_chromecast)
+    tripped._probe = None
+    for _ in range(tripped.failure_threshold):
+        tripped.record_failure()
+    with pytest.raises(CircuitOpenError):
+        async with CastSessionManager(mock_chromecast):
+            pass
+    mock_chromecast.wait.assert_not_called()
+    await breakers.stop()
+
+
+# Connection Pool Tests
+@pytest.mark.asyncio
+async def test_registry_reuses_open_connection(mock_chromecast, monkeypatch):
+    """A pooled, connected device is handed out without rediscovery."""
+    from src.cast.registry import CastDeviceRegistry
+
+    monkeypatch.delenv('CAST_DEVICE_IP', raising=False)
+    mock_chromecast.cast_info = None
+    mock_chromecast.socket_client.is_connected = True
+    discover = AsyncMock(return_value=mock_chromecast)
+
+    with patch('src.cast.registry.get_cast_device', discover):
+        async with CastDeviceRegistry(check_interval=0) as registry:
+            first = await registry.get_device("Living Room TV")
+            second = await registry.get_device("living room tv")
+
+            assert first is second is mock_chromecast
+            discover.assert_awaited_once()
+            mock_chromecast.register_connection_listener.assert_called_once()
+
+            # Sessions on pooled devices leave the connection open
+            async with CastSessionManager(mock_chromecast, keep_connection=True):
+                pass
+            mock_chromecast.disconnect.assert_not_called()
+
+    mock_chromecast.disconnect.assert_called_once()  # Registry stop closes it
+
+
+@pytest.mark.asyncio
+async def test_registry_lookups_share_discovery_and_run_in_parallel(monkeypatch):
+    """Lookups of one device share a discovery; different devices don't wait on each other."""
+    import time
+    from src.cast.registry import CastDeviceRegistry
+
+    monkeypatch.delenv('CAST_DEVICE_IP', raising=False)
+
+    def make_device(name, host):
+        device = MagicMock(host=host, port=8009)
+        device.cast_info.friendly_name = name
+        device.cast_info.host = host
+        device.cast_info.port = 8009
+        device.socket_client.is_connected = True
+        device.wait = lambda timeout: time.sleep(0.2)  # Slow TLS connect
+        return device
+
+    devices = {"kitchen tv": make_device("Kitchen TV", "10.0.0.1"),
+               "hall tv": make_device("Hall TV", "10.0.0.2")}
+    discovered = []
+
+    async def discover(name):
+        discovered.append(name)
+        await asyncio.sleep(0.2)
+        return devices[name.lower()]
+
+    with patch('src.cast.registry.get_cast_device', side_effect=discover):
+        async with CastDeviceRegistry(check_interval=0) as registry:
+            started = time.monotonic()
+            kitchen, kitchen_again, hall = await asyncio.gather(
+                registry.get_device("Kitchen TV"),
+                registry.get_device("kitchen tv"),
+                registry.get_device("Hall TV"),
+            )
+            elapsed = time.monotonic() - started
+
+            assert kitchen is kitchen_again is devices["kitchen tv"]
+            assert hall is devices["hall tv"]
+            assert sorted(discovered) == ["Hall TV", "Kitchen TV"]  # One discovery per device
+            assert elapsed < 0.7  # Discovered and connected side by side, not one after another
+            assert len(registry.devices) == 2
+
+
+@pytest.mark.asyncio
+async def test_registry_reconnects_with_backoff(mock_chromecast):
+    """A connection the socket client gave up on is rebuilt from its host."""
+    from pychromecast.socket_client import CONNECTION_STATUS_FAILED
+    from src.cast.registry import CastDeviceRegistry, PooledDevice
+
+    mock_chromecast.cast_info = None
+    mock_chromecast.socket_client.is_connected = False
+    replacement = MagicMock()
+    replacement.socket_client.is_connected = True
+    attempts = [ConnectionError("refused"), replacement]
+
+    def connect(*args, **kwargs):
+        result = attempts.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    registry = CastDeviceRegistry(check_interval=0, max_backoff=0.01)
+    await registry.start()
+    pooled = PooledDevice(mock_chromecast)
+    registry.devices.append(pooled)
+
+    with patch('pychromecast.get_chromecast_from_host', side_effect=connect) as from_host, \
+         patch('src.cast.registry.asyncio.sleep', new=AsyncMock()) as sleep:
+        registry._on_connection_status(pooled, CONNECTION_STATUS_FAILED)
+        await pooled.reconnect_task
+
+    assert pooled.device is replacement and pooled.reconnects == 1
+    assert from_host.call_args.args[0][:2] == ("192.168.1.100", 8009)
+    sleep.assert_awaited_once_with(1.0)  # One backoff after the failed attempt
+    mock_chromecast.disconnect.assert_called_once()
+    await registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_device_cache_tracks_announcements(device_index):
+    """The device table follows add/update/remove events from a local responder."""
+    from src.cast.device_cache import DeviceCache
+    from src.cast.simulator import FakeMdnsResponder
+
+    async with FakeMdnsResponder(interfaces=['127.0.0.1']) as responder, \
+               DeviceCache(interfaces=['127.0.0.1']) as cache:
+        assert cache.lookup("Test TV") is None  # Lookups never block
+
+        uuid = await responder.add_device("Test TV", host='127.0.0.1', port=8009)
+        entry = await cache.wait_for("test tv", timeout=10)
+        assert entry is not None and entry.uuid == uuid
+        assert entry.cast_info.host == '127.0.0.1' and entry.cast_info.port == 8009
+        first_seen = entry.last_seen
+
+        await responder.update_device(uuid, name="Kitchen TV")
+        renamed = await cache.wait_for("Kitchen TV", timeout=10)
+        assert renamed is not None and renamed.uuid == uuid
+        assert renamed.last_seen >= first_seen
+        assert cache.lookup("Test TV") is None
+
+        await responder.remove_device(uuid)
+        for _ in range(100):
+            if cache.lookup("Kitchen TV") is None:
+                break
+            await asyncio.sleep(0.1)
+        assert cache.lookup("Kitchen TV") is None and cache.devices() == []
+
+
+@pytest.mark.asyncio
+async def test_targeted_discovery_returns_on_first_answer(device_index):
+    """A named device resolves on its announcement, or at its last known address, not after a full browse."""
+    import time
+    from src.cast.discovery import discover_device
+    from src.cast.simulator import FakeCastDevice, FakeMdnsResponder
+
+    async with FakeMdnsResponder(interfaces=['127.0.0.1']) as responder:
+        uuid = await responder.add_device("Test TV", host='127.0.0.1', port=8009)
+        started = time.monotonic()
+        device = await discover_device(str(uuid), timeout=10, interfaces=['127.0.0.1'])
+        assert device is not None and device.cast_info.friendly_name == "Test TV"
+        assert time.monotonic() - started < 5
+    assert device_index.find("test tv").uuid == str(uuid)
+
+    # Not announced at all: the address it was last seen at answers instead
+    async with FakeCastDevice() as tv:
+        device_index.remember("Office TV", tv.host, tv.port)
+        with _announcing():
+            started = time.monotonic()
+            device = await get_cast_device("Office TV", timeout=10)
+        assert device is not None and device.socket_client.is_connected
+        assert time.monotonic() - started < 5
+        await asyncio.get_running_loop().run_in_executor(None, lambda: device.disconnect(timeout=2))
+
+
+def test_parse_cast_address_accepts_ipv6():
+    """IPv4, hostnames and IPv6 (bare or bracketed with a port) parse into host and port."""
+    from src.cast.discovery import parse_cast_address, parse_cast_addresses
+
+    assert parse_cast_address("10.0.0.5") == ("10.0.0.5", None)
+    assert parse_cast_address(" 10.0.0.5:8010 ") == ("10.0.0.5", 8010)
+    assert parse_cast_address("tv.local:8009") == ("tv.local", 8009)
+    assert parse_cast_address("fe80::1") == ("fe80::1", None)
+    assert parse_cast_address("2001:db8::42") == ("2001:db8::42", None)
+    assert parse_cast_address("[2001:db8::42]") == ("2001:db8::42", None)
+    assert parse_cast_address("[fe80::1]:8010") == ("fe80::1", 8010)
+    assert [parse_cast_address(a) for a in parse_cast_addresses("fe80::1, 10.0.0.5:8010")] == [
+        ("fe80::1", None), ("10.0.0.5", 8010)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cached_device_skips_last_known_address(device_index, monkeypatch):
+    """A device already in the mDNS cache is returned without connecting to its last known address."""
+    from src.cast import discovery
+
+    monkeypatch.delenv("CAST_DEVICE_IP", raising=False)
+    device_index.remember("Test TV", "10.0.0.9", 8009)
+    cache = MagicMock()
+    cached = cache.lookup.return_value
+    cached.name = "Test TV"
+
+    with patch('src.cast.device_cache.get_device_cache', return_value=cache), \
+         patch.object(discovery, '_connect_last_known') as last_known:
+        device = await get_cast_device("Test TV")
+
+    assert device is cache.get_chromecast.return_value
+    cache.get_chromecast.assert_called_once_with(cached)
+    last_known.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_static_candidates_resolve_in_parallel(monkeypatch):
+    """A list of CAST_DEVICE_IP candidates is probed at once; the one that answered is cached."""
+    import socket
+    import time
+    from src.cast import discovery
+    from src.cast.simulator import FakeCastDevice
+
+    monkeypatch.setattr(discovery, "_static_hits", {})
+    monkeypatch.setenv("CAST_DEVICE_IP_TIMEOUT", "3")
+    monkeypatch.delenv("CAST_DEVICE_NAME", raising=False)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        dead_port = probe.getsockname()[1]
+    hanging = await asyncio.start_server(lambda r, w: asyncio.sleep(10), "127.0.0.1", 0)
+    hanging_port = hanging.sockets[0].getsockname()[1]
+
+    try:
+        async with FakeCastDevice() as tv:
+            monkeypatch.setenv(
+                "CAST_DEVICE_IP", f"127.0.0.1:{dead_port},127.0.0.1:{hanging_port},{tv.address}"
+            )
+            started = time.monotonic()
+            device = await get_cast_device()
+            assert device is not None and device.cast_info.port == tv.port
+            assert time.monotonic() - started < 2  # Didn't wait out the hanging host
+            assert device.socket_client.tries is None  # Keeps reconnecting after a drop
+            await asyncio.get_running_loop().run_in_executor(None, lambda: device.disconnect(timeout=2))
+
+            assert [address for address, _ in discovery._static_hits.values()] == [tv.address]
+            device = await get_cast_device()
+            assert device is not None and device.cast_info.port == tv.port
+            await asyncio.get_running_loop().run_in_executor(None, lambda: device.disconnect(timeout=2))
+    finally:
+        hanging.close()
+        await hanging.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_session_against_simulated_receiver(tmp_path, monkeypatch):
+    """Real pychromecast control path against a local Cast v2 receiver fetching from StreamingServer."""
+    import socket
+    from src.cast.simulator import FakeCastDevice
+    from src.video.server import StreamingServer
+
+    (tmp_path / "live.m3u8").write_text(
+        "#EXTM3U\n#EXT-X-TARGETDURATION:2\n#EXT-X-MEDIA-SEQUENCE:7\n"
+        "#EXTINF:2.0,\nlive7.ts\n#EXTINF:2.0,\nlive8.ts\n"
+    )
+    for name in ("live7.ts", "live8.ts"):
+        (tmp_path / name).write_bytes(b"\x47" * 1880)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = StreamingServer(port=port, stream_dir=str(tmp_path))
+    fetched = []
+    server.add_request_listener(lambda filename, size: fetched.append(filename))
+    await server.start()
+
+    try:
+        async with FakeCastDevice(standby=True, wake_delay=0.2) as tv:
+            monkeypatch.setenv("CAST_DEVICE_IP", tv.address)
+            device = await get_cast_device()
+            assert device is not None
+
+            async with CastSessionManager(device, wake_timeout=5) as session:
+                assert tv.standby is False  # Woken over "HDMI-CEC"
+                url = f"http://127.0.0.1:{port}/live.m3u8"
+                assert await session.start_cast(url) is True
+                for _ in range(50):
+                    if tv.stats()['player_state'] == 'PLAYING':
+                        break
+                    await asyncio.sleep(0.05)
+                assert tv.stats()['player_state'] == 'PLAYING'
+                assert fetched[:2] == ["live.m3u8", "live8.ts"]  # Joined at the live edge
+
+                with pytest.raises(RuntimeError, match="failed to load media"):
+                    await session.start_cast(f"http://127.0.0.1:{port}/missing.m3u8")
+
+            stats = tv.stats()
+            assert stats['messages']['LAUNCH'] == 1 and stats['messages']['LOAD'] == 2
+            assert stats['segments_fetched'] == 1 and stats['fetch_errors'] == 1
+            assert len(stats['load_to_first_segment_ms']) == 1
+    finally:
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_playback_monitor_counts_stalls_and_recovers():
+    """A stall past the threshold reloads playback; QoE counters follow the receiver."""
+    from src.cast.playback import PlaybackMonitor, PlaybackThresholds
+
+    recover = AsyncMock()
+    monitor = PlaybackMonitor(
+        request_status=MagicMock(),
+        recover=recover,
+        thresholds=PlaybackThresholds(stall_timeout=0.05, idle_timeout=0.05,
+                                      stale_timeout=0, max_recoveries=1),
+        poll_interval=0
+    )
+    async with monitor:
+        monitor.on_status('BUFFERING')
+        monitor.on_status('PLAYING', position=1.0)
+        monitor.on_status('PLAYING', position=2.0)
+        assert await monitor.check() is False  # Healthy
+
+        monitor.on_status('BUFFERING')  # Rebuffer
+        await asyncio.sleep(0.1)
+        assert monitor.problem().startswith("buffering")
+        assert await monitor.check() is True
+        recover.assert_awaited_once()
+        assert await monitor.check() is False  # Reload gets a full threshold
+
+        monitor.on_status('IDLE', idle_reason='ERROR')
+        await asyncio.sleep(0.1)
+        assert monitor.problem().startswith("idle")
+        assert await monitor.check() is False  # Recovery limit reached
+        assert recover.await_count == 1
+
+        # Another sender took over: not ours to fix
+        monitor.on_status('IDLE', idle_reason='INTERRUPTED')
+        await asyncio.sleep(0.1)
+        assert monitor.problem() is None and monitor.ended == 'INTERRUPTED'
+
+    stats = monitor.stats()
+    assert stats['stalls'] == 1 and stats['recoveries'] == 1
+    assert stats['state'] == 'IDLE' and stats['idle_reason'] == 'INTERRUPTED'
+    assert stats['buffering_s'] >= 0.1 and 0 < stats['rebuffer_ratio'] < 1
+    assert [t['state'] for t in stats['transitions']] == [
+        'BUFFERING', 'PLAYING', 'BUFFERING', 'IDLE'
+    ]
+
+
+@pytest.mark.asyncio
+async def test_playback_monitor_stops_when_user_cancels():
+    """A STOP from another sender ends monitoring instead of reloading the stream."""
+    from src.cast.playback import PlaybackMonitor, PlaybackThresholds
+
+    recover = AsyncMock()
+    request_status = MagicMock()
+    monitor = PlaybackMonitor(
+        request_status=request_status,
+        recover=recover,
+        thresholds=PlaybackThresholds(idle_timeout=0.05),
+        poll_interval=0.02
+    )
+    async with monitor:
+        monitor.on_status('PLAYING', position=1.0)
+        monitor.on_status('IDLE', idle_reason='CANCELLED')
+        await asyncio.sleep(0.1)
+        assert monitor.ended == 'CANCELLED' and monitor._task.done()
+        polls = request_status.call_count
+        await asyncio.sleep(0.1)
+        assert request_status.call_count == polls  # No more polling
+        assert await monitor.check() is False
+    recover.assert_not_awaited()
+    assert monitor.stats()['ended'] == 'CANCELLED'
+
+
+@pytest.mark.asyncio
+async def test_playback_monitor_stops_polling_when_receiver_app_changes(mock_chromecast):
+    """Once another app runs on the TV the monitor stops asking for media status (which would relaunch ours)."""
+    from src.cast.playback import PlaybackMonitor
+
+    media_controller = mock_chromecast.media_controller
+    media_controller.supporting_app_id = "CC1AD845"
+    media_controller.namespace = "urn:x-cast:com.google.cast.media"
+    socket_client = mock_chromecast.socket_client
+    socket_client.receiver_controller.app_id = "CC1AD845"
+    socket_client.app_namespaces = ["urn:x-cast:com.google.cast.media"]
+
+    session = CastSessionManager(mock_chromecast)
+    recover = AsyncMock()
+    monitor = PlaybackMonitor(
+        request_status=media_controller.update_status,
+        recover=recover,
+        poll_interval=0.02,
+        app_running=session._media_app_running
+    )
+    async with monitor:
+        await asyncio.sleep(0.1)
+        assert media_controller.update_status.call_count > 0 and monitor.ended is None
+
+        socket_client.receiver_controller.app_id = "233637DE"  # YouTube
+        socket_client.app_namespaces = ["urn:x-cast:com.google.youtube.mdx"]
+        await asyncio.sleep(0.1)
+        assert monitor.ended == 'app_changed' and monitor._task.done()
+        polls = media_controller.update_status.call_count
+        await asyncio.sleep(0.1)
+        assert media_controller.update_status.call_count == polls
+    recover.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cast_group_starts_screens_together_and_fixes_drift():
+    """A wall loads paused, aligns screens to the shared live edge, plays together and re-syncs drift."""
+    import itertools
+    from src.cast.group import CastGroup
+
+    session_ids = itertools.count(1)
+
+    def make_device(name, position):
+        device = MagicMock()
+        device.cast_info.friendly_name = name
+        device.status = MagicMock(is_stand_by=False, is_active_input=True)
+        device.is_idle = False
+        controller = device.media_controller
+        controller.status = MagicMock(adjusted_current_time=position)
+
+        def fire(listeners, url, kwargs):
+            if kwargs.get('current_time') is not None:
+                controller.status.adjusted_current_time = kwargs['current_time']
+            status = MagicMock(media_session_id=next(session_ids), content_id=url)
+            for listener in listeners:
+                listener.new_media_status(status)
+
+        _media_status_on_load(device, fire)
+        controller.update_status.side_effect = lambda callback_function: callback_function(True, None)
+        return device
+
+    devices = [make_device("Left", 100.0), make_device("Middle", 100.2), make_device("Right", 103.0)]
+    urls = [f"http://host/stream_t{i}.m3u8" for i in range(3)]
+
+    async with CastGroup(devices, max_drift_ms=500, sync_interval=0) as group:
+        assert await group.start_cast(urls) is True
+
+        for device, url in zip(devices, urls):
+            _, kwargs = device.media_controller.play_media.call_args
+            assert device.media_controller.play_media.call_args[0][0] == url
+            assert kwargs['autoplay'] is False  # Loaded paused
+            device.media_controller.play.assert_called_once()  # Released together
+        # Only the screen ahead was reloaded, at the shared live edge
+        assert devices[0].media_controller.play_media.call_count == 1
+        assert devices[2].media_controller.play_media.call_count == 2
+        assert devices[2].media_controller.play_media.call_args[1]['current_time'] == 100.0
+
+        devices[2].media_controller.status.adjusted_current_time = 101.5
+        drifting = await group.check_drift()
+        assert [screen.name for screen in drifting] == ["Right"]
+        target = devices[2].media_controller.seek.call_args[0][0]
+        assert 100.2 <= target < 100.5  # Back to the median screen
+        devices[0].media_controller.seek.assert_not_called()
+
+        stats = group.playback_stats()
+        assert [s['device'] for s in stats['screens']] == ["Left", "Middle", "Right"]
+        assert stats['screens'][2]['corrections'] == 1
+        assert stats['screens'][2]['drift_ms'] == pytest.approx(1300, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_cast_group_times_slowest_device_and_plays_on_own_threads():
+    """Group connect spans cover the slowest screen; PLAY doesn't depend on a free default executor."""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from src.cast.group import CastGroup
+    from src.video.timeline import StartupTimeline
+
+    def make_device(name, connect_s):
+        device = MagicMock()
+        device.cast_info.friendly_name = name
+        device.status = MagicMock(is_stand_by=False, is_active_input=True)
+        device.is_idle = False
+        device.wait = lambda timeout=None: time.sleep(connect_s)
+        return device
+
+    devices = [make_device("Fast", 0.05), make_device("Slow", 0.3), make_device("Other", 0.05)]
+    timeline = StartupTimeline("wall")
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=4))
+    try:
+        async with CastGroup(devices, timeline=timeline, sync_interval=0) as group:
+            assert timeline.durations()['cast_connect'] >= 300  # The slow screen, not the fast one
+
+            # Default executor has room for one party only
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+            started = time.monotonic()
+            await group._play_together()
+            assert time.monotonic() - started < 2  # Not the 5s barrier timeout
+            for device in devices:
+                device.media_controller.play.assert_called_once()
+    finally:
+        loop.set_default_executor(ThreadPoolExecutor())
@@ -13,9 +13,10 @@ import os
 import time
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 from src.video.stream import StreamManager
-from src.video.quality import get_quality_config, QUALITY_PRESETS
+from src.video.quality import get_quality_config, QUALITY_PRESETS, RenderGeometry
 from src.video.encoder import FFmpegEncoder
 from src.video.capture import XvfbManager
+from src.video.timeline import StartupTimeline, StartupTraceLog
 
 
 class TestQualityConfiguration:
@@ -51,6 +52,30 @@ class TestQualityConfiguration:
         with pytest.raises(ValueError):
             get_quality_config('invalid-preset')
 
+    def test_render_geometry_matches_preset(self):
+        """Viewport and device scale are derived from the preset resolution."""
+        config = get_quality_config('720p')
+
+        native = RenderGeometry.for_quality(config, render_scale=1.0, layout_width=0)
+        assert native.display == native.viewport == (1280, 720)
+        assert native.device_scale_factor == 1.0
+        assert not native.upscaled
+
+        # 1080p layout scaled down into the 720p screen instead of cropped
+        layout = RenderGeometry.for_quality(config, render_scale=1.0, layout_width=1920)
+        assert layout.display == (1280, 720)
+        assert layout.viewport == (1920, 1080)
+
+        # Render fewer pixels with the same layout, upscaled by the encoder
+        reduced = RenderGeometry.for_quality(config, render_scale=0.75, layout_width=0)
+        assert reduced.display == (960, 540)
+        assert reduced.viewport == (1280, 720)
+        assert reduced.device_scale_factor == 0.75
+        assert reduced.upscaled
+
+        with pytest.raises(ValueError):
+            RenderGeometry.for_quality(config, render_scale=1.5)
+
 
 class TestFFmpegEncoder:
     """Test FFmpeg encoder functionality."""
@@ -79,6 +104,39 @@ class TestFFmpegEncoder:
         assert '-bf' in args
         assert '0' in args  # No B-frames
 
+    def test_reduced_capture_is_upscaled(self):
+        """Verify a smaller capture is grabbed at its size and scaled to the output."""
+        config = get_quality_config('1080p')
+        encoder = FFmpegEncoder(config, capture_resolution=(1440, 810))
+        args = encoder.build_ffmpeg_args('/tmp/test.m3u8')
+
+        assert args[args.index('-video_size') + 1] == '1440x810'
+        assert '1920:1080' in args[args.index('-vf') + 1]
+
+    def test_tiled_wall_encodes_one_output_per_tile(self):
+        """Verify a 2x2 wall is captured once, split and cropped into four streams."""
+        config = get_quality_config('1080p')
+        screen = RenderGeometry.for_quality(config, render_scale=1.0, layout_width=0)
+        wall = screen.tiled(2, 2)
+        tiles = screen.tiles(2, 2)
+        assert wall.display == (3840, 2160)
+        assert [(t.x, t.y) for t in tiles] == [(0, 0), (1920, 0), (0, 1080), (1920, 1080)]
+
+        encoder = FFmpegEncoder(config, capture_resolution=wall.display, tiles=tiles)
+        outputs = [f'/tmp/test_t{i}.m3u8' for i in range(4)]
+        args = encoder.build_tiled_ffmpeg_args(outputs)
+
+        assert args.count('-i') == 2  # One capture for all screens
+        assert args[args.index('-video_size') + 1] == '3840x2160'
+        graph = args[args.index('-filter_complex') + 1]
+        assert graph.startswith('[0:v]split=4[c0][c1][c2][c3]')
+        assert '[c3]crop=1920:1080:1920:1080[v3]' in graph
+        assert [args[i + 1] for i, a in enumerate(args) if a == '-map' and args[i + 1].startswith('[')] == [
+            '[v0]', '[v1]', '[v2]', '[v3]'
+        ]
+        assert all(output in args for output in outputs)
+        assert args.count('-c:v') == 4
+
     def test_normal_latency_mode_args(self):
         """Verify normal mode allows B-frames for better compression."""
         config = get_quality_config('1080p')
@@ -90,6 +148,22 @@ class TestFFmpegEncoder:
         idx = args.index('-bf')
         assert args[idx + 1] == '2'  # 2 B-frames
 
+    def test_progress_reports_parsed(self):
+        """Verify FFmpeg -progress lines update fps, speed and frame count."""
+        config = get_quality_config('720p')
+        encoder = FFmpegEncoder(config)
+        args = encoder.build_ffmpeg_args('/tmp/test.m3u8')
+        assert args[args.index('-progress') + 1] == 'pipe:1'
+
+        progress = encoder.progress
+        for line in ("frame=0", "fps=0.00", "speed=N/A", "progress=continue",
+                     "frame=300", "fps=29.97", "bitrate=2500.1kbits/s", "speed=0.998x", "progress=continue"):
+            key, _, value = line.partition('=')
+            progress.update(key, value)
+        stats = progress.to_dict()
+        assert (stats['frame'], stats['fps'], stats['speed']) == (300, 29.97, 0.998)
+        assert stats['reported_s_ago'] is not None and stats['reported_s_ago'] < 1
+
 
 @pytest.mark.asyncio
 class TestStreamingOrchestration:
@@ -147,7 +221,8 @@ class TestStreamingOrchestration:
              patch('src.video.stream.XvfbManager', return_value=mock_xvfb), \
              patch('src.video.stream.BrowserManager', return_value=mock_browser), \
              patch('src.video.stream.FFmpegEncoder', return_value=mock_ffmpeg), \
-             patch('src.video.stream.CastSessionManager', return_value=mock_session):
+             patch('src.video.stream.CastSessionManager', return_value=mock_session), \
+             patch('src.video.stream.get_storage_store', return_value=None):
 
             manager = StreamManager(
                 url="https://test.local",
@@ -165,6 +240,181 @@ class TestStreamingOrchestration:
             assert result['status'] == 'completed'
             assert result['duration'] == 2
 
+    def _slow_exit_component(self, enter_value, exit_delay, exits):
+        """Build a mock async context manager whose exit takes exit_delay seconds."""
+        component = AsyncMock()
+        component.__aenter__ = AsyncMock(return_value=enter_value)
+
+        async def slow_exit(*args):
+            await asyncio.sleep(exit_delay)
+            exits.append(enter_value)
+            return False
+
+        component.__aexit__ = slow_exit
+        return component
+
+    async def test_stop_stream_tears_down_concurrently(self):
+        """Verify stop_stream() ends an indefinite stream with parallel teardown."""
+        exits = []
+        mock_cast_device = Mock()
+        mock_page = AsyncMock()
+        mock_browser = self._slow_exit_component(None, 0.3, exits)
+        mock_browser.__aenter__ = AsyncMock(return_value=mock_browser)
+        mock_browser.open_page = AsyncMock(return_value=mock_page)
+        mock_session = self._slow_exit_component(None, 0.3, exits)
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.start_cast = AsyncMock()
+
+        with patch('src.video.stream.get_cast_device', return_value=mock_cast_device), \
+             patch('src.video.stream.XvfbManager',
+                   return_value=self._slow_exit_component(':99', 0.0, exits)), \
+             patch('src.video.stream.BrowserManager', return_value=mock_browser), \
+             patch('src.video.stream.FFmpegEncoder',
+                   return_value=self._slow_exit_component('http://h/stream.m3u8', 0.3, exits)), \
+             patch('src.video.stream.CastSessionManager', return_value=mock_session), \
+             patch('src.video.stream.get_storage_store', return_value=None):
+
+            manager = StreamManager(
+                url="https://test.local",
+                cast_device_name="Test TV",
+                quality_preset="720p",
+                duration=None
+            )
+            task = asyncio.create_task(manager.start_stream())
+            await asyncio.sleep(0.1)
+
+            time_to_idle_ms = await asyncio.wait_for(manager.stop_stream(), timeout=5)
+            result = await task
+
+        # Cast, encoder and browser each take 0.3s - serial would be >= 0.9s
+        assert len(exits) == 4
+        assert time_to_idle_ms < 800
+        assert result['time_to_idle_ms'] == time_to_idle_ms
+
+    async def test_slate_plays_while_pipeline_warms_up(self, tmp_path):
+        """Verify the slate is cast before the browser starts and live replaces it."""
+        from src.video.slate import DEFAULT_SLATE_CLIP, SlateCache
+
+        events = []
+        slate = SlateCache(stream_dir=str(tmp_path / 'streams'), directory=str(tmp_path / 'frames'))
+        (tmp_path / 'streams' / DEFAULT_SLATE_CLIP).write_bytes(b'mp4')
+
+        mock_session = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+        mock_session.start_cast = AsyncMock(side_effect=lambda url, mode: events.append((mode, url)))
+
+        async def slow_browser_enter(*args):
+            await asyncio.sleep(0.1)  # Slate starts while the browser launches
+            events.append('browser')
+            return mock_browser
+
+        mock_browser = AsyncMock()
+        mock_browser.__aenter__ = slow_browser_enter
+        mock_browser.__aexit__ = AsyncMock(return_value=False)
+        mock_browser.open_page = AsyncMock(return_value=MagicMock())
+        mock_ffmpeg = AsyncMock()
+        mock_ffmpeg.__aenter__ = AsyncMock(return_value='http://h/stream.m3u8')
+        mock_ffmpeg.__aexit__ = AsyncMock(return_value=False)
+        mock_xvfb = AsyncMock()
+        mock_xvfb.__aenter__ = AsyncMock(return_value=':99')
+        mock_xvfb.__aexit__ = AsyncMock(return_value=False)
+
+        with patch('src.video.stream.get_cast_device', return_value=Mock()), \
+             patch('src.video.stream.XvfbManager', return_value=mock_xvfb), \
+             patch('src.video.stream.BrowserManager', return_value=mock_browser), \
+             patch('src.video.stream.FFmpegEncoder', return_value=mock_ffmpeg), \
+             patch('src.video.stream.CastSessionManager', return_value=mock_session) as cast_cls, \
+             patch('src.video.stream.wait_for_ready', new=AsyncMock(return_value=True)), \
+             patch('src.video.stream.get_storage_store', return_value=None):
+
+            manager = StreamManager(
+                url="https://test.local",
+                cast_device_name="Test TV",
+                quality_preset="720p",
+                duration=0.1,
+                slate=slate
+            )
+            await manager.start_stream()
+
+        assert events[0][0] == 'clip' and events[0][1].endswith(DEFAULT_SLATE_CLIP)
+        assert events[1:] == ['browser', ('hls', 'http://h/stream.m3u8')]
+        assert cast_cls.call_count == 1  # The slate's session carries the live stream
+
+    async def test_cast_wakes_while_pipeline_warms_up(self):
+        """Verify the Cast session connects and wakes the TV concurrently with the browser."""
+        events = []
+
+        async def slow_wake(*args):
+            await asyncio.sleep(0.1)
+            events.append('cast_awake')
+            return mock_session
+
+        async def slow_browser_enter(*args):
+            await asyncio.sleep(0.1)
+            events.append('browser')
+            return mock_browser
+
+        mock_session = AsyncMock()
+        mock_session.__aenter__ = slow_wake
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+        mock_session.start_cast = AsyncMock()
+        mock_browser = AsyncMock()
+        mock_browser.__aenter__ = slow_browser_enter
+        mock_browser.__aexit__ = AsyncMock(return_value=False)
+        mock_browser.open_page = AsyncMock(return_value=MagicMock())
+        mock_ffmpeg = AsyncMock()
+        mock_ffmpeg.__aenter__ = AsyncMock(return_value='http://h/stream.m3u8')
+        mock_ffmpeg.__aexit__ = AsyncMock(return_value=False)
+        mock_xvfb = AsyncMock()
+        mock_xvfb.__aenter__ = AsyncMock(return_value=':99')
+        mock_xvfb.__aexit__ = AsyncMock(return_value=False)
+
+        with patch('src.video.stream.get_cast_device', return_value=Mock()), \
+             patch('src.video.stream.XvfbManager', return_value=mock_xvfb), \
+             patch('src.video.stream.BrowserManager', return_value=mock_browser), \
+             patch('src.video.stream.FFmpegEncoder', return_value=mock_ffmpeg), \
+             patch('src.video.stream.CastSessionManager', return_value=mock_session) as cast_cls, \
+             patch('src.video.stream.wait_for_ready', new=AsyncMock(return_value=True)), \
+             patch('src.video.stream.get_storage_store', return_value=None):
+
+            manager = StreamManager(
+                url="https://test.local",
+                cast_device_name="Test TV",
+                quality_preset="720p",
+                duration=0.1
+            )
+            started = time.monotonic()
+            mock_session.start_cast.side_effect = lambda url, mode: events.append(
+                (mode, time.monotonic() - started)
+            )
+            await manager.start_stream()
+
+        assert sorted(events[:2]) == ['browser', 'cast_awake']
+        mode, play_at = events[2]
+        assert mode == 'hls'
+        assert play_at < 0.19  # Wake and browser launch (0.1s each) overlapped
+        assert cast_cls.call_count == 1
+
+    async def test_stop_stream_during_startup_cancels(self):
+        """Verify stopping before streaming begins cancels startup."""
+        async def slow_discovery(name):
+            await asyncio.sleep(10)
+
+        with patch('src.video.stream.get_cast_device', slow_discovery):
+            manager = StreamManager(
+                url="https://test.local",
+                cast_device_name="Test TV",
+                quality_preset="720p"
+            )
+            task = asyncio.create_task(manager.start_stream())
+            await asyncio.sleep(0.05)
+
+            await asyncio.wait_for(manager.stop_stream(), timeout=2)
+
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
     async def test_cast_device_not_found_raises_error(self):
         """Verify ValueError raised when Cast device not found."""
         with patch('src.video.stream.get_cast_device', return_value=None):
@@ -263,6 +513,8 @@ class TestPipelineIntegration:
             return mock_cast_device
 
         class MockXvfb:
+            def __init__(self, *args, **kwargs):
+                pass
             async def __aenter__(self):
                 call_order.append('xvfb_start')
                 return ':99'
@@ -271,13 +523,15 @@ class TestPipelineIntegration:
                 return False
 
         class MockBrowser:
+            def __init__(self, *args, **kwargs):
+                pass
             async def __aenter__(self):
                 call_order.append('browser_start')
                 return self
             async def __aexit__(self, *args):
                 call_order.append('browser_stop')
                 return False
-            async def get_page(self, url):
+            async def open_page(self, url, **kwargs):
                 call_order.append('browser_navigate')
                 page = AsyncMock()
                 page.wait_for_load_state = AsyncMock()
@@ -294,11 +548,13 @@ class TestPipelineIntegration:
                 return False
 
         class MockCast:
-            def __init__(self, *args):
+            def __init__(self, *args, **kwargs):
                 pass
             async def __aenter__(self):
                 call_order.append('cast_start')
                 return self
+            async def start_cast(self, *args, **kwargs):
+                pass
             async def __aexit__(self, *args):
                 call_order.append('cast_stop')
                 return False
@@ -307,7 +563,8 @@ class TestPipelineIntegration:
              patch('src.video.stream.XvfbManager', MockXvfb), \
              patch('src.video.stream.BrowserManager', MockBrowser), \
              patch('src.video.stream.FFmpegEncoder', MockFFmpeg), \
-             patch('src.video.stream.CastSessionManager', MockCast):
+             patch('src.video.stream.CastSessionManager', MockCast), \
+             patch('src.video.stream.get_storage_store', return_value=None):
 
             manager = StreamManager(
                 url="https://test.local",
@@ -334,3 +591,117 @@ class TestPipelineIntegration:
         ]
 
         assert call_order == expected_order
+
+
+class TestStartupTimeline:
+    """Test startup stage tracing and the rolling trace log."""
+
+    def test_span_records_duration(self):
+        """Verify span() records a completed stage with a duration."""
+        timeline = StartupTimeline(session_id="abc")
+        with timeline.span('discovery'):
+            time.sleep(0.01)
+
+        data = timeline.to_dict()
+        assert data['session_id'] == "abc"
+        assert data['spans']['discovery']['duration_ms'] >= 10
+        assert timeline.durations()['discovery'] >= 10
+
+    def test_open_span_reported_incomplete(self):
+        """Verify stages that never end are reported without a duration."""
+        timeline = StartupTimeline()
+        timeline.begin('first_segment_fetch')
+
+        data = timeline.to_dict()
+        assert data['complete'] is False
+        assert data['spans']['first_segment_fetch']['duration_ms'] is None
+
+    def test_end_is_idempotent(self):
+        """Verify end() only closes an open span once."""
+        timeline = StartupTimeline()
+        assert timeline.end('play_media') is False
+        timeline.begin('play_media')
+        assert timeline.end('play_media') is True
+        assert timeline.end('play_media') is False
+
+    def test_trace_log_summary_percentiles(self, tmp_path):
+        """Verify trace log appends JSONL records and summarizes percentiles."""
+        trace_log = StartupTraceLog(str(tmp_path / "trace.jsonl"))
+        for _ in range(3):
+            timeline = StartupTimeline()
+            with timeline.span('xvfb'):
+                pass
+            timeline.begin('first_segment_fetch')
+            timeline.end('first_segment_fetch')
+            trace_log.append(timeline)
+
+        assert len(trace_log.load()) == 3
+        summary = trace_log.summarize(percentiles=(50, 90))
+        assert summary['xvfb']['count'] == 3
+        assert 'p50' in summary['xvfb'] and 'p90' in summary['xvfb']
+        assert summary['total']['count'] == 3
+
+    def test_trace_log_rotates(self, tmp_path):
+        """Verify trace file rotates once it exceeds max_bytes."""
+        trace_log = StartupTraceLog(str(tmp_path / "trace.jsonl"), max_bytes=10)
+        trace_log.append(StartupTimeline())
+        trace_log.append(StartupTimeline())
+
+        assert os.path.exists(trace_log.rotated_path)
+        assert len(trace_log.load()) == 2
+
+    def test_first_segment_fetch_closed_by_server_listener(self, tmp_path):
+        """Verify the receiver's first segment fetch completes the timeline."""
+        trace_log = StartupTraceLog(str(tmp_path / "trace.jsonl"))
+        manager = StreamManager(
+            url="https://test.local",
+            cast_device_name="Test TV",
+            streaming_server=MagicMock(),
+            trace_log=trace_log
+        )
+        manager._watch_first_fetch("http://10.0.0.2:8080/stream_abc.m3u8")
+        manager.timeline.begin('first_segment_fetch')
+
+        manager._on_file_served("stream_abc.m3u8", 100)
+        assert not manager.timeline.is_complete()
+
+        manager._on_file_served("stream_abc0.ts", 1000)
+        assert manager.timeline.is_complete()
+        assert len(trace_log.load()) == 1
+
+        manager._on_file_served("stream_other0.ts", 5000)  # Another session's stream
+        receiver = manager.stats()['receiver']
+        assert receiver['files_served'] == 2 and receiver['bytes_served'] == 1100
+        assert receiver['last_fetch_at'] is not None
+
+
+class TestSlateCache:
+    """Test slate clip lookup and encoding."""
+
+    def test_slate_clip_prefers_dashboard_frame(self, tmp_path):
+        """Verify a dashboard's own slate wins over the default one."""
+        from src.video.slate import DEFAULT_SLATE_CLIP, SlateCache
+
+        slate = SlateCache(stream_dir=str(tmp_path), directory=str(tmp_path / 'frames'))
+        assert slate.clip_url('https://a.local') is None
+
+        (tmp_path / DEFAULT_SLATE_CLIP).write_bytes(b'mp4')
+        (tmp_path / slate.clip_name('https://a.local')).write_bytes(b'mp4')
+        assert slate.clip_url('https://a.local').endswith(slate.clip_name('https://a.local'))
+        assert slate.clip_url('https://b.local').endswith(DEFAULT_SLATE_CLIP)
+
+        args = slate.build_encode_args(['-loop', '1', '-i', 'frame.jpg'], 'out.mp4')
+        assert args[args.index('-t') + 1] == str(slate.duration)
+        assert 'stillimage' in args and args[-1] == 'out.mp4'
+        assert args[args.index('-threads') + 1] == '1'
+
+    @pytest.mark.asyncio
+    async def test_slate_encode_failure_is_reported(self, tmp_path):
+        """Verify an encoder that can't start leaves the slate unchanged instead of raising."""
+        from src.video.slate import SlateCache
+
+        slate = SlateCache(stream_dir=str(tmp_path), directory=str(tmp_path / 'frames'))
+        with patch('src.video.slate.shutil.which', return_value='/usr/bin/ffmpeg'), \
+             patch('asyncio.create_subprocess_exec', side_effect=OSError("Resource temporarily unavailable")):
+            assert await slate.prepare_default() is False
+        assert slate.clip_url('https://a.local') is None